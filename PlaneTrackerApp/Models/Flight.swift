@@ -23,7 +23,7 @@ struct Flight: Identifiable {
     let predictedAltitude: Double?
     let altitudeConfidence: Double?
     let hasPredictedAltitude: Bool
-    let predictedTrajectory: [[String: Any]]?
+    let predictedTrajectory: TrajectoryBuffer?
     
     // Custom initializer for backward compatibility
     init(id: String, callsign: String, originCountry: String, timePosition: Int?, lastContact: Int, longitude: Double?, latitude: Double?, baroAltitude: Double?, onGround: Bool, velocity: Double?, trueTrack: Double?, verticalRate: Double?, sensors: [Int]?, geoAltitude: Double?, squawk: String?, spi: Bool, positionSource: Int) {
@@ -104,3 +104,56 @@ struct AnyCodable: Codable {
         }
     }
 }
+
+// MARK: - Backend Fields
+
+extension Flight {
+    /// Full initializer including the backend enhanced fields
+    init(id: String, callsign: String, originCountry: String, timePosition: Int?, lastContact: Int, longitude: Double?, latitude: Double?, baroAltitude: Double?, onGround: Bool, velocity: Double?, trueTrack: Double?, verticalRate: Double?, sensors: [Int]?, geoAltitude: Double?, squawk: String?, spi: Bool, positionSource: Int, predictedAltitude: Double?, altitudeConfidence: Double?, hasPredictedAltitude: Bool, predictedTrajectory: TrajectoryBuffer?) {
+        self.id = id
+        self.callsign = callsign
+        self.originCountry = originCountry
+        self.timePosition = timePosition
+        self.lastContact = lastContact
+        self.longitude = longitude
+        self.latitude = latitude
+        self.baroAltitude = baroAltitude
+        self.onGround = onGround
+        self.velocity = velocity
+        self.trueTrack = trueTrack
+        self.verticalRate = verticalRate
+        self.sensors = sensors
+        self.geoAltitude = geoAltitude
+        self.squawk = squawk
+        self.spi = spi
+        self.positionSource = positionSource
+        self.predictedAltitude = predictedAltitude
+        self.altitudeConfidence = altitudeConfidence
+        self.hasPredictedAltitude = hasPredictedAltitude
+        self.predictedTrajectory = predictedTrajectory
+    }
+}
+
+// MARK: - State Comparison
+
+extension Flight {
+    /// True when `other` carries the same position, motion and identity
+    /// fields, i.e. re-rendering it would not change anything on screen.
+    func hasSameState(as other: Flight) -> Bool {
+        return id == other.id &&
+            lastContact == other.lastContact &&
+            timePosition == other.timePosition &&
+            latitude == other.latitude &&
+            longitude == other.longitude &&
+            baroAltitude == other.baroAltitude &&
+            geoAltitude == other.geoAltitude &&
+            velocity == other.velocity &&
+            trueTrack == other.trueTrack &&
+            verticalRate == other.verticalRate &&
+            onGround == other.onGround &&
+            callsign == other.callsign &&
+            squawk == other.squawk &&
+            predictedAltitude == other.predictedAltitude &&
+            predictedTrajectory == other.predictedTrajectory
+    }
+}
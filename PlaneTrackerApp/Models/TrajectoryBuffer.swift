@@ -0,0 +1,126 @@
+import Foundation
+
+/// Backend-predicted trajectory stored as one contiguous `Double` column per
+/// component. Decoded once with the flight, so reading it back never touches
+/// per-point dictionaries or `Any` boxes.
+struct TrajectoryBuffer: Equatable {
+    private(set) var latitudes: [Double]
+    private(set) var longitudes: [Double]
+    private(set) var altitudes: [Double]
+    private(set) var timeOffsets: [Double]
+    private(set) var distancesFromCurrent: [Double]
+    private(set) var bearings: [Double]
+
+    init() {
+        latitudes = []
+        longitudes = []
+        altitudes = []
+        timeOffsets = []
+        distancesFromCurrent = []
+        bearings = []
+    }
+
+    /// Build from columns of equal length (shorter columns truncate the rest)
+    init(latitudes: [Double], longitudes: [Double], altitudes: [Double],
+         timeOffsets: [Double], distancesFromCurrent: [Double], bearings: [Double]) {
+        let count = [latitudes.count, longitudes.count, altitudes.count,
+                     timeOffsets.count, distancesFromCurrent.count, bearings.count].min() ?? 0
+        self.latitudes = Array(latitudes.prefix(count))
+        self.longitudes = Array(longitudes.prefix(count))
+        self.altitudes = Array(altitudes.prefix(count))
+        self.timeOffsets = Array(timeOffsets.prefix(count))
+        self.distancesFromCurrent = Array(distancesFromCurrent.prefix(count))
+        self.bearings = Array(bearings.prefix(count))
+    }
+
+    init<S: Sequence>(_ points: S) where S.Element == TrajectoryPoint {
+        self.init()
+        for point in points {
+            append(point)
+        }
+    }
+
+    var count: Int {
+        return latitudes.count
+    }
+
+    var isEmpty: Bool {
+        return latitudes.isEmpty
+    }
+
+    mutating func reserveCapacity(_ capacity: Int) {
+        latitudes.reserveCapacity(capacity)
+        longitudes.reserveCapacity(capacity)
+        altitudes.reserveCapacity(capacity)
+        timeOffsets.reserveCapacity(capacity)
+        distancesFromCurrent.reserveCapacity(capacity)
+        bearings.reserveCapacity(capacity)
+    }
+
+    mutating func append(_ point: TrajectoryPoint) {
+        latitudes.append(point.latitude)
+        longitudes.append(point.longitude)
+        altitudes.append(point.altitude)
+        timeOffsets.append(point.timeOffset)
+        distancesFromCurrent.append(point.distanceFromCurrent)
+        bearings.append(point.bearing)
+    }
+
+    subscript(index: Int) -> TrajectoryPoint {
+        return TrajectoryPoint(
+            latitude: latitudes[index],
+            longitude: longitudes[index],
+            altitude: altitudes[index],
+            timeOffset: timeOffsets[index],
+            distanceFromCurrent: distancesFromCurrent[index],
+            bearing: bearings[index]
+        )
+    }
+
+    /// Points in time order, for APIs that still take `[TrajectoryPoint]`
+    var points: [TrajectoryPoint] {
+        return (0..<count).map { self[$0] }
+    }
+}
+
+// MARK: - Codable
+
+/// One array element that may fail to decode without failing the array
+private struct LenientTrajectoryPoint: Decodable {
+    let point: BackendTrajectoryPoint?
+
+    init(from decoder: Decoder) throws {
+        point = try? BackendTrajectoryPoint(from: decoder)
+    }
+}
+
+/// Decodes directly from the backend's array of point objects. A point with
+/// a missing or null field is skipped, not the whole response.
+extension TrajectoryBuffer: Codable {
+    init(from decoder: Decoder) throws {
+        var container = try decoder.unkeyedContainer()
+        self.init()
+        if let count = container.count {
+            reserveCapacity(count)
+        }
+        while !container.isAtEnd {
+            if let point = try container.decode(LenientTrajectoryPoint.self).point {
+                append(TrajectoryPoint(from: point))
+            }
+        }
+    }
+
+    func encode(to encoder: Encoder) throws {
+        var container = encoder.unkeyedContainer()
+        for index in 0..<count {
+            try container.encode(BackendTrajectoryPoint(
+                latitude: latitudes[index],
+                longitude: longitudes[index],
+                altitude: altitudes[index],
+                timeOffset: timeOffsets[index],
+                distanceFromCurrent: distancesFromCurrent[index],
+                bearing: bearings[index]
+            ))
+        }
+    }
+}
@@ -0,0 +1,107 @@
+import Foundation
+
+/// Which step of the `AltitudeFallback` cascade produced an altitude
+enum AltitudeSource: UInt8 {
+    case backendPrediction
+    case barometric
+    case geometric
+    case ground
+    case kalmanPrediction
+    case verticalRateIntegration
+    case velocity
+    case flightPhase
+
+    /// Sources taken directly from a report, which are fused into the filter
+    var isMeasured: Bool {
+        switch self {
+        case .backendPrediction, .barometric, .geometric:
+            return true
+        default:
+            return false
+        }
+    }
+}
+
+/// One refresh laid out as one column per input of the altitude cascade.
+///
+/// Missing optional values are stored as NaN, so a comparison such as
+/// `baroAltitudes[i] > 0` is false for both "not reported" and "not positive"
+/// and a presence mask comes for free.
+struct AltitudeColumns {
+    let flightIds: [String]
+    let predictedAltitudes: [Double]
+    let baroAltitudes: [Double]
+    let geoAltitudes: [Double]
+    let verticalRates: [Double]
+    let velocities: [Double]
+    let onGround: [Bool]
+    let latitudes: [Double]
+    let longitudes: [Double]
+    /// `timePosition` in seconds since 1970
+    let positionTimes: [Double]
+    /// `timePosition`, or `lastContact` when the report has no position time
+    let reportTimes: [Double]
+
+    init(flights: [Flight]) {
+        var flightIds: [String] = []
+        var predictedAltitudes: [Double] = []
+        var baroAltitudes: [Double] = []
+        var geoAltitudes: [Double] = []
+        var verticalRates: [Double] = []
+        var velocities: [Double] = []
+        var onGround: [Bool] = []
+        var latitudes: [Double] = []
+        var longitudes: [Double] = []
+        var positionTimes: [Double] = []
+        var reportTimes: [Double] = []
+
+        flightIds.reserveCapacity(flights.count)
+        predictedAltitudes.reserveCapacity(flights.count)
+        baroAltitudes.reserveCapacity(flights.count)
+        geoAltitudes.reserveCapacity(flights.count)
+        verticalRates.reserveCapacity(flights.count)
+        velocities.reserveCapacity(flights.count)
+        onGround.reserveCapacity(flights.count)
+        latitudes.reserveCapacity(flights.count)
+        longitudes.reserveCapacity(flights.count)
+        positionTimes.reserveCapacity(flights.count)
+        reportTimes.reserveCapacity(flights.count)
+
+        for flight in flights {
+            flightIds.append(flight.id)
+            predictedAltitudes.append(flight.predictedAltitude ?? .nan)
+            baroAltitudes.append(flight.baroAltitude ?? .nan)
+            geoAltitudes.append(flight.geoAltitude ?? .nan)
+            verticalRates.append(flight.verticalRate ?? .nan)
+            velocities.append(flight.velocity ?? .nan)
+            onGround.append(flight.onGround)
+            latitudes.append(flight.latitude ?? .nan)
+            longitudes.append(flight.longitude ?? .nan)
+            positionTimes.append(flight.timePosition.map { Double($0) } ?? .nan)
+            reportTimes.append(Double(flight.timePosition ?? flight.lastContact))
+        }
+
+        self.flightIds = flightIds
+        self.predictedAltitudes = predictedAltitudes
+        self.baroAltitudes = baroAltitudes
+        self.geoAltitudes = geoAltitudes
+        self.verticalRates = verticalRates
+        self.velocities = velocities
+        self.onGround = onGround
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.positionTimes = positionTimes
+        self.reportTimes = reportTimes
+    }
+
+    var count: Int {
+        return flightIds.count
+    }
+}
+
+/// Batch output, row-aligned with the `AltitudeColumns` it was computed from
+struct AltitudeEstimates {
+    /// Meters
+    let altitudes: [Double]
+    let sources: [AltitudeSource]
+}
@@ -1,125 +1,274 @@
 import Foundation
 import CoreLocation
 
+/// Picks the best available altitude for each flight, falling back from
+/// reported values to per-aircraft Kalman prediction and heuristics.
 class AltitudeFallback {
     
-    // Kalman Filter State
-    private var altitudeState: [Double] = [35000.0, 0.0]  // [altitude, vertical_rate]
-    private var covariance: [[Double]] = [[1000.0, 0.0], [0.0, 100.0]]
-    private var lastUpdateTime: Date?
-    private var measurementHistory: [(Date, Double, Double?)] = []  // (time, altitude, vertical_rate)
-    private var predictionHistory: [(Date, Double, Double)] = []  // (time, altitude, vertical_rate)
+    /// Per-aircraft filter state, keyed by `icao24`
+    let filterBank: AltitudeFilterBank
+    /// Recent reports per aircraft for rate integration and phase analysis
+    let historyStore: FlightHistoryStore
+    /// Longest extrapolation from the last fused altitude before falling back further
+    var maximumPredictionInterval: TimeInterval = 120.0
+    
+    private let now: () -> Date
+    private var lastEvictionTime: TimeInterval = 0
+    private var lastEstimatedFlightId: String?
     
     // Standard altitude levels for different flight phases
     private let standardAltitudes: [Int] = [1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000, 11000, 12000, 13000, 14000, 15000, 16000, 17000, 18000, 19000, 20000, 21000, 22000, 23000, 24000, 25000, 26000, 27000, 28000, 29000, 30000, 31000, 32000, 33000, 34000, 35000, 36000, 37000, 38000, 39000, 40000, 41000, 42000, 43000, 44000, 45000, 46000, 47000, 48000, 49000, 50000]
     
+    init(filterBank: AltitudeFilterBank = AltitudeFilterBank(),
+         historyStore: FlightHistoryStore = FlightHistoryStore(),
+         now: @escaping () -> Date = Date.init) {
+        self.filterBank = filterBank
+        self.historyStore = historyStore
+        self.now = now
+    }
+    
+    /// `history` is recorded into `historyStore` before estimating, for
+    /// callers that still keep their own list of past reports
     func estimateAltitude(for flight: Flight, with history: [Flight] = []) -> Double {
+        return estimateAltitudeWithSource(for: flight, with: history).altitude
+    }
+    
+    /// Scalar cascade for one flight, also reporting which method answered
+    func estimateAltitudeWithSource(for flight: Flight, with history: [Flight] = []) -> (altitude: Double, source: AltitudeSource) {
+        let time = now().timeIntervalSince1970
+        
+        // Single-flight callers never hit the batch path, so evict from here too
+        if time - lastEvictionTime > filterBank.idleTimeout / 4 {
+            evictIdleAircraft(at: time)
+        }
+        
+        historyStore.record(history)
+        return estimateAltitude(for: flight, at: time)
+    }
+    
+    /// Estimate every flight in one pass against a single clock reading, then
+    /// evict tracks for aircraft that have gone idle. Keyed by `icao24`.
+    func estimateAltitudes(for flights: [Flight]) -> [String: Double] {
+        let columns = AltitudeColumns(flights: flights)
+        let estimates = estimateAltitudes(columns)
+        
+        var altitudes: [String: Double] = Dictionary(minimumCapacity: flights.count)
+        for (flightId, altitude) in zip(columns.flightIds, estimates.altitudes) {
+            altitudes[flightId] = altitude
+        }
+        return altitudes
+    }
+    
+    /// Columnar form of the cascade for a whole refresh. Rows that carry a
+    /// usable reported altitude are resolved with one mask pass per source;
+    /// only the remainder go through the per-aircraft fallbacks. Produces the
+    /// same altitudes and filter state as estimating each row on its own.
+    /// Flight ids are expected to be unique within `columns`.
+    func estimateAltitudes(_ columns: AltitudeColumns) -> AltitudeEstimates {
+        let time = now().timeIntervalSince1970
+        let count = columns.count
+        
+        var altitudes = [Double](repeating: .nan, count: count)
+        var sources = [AltitudeSource](repeating: .flightPhase, count: count)
+        var resolved = [Bool](repeating: false, count: count)
+        
+        // Method 1: backend predicted altitude
+        for i in 0..<count where columns.predictedAltitudes[i] > 0 {
+            altitudes[i] = columns.predictedAltitudes[i]
+            sources[i] = .backendPrediction
+            resolved[i] = true
+        }
+        
+        // Method 2: reported barometric, then geometric altitude
+        for i in 0..<count where !resolved[i] && isReportedAltitudeUsable(columns.baroAltitudes[i]) {
+            altitudes[i] = columns.baroAltitudes[i]
+            sources[i] = .barometric
+            resolved[i] = true
+        }
+        for i in 0..<count where !resolved[i] && isReportedAltitudeUsable(columns.geoAltitudes[i]) {
+            altitudes[i] = columns.geoAltitudes[i]
+            sources[i] = .geometric
+            resolved[i] = true
+        }
+        
+        // If on ground, altitude is 0
+        for i in 0..<count where !resolved[i] && columns.onGround[i] {
+            altitudes[i] = 0.0
+            sources[i] = .ground
+            resolved[i] = true
+        }
+        
+        // Every row feeds the history, exactly as the scalar path records each flight
+        for i in 0..<count {
+            let baroAltitude = columns.baroAltitudes[i]
+            let geoAltitude = columns.geoAltitudes[i]
+            historyStore.record(FlightHistorySample(
+                time: columns.reportTimes[i],
+                latitude: reported(columns.latitudes[i]),
+                longitude: reported(columns.longitudes[i]),
+                altitude: baroAltitude > 0 ? baroAltitude : (geoAltitude > 0 ? geoAltitude : nil),
+                verticalRate: reported(columns.verticalRates[i])
+            ), for: columns.flightIds[i])
+        }
+        
+        for i in 0..<count {
+            if sources[i].isMeasured {
+                updateKalmanFilter(
+                    flightId: columns.flightIds[i],
+                    altitude: altitudes[i],
+                    verticalRate: reported(columns.verticalRates[i]),
+                    positionTime: reported(columns.positionTimes[i]),
+                    at: time
+                )
+            } else if !resolved[i] {
+                // Methods 3-6 depend on each aircraft's own track and history
+                let fallback = fallbackAltitude(
+                    flightId: columns.flightIds[i],
+                    reportTime: columns.reportTimes[i],
+                    verticalRate: reported(columns.verticalRates[i]),
+                    velocity: reported(columns.velocities[i]),
+                    at: time
+                )
+                altitudes[i] = fallback.altitude
+                sources[i] = fallback.source
+            }
+        }
+        
+        lastEstimatedFlightId = columns.flightIds.last ?? lastEstimatedFlightId
+        evictIdleAircraft(at: time)
+        return AltitudeEstimates(altitudes: altitudes, sources: sources)
+    }
+    
+    /// Confidence in the filtered altitude of `flightId` (defaults to the most
+    /// recently estimated flight), from 0 for no track to 1 for a tight fix
+    func getConfidenceScore(for flightId: String? = nil) -> Double {
+        guard let flightId = flightId ?? lastEstimatedFlightId,
+              let predicted = filterBank.predictedAltitude(for: flightId, at: now().timeIntervalSince1970) else {
+            return 0.0
+        }
+        // 1.0 at zero spread, 0.5 at a 100 m standard deviation
+        return 1.0 / (1.0 + predicted.variance.squareRoot() / 100.0)
+    }
+    
+    private func evictIdleAircraft(at time: TimeInterval) {
+        filterBank.evictIdleTracks(at: time)
+        historyStore.evictIdleAircraft(at: time)
+        lastEvictionTime = time
+    }
+    
+    private func estimateAltitude(for flight: Flight, at time: TimeInterval) -> (altitude: Double, source: AltitudeSource) {
+        lastEstimatedFlightId = flight.id
+        historyStore.record(flight)
+        
         // Method 1: Use backend predicted altitude (highest priority)
         if let predictedAltitude = flight.predictedAltitude, predictedAltitude > 0 {
-            updateKalmanFilter(altitude: predictedAltitude, verticalRate: flight.verticalRate)
-            return predictedAltitude
+            updateKalmanFilter(for: flight, altitude: predictedAltitude, at: time)
+            return (predictedAltitude, .backendPrediction)
         }
         
         // Method 2: Use available altitude data and update Kalman filter
-        if let baroAltitude = flight.baroAltitude, baroAltitude > 0 {
-            updateKalmanFilter(altitude: baroAltitude, verticalRate: flight.verticalRate)
-            return baroAltitude
+        if let baroAltitude = flight.baroAltitude, isReportedAltitudeUsable(baroAltitude) {
+            updateKalmanFilter(for: flight, altitude: baroAltitude, at: time)
+            return (baroAltitude, .barometric)
         }
         
-        if let geoAltitude = flight.geoAltitude, geoAltitude > 0 {
-            updateKalmanFilter(altitude: geoAltitude, verticalRate: flight.verticalRate)
-            return geoAltitude
+        if let geoAltitude = flight.geoAltitude, isReportedAltitudeUsable(geoAltitude) {
+            updateKalmanFilter(for: flight, altitude: geoAltitude, at: time)
+            return (geoAltitude, .geometric)
         }
         
         // If on ground, return 0
         if flight.onGround {
-            return 0.0
+            return (0.0, .ground)
         }
         
+        return fallbackAltitude(
+            flightId: flight.id,
+            reportTime: TimeInterval(flight.timePosition ?? flight.lastContact),
+            verticalRate: flight.verticalRate,
+            velocity: flight.velocity,
+            at: time
+        )
+    }
+    
+    /// Methods 3-6, for aircraft without a usable reported altitude
+    private func fallbackAltitude(flightId: String,
+                                  reportTime: TimeInterval,
+                                  verticalRate: Double?,
+                                  velocity: Double?,
+                                  at time: TimeInterval) -> (altitude: Double, source: AltitudeSource) {
         // Method 3: Kalman Filter Prediction (fallback when backend unavailable)
-        if let predictedAltitude = predictAltitudeWithKalman() {
-            return predictedAltitude
+        if let predictedAltitude = predictAltitudeWithKalman(for: flightId, at: time) {
+            return (predictedAltitude, .kalmanPrediction)
         }
         
         // Method 4: Vertical Rate Integration
-        if flight.verticalRate != nil {
-            let integratedAltitude = integrateVerticalRate(flight: flight, history: history)
+        if let verticalRate = verticalRate {
+            let integratedAltitude = integrateVerticalRate(flightId: flightId, reportTime: reportTime, verticalRate: verticalRate)
             if isReasonableAltitude(integratedAltitude) {
-                return integratedAltitude
+                return (integratedAltitude, .verticalRateIntegration)
             }
         }
         
         // Method 5: Velocity-based estimation
-        if let velocity = flight.velocity {
+        if let velocity = velocity {
             let velocityAltitude = estimateFromVelocity(velocity)
             if isReasonableAltitude(velocityAltitude) {
-                return velocityAltitude
+                return (velocityAltitude, .velocity)
             }
         }
         
         // Method 6: Flight phase analysis
-        return estimateFromFlightPhase(flight: flight, history: history)
+        return (estimateFromFlightPhase(flightId: flightId), .flightPhase)
+    }
+    
+    private func isReportedAltitudeUsable(_ altitude: Double) -> Bool {
+        return altitude > 0 && isReasonableAltitude(altitude)
+    }
+    
+    /// Column values use NaN for "not reported"
+    private func reported(_ value: Double) -> Double? {
+        return value.isNaN ? nil : value
     }
     
     // MARK: - Kalman Filter Methods
     
-    private func updateKalmanFilter(altitude: Double, verticalRate: Double?) {
-        let now = Date()
-        let dt = lastUpdateTime?.timeIntervalSince(now) ?? 1.0
-        
-        // Predict step
-        let _ = [[1.0, dt], [0.0, 1.0]]  // State transition matrix (unused for now)
-        let _ = [[1.0, 0.0], [0.0, 0.1]] // Process noise (unused for now)
-        
-        // Update state
-        altitudeState[0] = altitudeState[0] + altitudeState[1] * dt
-        altitudeState[1] = verticalRate ?? altitudeState[1]
-        
-        // Update covariance (simplified)
-        covariance[0][0] = covariance[0][0] + 1.0
-        covariance[1][1] = covariance[1][1] + 0.1
-        
-        // Store measurement
-        measurementHistory.append((now, altitude, verticalRate))
-        if measurementHistory.count > 20 {
-            measurementHistory.removeFirst()
-        }
-        
-        lastUpdateTime = now
+    private func updateKalmanFilter(for flight: Flight, altitude: Double, at time: TimeInterval) {
+        updateKalmanFilter(
+            flightId: flight.id,
+            altitude: altitude,
+            verticalRate: flight.verticalRate,
+            positionTime: flight.timePosition.map { TimeInterval($0) },
+            at: time
+        )
     }
     
-    private func predictAltitudeWithKalman() -> Double? {
-        guard let lastTime = lastUpdateTime else { return nil }
-        
-        let dt = Date().timeIntervalSince(lastTime)
-        let predictedAltitude = altitudeState[0] + altitudeState[1] * dt
-        
-        return isReasonableAltitude(predictedAltitude) ? predictedAltitude : nil
+    private func updateKalmanFilter(flightId: String,
+                                    altitude: Double,
+                                    verticalRate: Double?,
+                                    positionTime: TimeInterval?,
+                                    at time: TimeInterval) {
+        // Prefer the aircraft's own position timestamp so poll latency does not skew dt
+        filterBank.update(
+            flightId: flightId,
+            with: AltitudeMeasurement(time: positionTime ?? time, altitude: altitude, verticalRate: verticalRate)
+        )
     }
     
-    private func integrateVerticalRate(flight: Flight, history: [Flight]) -> Double {
-        // Find most recent altitude measurement
-        var lastAltitude: Double?
-        var timeSinceAltitude: Double = 0
-        
-        for i in stride(from: history.count - 1, through: 0, by: -1) {
-            let prevFlight = history[i]
-            if prevFlight.id == flight.id {
-                if let baroAlt = prevFlight.baroAltitude, baroAlt > 0 {
-                    lastAltitude = baroAlt
-                    break
-                } else if let geoAlt = prevFlight.geoAltitude, geoAlt > 0 {
-                    lastAltitude = geoAlt
-                    break
-                }
-                timeSinceAltitude += 1
-            }
-        }
+    private func predictAltitudeWithKalman(for flightId: String, at time: TimeInterval) -> Double? {
+        guard let track = filterBank.track(for: flightId),
+              time - track.time <= maximumPredictionInterval,
+              let predicted = filterBank.predictedAltitude(for: flightId, at: time) else { return nil }
         
-        guard let lastAlt = lastAltitude else { return 35000.0 }
+        return isReasonableAltitude(predicted.altitude) ? predicted.altitude : nil
+    }
+    
+    private func integrateVerticalRate(flightId: String, reportTime: TimeInterval, verticalRate: Double) -> Double {
+        // Most recent altitude measurement for this aircraft
+        guard let lastKnown = historyStore.lastKnownAltitude(for: flightId) else { return 35000.0 }
         
-        let verticalRate = flight.verticalRate ?? 0.0
-        let predictedAltitude = lastAlt + (verticalRate * timeSinceAltitude)
+        let timeSinceAltitude = max(0, reportTime - lastKnown.time)
+        let predictedAltitude = lastKnown.altitude + (verticalRate * timeSinceAltitude)
         
         return max(0, predictedAltitude)
     }
@@ -141,16 +290,11 @@ class AltitudeFallback {
         }
     }
     
-    private func estimateFromFlightPhase(flight: Flight, history: [Flight]) -> Double {
+    private func estimateFromFlightPhase(flightId: String) -> Double {
         // Analyze recent trajectory
-        let recentPositions = history.suffix(5).compactMap { prevFlight -> CLLocationCoordinate2D? in
-            guard prevFlight.id == flight.id,
-                  let lat = prevFlight.latitude,
-                  let lon = prevFlight.longitude else { return nil }
-            return CLLocationCoordinate2D(latitude: lat, longitude: lon)
-        }
+        let recentPositions = historyStore.recentPositions(for: flightId, limit: 5)
         
-        if recentPositions.count < 2 {
+        if recentPositions.count < 3 {
             return 35000.0
         }
         
@@ -167,11 +311,12 @@ class AltitudeFallback {
     }
     
     private func analyzeTrajectory(_ positions: [CLLocationCoordinate2D]) -> Double {
-        guard positions.count >= 2 else { return 0.0 }
+        // Each bearing change needs three consecutive positions
+        guard positions.count >= 3 else { return 0.0 }
         
         var bearingChanges: [Double] = []
         
-        for i in 1..<positions.count {
+        for i in 1..<(positions.count - 1) {
             let bearing1 = calculateBearing(from: positions[i-1], to: positions[i])
             let bearing2 = calculateBearing(from: positions[i], to: positions[i+1])
             bearingChanges.append(bearing2 - bearing1)
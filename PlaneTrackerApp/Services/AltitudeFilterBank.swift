@@ -0,0 +1,193 @@
+import Foundation
+
+/// One altitude report fed into an aircraft's filter
+struct AltitudeMeasurement {
+    /// Seconds since 1970
+    let time: TimeInterval
+    /// Meters
+    let altitude: Double
+    /// Meters per second, when the aircraft reported one
+    let verticalRate: Double?
+}
+
+/// Two-state Kalman filter for a single aircraft.
+///
+/// State is `[altitude, verticalRate]` under a constant-velocity model with
+/// white-noise vertical acceleration. Altitude and vertical rate are fused as
+/// independent scalar measurements, so the 2x2 covariance updates stay in
+/// closed form.
+struct AltitudeTrack {
+    /// Meters
+    private(set) var altitude: Double
+    /// Meters per second
+    private(set) var verticalRate: Double
+    /// Covariance `[[altitudeVariance, crossCovariance], [crossCovariance, rateVariance]]`
+    private(set) var altitudeVariance: Double
+    private(set) var crossCovariance: Double
+    private(set) var rateVariance: Double
+    /// Time the state refers to, seconds since 1970
+    private(set) var time: TimeInterval
+    private(set) var measurements: RingBuffer<AltitudeMeasurement>
+
+    init(measurement: AltitudeMeasurement,
+         altitudeVariance: Double,
+         rateVariance: Double,
+         historyCapacity: Int) {
+        self.altitude = measurement.altitude
+        self.verticalRate = measurement.verticalRate ?? 0
+        self.altitudeVariance = altitudeVariance
+        self.crossCovariance = 0
+        self.rateVariance = rateVariance
+        self.time = measurement.time
+        self.measurements = RingBuffer(capacity: historyCapacity)
+        self.measurements.append(measurement)
+    }
+
+    /// Altitude and its variance extrapolated to `time` without changing the state
+    func predicted(at time: TimeInterval, processNoise: Double) -> (altitude: Double, variance: Double) {
+        let dt = max(0, time - self.time)
+        let dt2 = dt * dt
+        let variance = altitudeVariance + 2 * dt * crossCovariance + dt2 * rateVariance + processNoise * dt2 * dt / 3
+        return (altitude + verticalRate * dt, variance)
+    }
+
+    // MARK: - Predict / Update
+
+    /// Propagate state and covariance forward to `time`
+    mutating func predict(to time: TimeInterval, processNoise: Double) {
+        let dt = time - self.time
+        guard dt > 0 else { return }
+
+        let dt2 = dt * dt
+        let p00 = altitudeVariance + 2 * dt * crossCovariance + dt2 * rateVariance + processNoise * dt2 * dt / 3
+        let p01 = crossCovariance + dt * rateVariance + processNoise * dt2 / 2
+        let p11 = rateVariance + processNoise * dt
+
+        altitude += verticalRate * dt
+        altitudeVariance = p00
+        crossCovariance = p01
+        rateVariance = p11
+        self.time = time
+    }
+
+    /// Fuse a direct altitude observation (H = [1, 0])
+    mutating func update(altitude measured: Double, variance: Double) {
+        let innovation = measured - altitude
+        let s = altitudeVariance + variance
+        let k0 = altitudeVariance / s
+        let k1 = crossCovariance / s
+
+        altitude += k0 * innovation
+        verticalRate += k1 * innovation
+        rateVariance -= k1 * crossCovariance
+        crossCovariance -= k0 * crossCovariance
+        altitudeVariance -= k0 * altitudeVariance
+    }
+
+    /// Fuse a reported vertical rate (H = [0, 1])
+    mutating func update(verticalRate measured: Double, variance: Double) {
+        let innovation = measured - verticalRate
+        let s = rateVariance + variance
+        let k0 = crossCovariance / s
+        let k1 = rateVariance / s
+
+        altitude += k0 * innovation
+        verticalRate += k1 * innovation
+        altitudeVariance -= k0 * crossCovariance
+        crossCovariance -= k0 * rateVariance
+        rateVariance -= k1 * rateVariance
+    }
+
+    mutating func record(_ measurement: AltitudeMeasurement) {
+        measurements.append(measurement)
+    }
+}
+
+/// Independent altitude filters keyed by `icao24`.
+///
+/// Every aircraft keeps its own state, covariance and a short fixed-size
+/// measurement ring, so estimating one flight never disturbs another. Tracks
+/// that have not been updated for `idleTimeout` seconds are evicted.
+class AltitudeFilterBank {
+
+    /// Spectral density of vertical acceleration, m²/s³
+    var processNoise: Double = 1.0
+    /// Variance of a reported altitude, m²
+    var altitudeMeasurementVariance: Double = 225.0
+    /// Variance of a reported vertical rate, m²/s²
+    var verticalRateMeasurementVariance: Double = 1.0
+    /// Initial vertical rate variance when the first report has no rate, m²/s²
+    var initialRateVariance: Double = 100.0
+    var idleTimeout: TimeInterval = 300.0
+
+    let historyCapacity: Int
+
+    private var tracks: [String: AltitudeTrack] = [:]
+
+    init(historyCapacity: Int = 8) {
+        self.historyCapacity = historyCapacity
+    }
+
+    var count: Int {
+        return tracks.count
+    }
+
+    func track(for flightId: String) -> AltitudeTrack? {
+        return tracks[flightId]
+    }
+
+    /// Predict the aircraft's track to the measurement time and fuse it.
+    /// Reports not newer than the current state are ignored, so re-polling an
+    /// unchanged position does not shrink the covariance twice.
+    func update(flightId: String, with measurement: AltitudeMeasurement) {
+        guard tracks[flightId] != nil else {
+            tracks[flightId] = AltitudeTrack(
+                measurement: measurement,
+                altitudeVariance: altitudeMeasurementVariance,
+                rateVariance: measurement.verticalRate == nil ? initialRateVariance : verticalRateMeasurementVariance,
+                historyCapacity: historyCapacity
+            )
+            return
+        }
+
+        let processNoise = self.processNoise
+        let altitudeVariance = altitudeMeasurementVariance
+        let rateVariance = verticalRateMeasurementVariance
+
+        // Mutate in place so the measurement ring is not copied
+        modifyTrack(flightId) { track in
+            guard measurement.time > track.time else { return }
+            track.predict(to: measurement.time, processNoise: processNoise)
+            track.update(altitude: measurement.altitude, variance: altitudeVariance)
+            if let verticalRate = measurement.verticalRate {
+                track.update(verticalRate: verticalRate, variance: rateVariance)
+            }
+            track.record(measurement)
+        }
+    }
+
+    /// Altitude extrapolated from the last fused state, nil for unknown aircraft
+    func predictedAltitude(for flightId: String, at time: TimeInterval) -> (altitude: Double, variance: Double)? {
+        return tracks[flightId]?.predicted(at: time, processNoise: processNoise)
+    }
+
+    /// Drop tracks whose last update is older than `idleTimeout`; returns how many were removed
+    @discardableResult
+    func evictIdleTracks(at time: TimeInterval) -> Int {
+        let cutoff = time - idleTimeout
+        let idle = tracks.compactMap { $0.value.time < cutoff ? $0.key : nil }
+        for flightId in idle {
+            tracks.removeValue(forKey: flightId)
+        }
+        return idle.count
+    }
+
+    func removeAll() {
+        tracks.removeAll()
+    }
+
+    private func modifyTrack(_ flightId: String, _ body: (inout AltitudeTrack) -> Void) {
+        guard let index = tracks.index(forKey: flightId) else { return }
+        body(&tracks.values[index])
+    }
+}
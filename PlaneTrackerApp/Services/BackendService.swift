@@ -2,92 +2,244 @@ import Foundation
 import Combine
 
 class BackendService: ObservableObject {
-    private var baseURL: String {
+    private static var defaultBaseURL: String {
         #if DEBUG
         return "http://10.103.2.222:8000"
         #else
         return "https://your-production-backend.com"
         #endif
     }
-    private let session = URLSession.shared
+    private let baseURL: String
+    /// Keep-alive, compression, conditional GETs and per-endpoint metrics
+    let session: BackendSession
     
-    // Caching
-    private var flightsCache: [Flight] = []
-    private var cacheTimestamp: Date?
-    private let cacheDuration: TimeInterval = 8.0 // 8 seconds to match backend
+    // Caching: last fetched snapshot, served stale-while-revalidate
+    private let cache: FlightFetchCache
     
     @Published var flights: [Flight] = []
     @Published var isLoading = false
     @Published var errorMessage: String?
     
+    /// Keyed copy of `flights`; each refresh is diffed against it
+    let flightStore = FlightStore()
+    /// Emits only the added/updated/removed flights of each refresh
+    let flightChanges = PassthroughSubject<FlightChangeset, Never>()
+    
+    /// Ask for the columnar binary flights encoding, falling back to JSON
+    var prefersCompactFormat = true
+    private let compactCodec = CompactFlightsCodec()
+    /// Decodes and diffs off the main thread; delivers finished snapshots on main
+    private let processor = FlightSnapshotProcessor(label: "com.planetracker.backend-snapshots")
+    
+    /// Largest id list sent in one bulk trajectory request
+    static let maxBulkTrajectoryIds = 250
+    
+    // Server-pushed updates, replacing polling while active
+    private var updateStream: FlightUpdateStream?
+    private var streamCancellable: AnyCancellable?
+    
+    // Latest backend trajectory per flight, filled by single and bulk fetches
+    private struct CachedTrajectory {
+        let points: [TrajectoryPoint]
+        let storedAt: Date
+    }
+    private let trajectoryLock = NSLock()
+    private var trajectoryCache: [String: CachedTrajectory] = [:]
+    /// Predictions cover about a minute ahead; older ones are dropped
+    var trajectoryLifetime: TimeInterval = 120
+    /// Beyond this many flights, the oldest trajectories are evicted
+    var maximumCachedTrajectories = 1000
+    
+    init(baseURL: String? = nil, session: BackendSession = BackendSession(),
+         cachePolicy: FlightCachePolicy = .default) {
+        self.baseURL = baseURL ?? BackendService.defaultBaseURL
+        self.session = session
+        self.cache = FlightFetchCache(policy: cachePolicy)
+    }
+    
+    var cachePolicy: FlightCachePolicy {
+        return cache.policy
+    }
+    
+    /// Seconds since the served snapshot was fetched or revalidated; nil before the first fetch
+    var cacheAge: TimeInterval? {
+        return cache.age()
+    }
+    
+    /// True while a network refresh is outstanding
+    var isRefreshing: Bool {
+        return cache.isRefreshing
+    }
+    
     // MARK: - Public Methods
     
+    /// Serve the cached snapshot when it is within `cachePolicy`, and go to
+    /// the network when it is stale or missing. A stale snapshot is published
+    /// immediately and replaced when the background refresh lands; only a
+    /// miss sets `isLoading`. At most one refresh is in flight at a time.
     func fetchFlights() {
-        NSLog("🔵 BackendService.fetchFlights() called")
+        Log.info("🔵 BackendService.fetchFlights() called", category: .network)
         // Check cache first
-        if let cacheTime = cacheTimestamp,
-           Date().timeIntervalSince(cacheTime) < cacheDuration,
-           !flightsCache.isEmpty {
-            NSLog("💾 BackendService: Using cached data (%d flights)", flightsCache.count)
-            DispatchQueue.main.async {
-                self.flights = self.flightsCache
-                self.isLoading = false
-                self.errorMessage = nil
+        let lookup = cache.lookup()
+        if lookup != .miss {
+            let age = Int(cache.age() ?? 0)
+            Log.info("💾 BackendService: Using \(lookup == .fresh ? "cached" : "stale") data (\(cache.flights.count) flights, \(age)s old)", category: .network)
+            processor.process(flights: cache.flights) { [weak self] snapshot in
+                self?.publish(snapshot)
+                self?.errorMessage = nil
             }
+            guard lookup == .stale else { return }
+        }
+        
+        guard cache.beginRefresh() else {
+            Log.info("⏳ BackendService: Refresh already in flight", category: .network)
             return
         }
         
-        isLoading = true
+        if lookup == .miss {
+            isLoading = true
+        }
         errorMessage = nil
         
         guard let url = URL(string: "\(baseURL)/api/flights") else {
-            NSLog("❌ BackendService: Invalid URL")
+            Log.error("❌ BackendService: Invalid URL", category: .network)
             errorMessage = "Invalid URL"
             isLoading = false
+            cache.endRefresh()
             return
         }
         
-        NSLog("🌐 BackendService: Fetching from %@", url.absoluteString)
+        Log.info("🌐 BackendService: Fetching from \(url.absoluteString)", category: .network)
         
-        session.dataTask(with: url) { [weak self] data, response, error in
-            DispatchQueue.main.async {
-                self?.isLoading = false
-                
-                if let error = error {
-                    NSLog("❌ BackendService: Network error - %@", error.localizedDescription)
-                    self?.errorMessage = error.localizedDescription
+        let accept = prefersCompactFormat
+            ? "\(CompactFlightsCodec.contentType), application/json;q=0.9"
+            : "application/json"
+        
+        // A 304 only means something if there is a decoded snapshot to keep
+        let hasCachedFlights = !cache.isEmpty
+        // The snapshot's age counts from when it was requested, not when it landed
+        let requestedAt = Date()
+        
+        session.get(url, endpoint: .flights, accept: accept) { [weak self] result in
+            // Runs on the session's delegate queue; decoding stays off main
+            guard let self = self else { return }
+            
+            let response: BackendSessionResponse
+            switch result {
+            case .failure(let error):
+                Log.error("❌ BackendService: Network error - \(error.localizedDescription)", category: .network)
+                DispatchQueue.main.async {
+                    self.cache.endRefresh()
+                    self.isLoading = false
+                    self.errorMessage = error.localizedDescription
                     // Return cached data if available
-                    if let cache = self?.flightsCache, !cache.isEmpty {
-                        NSLog("💾 BackendService: Using cached data due to error")
-                        self?.flights = cache
+                    if !self.cache.isEmpty {
+                        Log.info("💾 BackendService: Using cached data due to error", category: .network)
+                        self.processor.process(flights: self.cache.flights) { [weak self] snapshot in
+                            self?.publish(snapshot)
+                        }
                     }
-                    return
-                }
-                
-                guard let data = data else {
-                    self?.errorMessage = "No data received"
-                    return
                 }
+                return
+            case .success(let value):
+                response = value
+            }
+            
+            // 304: the snapshot we already decoded is still current
+            let isNotModified = response.isNotModified && hasCachedFlights
+            
+            self.processor.process({ [weak self] in
+                guard !isNotModified else { return nil }
+                return try self?.decodeFlights(response)
+            }, completion: { [weak self] result in
+                guard let self = self else { return }
+                self.cache.endRefresh()
+                self.isLoading = false
                 
-                do {
-                    let response = try JSONDecoder().decode(BackendFlightsResponse.self, from: data)
-                    if response.success {
-                        let flights = response.flights.map { Flight(from: $0) }
-                        NSLog("✅✅✅ BackendService: Successfully fetched %d flights", flights.count)
-                        self?.flights = flights
-                        self?.flightsCache = flights
-                        self?.cacheTimestamp = Date()
-                        self?.errorMessage = nil
-                    } else {
-                        NSLog("❌ BackendService: Backend returned success=false")
-                        self?.errorMessage = "Backend error"
-                    }
-                } catch {
-                    NSLog("❌ BackendService: Failed to decode - %@", error.localizedDescription)
-                    self?.errorMessage = "Failed to decode response: \(error.localizedDescription)"
+                switch result {
+                case .success(let snapshot?):
+                    Log.info("✅✅✅ BackendService: Successfully fetched \(snapshot.flights.count) flights", category: .network)
+                    self.publish(snapshot)
+                    self.cache.store(snapshot.flights, at: requestedAt)
+                    self.errorMessage = nil
+                case .success(nil) where isNotModified:
+                    Log.info("💾 BackendService: Flights not modified (\(self.cache.flights.count) flights)", category: .network)
+                    self.cache.revalidate(at: requestedAt)
+                    self.errorMessage = nil
+                case .success(nil):
+                    Log.error("❌ BackendService: Backend returned success=false", category: .network)
+                    self.errorMessage = "Backend error"
+                case .failure(let error):
+                    Log.error("❌ BackendService: Failed to decode - \(error.localizedDescription)", category: .network)
+                    self.errorMessage = "Failed to decode response: \(error.localizedDescription)"
                 }
+            })
+        }
+    }
+    
+    // MARK: - Streaming
+    
+    var isStreaming: Bool {
+        return updateStream != nil
+    }
+    
+    /// Subscribe to `/api/flights/stream`. The backend pushes a snapshot on
+    /// connect and per-aircraft deltas as it ingests state vectors; both are
+    /// applied to `flightStore` and republished through `flightChanges`.
+    func startStreaming() {
+        guard updateStream == nil,
+              let url = URL(string: "\(baseURL)/api/flights/stream") else { return }
+        
+        let stream = FlightUpdateStream(url: url)
+        // Messages go straight to the processor, which delivers on main
+        streamCancellable = stream.messages
+            .sink { [weak self] message in
+                self?.apply(message)
             }
-        }.resume()
+        updateStream = stream
+        stream.start()
+    }
+    
+    func stopStreaming() {
+        updateStream?.stop()
+        updateStream = nil
+        streamCancellable = nil
+    }
+    
+    private func apply(_ message: FlightStreamMessage) {
+        let completion: (FlightSnapshot) -> Void = { [weak self] snapshot in
+            guard let self = self else { return }
+            self.publish(snapshot)
+            self.cache.store(snapshot.flights)
+            self.errorMessage = nil
+        }
+        
+        switch message {
+        case .snapshot(let snapshot):
+            processor.process(flights: snapshot, completion: completion)
+        case .delta(let upserts, let removed):
+            processor.process(upserts: upserts, removals: removed, completion: completion)
+        }
+    }
+    
+    /// Decode a flights body in whichever format the server chose; nil when the backend reports failure
+    func decodeFlights(_ response: BackendSessionResponse) throws -> [Flight]? {
+        if let contentType = response.header("Content-Type"), contentType.hasPrefix(CompactFlightsCodec.contentType) {
+            return try compactCodec.decode(response.data).flights
+        }
+        
+        let decoded = try JSONDecoder().decode(BackendFlightsResponse.self, from: response.data)
+        return decoded.success ? decoded.flights.map { Flight(from: $0) } : nil
+    }
+    
+    /// Mirror a processed snapshot into the store and publish it only if something changed.
+    /// Main thread only; the diffing already happened on the processor's queue.
+    private func publish(_ snapshot: FlightSnapshot) {
+        let changes = flightStore.adopt(snapshot)
+        guard !changes.isEmpty else { return }
+        Log.info("🔄 BackendService: +\(changes.added.count) ~\(changes.updated.count) -\(changes.removed.count) flights", category: .network)
+        flights = snapshot.flights
+        flightChanges.send(changes)
     }
     
     func fetchFlightTrajectory(flightId: String, predictionTime: Double = 60.0) async throws -> [TrajectoryPoint] {
@@ -95,35 +247,119 @@ class BackendService: ObservableObject {
             throw BackendError.invalidURL
         }
         
-        let (data, response) = try await session.data(from: url)
+        let response = try await session.get(url, endpoint: .trajectory)
         
-        guard let httpResponse = response as? HTTPURLResponse,
-              httpResponse.statusCode == 200 else {
-            throw BackendError.serverError
+        if response.isNotModified, let cached = cachedTrajectory(for: flightId) {
+            return cached
         }
         
-        let trajectoryResponse = try JSONDecoder().decode(BackendTrajectoryResponse.self, from: data)
+        let trajectoryResponse = try JSONDecoder().decode(BackendTrajectoryResponse.self, from: response.data)
         
         if trajectoryResponse.success {
-            return trajectoryResponse.trajectory.map { TrajectoryPoint(from: $0) }
+            let trajectory = trajectoryResponse.trajectory.map { TrajectoryPoint(from: $0) }
+            storeTrajectories([flightId: trajectory])
+            return trajectory
         } else {
             throw BackendError.serverError
         }
     }
     
-    func fetchAltitudePrediction(flightId: String) async throws -> AltitudePrediction {
-        guard let url = URL(string: "\(baseURL)/api/flights/\(flightId)/altitude") else {
+    /// Fetch trajectories for many flights in as few round trips as possible.
+    ///
+    /// Ids are de-duplicated and sent in chunks of `maxBulkTrajectoryIds` to
+    /// `POST /api/flights/trajectories`, chunks in parallel. Results are merged
+    /// into the trajectory cache and returned keyed by flight id; flights the
+    /// backend could not predict are simply absent.
+    @discardableResult
+    func fetchTrajectories(flightIds: [String], predictionTime: Double = 60.0) async throws -> [String: [TrajectoryPoint]] {
+        var seen = Set<String>()
+        let ids = flightIds.filter { seen.insert($0).inserted }
+        guard !ids.isEmpty else { return [:] }
+        
+        guard let url = URL(string: "\(baseURL)/api/flights/trajectories") else {
             throw BackendError.invalidURL
         }
         
-        let (data, response) = try await session.data(from: url)
+        let chunkSize = BackendService.maxBulkTrajectoryIds
+        let chunks = stride(from: 0, to: ids.count, by: chunkSize).map {
+            Array(ids[$0..<min($0 + chunkSize, ids.count)])
+        }
+        
+        var trajectories: [String: [TrajectoryPoint]] = [:]
+        try await withThrowingTaskGroup(of: [String: [TrajectoryPoint]].self) { group in
+            for chunk in chunks {
+                group.addTask {
+                    try await self.fetchTrajectoryChunk(chunk, predictionTime: predictionTime, url: url)
+                }
+            }
+            for try await partial in group {
+                trajectories.merge(partial) { _, new in new }
+            }
+        }
+        
+        Log.info("🛤️ BackendService: Fetched \(trajectories.count) trajectories for \(ids.count) flights in \(chunks.count) requests",
+                 category: .network)
+        storeTrajectories(trajectories)
+        return trajectories
+    }
+    
+    private func fetchTrajectoryChunk(_ flightIds: [String], predictionTime: Double, url: URL) async throws -> [String: [TrajectoryPoint]] {
+        let body = try JSONEncoder().encode(BackendBulkTrajectoryRequest(flightIds: flightIds, predictionTime: predictionTime))
+        let response = try await session.post(url, endpoint: .trajectories, body: body)
         
-        guard let httpResponse = response as? HTTPURLResponse,
-              httpResponse.statusCode == 200 else {
+        let bulkResponse = try JSONDecoder().decode(BackendBulkTrajectoryResponse.self, from: response.data)
+        guard bulkResponse.success else {
             throw BackendError.serverError
         }
         
-        let altitudeResponse = try JSONDecoder().decode(BackendAltitudeResponse.self, from: data)
+        return bulkResponse.trajectories.mapValues { points in
+            points.map { TrajectoryPoint(from: $0) }
+        }
+    }
+    
+    /// Last trajectory received from the backend for `flightId`, unless it has expired
+    func cachedTrajectory(for flightId: String, now: Date = Date()) -> [TrajectoryPoint]? {
+        trajectoryLock.lock()
+        defer { trajectoryLock.unlock() }
+        guard let cached = trajectoryCache[flightId],
+              now.timeIntervalSince(cached.storedAt) < trajectoryLifetime else { return nil }
+        return cached.points
+    }
+    
+    var cachedTrajectoryCount: Int {
+        trajectoryLock.lock()
+        defer { trajectoryLock.unlock() }
+        return trajectoryCache.count
+    }
+    
+    /// Merge into the cache, then drop expired entries and, past
+    /// `maximumCachedTrajectories`, the oldest ones
+    func storeTrajectories(_ trajectories: [String: [TrajectoryPoint]], at date: Date = Date()) {
+        trajectoryLock.lock()
+        defer { trajectoryLock.unlock() }
+        for (flightId, points) in trajectories {
+            trajectoryCache[flightId] = CachedTrajectory(points: points, storedAt: date)
+        }
+        guard trajectoryCache.count > maximumCachedTrajectories else { return }
+        
+        trajectoryCache = trajectoryCache.filter { date.timeIntervalSince($0.value.storedAt) < trajectoryLifetime }
+        let excess = trajectoryCache.count - maximumCachedTrajectories
+        if excess > 0 {
+            let oldest = trajectoryCache.sorted { $0.value.storedAt < $1.value.storedAt }.prefix(excess)
+            for (flightId, _) in oldest {
+                trajectoryCache.removeValue(forKey: flightId)
+            }
+        }
+    }
+    
+    func fetchAltitudePrediction(flightId: String) async throws -> AltitudePrediction {
+        guard let url = URL(string: "\(baseURL)/api/flights/\(flightId)/altitude") else {
+            throw BackendError.invalidURL
+        }
+        
+        let response = try await session.get(url, endpoint: .altitude)
+        
+        let altitudeResponse = try JSONDecoder().decode(BackendAltitudeResponse.self, from: response.data)
         
         if altitudeResponse.success {
             return AltitudePrediction(
@@ -144,11 +380,8 @@ class BackendService: ObservableObject {
         }
         
         do {
-            let (_, response) = try await session.data(from: url)
-            guard let httpResponse = response as? HTTPURLResponse else {
-                return false
-            }
-            return httpResponse.statusCode == 200
+            let response = try await session.get(url, endpoint: .health)
+            return response.statusCode == 200
         } catch {
             return false
         }
@@ -187,7 +420,8 @@ struct BackendFlight: Codable {
     let predictedAltitude: Double?
     let altitudeConfidence: Double?
     let hasPredictedAltitude: Bool?
-    let predictedTrajectory: [[String: AnyCodable]]?
+    /// Decoded straight into typed columns
+    let predictedTrajectory: TrajectoryBuffer?
     
     enum CodingKeys: String, CodingKey {
         case icao24, callsign, originCountry, timePosition, lastContact
@@ -223,6 +457,27 @@ struct BackendTrajectoryPoint: Codable {
     }
 }
 
+struct BackendBulkTrajectoryRequest: Codable {
+    let flightIds: [String]
+    let predictionTime: Double
+    
+    enum CodingKeys: String, CodingKey {
+        case flightIds = "flight_ids", predictionTime = "prediction_time"
+    }
+}
+
+struct BackendBulkTrajectoryResponse: Codable {
+    let success: Bool
+    /// Keyed by icao24; unknown or unpredictable flights are omitted
+    let trajectories: [String: [BackendTrajectoryPoint]]
+    let predictionTime: Double
+    let timestamp: String
+    
+    enum CodingKeys: String, CodingKey {
+        case success, trajectories, predictionTime = "prediction_time", timestamp
+    }
+}
+
 struct BackendAltitudeResponse: Codable {
     let success: Bool
     let flightId: String
@@ -269,9 +524,7 @@ extension Flight {
         self.predictedAltitude = backendFlight.predictedAltitude
         self.altitudeConfidence = backendFlight.altitudeConfidence
         self.hasPredictedAltitude = backendFlight.hasPredictedAltitude ?? false
-        self.predictedTrajectory = backendFlight.predictedTrajectory?.map { dict in
-            dict.mapValues { $0.value }
-        }
+        self.predictedTrajectory = backendFlight.predictedTrajectory
     }
 }
 
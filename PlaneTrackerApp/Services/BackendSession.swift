@@ -0,0 +1,298 @@
+import Foundation
+
+/// Backend endpoints tracked separately for metrics
+enum BackendEndpoint: String, CaseIterable {
+    case flights
+    case trajectory
+    case trajectories
+    case altitude
+    case health
+}
+
+/// Result of a `BackendSession` GET
+struct BackendSessionResponse {
+    let statusCode: Int
+    let headers: [AnyHashable: Any]
+    /// Response body; on `304` this is the body cached with the matching ETag,
+    /// and `headers` carry that body's original `Content-Type`
+    let data: Data
+    /// Server answered `304 Not Modified` - callers holding a decoded copy can skip decoding
+    let isNotModified: Bool
+
+    /// Case-insensitive header lookup
+    func header(_ name: String) -> String? {
+        for (key, value) in headers {
+            if let key = key as? String, key.caseInsensitiveCompare(name) == .orderedSame {
+                return value as? String
+            }
+        }
+        return nil
+    }
+}
+
+/// Bytes-on-wire and latency totals for one endpoint
+struct BackendEndpointMetrics {
+    var requestCount = 0
+    var notModifiedCount = 0
+    var coalescedCount = 0
+    /// Response body bytes as received, i.e. before gzip/deflate decoding
+    var bytesReceived: Int64 = 0
+    /// Response body bytes after decoding
+    var bytesDecoded: Int64 = 0
+    var bytesSent: Int64 = 0
+    var totalLatency: TimeInterval = 0
+    var lastLatency: TimeInterval = 0
+
+    var averageLatency: TimeInterval {
+        return requestCount > 0 ? totalLatency / Double(requestCount) : 0
+    }
+}
+
+/// Shared HTTP layer for the backend.
+///
+/// One long-lived `URLSession` keeps connections alive between refreshes and
+/// negotiates gzip/deflate. GETs are conditional: the last `ETag` per URL and
+/// `Accept` is replayed as `If-None-Match`, and a `304` hands back the cached
+/// body, with its `Content-Type`, flagged `isNotModified`. Concurrent
+/// identical GETs share a single task.
+class BackendSession {
+
+    typealias Completion = (Result<BackendSessionResponse, Error>) -> Void
+
+    /// A representation depends on the negotiated format as well as the URL
+    private struct ValidatorKey: Hashable {
+        let url: URL
+        let accept: String
+    }
+
+    private struct Validator {
+        let etag: String
+        let body: Data
+        let contentType: String?
+    }
+
+    /// Callers joined on one in-flight GET. A reference, so the task can
+    /// still answer them if the session is released mid-request.
+    private final class PendingRequest {
+        var completions: [Completion]
+
+        init(_ completion: @escaping Completion) {
+            completions = [completion]
+        }
+    }
+
+    private let session: URLSession
+    private let metricsCollector: BackendMetricsCollector
+
+    private let lock = NSLock()
+    private var validators: [ValidatorKey: Validator] = [:]
+    private var inFlight: [String: PendingRequest] = [:]
+
+    init(configuration: URLSessionConfiguration = BackendSession.makeConfiguration()) {
+        metricsCollector = BackendMetricsCollector()
+        session = URLSession(configuration: configuration, delegate: metricsCollector, delegateQueue: nil)
+    }
+
+    deinit {
+        session.finishTasksAndInvalidate()
+    }
+
+    static func makeConfiguration() -> URLSessionConfiguration {
+        let configuration = URLSessionConfiguration.default
+        configuration.httpMaximumConnectionsPerHost = 4
+        configuration.timeoutIntervalForRequest = 15
+        configuration.httpAdditionalHeaders = ["Accept-Encoding": "gzip, deflate"]
+        // Validators are handled here; URLCache would turn our 304s back into 200s
+        configuration.requestCachePolicy = .reloadIgnoringLocalCacheData
+        configuration.urlCache = nil
+        return configuration
+    }
+
+    // MARK: - Requests
+
+    /// Conditional GET. Identical requests already in flight are joined rather than re-sent.
+    func get(_ url: URL, endpoint: BackendEndpoint, accept: String = "application/json", completion: @escaping Completion) {
+        let key = "\(accept) \(url.absoluteString)"
+
+        lock.lock()
+        if let pending = inFlight[key] {
+            pending.completions.append(completion)
+            lock.unlock()
+            metricsCollector.recordCoalesced(endpoint)
+            return
+        }
+        let pending = PendingRequest(completion)
+        inFlight[key] = pending
+        let validatorKey = ValidatorKey(url: url, accept: accept)
+        let validator = validators[validatorKey]
+        lock.unlock()
+
+        var request = URLRequest(url: url)
+        request.setValue(accept, forHTTPHeaderField: "Accept")
+        if let validator = validator {
+            request.setValue(validator.etag, forHTTPHeaderField: "If-None-Match")
+        }
+
+        let task = session.dataTask(with: request) { [weak self] data, response, error in
+            guard let self = self else {
+                // Nothing can join any more; answer everyone who already did
+                for waiter in pending.completions {
+                    waiter(.failure(BackendError.networkError))
+                }
+                return
+            }
+            let result = self.makeResult(validatorKey: validatorKey, data: data, response: response, error: error)
+
+            self.lock.lock()
+            self.inFlight.removeValue(forKey: key)
+            let waiters = pending.completions
+            self.lock.unlock()
+
+            for waiter in waiters {
+                waiter(result)
+            }
+        }
+        task.taskDescription = endpoint.rawValue
+        task.resume()
+    }
+
+    func get(_ url: URL, endpoint: BackendEndpoint, accept: String = "application/json") async throws -> BackendSessionResponse {
+        return try await withCheckedThrowingContinuation { continuation in
+            get(url, endpoint: endpoint, accept: accept) { result in
+                continuation.resume(with: result)
+            }
+        }
+    }
+
+    /// POST a JSON body. Never coalesced or conditional, since bodies differ per caller.
+    func post(_ url: URL, endpoint: BackendEndpoint, body: Data, accept: String = "application/json") async throws -> BackendSessionResponse {
+        var request = URLRequest(url: url)
+        request.httpMethod = "POST"
+        request.httpBody = body
+        request.setValue("application/json", forHTTPHeaderField: "Content-Type")
+        request.setValue(accept, forHTTPHeaderField: "Accept")
+
+        return try await withCheckedThrowingContinuation { continuation in
+            let task = session.dataTask(with: request) { [weak self] data, response, error in
+                guard let self = self else {
+                    continuation.resume(throwing: BackendError.networkError)
+                    return
+                }
+                continuation.resume(with: self.makeResult(validatorKey: nil, data: data, response: response, error: error))
+            }
+            task.taskDescription = endpoint.rawValue
+            task.resume()
+        }
+    }
+
+    /// `validatorKey` is where the ETag is stored/consulted; nil for non-GET requests
+    private func makeResult(validatorKey: ValidatorKey?, data: Data?, response: URLResponse?, error: Error?) -> Result<BackendSessionResponse, Error> {
+        if let error = error {
+            return .failure(error)
+        }
+        guard let httpResponse = response as? HTTPURLResponse else {
+            return .failure(BackendError.networkError)
+        }
+
+        lock.lock()
+        defer { lock.unlock() }
+
+        switch httpResponse.statusCode {
+        case 304:
+            guard let validatorKey = validatorKey, let validator = validators[validatorKey] else {
+                return .failure(BackendError.serverError)
+            }
+            // A 304 rarely repeats Content-Type; describe the cached body instead
+            var headers = httpResponse.allHeaderFields.filter {
+                ($0.key as? String)?.caseInsensitiveCompare("Content-Type") != .orderedSame
+            }
+            if let contentType = validator.contentType {
+                headers["Content-Type"] = contentType
+            }
+            return .success(BackendSessionResponse(statusCode: 304, headers: headers,
+                                                   data: validator.body, isNotModified: true))
+        case 200..<300:
+            let body = data ?? Data()
+            if let validatorKey = validatorKey {
+                if let etag = httpResponse.value(forHTTPHeaderField: "ETag") {
+                    validators[validatorKey] = Validator(etag: etag, body: body,
+                                                         contentType: httpResponse.value(forHTTPHeaderField: "Content-Type"))
+                } else {
+                    validators.removeValue(forKey: validatorKey)
+                }
+            }
+            return .success(BackendSessionResponse(statusCode: httpResponse.statusCode, headers: httpResponse.allHeaderFields,
+                                                   data: body, isNotModified: false))
+        default:
+            return .failure(BackendError.serverError)
+        }
+    }
+
+    // MARK: - Metrics
+
+    func metrics(for endpoint: BackendEndpoint) -> BackendEndpointMetrics {
+        return metricsCollector.metrics(for: endpoint)
+    }
+
+    func resetMetrics() {
+        metricsCollector.reset()
+    }
+}
+
+/// Session delegate that folds `URLSessionTaskMetrics` into per-endpoint totals.
+/// Kept separate from `BackendSession` because the session retains its delegate.
+private final class BackendMetricsCollector: NSObject, URLSessionTaskDelegate {
+
+    private let lock = NSLock()
+    private var totals: [BackendEndpoint: BackendEndpointMetrics] = [:]
+
+    func metrics(for endpoint: BackendEndpoint) -> BackendEndpointMetrics {
+        lock.lock()
+        defer { lock.unlock() }
+        return totals[endpoint] ?? BackendEndpointMetrics()
+    }
+
+    func reset() {
+        lock.lock()
+        totals.removeAll()
+        lock.unlock()
+    }
+
+    func recordCoalesced(_ endpoint: BackendEndpoint) {
+        lock.lock()
+        totals[endpoint, default: BackendEndpointMetrics()].coalescedCount += 1
+        lock.unlock()
+    }
+
+    func urlSession(_ session: URLSession, task: URLSessionTask, didFinishCollecting metrics: URLSessionTaskMetrics) {
+        guard let name = task.taskDescription, let endpoint = BackendEndpoint(rawValue: name) else { return }
+
+        let latency = metrics.taskInterval.duration
+        let statusCode = (task.response as? HTTPURLResponse)?.statusCode
+
+        var received: Int64 = 0
+        var decoded: Int64 = 0
+        var sent: Int64 = 0
+        for transaction in metrics.transactionMetrics {
+            received += transaction.countOfResponseBodyBytesReceived
+            decoded += transaction.countOfResponseBodyBytesAfterDecoding
+            sent += transaction.countOfRequestHeaderBytesSent + transaction.countOfRequestBodyBytesSent
+        }
+
+        lock.lock()
+        var entry = totals[endpoint] ?? BackendEndpointMetrics()
+        entry.requestCount += 1
+        if statusCode == 304 {
+            entry.notModifiedCount += 1
+        }
+        entry.bytesReceived += received
+        entry.bytesDecoded += decoded
+        entry.bytesSent += sent
+        entry.totalLatency += latency
+        entry.lastLatency = latency
+        totals[endpoint] = entry
+        lock.unlock()
+
+        Log.debug("📶 BackendSession: \(name) \(statusCode ?? 0) in \(Int(latency * 1000)) ms, \(received) bytes on wire", category: .network)
+    }
+}
@@ -0,0 +1,328 @@
+import Foundation
+
+/// Columnar binary encoding of a flights snapshot.
+///
+/// The JSON flights response repeats every key for every aircraft and every
+/// trajectory point. This format stores each field as one fixed-width column
+/// and each trajectory component as one flat `Float64` array that slices
+/// straight into a `TrajectoryBuffer`, so decoding is mostly bulk copies. Strings go through a
+/// de-duplicated table (origin countries repeat heavily).
+///
+/// Layout, all little-endian:
+///
+///     magic "PTF1" u32 | version u16 | reserved u16 | count u32
+///     timestamp: u16 length + UTF-8
+///     string table: u32 entries, each u16 length + UTF-8
+///     icao24, callsign, originCountry, squawk: u32[count] table refs (squawk nil = 0xFFFFFFFF)
+///     lastContact, timePosition: i64[count] (timePosition nil = Int64.min)
+///     positionSource: u8[count]
+///     flags: u8[count] (bit 0 onGround, bit 1 spi, bit 2 hasPredictedAltitude)
+///     longitude, latitude, baroAltitude, velocity, trueTrack, verticalRate,
+///     geoAltitude, predictedAltitude, altitudeConfidence: f64[count] (nil = NaN)
+///     sensors: u16[count] counts (nil = 0xFFFF), then i32[sum]
+///     trajectories: u32[count] point counts (nil = 0xFFFFFFFF), then
+///     latitude, longitude, altitude, time_offset, distance_from_current,
+///     bearing: f64[sum]
+///
+/// Columns are copied as-is, which relies on the host being little-endian
+/// (true of every Apple platform).
+struct CompactFlightsCodec {
+
+    /// Media type used to negotiate this format via `Accept` / `Content-Type`
+    static let contentType = "application/vnd.planetracker.flights+binary"
+    static let version: UInt16 = 1
+
+    private static let magic: UInt32 = 0x3146_5450 // "PTF1"
+    private static let noString = UInt32.max
+    private static let noTimePosition = Int64.min
+    private static let noSensors = UInt16.max
+    private static let noTrajectory = UInt32.max
+    private static let trajectoryColumns: [KeyPath<TrajectoryBuffer, [Double]>] = [
+        \.latitudes, \.longitudes, \.altitudes, \.timeOffsets, \.distancesFromCurrent, \.bearings
+    ]
+
+    struct Payload {
+        let timestamp: String
+        let flights: [Flight]
+    }
+
+    // MARK: - Encoding
+
+    func encode(_ flights: [Flight], timestamp: String) -> Data {
+        let count = flights.count
+        var writer = ByteWriter()
+        writer.data.reserveCapacity(64 + count * 160)
+
+        writer.write(CompactFlightsCodec.magic)
+        writer.write(CompactFlightsCodec.version)
+        writer.write(UInt16(0))
+        writer.write(UInt32(count))
+        writer.write(timestamp)
+
+        // String table
+        var table: [String] = []
+        var tableIndex: [String: UInt32] = [:]
+        func reference(_ string: String?) -> UInt32 {
+            guard let string = string else { return CompactFlightsCodec.noString }
+            if let existing = tableIndex[string] {
+                return existing
+            }
+            let index = UInt32(table.count)
+            table.append(string)
+            tableIndex[string] = index
+            return index
+        }
+        let icao24 = flights.map { reference($0.id) }
+        let callsigns = flights.map { reference($0.callsign) }
+        let countries = flights.map { reference($0.originCountry) }
+        let squawks = flights.map { reference($0.squawk) }
+
+        writer.write(UInt32(table.count))
+        for string in table {
+            writer.write(string)
+        }
+        writer.writeColumn(icao24)
+        writer.writeColumn(callsigns)
+        writer.writeColumn(countries)
+        writer.writeColumn(squawks)
+
+        writer.writeColumn(flights.map { Int64($0.lastContact) })
+        writer.writeColumn(flights.map { $0.timePosition.map { Int64($0) } ?? CompactFlightsCodec.noTimePosition })
+        writer.writeColumn(flights.map { UInt8(truncatingIfNeeded: $0.positionSource) })
+        writer.writeColumn(flights.map { flight -> UInt8 in
+            (flight.onGround ? 1 : 0) | (flight.spi ? 2 : 0) | (flight.hasPredictedAltitude ? 4 : 0)
+        })
+
+        for column in CompactFlightsCodec.doubleColumns {
+            writer.writeColumn(flights.map { $0[keyPath: column] ?? .nan })
+        }
+
+        writer.writeColumn(flights.map { $0.sensors.map { UInt16(min($0.count, Int(UInt16.max) - 1)) } ?? CompactFlightsCodec.noSensors })
+        writer.writeColumn(flights.flatMap { flight -> [Int32] in
+            guard let sensors = flight.sensors else { return [] }
+            return sensors.prefix(Int(UInt16.max) - 1).map { Int32(truncatingIfNeeded: $0) }
+        })
+
+        writer.writeColumn(flights.map { $0.predictedTrajectory.map { UInt32($0.count) } ?? CompactFlightsCodec.noTrajectory })
+        for column in CompactFlightsCodec.trajectoryColumns {
+            writer.writeColumn(flights.flatMap { $0.predictedTrajectory?[keyPath: column] ?? [] })
+        }
+
+        return writer.data
+    }
+
+    // MARK: - Decoding
+
+    func decode(_ data: Data) throws -> Payload {
+        return try data.withUnsafeBytes { raw -> Payload in
+            var reader = ByteReader(bytes: raw)
+
+            guard try reader.read(UInt32.self) == CompactFlightsCodec.magic else {
+                throw CompactFlightsError.badMagic
+            }
+            let version = try reader.read(UInt16.self)
+            guard version == CompactFlightsCodec.version else {
+                throw CompactFlightsError.unsupportedVersion(version)
+            }
+            _ = try reader.read(UInt16.self)
+            let count = Int(try reader.read(UInt32.self))
+            let timestamp = try reader.readString()
+
+            let tableCount = Int(try reader.read(UInt32.self))
+            guard tableCount <= raw.count else { throw CompactFlightsError.truncated }
+            var table: [String] = []
+            table.reserveCapacity(tableCount)
+            for _ in 0..<tableCount {
+                table.append(try reader.readString())
+            }
+            func string(_ reference: UInt32) throws -> String? {
+                if reference == CompactFlightsCodec.noString { return nil }
+                guard Int(reference) < table.count else { throw CompactFlightsError.invalidReference }
+                return table[Int(reference)]
+            }
+
+            let icao24 = try reader.readColumn(UInt32.self, count: count)
+            let callsigns = try reader.readColumn(UInt32.self, count: count)
+            let countries = try reader.readColumn(UInt32.self, count: count)
+            let squawks = try reader.readColumn(UInt32.self, count: count)
+            let lastContacts = try reader.readColumn(Int64.self, count: count)
+            let timePositions = try reader.readColumn(Int64.self, count: count)
+            let positionSources = try reader.readColumn(UInt8.self, count: count)
+            let flags = try reader.readColumn(UInt8.self, count: count)
+            let doubles = try CompactFlightsCodec.doubleColumns.map { _ in
+                try reader.readColumn(Double.self, count: count)
+            }
+
+            let sensorCounts = try reader.readColumn(UInt16.self, count: count)
+            let sensorTotal = sensorCounts.reduce(0) { $0 + ($1 == CompactFlightsCodec.noSensors ? 0 : Int($1)) }
+            let sensorValues = try reader.readColumn(Int32.self, count: sensorTotal)
+
+            let pointCounts = try reader.readColumn(UInt32.self, count: count)
+            let pointTotal = pointCounts.reduce(0) { $0 + ($1 == CompactFlightsCodec.noTrajectory ? 0 : Int($1)) }
+            let pointColumns = try CompactFlightsCodec.trajectoryColumns.map { _ in
+                try reader.readColumn(Double.self, count: pointTotal)
+            }
+
+            func optional(_ value: Double) -> Double? {
+                return value.isNaN ? nil : value
+            }
+
+            var flights: [Flight] = []
+            flights.reserveCapacity(count)
+            var sensorCursor = 0
+            var pointCursor = 0
+
+            for i in 0..<count {
+                var sensors: [Int]?
+                if sensorCounts[i] != CompactFlightsCodec.noSensors {
+                    let end = sensorCursor + Int(sensorCounts[i])
+                    sensors = sensorValues[sensorCursor..<end].map { Int($0) }
+                    sensorCursor = end
+                }
+
+                var trajectory: TrajectoryBuffer?
+                if pointCounts[i] != CompactFlightsCodec.noTrajectory {
+                    let range = pointCursor..<(pointCursor + Int(pointCounts[i]))
+                    trajectory = TrajectoryBuffer(
+                        latitudes: Array(pointColumns[0][range]),
+                        longitudes: Array(pointColumns[1][range]),
+                        altitudes: Array(pointColumns[2][range]),
+                        timeOffsets: Array(pointColumns[3][range]),
+                        distancesFromCurrent: Array(pointColumns[4][range]),
+                        bearings: Array(pointColumns[5][range])
+                    )
+                    pointCursor = range.upperBound
+                }
+
+                guard let id = try string(icao24[i]),
+                      let callsign = try string(callsigns[i]),
+                      let originCountry = try string(countries[i]) else {
+                    throw CompactFlightsError.invalidReference
+                }
+
+                flights.append(Flight(
+                    id: id,
+                    callsign: callsign,
+                    originCountry: originCountry,
+                    timePosition: timePositions[i] == CompactFlightsCodec.noTimePosition ? nil : Int(timePositions[i]),
+                    lastContact: Int(lastContacts[i]),
+                    longitude: optional(doubles[0][i]),
+                    latitude: optional(doubles[1][i]),
+                    baroAltitude: optional(doubles[2][i]),
+                    onGround: flags[i] & 1 != 0,
+                    velocity: optional(doubles[3][i]),
+                    trueTrack: optional(doubles[4][i]),
+                    verticalRate: optional(doubles[5][i]),
+                    sensors: sensors,
+                    geoAltitude: optional(doubles[6][i]),
+                    squawk: try string(squawks[i]),
+                    spi: flags[i] & 2 != 0,
+                    positionSource: Int(positionSources[i]),
+                    predictedAltitude: optional(doubles[7][i]),
+                    altitudeConfidence: optional(doubles[8][i]),
+                    hasPredictedAltitude: flags[i] & 4 != 0,
+                    predictedTrajectory: trajectory
+                ))
+            }
+
+            return Payload(timestamp: timestamp, flights: flights)
+        }
+    }
+
+    /// Order of the optional `Float64` columns; decode indexes into this
+    private static let doubleColumns: [KeyPath<Flight, Double?>] = [
+        \.longitude, \.latitude, \.baroAltitude, \.velocity, \.trueTrack,
+        \.verticalRate, \.geoAltitude, \.predictedAltitude, \.altitudeConfidence
+    ]
+}
+
+// MARK: - Errors
+
+enum CompactFlightsError: Error, LocalizedError {
+    case badMagic
+    case unsupportedVersion(UInt16)
+    case truncated
+    case invalidReference
+
+    var errorDescription: String? {
+        switch self {
+        case .badMagic:
+            return "Not a compact flights payload"
+        case .unsupportedVersion(let version):
+            return "Unsupported compact flights version \(version)"
+        case .truncated:
+            return "Compact flights payload is truncated"
+        case .invalidReference:
+            return "Compact flights payload has an invalid string reference"
+        }
+    }
+}
+
+// MARK: - Byte Buffers
+
+private struct ByteWriter {
+    var data = Data()
+
+    mutating func write<T: FixedWidthInteger>(_ value: T) {
+        var littleEndian = value.littleEndian
+        withUnsafeBytes(of: &littleEndian) { data.append(contentsOf: $0) }
+    }
+
+    mutating func write(_ string: String) {
+        var utf8 = string[...].utf8
+        if utf8.count > Int(UInt16.max) {
+            // Truncate on a character boundary so no multi-byte sequence is split
+            var end = string.startIndex
+            var length = 0
+            for index in string.indices {
+                let next = string.index(after: index)
+                let size = string.utf8.distance(from: index, to: next)
+                guard length + size <= Int(UInt16.max) else { break }
+                length += size
+                end = next
+            }
+            utf8 = string[..<end].utf8
+        }
+        write(UInt16(utf8.count))
+        data.append(contentsOf: utf8)
+    }
+
+    mutating func writeColumn<T>(_ values: [T]) {
+        values.withUnsafeBytes { data.append(contentsOf: $0) }
+    }
+}
+
+private struct ByteReader {
+    let bytes: UnsafeRawBufferPointer
+    var offset = 0
+
+    private mutating func take(_ byteCount: Int) throws -> UnsafeRawBufferPointer {
+        guard byteCount >= 0, byteCount <= bytes.count - offset else {
+            throw CompactFlightsError.truncated
+        }
+        let slice = UnsafeRawBufferPointer(rebasing: bytes[offset..<offset + byteCount])
+        offset += byteCount
+        return slice
+    }
+
+    mutating func read<T: FixedWidthInteger>(_ type: T.Type) throws -> T {
+        let source = try take(MemoryLayout<T>.size)
+        var value: T = 0
+        withUnsafeMutableBytes(of: &value) { $0.copyMemory(from: source) }
+        return T(littleEndian: value)
+    }
+
+    mutating func readString() throws -> String {
+        let length = Int(try read(UInt16.self))
+        return String(decoding: try take(length), as: UTF8.self)
+    }
+
+    mutating func readColumn<T>(_ type: T.Type, count: Int) throws -> [T] {
+        guard count <= bytes.count else { throw CompactFlightsError.truncated }
+        let source = try take(count * MemoryLayout<T>.stride)
+        return [T](unsafeUninitializedCapacity: count) { buffer, initializedCount in
+            UnsafeMutableRawBufferPointer(buffer).copyMemory(from: source)
+            initializedCount = count
+        }
+    }
+}
@@ -0,0 +1,87 @@
+import Foundation
+
+/// How long a fetched snapshot may be served, and how
+struct FlightCachePolicy {
+    /// Younger than this, the snapshot is served without touching the network
+    var freshness: TimeInterval
+    /// Past `freshness` but younger than this, the snapshot is still served
+    /// immediately while one background refresh replaces it
+    var maximumStaleness: TimeInterval
+
+    /// Matches the backend's 8 s ingest cycle
+    static let `default` = FlightCachePolicy(freshness: 8, maximumStaleness: 60)
+}
+
+/// Last fetched snapshot of a flight service, with stale-while-revalidate
+/// bookkeeping.
+///
+/// A lookup is `.fresh` inside the freshness window, `.stale` inside the
+/// max-stale window and `.miss` otherwise (or when nothing is cached).
+/// `beginRefresh()` lets at most one network refresh run at a time, so
+/// repeated polls while a request is outstanding do not pile up. Main
+/// thread only, like the services that own it.
+final class FlightFetchCache {
+
+    enum Lookup: Equatable {
+        case fresh
+        case stale
+        case miss
+    }
+
+    let policy: FlightCachePolicy
+
+    private(set) var flights: [Flight] = []
+    /// When `flights` was last fetched or confirmed unchanged
+    private(set) var storedAt: Date?
+    /// True between `beginRefresh()` and `endRefresh()`
+    private(set) var isRefreshing = false
+
+    init(policy: FlightCachePolicy = .default) {
+        self.policy = policy
+    }
+
+    var isEmpty: Bool {
+        return flights.isEmpty
+    }
+
+    /// Seconds since the snapshot was stored; nil when nothing is cached
+    func age(at date: Date = Date()) -> TimeInterval? {
+        guard let storedAt = storedAt, !flights.isEmpty else { return nil }
+        return max(0, date.timeIntervalSince(storedAt))
+    }
+
+    func lookup(at date: Date = Date()) -> Lookup {
+        guard let age = age(at: date) else { return .miss }
+        if age < policy.freshness {
+            return .fresh
+        }
+        if age < policy.maximumStaleness {
+            return .stale
+        }
+        return .miss
+    }
+
+    // MARK: - Updating
+
+    func store(_ flights: [Flight], at date: Date = Date()) {
+        self.flights = flights
+        storedAt = date
+    }
+
+    /// The server confirmed the snapshot is still current (HTTP 304)
+    func revalidate(at date: Date = Date()) {
+        guard storedAt != nil else { return }
+        storedAt = date
+    }
+
+    /// Claim the single refresh slot; false when a refresh is already in flight
+    func beginRefresh() -> Bool {
+        guard !isRefreshing else { return false }
+        isRefreshing = true
+        return true
+    }
+
+    func endRefresh() {
+        isRefreshing = false
+    }
+}
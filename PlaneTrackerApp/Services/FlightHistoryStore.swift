@@ -0,0 +1,133 @@
+import Foundation
+import CoreLocation
+
+/// One recorded state report for an aircraft
+struct FlightHistorySample {
+    /// Seconds since 1970, from the report's position timestamp
+    let time: TimeInterval
+    let latitude: Double?
+    let longitude: Double?
+    /// Best reported altitude in meters, nil when the report had none
+    let altitude: Double?
+    let verticalRate: Double?
+}
+
+/// Time-ordered state reports per aircraft, keyed by `icao24`.
+///
+/// Each aircraft keeps a bounded ring of its most recent reports plus the
+/// last report that carried a usable altitude, so "last known good altitude"
+/// is a dictionary lookup instead of a backwards scan over every flight.
+class FlightHistoryStore {
+
+    private struct AircraftHistory {
+        var samples: RingBuffer<FlightHistorySample>
+        var lastGoodAltitude: (altitude: Double, time: TimeInterval)?
+    }
+
+    let capacity: Int
+    var idleTimeout: TimeInterval = 300.0
+
+    private var histories: [String: AircraftHistory] = [:]
+
+    init(capacity: Int = 16) {
+        self.capacity = capacity
+    }
+
+    var count: Int {
+        return histories.count
+    }
+
+    // MARK: - Recording
+
+    /// Append `flight`'s report to its aircraft's history. Reports that are
+    /// not newer than the last recorded one are ignored.
+    func record(_ flight: Flight) {
+        record(FlightHistoryStore.sample(from: flight), for: flight.id)
+    }
+
+    func record(_ sample: FlightHistorySample, for flightId: String) {
+        guard let index = histories.index(forKey: flightId) else {
+            var history = AircraftHistory(samples: RingBuffer(capacity: capacity), lastGoodAltitude: nil)
+            FlightHistoryStore.append(sample, to: &history)
+            histories[flightId] = history
+            return
+        }
+
+        // Mutate in place so the ring storage is not copied
+        FlightHistoryStore.append(sample, to: &histories.values[index])
+    }
+
+    func record<S: Sequence>(_ flights: S) where S.Element == Flight {
+        for flight in flights {
+            record(flight)
+        }
+    }
+
+    private static func append(_ sample: FlightHistorySample, to history: inout AircraftHistory) {
+        if let last = history.samples.last, sample.time <= last.time {
+            return
+        }
+        history.samples.append(sample)
+        if let altitude = sample.altitude {
+            history.lastGoodAltitude = (altitude, sample.time)
+        }
+    }
+
+    private static func sample(from flight: Flight) -> FlightHistorySample {
+        let altitude: Double?
+        if let baroAltitude = flight.baroAltitude, baroAltitude > 0 {
+            altitude = baroAltitude
+        } else if let geoAltitude = flight.geoAltitude, geoAltitude > 0 {
+            altitude = geoAltitude
+        } else {
+            altitude = nil
+        }
+
+        return FlightHistorySample(
+            time: TimeInterval(flight.timePosition ?? flight.lastContact),
+            latitude: flight.latitude,
+            longitude: flight.longitude,
+            altitude: altitude,
+            verticalRate: flight.verticalRate
+        )
+    }
+
+    // MARK: - Queries
+
+    /// Reports for `flightId`, oldest first
+    func samples(for flightId: String) -> RingBuffer<FlightHistorySample>? {
+        return histories[flightId]?.samples
+    }
+
+    /// Most recent report with a usable altitude, even if it has rolled out of the ring
+    func lastKnownAltitude(for flightId: String) -> (altitude: Double, time: TimeInterval)? {
+        return histories[flightId]?.lastGoodAltitude
+    }
+
+    /// Up to `limit` most recent positions for `flightId`, oldest first
+    func recentPositions(for flightId: String, limit: Int) -> [CLLocationCoordinate2D] {
+        guard let samples = histories[flightId]?.samples else { return [] }
+
+        return samples.suffix(limit).compactMap { sample in
+            guard let latitude = sample.latitude, let longitude = sample.longitude else { return nil }
+            return CLLocationCoordinate2D(latitude: latitude, longitude: longitude)
+        }
+    }
+
+    // MARK: - Eviction
+
+    /// Drop aircraft whose last report is older than `idleTimeout`; returns how many were removed
+    @discardableResult
+    func evictIdleAircraft(at time: TimeInterval) -> Int {
+        let cutoff = time - idleTimeout
+        let idle = histories.compactMap { ($0.value.samples.last?.time ?? 0) < cutoff ? $0.key : nil }
+        for flightId in idle {
+            histories.removeValue(forKey: flightId)
+        }
+        return idle.count
+    }
+
+    func removeAll() {
+        histories.removeAll()
+    }
+}
@@ -0,0 +1,205 @@
+import Foundation
+import Combine
+import CoreLocation
+
+/// App-wide owner of live flight data.
+///
+/// One `OpenSkyService` (and so one cache and one `FlightStore`) serves
+/// every screen, so the snapshot fetched behind the loading screen is the
+/// one `ARView` starts from instead of a second cold fetch. Polling is
+/// reference counted: it runs while at least one screen has asked for it,
+/// paced by a `PollingScheduler` fed with each request's outcome and with
+/// how fast the aircraft around the observer are moving.
+///
+/// Every fetched snapshot is also written to a `FlightSnapshotCache`, and
+/// `restoreCachedSnapshot()` replays it on the next launch, dead-reckoned
+/// to the current time and flagged `isStale` until a fetch lands.
+final class FlightRepository {
+
+    static let shared = FlightRepository()
+
+    private let service: OpenSkyService
+    private let snapshotCache: FlightSnapshotCache?
+    private let staleSubject = CurrentValueSubject<Bool, Never>(false)
+    private let scheduler: PollingScheduler
+    private var pollingClients = 0
+    private var observerLocation: CLLocation?
+    private var cancellables = Set<AnyCancellable>()
+
+    init(service: OpenSkyService = OpenSkyService(),
+         polling: PollingScheduler.Configuration = .default,
+         clock: PollingClock = .system,
+         snapshotCache: FlightSnapshotCache? = FlightSnapshotCache()) {
+        self.service = service
+        self.snapshotCache = snapshotCache
+
+        // Polls inside the cache's freshness window would never reach the network
+        let configuration = polling.aligned(with: service.cachePolicy)
+        self.scheduler = PollingScheduler(configuration: configuration, clock: clock) { [weak service] in
+            service?.fetchFlights()
+        }
+
+        service.$lastFetchDate
+            .compactMap { $0 }
+            .sink { [weak self] _ in
+                self?.didFetchSnapshot()
+            }
+            .store(in: &cancellables)
+
+        service.fetchOutcomes
+            .sink { [weak self] outcome in
+                self?.scheduler.record(outcome)
+            }
+            .store(in: &cancellables)
+
+        service.flightChanges
+            .sink { [weak self] _ in
+                self?.updatePollingMotion()
+            }
+            .store(in: &cancellables)
+    }
+
+    deinit {
+        scheduler.stop()
+    }
+
+    // MARK: - Current State
+
+    /// Latest snapshot, in feed order
+    var flights: [Flight] {
+        return service.flights
+    }
+
+    /// Keyed view of `flights`
+    var flightStore: FlightStore {
+        return service.flightStore
+    }
+
+    var isPolling: Bool {
+        return scheduler.isRunning
+    }
+
+    /// When the scheduler will poll next; nil while not polling
+    var nextPollDate: Date? {
+        return scheduler.nextPollDate
+    }
+
+    /// True while the flights shown come from the on-disk snapshot
+    var isStale: Bool {
+        return staleSubject.value
+    }
+
+    /// Seconds since the service's snapshot was fetched; nil before the first fetch
+    var cacheAge: TimeInterval? {
+        return service.cacheAge
+    }
+
+    var cachePolicy: FlightCachePolicy {
+        return service.cachePolicy
+    }
+
+    /// Everything currently held, phrased as a changeset that adds it all.
+    /// Lets a screen that subscribes late render the existing snapshot
+    /// through the same path as live updates.
+    func currentSnapshotChanges() -> FlightChangeset {
+        return FlightChangeset(added: service.flights, updated: [], removed: [])
+    }
+
+    // MARK: - Publishers
+
+    /// Added / updated / removed flights of each refresh, on main
+    var flightChanges: AnyPublisher<FlightChangeset, Never> {
+        return service.flightChanges.eraseToAnyPublisher()
+    }
+
+    var flightsPublisher: AnyPublisher<[Flight], Never> {
+        return service.$flights.eraseToAnyPublisher()
+    }
+
+    var errorMessagePublisher: AnyPublisher<String?, Never> {
+        return service.$errorMessage.eraseToAnyPublisher()
+    }
+
+    var isLoadingPublisher: AnyPublisher<Bool, Never> {
+        return service.$isLoading.eraseToAnyPublisher()
+    }
+
+    var isStalePublisher: AnyPublisher<Bool, Never> {
+        return staleSubject.removeDuplicates().eraseToAnyPublisher()
+    }
+
+    // MARK: - Warm Start
+
+    /// Publish the snapshot saved by the previous launch, moved forward to
+    /// `now`, and mark it stale until fresh data arrives. Call before the
+    /// first `refresh()`; the disk read and decode happen off the main thread.
+    /// `completion` receives the number of aircraft restored.
+    func restoreCachedSnapshot(now: Date = Date(), completion: ((Int) -> Void)? = nil) {
+        guard let snapshotCache = snapshotCache else {
+            completion?(0)
+            return
+        }
+
+        service.restore({
+            guard let cached = snapshotCache.load(now: now) else { return nil }
+            return FlightSnapshotCache.deadReckon(cached.flights, from: cached.savedAt, to: now)
+        }, completion: { [weak self] restored in
+            // Nothing is published when a fetch already landed, which then stays current
+            if restored > 0 {
+                self?.staleSubject.send(true)
+            }
+            completion?(restored)
+        })
+    }
+
+    private func didFetchSnapshot() {
+        staleSubject.send(false)
+        snapshotCache?.save(service.flights)
+    }
+
+    // MARK: - Fetching
+
+    /// One fetch; a fresh cached snapshot is served as-is and a stale one
+    /// is served while the service revalidates it in the background
+    func refresh() {
+        service.fetchFlights()
+    }
+
+    /// Start polling for the caller (refreshing right away) until the
+    /// matching `stopPolling()`. Main thread only.
+    func startPolling() {
+        pollingClients += 1
+        guard !scheduler.isRunning else { return }
+
+        Log.info("⏰ FlightRepository: Polling started", category: .network)
+        scheduler.start()
+    }
+
+    func stopPolling() {
+        guard pollingClients > 0 else { return }
+        pollingClients -= 1
+        guard pollingClients == 0 else { return }
+
+        Log.info("⏸️ FlightRepository: Polling stopped", category: .network)
+        scheduler.stop()
+    }
+
+    // MARK: - Polling Pace
+
+    /// Where the user is; aircraft near them set how often to poll
+    func updateObserverLocation(_ location: CLLocation) {
+        // GPS jitter does not change how fast aircraft sweep the view
+        if let previous = observerLocation, previous.distance(from: location) < 100 {
+            return
+        }
+        observerLocation = location
+        updatePollingMotion()
+    }
+
+    private func updatePollingMotion() {
+        guard let observer = observerLocation else { return }
+        let speed = PollingScheduler.maximumAngularSpeed(of: service.flights, observer: observer,
+                                                         range: scheduler.configuration.motionRange)
+        scheduler.updateMotion(maximumAngularSpeed: speed)
+    }
+}
@@ -0,0 +1,131 @@
+import Foundation
+
+/// Last flight snapshot on disk, so a launch can show aircraft before the
+/// first network round trip.
+///
+/// Snapshots are stored in the `CompactFlightsCodec` format (the codec's
+/// timestamp field holds the save time in seconds since 1970) and read back
+/// memory-mapped. Writes happen on a background queue and replace the file
+/// atomically, so a crash mid-write leaves the previous snapshot intact.
+final class FlightSnapshotCache {
+
+    struct CachedSnapshot {
+        let flights: [Flight]
+        let savedAt: Date
+    }
+
+    let fileURL: URL
+    /// Snapshots older than this are not worth showing
+    var maximumAge: TimeInterval = 30 * 60
+
+    private let codec = CompactFlightsCodec()
+    private let queue = DispatchQueue(label: "com.planetracker.snapshot-cache", qos: .utility)
+
+    static var defaultFileURL: URL {
+        let caches = FileManager.default.urls(for: .cachesDirectory, in: .userDomainMask)[0]
+        return caches.appendingPathComponent("FlightSnapshot.ptf")
+    }
+
+    init(fileURL: URL = FlightSnapshotCache.defaultFileURL) {
+        self.fileURL = fileURL
+    }
+
+    // MARK: - Reading
+
+    /// Map and decode the stored snapshot; nil when there is none, it is
+    /// unreadable, or it is older than `maximumAge` at `now`
+    func load(now: Date = Date()) -> CachedSnapshot? {
+        guard let data = try? Data(contentsOf: fileURL, options: .alwaysMapped) else { return nil }
+
+        do {
+            let payload = try codec.decode(data)
+            guard let seconds = TimeInterval(payload.timestamp) else { return nil }
+            let savedAt = Date(timeIntervalSince1970: seconds)
+            guard now.timeIntervalSince(savedAt) <= maximumAge else {
+                Log.info("💾 FlightSnapshotCache: Ignoring snapshot from \(Int(now.timeIntervalSince(savedAt)))s ago", category: .general)
+                return nil
+            }
+            return CachedSnapshot(flights: payload.flights, savedAt: savedAt)
+        } catch {
+            Log.warning("⚠️ FlightSnapshotCache: Unreadable snapshot - \(error)", category: .general)
+            return nil
+        }
+    }
+
+    // MARK: - Writing
+
+    /// Encode and write `flights` in the background
+    func save(_ flights: [Flight], at date: Date = Date()) {
+        queue.async {
+            let data = self.codec.encode(flights, timestamp: String(date.timeIntervalSince1970))
+            do {
+                try FileManager.default.createDirectory(at: self.fileURL.deletingLastPathComponent(),
+                                                        withIntermediateDirectories: true)
+                try data.write(to: self.fileURL, options: .atomic)
+            } catch {
+                Log.warning("⚠️ FlightSnapshotCache: Failed to save snapshot - \(error.localizedDescription)", category: .general)
+            }
+        }
+    }
+
+    func remove() {
+        queue.async {
+            try? FileManager.default.removeItem(at: self.fileURL)
+        }
+    }
+
+    /// Block until pending writes have finished
+    func waitUntilIdle() {
+        queue.sync {}
+    }
+
+    // MARK: - Dead Reckoning
+
+    private static let earthRadius = 6_371_008.8
+
+    /// Move each airborne flight along its track for the time between
+    /// `savedAt` and `date` (at most `maximumInterval`), using its last
+    /// ground speed and vertical rate. Flights on the ground or without a
+    /// position, speed or track are returned unchanged.
+    static func deadReckon(_ flights: [Flight], from savedAt: Date, to date: Date,
+                           maximumInterval: TimeInterval = 300) -> [Flight] {
+        let interval = min(max(date.timeIntervalSince(savedAt), 0), maximumInterval)
+        guard interval > 0 else { return flights }
+
+        return flights.map { flight in
+            guard !flight.onGround,
+                  let latitude = flight.latitude,
+                  let longitude = flight.longitude,
+                  let velocity = flight.velocity,
+                  let track = flight.trueTrack else {
+                return flight
+            }
+
+            // Great-circle destination from the last position
+            let angularDistance = velocity * interval / earthRadius
+            let bearing = track * .pi / 180
+            let lat1 = latitude * .pi / 180
+            let lon1 = longitude * .pi / 180
+            let lat2 = asin(sin(lat1) * cos(angularDistance) + cos(lat1) * sin(angularDistance) * cos(bearing))
+            let lon2 = lon1 + atan2(sin(bearing) * sin(angularDistance) * cos(lat1),
+                                    cos(angularDistance) - sin(lat1) * sin(lat2))
+            let newLongitude = remainder(lon2 * 180 / .pi, 360)
+
+            let climb = (flight.verticalRate ?? 0) * interval
+            func advanced(_ altitude: Double?) -> Double? {
+                return altitude.map { max(0, $0 + climb) }
+            }
+
+            return Flight(id: flight.id, callsign: flight.callsign, originCountry: flight.originCountry,
+                          timePosition: flight.timePosition, lastContact: flight.lastContact,
+                          longitude: newLongitude, latitude: lat2 * 180 / .pi,
+                          baroAltitude: advanced(flight.baroAltitude), onGround: flight.onGround,
+                          velocity: flight.velocity, trueTrack: flight.trueTrack, verticalRate: flight.verticalRate,
+                          sensors: flight.sensors, geoAltitude: advanced(flight.geoAltitude), squawk: flight.squawk,
+                          spi: flight.spi, positionSource: flight.positionSource,
+                          predictedAltitude: flight.predictedAltitude, altitudeConfidence: flight.altitudeConfidence,
+                          hasPredictedAltitude: flight.hasPredictedAltitude,
+                          predictedTrajectory: flight.predictedTrajectory)
+        }
+    }
+}
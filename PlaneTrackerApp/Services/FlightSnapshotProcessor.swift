@@ -0,0 +1,137 @@
+import Foundation
+
+/// One refresh, decoded, validated and diffed, ready to publish as-is
+struct FlightSnapshot {
+    /// Flights in feed order, first occurrence of each id
+    let flights: [Flight]
+    let flightsById: [String: Flight]
+    /// Ids of `flights`, in the same order
+    let flightIds: [String]
+    /// Difference from the previous snapshot
+    let changes: FlightChangeset
+    /// Entries dropped by validation
+    let rejectedCount: Int
+}
+
+/// Background stage between the network and the UI.
+///
+/// Response bodies are decoded, validated and diffed on a private serial
+/// queue against a working `FlightStore` that never leaves that queue. Only
+/// the finished `FlightSnapshot` is delivered, on `deliveryQueue` (main by
+/// default), in the order work was submitted.
+final class FlightSnapshotProcessor {
+
+    private let queue: DispatchQueue
+    private let deliveryQueue: DispatchQueue
+    /// Previous snapshot for diffing; confined to `queue`
+    private let workingStore = FlightStore()
+    /// True once a fetched or pushed snapshot became the diff base; confined to `queue`
+    private var hasLiveSnapshot = false
+
+    init(label: String = "com.planetracker.flight-snapshots", deliveryQueue: DispatchQueue = .main) {
+        self.queue = DispatchQueue(label: label, qos: .userInitiated)
+        self.deliveryQueue = deliveryQueue
+    }
+
+    // MARK: - Submitting Work
+
+    /// Run `decode` off the main thread and turn its flights into the next
+    /// snapshot. A nil decode result (backend reported failure) is delivered
+    /// as `.success(nil)` and leaves the previous snapshot in place.
+    func process(_ decode: @escaping () throws -> [Flight]?,
+                 completion: @escaping (Result<FlightSnapshot?, Error>) -> Void) {
+        queue.async {
+            let result: Result<FlightSnapshot?, Error>
+            do {
+                result = .success(try decode().map { self.makeSnapshot(from: $0) })
+                if case .success(_?) = result {
+                    self.hasLiveSnapshot = true
+                }
+            } catch {
+                result = .failure(error)
+            }
+            self.deliveryQueue.async {
+                completion(result)
+            }
+        }
+    }
+
+    /// Replace the current flights with an already-decoded list, e.g. a cached one
+    func process(flights: [Flight], completion: @escaping (FlightSnapshot) -> Void) {
+        queue.async {
+            let snapshot = self.makeSnapshot(from: flights)
+            self.hasLiveSnapshot = true
+            self.deliveryQueue.async {
+                completion(snapshot)
+            }
+        }
+    }
+
+    /// Merge a pushed delta into the current flights
+    func process(upserts: [Flight], removals: [String], completion: @escaping (FlightSnapshot) -> Void) {
+        queue.async {
+            let valid = upserts.filter(FlightSnapshotProcessor.isValid)
+            let changes = self.workingStore.applyDelta(upserts: valid, removals: removals)
+            self.hasLiveSnapshot = true
+            let snapshot = FlightSnapshot(
+                flights: self.workingStore.flights,
+                flightsById: self.workingStore.flightsById,
+                flightIds: self.workingStore.flightIds,
+                changes: changes,
+                rejectedCount: upserts.count - valid.count
+            )
+            self.deliveryQueue.async {
+                completion(snapshot)
+            }
+        }
+    }
+
+    /// Adopt flights that did not come from the network, e.g. the on-disk
+    /// snapshot, only while nothing live has been processed. Once a fetch is
+    /// the diff base, replacing it would make the next fetch diff against
+    /// the restored flights. Delivers nil when skipped or `load` finds nothing.
+    func processRestored(_ load: @escaping () -> [Flight]?, completion: @escaping (FlightSnapshot?) -> Void) {
+        queue.async {
+            var snapshot: FlightSnapshot?
+            if !self.hasLiveSnapshot, let flights = load() {
+                snapshot = self.makeSnapshot(from: flights)
+            }
+            self.deliveryQueue.async {
+                completion(snapshot)
+            }
+        }
+    }
+
+    /// Block until everything submitted so far has been processed (not delivered)
+    func waitUntilIdle() {
+        queue.sync {}
+    }
+
+    // MARK: - Validation
+
+    /// Reject entries no consumer can place: an empty id or coordinates that
+    /// are present but not finite or out of range. Missing coordinates are
+    /// allowed; views already skip those flights.
+    static func isValid(_ flight: Flight) -> Bool {
+        guard !flight.id.isEmpty else { return false }
+        if let latitude = flight.latitude, !(latitude.isFinite && (-90...90).contains(latitude)) {
+            return false
+        }
+        if let longitude = flight.longitude, !(longitude.isFinite && (-180...180).contains(longitude)) {
+            return false
+        }
+        return true
+    }
+
+    private func makeSnapshot(from decoded: [Flight]) -> FlightSnapshot {
+        let valid = decoded.filter(FlightSnapshotProcessor.isValid)
+        let changes = workingStore.apply(valid)
+        return FlightSnapshot(
+            flights: workingStore.flights,
+            flightsById: workingStore.flightsById,
+            flightIds: workingStore.flightIds,
+            changes: changes,
+            rejectedCount: decoded.count - valid.count
+        )
+    }
+}
@@ -0,0 +1,129 @@
+import Foundation
+
+/// Difference between two consecutive flight snapshots
+struct FlightChangeset {
+    let added: [Flight]
+    let updated: [Flight]
+    /// `icao24` ids of flights no longer in the snapshot
+    let removed: [String]
+
+    static let empty = FlightChangeset(added: [], updated: [], removed: [])
+
+    var isEmpty: Bool {
+        return added.isEmpty && updated.isEmpty && removed.isEmpty
+    }
+
+    /// Flights whose nodes need to be created or refreshed
+    var upserted: [Flight] {
+        return added + updated
+    }
+}
+
+/// Current flights keyed by `icao24`.
+///
+/// Each refresh is applied as a whole snapshot and turned into an explicit
+/// added / updated / removed changeset, so subscribers only touch aircraft
+/// whose state actually changed between polls.
+class FlightStore {
+
+    private(set) var flightsById: [String: Flight] = [:]
+    private var orderedIds: [String] = []
+
+    /// Flights in the order of the last applied snapshot
+    var flights: [Flight] {
+        return orderedIds.compactMap { flightsById[$0] }
+    }
+
+    /// Ids of `flights`, in the same order
+    var flightIds: [String] {
+        return orderedIds
+    }
+
+    var count: Int {
+        return orderedIds.count
+    }
+
+    subscript(flightId: String) -> Flight? {
+        return flightsById[flightId]
+    }
+
+    /// Replace the stored flights with `snapshot` and return what changed.
+    /// Duplicate ids within a snapshot keep their first occurrence.
+    @discardableResult
+    func apply(_ snapshot: [Flight]) -> FlightChangeset {
+        var next: [String: Flight] = Dictionary(minimumCapacity: snapshot.count)
+        var nextOrder: [String] = []
+        nextOrder.reserveCapacity(snapshot.count)
+
+        var added: [Flight] = []
+        var updated: [Flight] = []
+
+        for flight in snapshot where next[flight.id] == nil {
+            next[flight.id] = flight
+            nextOrder.append(flight.id)
+
+            if let previous = flightsById[flight.id] {
+                if !previous.hasSameState(as: flight) {
+                    updated.append(flight)
+                }
+            } else {
+                added.append(flight)
+            }
+        }
+
+        let removed = orderedIds.filter { next[$0] == nil }
+
+        flightsById = next
+        orderedIds = nextOrder
+
+        return FlightChangeset(added: added, updated: updated, removed: removed)
+    }
+
+    /// Merge a partial update: `upserts` are inserted or replaced and
+    /// `removals` dropped, leaving every other flight untouched. New flights
+    /// are appended after the existing order.
+    @discardableResult
+    func applyDelta(upserts: [Flight], removals: [String]) -> FlightChangeset {
+        var added: [Flight] = []
+        var updated: [Flight] = []
+        var removed: [String] = []
+
+        for flightId in removals {
+            if flightsById.removeValue(forKey: flightId) != nil {
+                removed.append(flightId)
+            }
+        }
+        if !removed.isEmpty {
+            let gone = Set(removed)
+            orderedIds.removeAll { gone.contains($0) }
+        }
+
+        for flight in upserts {
+            if let previous = flightsById[flight.id] {
+                if !previous.hasSameState(as: flight) {
+                    updated.append(flight)
+                }
+            } else {
+                orderedIds.append(flight.id)
+                added.append(flight)
+            }
+            flightsById[flight.id] = flight
+        }
+
+        return FlightChangeset(added: added, updated: updated, removed: removed)
+    }
+
+    /// Mirror a snapshot that was already diffed elsewhere (see
+    /// `FlightSnapshotProcessor`) and return its changeset; no re-diffing.
+    @discardableResult
+    func adopt(_ snapshot: FlightSnapshot) -> FlightChangeset {
+        flightsById = snapshot.flightsById
+        orderedIds = snapshot.flightIds
+        return snapshot.changes
+    }
+
+    @discardableResult
+    func removeAll() -> FlightChangeset {
+        return apply([])
+    }
+}
@@ -0,0 +1,212 @@
+import Foundation
+import Combine
+
+/// Decoded message from the backend flight stream
+enum FlightStreamMessage {
+    /// Full state; replaces everything the client holds
+    case snapshot([Flight])
+    /// Per-aircraft changes since the previous event
+    case delta(upserts: [Flight], removed: [String])
+}
+
+/// Server-Sent Events subscription to `GET /api/flights/stream`.
+///
+/// Keeps one long-lived connection open and publishes decoded snapshot and
+/// delta messages as the backend pushes them. Dropped connections are retried
+/// with exponential backoff and resume from the last complete event via
+/// `Last-Event-ID`. Delta sequence numbers are checked against the last one
+/// applied: duplicates are dropped, and a gap discards the resume point and
+/// reconnects for a fresh snapshot, so no delta is missed or applied twice.
+class FlightUpdateStream: NSObject, URLSessionDataDelegate {
+
+    enum State {
+        case idle
+        case connecting
+        case connected
+        case waitingToReconnect
+    }
+
+    /// Messages in stream order, delivered on the stream's private queue
+    let messages = PassthroughSubject<FlightStreamMessage, Never>()
+    let state = CurrentValueSubject<State, Never>(.idle)
+
+    var minimumReconnectDelay: TimeInterval = 1.0
+    var maximumReconnectDelay: TimeInterval = 30.0
+    /// Longest silence tolerated before reconnecting; the server sends comment heartbeats
+    var idleTimeout: TimeInterval = 45.0
+
+    private let url: URL
+    private let queue = DispatchQueue(label: "FlightUpdateStream")
+    private let delegateQueue = OperationQueue()
+    private var session: URLSession?
+    private var task: URLSessionDataTask?
+    private var parser = ServerSentEventParser()
+    private var reconnectDelay: TimeInterval = 0
+    /// Sequence of the last snapshot or delta published; nil until one is
+    private var lastSequence: Int?
+    private var isRunning = false
+    private let decoder = JSONDecoder()
+
+    init(url: URL) {
+        self.url = url
+        super.init()
+        delegateQueue.underlyingQueue = queue
+        delegateQueue.maxConcurrentOperationCount = 1
+    }
+
+    /// Sequence id of the last event received, sent as `Last-Event-ID` on reconnect
+    var lastEventId: String? {
+        return queue.sync { parser.lastEventId }
+    }
+
+    // MARK: - Lifecycle
+
+    func start() {
+        queue.async {
+            guard !self.isRunning else { return }
+            self.isRunning = true
+            self.reconnectDelay = self.minimumReconnectDelay
+
+            let configuration = URLSessionConfiguration.default
+            configuration.timeoutIntervalForRequest = self.idleTimeout
+            configuration.timeoutIntervalForResource = .infinity
+            configuration.requestCachePolicy = .reloadIgnoringLocalCacheData
+            self.session = URLSession(configuration: configuration, delegate: self, delegateQueue: self.delegateQueue)
+            self.connect()
+        }
+    }
+
+    func stop() {
+        queue.async {
+            guard self.isRunning else { return }
+            self.isRunning = false
+            self.task = nil
+            // Breaks the session -> delegate retain cycle
+            self.session?.invalidateAndCancel()
+            self.session = nil
+            self.state.send(.idle)
+        }
+    }
+
+    private func connect() {
+        guard isRunning, let session = session else { return }
+
+        var request = URLRequest(url: url)
+        request.setValue("text/event-stream", forHTTPHeaderField: "Accept")
+        request.setValue("no-cache", forHTTPHeaderField: "Cache-Control")
+        if let lastEventId = parser.lastEventId {
+            request.setValue(lastEventId, forHTTPHeaderField: "Last-Event-ID")
+        }
+
+        // Fresh parser for the new connection, keeping the resume point
+        parser = ServerSentEventParser(lastEventId: parser.lastEventId)
+
+        let task = session.dataTask(with: request)
+        self.task = task
+        state.send(.connecting)
+        Log.info("📡 FlightUpdateStream: Connecting to \(url.absoluteString) (last event \(parser.lastEventId ?? "none"))", category: .stream)
+        task.resume()
+    }
+
+    private func scheduleReconnect() {
+        guard isRunning else { return }
+        state.send(.waitingToReconnect)
+
+        let delay = reconnectDelay * Double.random(in: 0.8...1.2)
+        reconnectDelay = min(reconnectDelay * 2, maximumReconnectDelay)
+        Log.info("🔁 FlightUpdateStream: Reconnecting in \(String(format: "%.1f", delay))s", category: .stream)
+
+        queue.asyncAfter(deadline: .now() + delay) { [weak self] in
+            self?.connect()
+        }
+    }
+
+    /// Drop the resume point and reconnect; the server answers a connection
+    /// without `Last-Event-ID` with a full snapshot
+    private func resynchronize() {
+        lastSequence = nil
+        parser = ServerSentEventParser()
+        task?.cancel()
+        task = nil
+        connect()
+    }
+    
+    // MARK: - URLSessionDataDelegate
+
+    func urlSession(_ session: URLSession, dataTask: URLSessionDataTask, didReceive response: URLResponse,
+                    completionHandler: @escaping (URLSession.ResponseDisposition) -> Void) {
+        guard dataTask === task,
+              let httpResponse = response as? HTTPURLResponse,
+              httpResponse.statusCode == 200,
+              httpResponse.value(forHTTPHeaderField: "Content-Type")?.hasPrefix("text/event-stream") == true else {
+            Log.error("❌ FlightUpdateStream: Unexpected response \(String(describing: response))", category: .stream)
+            completionHandler(.cancel)
+            return
+        }
+
+        state.send(.connected)
+        reconnectDelay = minimumReconnectDelay
+        completionHandler(.allow)
+    }
+
+    func urlSession(_ session: URLSession, dataTask: URLSessionDataTask, didReceive data: Data) {
+        guard dataTask === task else { return }
+
+        // A sequence gap replaces the task mid-chunk; drop the rest of the old connection
+        for event in parser.feed(data) where dataTask === task {
+            handle(event)
+        }
+        if let retry = parser.retryInterval {
+            minimumReconnectDelay = retry
+        }
+    }
+
+    func urlSession(_ session: URLSession, task: URLSessionTask, didCompleteWithError error: Error?) {
+        guard task === self.task else { return }
+        self.task = nil
+        Log.warning("⚠️ FlightUpdateStream: Stream ended - \(error?.localizedDescription ?? "closed by server")", category: .stream)
+        scheduleReconnect()
+    }
+
+    // MARK: - Decoding
+
+    private func handle(_ event: ServerSentEvent) {
+        let payload = Data(event.data.utf8)
+        do {
+            switch event.event {
+            case "snapshot":
+                let response = try decoder.decode(BackendFlightsResponse.self, from: payload)
+                lastSequence = event.id.flatMap { Int($0) }
+                messages.send(.snapshot(response.flights.map { Flight(from: $0) }))
+            case "delta":
+                let delta = try decoder.decode(BackendFlightDelta.self, from: payload)
+                if let last = lastSequence {
+                    guard delta.sequence > last else {
+                        Log.warning("⚠️ FlightUpdateStream: Dropping duplicate delta \(delta.sequence)", category: .stream)
+                        return
+                    }
+                    guard delta.sequence == last + 1 else {
+                        Log.warning("⚠️ FlightUpdateStream: Missed deltas \(last + 1)..<\(delta.sequence), resynchronizing", category: .stream)
+                        resynchronize()
+                        return
+                    }
+                }
+                lastSequence = delta.sequence
+                messages.send(.delta(upserts: delta.upserts.map { Flight(from: $0) }, removed: delta.removed))
+            default:
+                break
+            }
+        } catch {
+            Log.error("❌ FlightUpdateStream: Failed to decode \(event.event) event - \(error.localizedDescription)", category: .stream)
+        }
+    }
+}
+
+// MARK: - Data Models
+
+struct BackendFlightDelta: Codable {
+    let sequence: Int
+    let upserts: [BackendFlight]
+    /// `icao24` ids no longer tracked
+    let removed: [String]
+}
@@ -5,11 +5,23 @@ class OpenSkyService: ObservableObject {
     @Published var flights: [Flight] = []
     @Published var isLoading = false
     @Published var errorMessage: String?
+    /// When the last snapshot fetched from the network was published
+    @Published private(set) var lastFetchDate: Date?
     
-    private let session = URLSession.shared
-    private var flightsCache: [Flight] = []
-    private var cacheTimestamp: Date?
-    private let cacheDuration: TimeInterval = 8.0
+    /// Keyed copy of `flights`; each refresh is diffed against it
+    let flightStore = FlightStore()
+    /// Emits only the added/updated/removed flights of each refresh
+    let flightChanges = PassthroughSubject<FlightChangeset, Never>()
+    /// Result of each network request, with its rate-limit headers, on main
+    let fetchOutcomes = PassthroughSubject<PollingScheduler.Outcome, Never>()
+    
+    private let baseURL: String
+    private let session: URLSession
+    private let stateDecoder = OpenSkyStateDecoder()
+    /// Decodes and diffs off the main thread; delivers finished snapshots on main
+    private let processor = FlightSnapshotProcessor(label: "com.planetracker.opensky-snapshots")
+    /// Last fetched snapshot, served stale-while-revalidate
+    private let cache: FlightFetchCache
     
     // SF Bay Area bounding box
     private let minLat = 36.8
@@ -17,136 +29,224 @@ class OpenSkyService: ObservableObject {
     private let minLon = -123.8
     private let maxLon = -121.0
     
+    init(cachePolicy: FlightCachePolicy = .default,
+         baseURL: String = "https://opensky-network.org",
+         session: URLSession = .shared) {
+        self.cache = FlightFetchCache(policy: cachePolicy)
+        self.baseURL = baseURL
+        self.session = session
+    }
+    
+    var cachePolicy: FlightCachePolicy {
+        return cache.policy
+    }
+    
+    /// Seconds since the served snapshot was fetched; nil before the first fetch
+    var cacheAge: TimeInterval? {
+        return cache.age()
+    }
+    
+    /// True while a network refresh is outstanding
+    var isRefreshing: Bool {
+        return cache.isRefreshing
+    }
+    
+    /// Serve the cached snapshot when it is within `cachePolicy`, and go to
+    /// the network when it is stale or missing. A stale snapshot is published
+    /// immediately and replaced when the background refresh lands; only a
+    /// miss sets `isLoading`. At most one refresh is in flight at a time.
     func fetchFlights() {
         // ===== MOCK DATA MODE - DISABLED - USING REAL OPENSKY DATA =====
         // To re-enable mock data for testing, uncomment the block below
         // Uncomment this block to re-enable mock data for testing
         /*
-        NSLog("🎭 OpenSkyService: Using MOCK data for testing")
+        Log.info("🎭 OpenSkyService: Using MOCK data for testing", category: .network)
         DispatchQueue.main.async {
             self.flights = self.generateMockFlights()
-            self.flightsCache = self.flights
-            self.cacheTimestamp = Date()
+            self.cache.store(self.flights)
             self.isLoading = false
             self.errorMessage = nil
-            NSLog("✅ OpenSkyService: Loaded \(self.flights.count) MOCK flights")
+            Log.info("✅ OpenSkyService: Loaded \(self.flights.count) MOCK flights", category: .network)
             return
         }
         */
         // ===== END MOCK DATA MODE =====
         
-        NSLog("🌐 OpenSkyService: Fetching REAL flights from OpenSky API...")
+        Log.info("🌐 OpenSkyService: Fetching REAL flights from OpenSky API...", category: .network)
         
         // Check cache first
-        if let cacheTime = cacheTimestamp,
-           Date().timeIntervalSince(cacheTime) < cacheDuration,
-           !flightsCache.isEmpty {
-            NSLog("💾 OpenSkyService: Using cached data (\(flightsCache.count) flights)")
-            DispatchQueue.main.async {
-                self.flights = self.flightsCache
-                self.isLoading = false
-                self.errorMessage = nil
+        let lookup = cache.lookup()
+        if lookup != .miss {
+            let age = Int(cache.age() ?? 0)
+            Log.info("💾 OpenSkyService: Using \(lookup == .fresh ? "cached" : "stale") data (\(cache.flights.count) flights, \(age)s old)", category: .network)
+            processor.process(flights: cache.flights) { [weak self] snapshot in
+                self?.publish(snapshot)
+                self?.errorMessage = nil
             }
+            guard lookup == .stale else { return }
+        }
+        
+        guard cache.beginRefresh() else {
+            Log.info("⏳ OpenSkyService: Refresh already in flight", category: .network)
             return
         }
         
-        isLoading = true
+        if lookup == .miss {
+            isLoading = true
+        }
         errorMessage = nil
         
-        let urlString = "https://opensky-network.org/api/states/all?lamin=\(minLat)&lomin=\(minLon)&lamax=\(maxLat)&lomax=\(maxLon)"
+        let urlString = "\(baseURL)/api/states/all?lamin=\(minLat)&lomin=\(minLon)&lamax=\(maxLat)&lomax=\(maxLon)"
         
         guard let url = URL(string: urlString) else {
-            NSLog("❌ OpenSkyService: Invalid URL")
+            Log.error("❌ OpenSkyService: Invalid URL", category: .network)
             errorMessage = "Invalid URL"
             isLoading = false
+            cache.endRefresh()
             return
         }
         
-        NSLog("🌐 OpenSkyService: Fetching from \(url.absoluteString)")
+        Log.info("🌐 OpenSkyService: Fetching from \(url.absoluteString)", category: .network)
         
         var request = URLRequest(url: url)
         request.timeoutInterval = 10.0
         
+        // The snapshot's age counts from when it was requested, the same
+        // instant the poll that asked for it was scheduled from
+        let requestedAt = Date()
+        
         session.dataTask(with: request) { [weak self] data, response, error in
-            DispatchQueue.main.async {
-                self?.isLoading = false
-                
-                if let error = error {
-                    NSLog("❌ OpenSkyService: Network error - \(error.localizedDescription)")
-                    self?.errorMessage = "Network error: \(error.localizedDescription)"
+            // Runs on URLSession's delegate queue; only failures hop straight to main
+            guard let self = self else { return }
+            
+            if let error = error {
+                Log.error("❌ OpenSkyService: Network error - \(error.localizedDescription)", category: .network)
+                DispatchQueue.main.async {
+                    self.cache.endRefresh()
+                    self.isLoading = false
+                    self.errorMessage = "Network error: \(error.localizedDescription)"
+                    self.fetchOutcomes.send(.failure(retryAfter: nil))
                     // Use cached data if available
-                    if let cache = self?.flightsCache, !cache.isEmpty {
-                        NSLog("💾 OpenSkyService: Using cached data due to error")
-                        self?.flights = cache
+                    if !self.cache.isEmpty {
+                        Log.info("💾 OpenSkyService: Using cached data due to error", category: .network)
+                        self.processor.process(flights: self.cache.flights) { [weak self] snapshot in
+                            self?.publish(snapshot)
+                        }
                     }
-                    return
-                }
-                
-                guard let httpResponse = response as? HTTPURLResponse else {
-                    NSLog("❌ OpenSkyService: Invalid response type")
-                    self?.errorMessage = "Invalid response from server"
-                    return
                 }
+                return
+            }
+            
+            guard let httpResponse = response as? HTTPURLResponse else {
+                Log.error("❌ OpenSkyService: Invalid response type", category: .network)
+                self.fail("Invalid response from server")
+                return
+            }
+            
+            Log.info("📡 OpenSkyService: HTTP Status Code: \(httpResponse.statusCode)", category: .network)
+            
+            // 429 when out of credits; OpenSky says how long to wait
+            guard httpResponse.statusCode == 200 else {
+                let retryAfter = PollingScheduler.retryAfter(from: httpResponse)
+                Log.error("❌ OpenSkyService: HTTP \(httpResponse.statusCode), retry after \(retryAfter.map { "\(Int($0))s" } ?? "-")", category: .network)
+                self.fail(httpResponse.statusCode == 429 ? "Rate limited by OpenSky" : "Server error (\(httpResponse.statusCode))",
+                          retryAfter: retryAfter)
+                return
+            }
+            let remainingRequests = PollingScheduler.remainingRequests(from: httpResponse)
+            
+            guard let data = data else {
+                Log.error("❌ OpenSkyService: No data received", category: .network)
+                self.fail("No data received from server")
+                return
+            }
+            
+            Log.info("📦 OpenSkyService: Received \(data.count) bytes", category: .network)
+            
+            // Log raw response for debugging
+            Log.debug("📄 OpenSkyService: Raw response (first 200 chars): \(String(decoding: data.prefix(200), as: UTF8.self))", category: .network)
+            
+            let stateDecoder = self.stateDecoder
+            self.processor.process({
+                Log.info("🔍 Attempting to decode OpenSky response...", category: .network)
+                let snapshot = try stateDecoder.decode(data)
+                Log.debug("✅ Decoded \(snapshot.stateCount) state vectors", category: .network)
+                return snapshot.flights
+            }, completion: { [weak self] result in
+                guard let self = self else { return }
+                self.cache.endRefresh()
+                self.isLoading = false
                 
-                NSLog("📡 OpenSkyService: HTTP Status Code: \(httpResponse.statusCode)")
-                
-                guard let data = data else {
-                    NSLog("❌ OpenSkyService: No data received")
-                    self?.errorMessage = "No data received from server"
-                    return
+                switch result {
+                case .success(let snapshot):
+                    guard let snapshot = snapshot else { return }
+                    Log.info("✅ OpenSkyService: Successfully fetched \(snapshot.flights.count) flights", category: .network)
+                    self.publish(snapshot)
+                    self.cache.store(snapshot.flights, at: requestedAt)
+                    self.errorMessage = nil
+                    self.lastFetchDate = Date()
+                    self.fetchOutcomes.send(.success(remainingRequests: remainingRequests))
+                case .failure(let error):
+                    Log.error("❌ OpenSkyService: Failed to decode - \(error.localizedDescription)", category: .network)
+                    self.errorMessage = "API response format error"
+                    self.fetchOutcomes.send(.failure(retryAfter: nil))
                 }
-                
-                NSLog("📦 OpenSkyService: Received \(data.count) bytes")
-                
-                // Log raw response for debugging
-                if let rawString = String(data: data, encoding: .utf8) {
-                    NSLog("📄 OpenSkyService: Raw response (first 200 chars): \(String(rawString.prefix(200)))")
+            })
+        }.resume()
     }
     
-                do {
-                    NSLog("🔍 Attempting to decode OpenSky response...")
-                    let response = try JSONDecoder().decode(OpenSkyResponse.self, from: data)
-                    NSLog("✅ Decoded response object successfully")
-                    let flights = self?.parseFlights(from: response) ?? []
-                    NSLog("✅ OpenSkyService: Successfully fetched \(flights.count) flights")
-                    self?.flights = flights
-                    self?.flightsCache = flights
-                    self?.cacheTimestamp = Date()
-                    self?.errorMessage = nil
-                } catch {
-                    NSLog("❌ OpenSkyService: Failed to decode - \(error)")
-                    if let decodingError = error as? DecodingError {
-                        switch decodingError {
-                        case .dataCorrupted(let context):
-                            NSLog("❌ Data corrupted: \(context.debugDescription)")
-                        case .keyNotFound(let key, let context):
-                            NSLog("❌ Key '\(key)' not found: \(context.debugDescription)")
-                        case .typeMismatch(let type, let context):
-                            NSLog("❌ Type mismatch for type '\(type)': \(context.debugDescription)")
-                        case .valueNotFound(let type, let context):
-                            NSLog("❌ Value not found for type '\(type)': \(context.debugDescription)")
-                        @unknown default:
-                            NSLog("❌ Unknown decoding error")
-                        }
-                    }
-                    self?.errorMessage = "API response format error"
-                }
+    /// Publish flights that did not come from the network, e.g. the on-disk
+    /// snapshot. `load` runs off the main thread. Restored flights do not warm
+    /// the fetch cache, so the next `fetchFlights()` still goes to the
+    /// network; the processor drops them if a fetch was already processed.
+    /// `completion` receives the number of flights published.
+    func restore(_ load: @escaping () -> [Flight]?, completion: ((Int) -> Void)? = nil) {
+        processor.processRestored(load) { [weak self] snapshot in
+            // Delivered in submission order, before any later fetch, so
+            // publishing keeps `flightStore` in step with the processor
+            guard let self = self, let snapshot = snapshot else {
+                completion?(0)
+                return
             }
-        }.resume()
+            Log.info("💾 OpenSkyService: Restored \(snapshot.flights.count) flights", category: .network)
+            self.publish(snapshot)
+            completion?(snapshot.flights.count)
+        }
+    }
+    
+    private func fail(_ message: String, retryAfter: TimeInterval? = nil) {
+        DispatchQueue.main.async {
+            self.cache.endRefresh()
+            self.isLoading = false
+            self.errorMessage = message
+            self.fetchOutcomes.send(.failure(retryAfter: retryAfter))
+        }
+    }
+    
+    /// Mirror a processed snapshot into the store and publish it only if something changed.
+    /// Main thread only; the diffing already happened on the processor's queue.
+    private func publish(_ snapshot: FlightSnapshot) {
+        let changes = flightStore.adopt(snapshot)
+        guard !changes.isEmpty else { return }
+        Log.info("🔄 OpenSkyService: +\(changes.added.count) ~\(changes.updated.count) -\(changes.removed.count) flights", category: .network)
+        flights = snapshot.flights
+        flightChanges.send(changes)
     }
     
-    private func parseFlights(from response: OpenSkyResponse) -> [Flight] {
+    /// Legacy `[[Any]]` parsing path. Superseded by `OpenSkyStateDecoder` and
+    /// kept as the reference implementation for its equivalence and benchmark tests.
+    func parseFlights(from response: OpenSkyResponse) -> [Flight] {
         guard let states = response.states else {
-            NSLog("⚠️ No states array in OpenSky response")
+            Log.warning("⚠️ No states array in OpenSky response", category: .network)
             return []
         }
         
-        NSLog("📊 OpenSkyService: Parsing \(states.count) flight states...")
+        Log.info("📊 OpenSkyService: Parsing \(states.count) flight states...", category: .network)
         
         return states.compactMap { state in
             // State array indices from OpenSky API
             guard state.count >= 17 else {
-                NSLog("⚠️ State array too short: \(state.count) elements")
+                Log.debug("⚠️ State array too short: \(state.count) elements", category: .flights)
                 return nil
             }
             
@@ -154,7 +254,7 @@ class OpenSkyService: ObservableObject {
                   let callsign = state[1] as? String,
                   let originCountry = state[2] as? String,
                   let lastContact = state[4] as? Int else {
-                NSLog("⚠️ Failed to parse required fields for state")
+                Log.debug("⚠️ Failed to parse required fields for state", category: .flights)
                 return nil
             }
             
@@ -173,17 +273,17 @@ class OpenSkyService: ObservableObject {
             
             // Skip flights without position data
             guard longitude != nil, latitude != nil else {
-                NSLog("⚠️ Skipping flight without position: \(callsign)")
+                Log.debug("⚠️ Skipping flight without position: \(callsign)", category: .flights)
                 return nil
             }
             
             // Skip flights on ground
             guard !onGround else {
-                NSLog("⚠️ Skipping ground flight: \(callsign)")
+                Log.debug("⚠️ Skipping ground flight: \(callsign)", category: .flights)
                 return nil
             }
             
-            NSLog("✅ Parsed flight: \(callsign) at (\(latitude!), \(longitude!)) alt=\(baroAltitude ?? 0)")
+            Log.debug("✅ Parsed flight: \(callsign) at (\(latitude!), \(longitude!)) alt=\(baroAltitude ?? 0)", category: .flights)
             
             return Flight(
                 id: icao24,
@@ -318,14 +418,14 @@ struct OpenSkyResponse: Decodable {
         // Decode states as array of mixed types
         do {
             if let statesArray = try container.decodeIfPresent([[AnyCodable]].self, forKey: .states) {
-                NSLog("✅ Successfully decoded \(statesArray.count) flight states")
+                Log.info("✅ Successfully decoded \(statesArray.count) flight states", category: .network)
                 states = statesArray.map { $0.map { $0.value } }
             } else {
-                NSLog("⚠️ States array is nil")
+                Log.warning("⚠️ States array is nil", category: .network)
                 states = nil
             }
         } catch {
-            NSLog("❌ Failed to decode states array: \(error)")
+            Log.error("❌ Failed to decode states array: \(error)", category: .network)
             states = nil
         }
     }
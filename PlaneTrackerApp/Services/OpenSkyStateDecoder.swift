@@ -0,0 +1,494 @@
+import Foundation
+
+/// Single-pass decoder for OpenSky `states/all` responses.
+///
+/// Walks the raw JSON bytes once and writes every positional state vector
+/// straight into a `Flight`. There is no intermediate `[[AnyCodable]]` /
+/// `[[Any]]` tree and no per-field `as?` casts, so the cost per aircraft is
+/// the handful of strings a `Flight` actually keeps.
+///
+/// Filtering matches `OpenSkyService.parseFlights(from:)`: state vectors
+/// missing `icao24`, `callsign`, `origin_country` or `last_contact`, without
+/// a position, or reported on the ground are dropped.
+struct OpenSkyStateDecoder {
+
+    struct Snapshot {
+        let time: Int?
+        let flights: [Flight]
+        /// Number of state vectors in the payload, before filtering
+        let stateCount: Int
+    }
+
+    /// Minimum number of positional fields in an OpenSky state vector
+    static let stateVectorFieldCount = 17
+
+    func decode(_ data: Data) throws -> Snapshot {
+        return try data.withUnsafeBytes { rawBuffer -> Snapshot in
+            var scanner = StateVectorScanner(bytes: rawBuffer.bindMemory(to: UInt8.self))
+            return try scanner.readResponse()
+        }
+    }
+}
+
+// MARK: - Errors
+
+enum OpenSkyDecodingError: Error, LocalizedError {
+    case unexpectedEnd
+    case unexpectedByte(offset: Int)
+    case invalidNumber(offset: Int)
+    case invalidString(offset: Int)
+
+    var errorDescription: String? {
+        switch self {
+        case .unexpectedEnd:
+            return "Unexpected end of OpenSky response"
+        case .unexpectedByte(let offset):
+            return "Unexpected byte at offset \(offset)"
+        case .invalidNumber(let offset):
+            return "Invalid number at offset \(offset)"
+        case .invalidString(let offset):
+            return "Invalid string at offset \(offset)"
+        }
+    }
+}
+
+// MARK: - Byte Scanner
+
+private struct StateVectorScanner {
+
+    private let bytes: UnsafeBufferPointer<UInt8>
+    private var index = 0
+
+    /// NUL-terminated scratch space for `strtod`, reused for every number
+    private var numberScratch = [CChar](repeating: 0, count: 64)
+
+    init(bytes: UnsafeBufferPointer<UInt8>) {
+        self.bytes = bytes
+    }
+
+    // MARK: Response
+
+    mutating func readResponse() throws -> OpenSkyStateDecoder.Snapshot {
+        var time: Int?
+        var flights: [Flight] = []
+        var stateCount = 0
+
+        try expect(UInt8(ascii: "{"))
+        if try consume(UInt8(ascii: "}")) {
+            return OpenSkyStateDecoder.Snapshot(time: nil, flights: [], stateCount: 0)
+        }
+
+        repeat {
+            guard let key = try readString() else {
+                throw OpenSkyDecodingError.unexpectedByte(offset: index)
+            }
+            try expect(UInt8(ascii: ":"))
+
+            switch key {
+            case "time":
+                time = try readInt()
+            case "states":
+                if try consumeNull() { break }
+                try expect(UInt8(ascii: "["))
+                if try consume(UInt8(ascii: "]")) { break }
+                flights.reserveCapacity(estimatedStateCount())
+                repeat {
+                    stateCount += 1
+                    if let flight = try readStateVector() {
+                        flights.append(flight)
+                    }
+                } while try consume(UInt8(ascii: ","))
+                try expect(UInt8(ascii: "]"))
+            default:
+                try skipValue()
+            }
+        } while try consume(UInt8(ascii: ","))
+
+        try expect(UInt8(ascii: "}"))
+
+        return OpenSkyStateDecoder.Snapshot(time: time, flights: flights, stateCount: stateCount)
+    }
+
+    /// Rough upper bound on state vectors left in the buffer (~150 bytes each)
+    private func estimatedStateCount() -> Int {
+        return max(16, (bytes.count - index) / 150)
+    }
+
+    // MARK: State Vector
+
+    private mutating func readStateVector() throws -> Flight? {
+        try expect(UInt8(ascii: "["))
+
+        var icao24: String?
+        var callsign: String?
+        var originCountry: String?
+        var timePosition: Int?
+        var lastContact: Int?
+        var longitude: Double?
+        var latitude: Double?
+        var baroAltitude: Double?
+        var onGround = false
+        var velocity: Double?
+        var trueTrack: Double?
+        var verticalRate: Double?
+        var geoAltitude: Double?
+        var squawk: String?
+        var spi = false
+        var positionSource = 0
+
+        var field = 0
+        if try !consume(UInt8(ascii: "]")) {
+            repeat {
+                switch field {
+                case 0: icao24 = try readString()
+                case 1: callsign = try readString()
+                case 2: originCountry = try readString()
+                case 3: timePosition = try readInt()
+                case 4: lastContact = try readInt()
+                case 5: longitude = try readDouble()
+                case 6: latitude = try readDouble()
+                case 7: baroAltitude = try readDouble()
+                case 8: onGround = try readBool() ?? false
+                case 9: velocity = try readDouble()
+                case 10: trueTrack = try readDouble()
+                case 11: verticalRate = try readDouble()
+                case 13: geoAltitude = try readDouble()
+                case 14: squawk = try readString()
+                case 15: spi = try readBool() ?? false
+                case 16: positionSource = try readInt() ?? 0
+                default: try skipValue()  // 12 = sensors, 17+ = category
+                }
+                field += 1
+            } while try consume(UInt8(ascii: ","))
+            try expect(UInt8(ascii: "]"))
+        }
+
+        guard field >= OpenSkyStateDecoder.stateVectorFieldCount,
+              let icao24 = icao24,
+              let callsign = callsign,
+              let originCountry = originCountry,
+              let lastContact = lastContact else {
+            return nil
+        }
+
+        // Skip flights without position data or on the ground
+        guard longitude != nil, latitude != nil, !onGround else {
+            return nil
+        }
+
+        return Flight(
+            id: icao24,
+            callsign: callsign.trimmingCharacters(in: .whitespaces),
+            originCountry: originCountry,
+            timePosition: timePosition,
+            lastContact: lastContact,
+            longitude: longitude,
+            latitude: latitude,
+            baroAltitude: baroAltitude,
+            onGround: onGround,
+            velocity: velocity,
+            trueTrack: trueTrack,
+            verticalRate: verticalRate,
+            sensors: nil,
+            geoAltitude: geoAltitude,
+            squawk: squawk,
+            spi: spi,
+            positionSource: positionSource
+        )
+    }
+
+    // MARK: Typed Values
+    //
+    // Each reader returns nil for JSON null or a value of a different type,
+    // consuming the value either way so the positional index stays aligned.
+
+    private mutating func readString() throws -> String? {
+        guard try peek() == UInt8(ascii: "\"") else {
+            try skipValue()
+            return nil
+        }
+        index += 1
+        let start = index
+        var hasEscapes = false
+
+        while index < bytes.count {
+            let byte = bytes[index]
+            if byte == UInt8(ascii: "\"") {
+                let end = index
+                index += 1
+                if hasEscapes {
+                    return try unescapeString(from: start, to: end)
+                }
+                return String(decoding: UnsafeBufferPointer(rebasing: bytes[start..<end]), as: UTF8.self)
+            }
+            if byte == UInt8(ascii: "\\") {
+                hasEscapes = true
+                index += 1
+            }
+            index += 1
+        }
+        throw OpenSkyDecodingError.unexpectedEnd
+    }
+
+    private mutating func readDouble() throws -> Double? {
+        guard let range = try numberToken() else { return nil }
+        let length = range.count
+        guard length < numberScratch.count else {
+            throw OpenSkyDecodingError.invalidNumber(offset: range.lowerBound)
+        }
+
+        let source = bytes
+        return try numberScratch.withUnsafeMutableBufferPointer { scratch -> Double in
+            for offset in 0..<length {
+                scratch[offset] = CChar(bitPattern: source[range.lowerBound + offset])
+            }
+            scratch[length] = 0
+
+            var end: UnsafeMutablePointer<CChar>?
+            let value = strtod(scratch.baseAddress!, &end)
+            guard let endPointer = end, endPointer == scratch.baseAddress! + length else {
+                throw OpenSkyDecodingError.invalidNumber(offset: range.lowerBound)
+            }
+            return value
+        }
+    }
+
+    /// Integral JSON numbers only; fractional or exponent forms read as nil
+    private mutating func readInt() throws -> Int? {
+        guard let range = try numberToken() else { return nil }
+
+        var position = range.lowerBound
+        let negative = bytes[position] == UInt8(ascii: "-")
+        if negative { position += 1 }
+        guard position < range.upperBound else {
+            throw OpenSkyDecodingError.invalidNumber(offset: range.lowerBound)
+        }
+
+        var value = 0
+        while position < range.upperBound {
+            let byte = bytes[position]
+            guard byte >= UInt8(ascii: "0") && byte <= UInt8(ascii: "9") else {
+                return nil
+            }
+            let (multiplied, overflow1) = value.multipliedReportingOverflow(by: 10)
+            let (added, overflow2) = multiplied.addingReportingOverflow(Int(byte - UInt8(ascii: "0")))
+            guard !overflow1 && !overflow2 else { return nil }
+            value = added
+            position += 1
+        }
+        return negative ? -value : value
+    }
+
+    private mutating func readBool() throws -> Bool? {
+        switch try peek() {
+        case UInt8(ascii: "t"):
+            try expectLiteral("true")
+            return true
+        case UInt8(ascii: "f"):
+            try expectLiteral("false")
+            return false
+        default:
+            try skipValue()
+            return nil
+        }
+    }
+
+    /// Byte range of the number at the cursor, or nil (value skipped) if the
+    /// next value is not a number
+    private mutating func numberToken() throws -> Range<Int>? {
+        let first = try peek()
+        guard first == UInt8(ascii: "-") || (first >= UInt8(ascii: "0") && first <= UInt8(ascii: "9")) else {
+            try skipValue()
+            return nil
+        }
+        let start = index
+        while index < bytes.count, isNumberByte(bytes[index]) {
+            index += 1
+        }
+        return start..<index
+    }
+
+    // MARK: Structure
+
+    private mutating func skipValue() throws {
+        switch try peek() {
+        case UInt8(ascii: "\""):
+            _ = try readString()
+        case UInt8(ascii: "n"):
+            try expectLiteral("null")
+        case UInt8(ascii: "t"):
+            try expectLiteral("true")
+        case UInt8(ascii: "f"):
+            try expectLiteral("false")
+        case UInt8(ascii: "["), UInt8(ascii: "{"):
+            try skipContainer()
+        case UInt8(ascii: "-"), UInt8(ascii: "0")...UInt8(ascii: "9"):
+            _ = try numberToken()
+        default:
+            throw OpenSkyDecodingError.unexpectedByte(offset: index)
+        }
+    }
+
+    private mutating func skipContainer() throws {
+        var depth = 0
+        while index < bytes.count {
+            let byte = bytes[index]
+            switch byte {
+            case UInt8(ascii: "\""):
+                _ = try readString()
+                continue
+            case UInt8(ascii: "["), UInt8(ascii: "{"):
+                depth += 1
+            case UInt8(ascii: "]"), UInt8(ascii: "}"):
+                depth -= 1
+                if depth == 0 {
+                    index += 1
+                    return
+                }
+            default:
+                break
+            }
+            index += 1
+        }
+        throw OpenSkyDecodingError.unexpectedEnd
+    }
+
+    private mutating func consumeNull() throws -> Bool {
+        guard try peek() == UInt8(ascii: "n") else { return false }
+        try expectLiteral("null")
+        return true
+    }
+
+    // MARK: Primitives
+
+    /// Next non-whitespace byte, without consuming it
+    private mutating func peek() throws -> UInt8 {
+        skipWhitespace()
+        guard index < bytes.count else {
+            throw OpenSkyDecodingError.unexpectedEnd
+        }
+        return bytes[index]
+    }
+
+    private mutating func consume(_ byte: UInt8) throws -> Bool {
+        guard try peek() == byte else { return false }
+        index += 1
+        return true
+    }
+
+    private mutating func expect(_ byte: UInt8) throws {
+        guard try consume(byte) else {
+            throw OpenSkyDecodingError.unexpectedByte(offset: index)
+        }
+    }
+
+    private mutating func expectLiteral(_ literal: StaticString) throws {
+        skipWhitespace()
+        let count = literal.utf8CodeUnitCount
+        guard index + count <= bytes.count else {
+            throw OpenSkyDecodingError.unexpectedEnd
+        }
+        let literalBytes = literal.utf8Start
+        for offset in 0..<count where bytes[index + offset] != literalBytes[offset] {
+            throw OpenSkyDecodingError.unexpectedByte(offset: index + offset)
+        }
+        index += count
+    }
+
+    private mutating func skipWhitespace() {
+        while index < bytes.count {
+            switch bytes[index] {
+            case UInt8(ascii: " "), UInt8(ascii: "\n"), UInt8(ascii: "\r"), UInt8(ascii: "\t"):
+                index += 1
+            default:
+                return
+            }
+        }
+    }
+
+    private func isNumberByte(_ byte: UInt8) -> Bool {
+        switch byte {
+        case UInt8(ascii: "0")...UInt8(ascii: "9"),
+             UInt8(ascii: "-"), UInt8(ascii: "+"), UInt8(ascii: "."),
+             UInt8(ascii: "e"), UInt8(ascii: "E"):
+            return true
+        default:
+            return false
+        }
+    }
+
+    // MARK: Escapes
+
+    /// Slow path for strings containing backslash escapes
+    private func unescapeString(from start: Int, to end: Int) throws -> String {
+        var utf8: [UInt8] = []
+        utf8.reserveCapacity(end - start)
+        var position = start
+
+        while position < end {
+            let byte = bytes[position]
+            guard byte == UInt8(ascii: "\\") else {
+                utf8.append(byte)
+                position += 1
+                continue
+            }
+
+            guard position + 1 < end else {
+                throw OpenSkyDecodingError.invalidString(offset: position)
+            }
+            let escaped = bytes[position + 1]
+            position += 2
+
+            switch escaped {
+            case UInt8(ascii: "\""), UInt8(ascii: "\\"), UInt8(ascii: "/"):
+                utf8.append(escaped)
+            case UInt8(ascii: "b"): utf8.append(0x08)
+            case UInt8(ascii: "f"): utf8.append(0x0C)
+            case UInt8(ascii: "n"): utf8.append(0x0A)
+            case UInt8(ascii: "r"): utf8.append(0x0D)
+            case UInt8(ascii: "t"): utf8.append(0x09)
+            case UInt8(ascii: "u"):
+                var scalarValue = try readHex4(at: position, end: end)
+                position += 4
+
+                // Surrogate pair
+                if scalarValue >= 0xD800 && scalarValue < 0xDC00,
+                   position + 6 <= end,
+                   bytes[position] == UInt8(ascii: "\\"),
+                   bytes[position + 1] == UInt8(ascii: "u") {
+                    let low = try readHex4(at: position + 2, end: end)
+                    if low >= 0xDC00 && low < 0xE000 {
+                        scalarValue = 0x10000 + ((scalarValue - 0xD800) << 10) + (low - 0xDC00)
+                        position += 6
+                    }
+                }
+
+                let scalar = Unicode.Scalar(scalarValue) ?? "\u{FFFD}"
+                utf8.append(contentsOf: String(Character(scalar)).utf8)
+            default:
+                throw OpenSkyDecodingError.invalidString(offset: position - 2)
+            }
+        }
+
+        return String(decoding: utf8, as: UTF8.self)
+    }
+
+    private func readHex4(at position: Int, end: Int) throws -> UInt32 {
+        guard position + 4 <= end else {
+            throw OpenSkyDecodingError.invalidString(offset: position)
+        }
+        var value: UInt32 = 0
+        for offset in 0..<4 {
+            let byte = bytes[position + offset]
+            let digit: UInt32
+            switch byte {
+            case UInt8(ascii: "0")...UInt8(ascii: "9"): digit = UInt32(byte - UInt8(ascii: "0"))
+            case UInt8(ascii: "a")...UInt8(ascii: "f"): digit = UInt32(byte - UInt8(ascii: "a") + 10)
+            case UInt8(ascii: "A")...UInt8(ascii: "F"): digit = UInt32(byte - UInt8(ascii: "A") + 10)
+            default: throw OpenSkyDecodingError.invalidString(offset: position + offset)
+            }
+            value = value << 4 | digit
+        }
+        return value
+    }
+}
@@ -0,0 +1,123 @@
+import Foundation
+
+/// One dispatched `text/event-stream` event
+struct ServerSentEvent: Equatable {
+    /// Last event id seen on the stream when this event was dispatched
+    let id: String?
+    let event: String
+    let data: String
+}
+
+/// Incremental parser for the Server-Sent Events wire format.
+///
+/// Feed it chunks as they arrive off the socket; lines may be split across
+/// chunks at any byte, including between `\r` and `\n`. Follows the WHATWG
+/// event-stream rules for `event`, `data`, `id`, `retry` and comments.
+struct ServerSentEventParser {
+
+    /// Id of the last dispatched event; sticky across events, as required
+    /// for `Last-Event-ID` resume. An `id:` line only takes effect once its
+    /// event is complete, so a connection cut mid-event resumes before it.
+    private(set) var lastEventId: String?
+    /// Reconnection delay requested by the server via `retry:`
+    private(set) var retryInterval: TimeInterval?
+
+    private var lineBuffer: [UInt8] = []
+    /// The spec's last event ID buffer, committed to `lastEventId` on dispatch
+    private var pendingEventId: String?
+    private var eventType = ""
+    private var dataLines: [String] = []
+    private var lastByteWasCarriageReturn = false
+    private var isAtStreamStart = true
+
+    init(lastEventId: String? = nil) {
+        self.lastEventId = lastEventId
+        self.pendingEventId = lastEventId
+    }
+
+    mutating func feed(_ chunk: Data) -> [ServerSentEvent] {
+        var events: [ServerSentEvent] = []
+
+        for byte in chunk {
+            switch byte {
+            case 0x0A where lastByteWasCarriageReturn:
+                lastByteWasCarriageReturn = false
+            case 0x0A:
+                processLine(into: &events)
+            case 0x0D:
+                processLine(into: &events)
+                lastByteWasCarriageReturn = true
+            default:
+                lastByteWasCarriageReturn = false
+                lineBuffer.append(byte)
+            }
+        }
+
+        return events
+    }
+
+    private mutating func processLine(into events: inout [ServerSentEvent]) {
+        var line = String(decoding: lineBuffer, as: UTF8.self)
+        lineBuffer.removeAll(keepingCapacity: true)
+
+        if isAtStreamStart {
+            isAtStreamStart = false
+            if line.hasPrefix("\u{FEFF}") {
+                line.removeFirst()
+            }
+        }
+
+        if line.isEmpty {
+            dispatch(into: &events)
+            return
+        }
+        if line.hasPrefix(":") {
+            return // comment / heartbeat
+        }
+
+        let field: Substring
+        var value: Substring
+        if let colon = line.firstIndex(of: ":") {
+            field = line[..<colon]
+            value = line[line.index(after: colon)...]
+            if value.hasPrefix(" ") {
+                value = value.dropFirst()
+            }
+        } else {
+            field = line[...]
+            value = ""
+        }
+
+        switch field {
+        case "event":
+            eventType = String(value)
+        case "data":
+            dataLines.append(String(value))
+        case "id":
+            if !value.contains("\0") {
+                pendingEventId = String(value)
+            }
+        case "retry":
+            if let milliseconds = Int(value) {
+                retryInterval = TimeInterval(milliseconds) / 1000
+            }
+        default:
+            break
+        }
+    }
+
+    private mutating func dispatch(into events: inout [ServerSentEvent]) {
+        defer {
+            eventType = ""
+            dataLines.removeAll()
+        }
+        lastEventId = pendingEventId
+        guard !dataLines.isEmpty else { return }
+
+        events.append(ServerSentEvent(
+            id: lastEventId,
+            event: eventType.isEmpty ? "message" : eventType,
+            data: dataLines.joined(separator: "\n")
+        ))
+    }
+}
@@ -1,6 +1,7 @@
 import Foundation
 import CoreLocation
 import simd
+import Accelerate
 
 class TrajectoryPredictor {
     
@@ -15,35 +16,13 @@ class TrajectoryPredictor {
         
         // First priority: Use backend predicted trajectory
         if let predictedTrajectory = flight.predictedTrajectory, !predictedTrajectory.isEmpty {
-            return convertBackendTrajectory(predictedTrajectory)
+            return predictedTrajectory.points
         }
         
         // Fallback: Use local prediction when backend unavailable
         return predictTrajectoryLocally(for: flight, predictionTime: predictionTime, timeStep: timeStep)
     }
     
-    private func convertBackendTrajectory(_ backendTrajectory: [[String: Any]]) -> [TrajectoryPoint] {
-        return backendTrajectory.compactMap { pointDict in
-            guard let latitude = pointDict["latitude"] as? Double,
-                  let longitude = pointDict["longitude"] as? Double,
-                  let altitude = pointDict["altitude"] as? Double,
-                  let timeOffset = pointDict["time_offset"] as? Double,
-                  let distanceFromCurrent = pointDict["distance_from_current"] as? Double,
-                  let bearing = pointDict["bearing"] as? Double else {
-                return nil
-            }
-            
-            return TrajectoryPoint(
-                latitude: latitude,
-                longitude: longitude,
-                altitude: altitude,
-                timeOffset: timeOffset,
-                distanceFromCurrent: distanceFromCurrent,
-                bearing: bearing
-            )
-        }
-    }
-    
     private func predictTrajectoryLocally(for flight: Flight, 
                                         predictionTime: Double = 60.0, 
                                         timeStep: Double = 2.0) -> [TrajectoryPoint] {
@@ -230,6 +209,18 @@ class TrajectoryPredictor {
         // Get predicted trajectory
         let trajectory = predictTrajectory(for: flight)
         
+        return visiblePoints(of: trajectory,
+                             cameraPosition: cameraPosition,
+                             cameraOrientation: cameraOrientation,
+                             fieldOfView: fieldOfView)
+    }
+    
+    /// Filter an already predicted trajectory down to the points within camera view
+    func visiblePoints(of trajectory: [TrajectoryPoint],
+                       cameraPosition: SIMD3<Float>,
+                       cameraOrientation: SIMD3<Float>,
+                       fieldOfView: Float = 60.0) -> [TrajectoryPoint] {
+        
         // Filter points within camera view
         let visiblePoints = trajectory.filter { point in
             let point3D = latLonAltTo3D(
@@ -308,6 +299,216 @@ class TrajectoryPredictor {
     }
 }
 
+// MARK: - Batch Prediction
+
+extension TrajectoryPredictor {
+    
+    /// Number of trajectory samples processed per vectorized pass; keeps the
+    /// scratch buffers small enough to stay in cache.
+    private static let batchChunkCapacity = 8192
+    
+    /// Predict trajectories for every flight in one pass.
+    ///
+    /// Backend trajectories still take priority. The remaining flights are
+    /// packed into structure-of-arrays buffers and run through vDSP / vForce,
+    /// reproducing `predictTrajectory(for:)` within floating point tolerance.
+    /// Flights without a position map to an empty trajectory.
+    func predictTrajectories(for flights: [Flight],
+                             predictionTime: Double = 60.0,
+                             timeStep: Double = 2.0) -> [String: [TrajectoryPoint]] {
+        var result: [String: [TrajectoryPoint]] = [:]
+        result.reserveCapacity(flights.count)
+        
+        var localFlights: [Flight] = []
+        localFlights.reserveCapacity(flights.count)
+        
+        for flight in flights {
+            if let predictedTrajectory = flight.predictedTrajectory, !predictedTrajectory.isEmpty {
+                result[flight.id] = predictedTrajectory.points
+            } else if flight.latitude == nil || flight.longitude == nil {
+                result[flight.id] = []
+            } else {
+                localFlights.append(flight)
+            }
+        }
+        
+        // Same accumulation as the scalar loop so both paths emit identical offsets
+        var times: [Double] = []
+        var time = 0.0
+        while time <= predictionTime {
+            times.append(time)
+            time += timeStep
+        }
+        guard !times.isEmpty, !localFlights.isEmpty else {
+            for flight in localFlights {
+                result[flight.id] = []
+            }
+            return result
+        }
+        
+        let steps = times.count
+        let flightsPerChunk = max(1, TrajectoryPredictor.batchChunkCapacity / steps)
+        let workspace = TrajectoryBatchWorkspace(capacity: min(flightsPerChunk, localFlights.count) * steps)
+        
+        var start = 0
+        while start < localFlights.count {
+            let chunk = localFlights[start..<min(start + flightsPerChunk, localFlights.count)]
+            predictChunk(chunk, times: times, workspace: workspace, into: &result)
+            start += flightsPerChunk
+        }
+        
+        return result
+    }
+    
+    private func predictChunk(_ flights: ArraySlice<Flight>,
+                              times: [Double],
+                              workspace w: TrajectoryBatchWorkspace,
+                              into result: inout [String: [TrajectoryPoint]]) {
+        let steps = times.count
+        let count = flights.count * steps
+        let n = vDSP_Length(count)
+        var n32 = Int32(count)
+        
+        var degrees = 180.0 / .pi
+        var radians = Double.pi / 180
+        var halfRadians = Double.pi / 360
+        var radius = earthRadius
+        var negativeRadius = -earthRadius
+        var diameter = 2 * earthRadius
+        
+        // Pack per-flight state into per-sample lanes
+        for (k, flight) in flights.enumerated() {
+            var lat = flight.latitude!
+            var lon = flight.longitude!
+            var alt = flight.baroAltitude ?? flight.geoAltitude ?? 35000
+            
+            let initial = latLonAltTo3D(latitude: lat, longitude: lon, altitude: alt)
+            let velocity = calculateVelocityVector(
+                velocity: flight.velocity ?? 0,
+                track: flight.trueTrack ?? 0,
+                verticalRate: flight.verticalRate ?? 0
+            )
+            let factor = getAltitudeCorrectionFactor(altitude: alt)
+            var x0 = initial.x * factor, y0 = initial.y * factor, z0 = initial.z * factor
+            var vx = velocity.x * factor, vy = velocity.y * factor, vz = velocity.z * factor
+            var cosLat = cos(lat * .pi / 180)
+            var sinLat = sin(lat * .pi / 180)
+            
+            let lane = k * steps
+            let laneLength = vDSP_Length(steps)
+            vDSP_vsmsaD(times, 1, &vx, &x0, w.px + lane, 1, laneLength)
+            vDSP_vsmsaD(times, 1, &vy, &y0, w.py + lane, 1, laneLength)
+            vDSP_vsmsaD(times, 1, &vz, &z0, w.pz + lane, 1, laneLength)
+            vDSP_vfillD(&lat, w.originLatitude + lane, 1, laneLength)
+            vDSP_vfillD(&lon, w.originLongitude + lane, 1, laneLength)
+            vDSP_vfillD(&alt, w.originAltitude + lane, 1, laneLength)
+            vDSP_vfillD(&cosLat, w.originCosLatitude + lane, 1, laneLength)
+            vDSP_vfillD(&sinLat, w.originSinLatitude + lane, 1, laneLength)
+        }
+        
+        // |p|, then geodetic coordinates; points below the surface are clamped to it
+        vDSP_vmmaD(w.px, 1, w.px, 1, w.py, 1, w.py, 1, w.r, 1, n)
+        vDSP_vmaD(w.pz, 1, w.pz, 1, w.r, 1, w.r, 1, n)
+        vvsqrt(w.r, w.r, &n32)
+        
+        vDSP_vdivD(w.r, 1, w.pz, 1, w.t1, 1, n)
+        vvasin(w.t1, w.t1, &n32)
+        vDSP_vsmulD(w.t1, 1, &degrees, w.latitude, 1, n)
+        
+        vvatan2(w.t1, w.py, w.px, &n32)
+        vDSP_vsmulD(w.t1, 1, &degrees, w.longitude, 1, n)
+        
+        vDSP_vthrD(w.r, 1, &radius, w.t1, 1, n)
+        vDSP_vsaddD(w.t1, 1, &negativeRadius, w.altitude, 1, n)
+        
+        // Haversine distance from the current position: t2 = sin(lat2), t3 = cos(lat2)
+        vDSP_vsmulD(w.latitude, 1, &radians, w.t1, 1, n)
+        vvsincos(w.t2, w.t3, w.t1, &n32)
+        
+        vDSP_vsubD(w.originLatitude, 1, w.latitude, 1, w.t1, 1, n)
+        vDSP_vsmulD(w.t1, 1, &halfRadians, w.t1, 1, n)
+        vvsin(w.t1, w.t1, &n32)
+        vDSP_vsqD(w.t1, 1, w.t1, 1, n)
+        
+        vDSP_vsubD(w.originLongitude, 1, w.longitude, 1, w.t4, 1, n)
+        vDSP_vsmulD(w.t4, 1, &halfRadians, w.t5, 1, n)
+        vvsin(w.t5, w.t5, &n32)
+        vDSP_vsqD(w.t5, 1, w.t5, 1, n)
+        vDSP_vmulD(w.originCosLatitude, 1, w.t3, 1, w.t6, 1, n)
+        vDSP_vmaD(w.t6, 1, w.t5, 1, w.t1, 1, w.t1, 1, n)
+        
+        vvsqrt(w.t1, w.t1, &n32)
+        vvasin(w.t1, w.t1, &n32)
+        vDSP_vsmulD(w.t1, 1, &diameter, w.t1, 1, n)
+        vDSP_vsubD(w.originAltitude, 1, w.altitude, 1, w.t5, 1, n)
+        vDSP_vdistD(w.t1, 1, w.t5, 1, w.distance, 1, n)
+        
+        // Initial bearing: t4 holds dLon in radians
+        vDSP_vsmulD(w.t4, 1, &radians, w.t4, 1, n)
+        vvsincos(w.t5, w.t6, w.t4, &n32)
+        vDSP_vmulD(w.t5, 1, w.t3, 1, w.t5, 1, n)
+        vDSP_vmulD(w.t6, 1, w.t3, 1, w.t6, 1, n)
+        vDSP_vmulD(w.t6, 1, w.originSinLatitude, 1, w.t6, 1, n)
+        vDSP_vmulD(w.t2, 1, w.originCosLatitude, 1, w.t2, 1, n)
+        vDSP_vsubD(w.t6, 1, w.t2, 1, w.t2, 1, n)
+        vvatan2(w.t1, w.t5, w.t2, &n32)
+        vDSP_vsmulD(w.t1, 1, &degrees, w.bearing, 1, n)
+        
+        // Unpack into per-flight point arrays
+        for (k, flight) in flights.enumerated() {
+            let lane = k * steps
+            var trajectory: [TrajectoryPoint] = []
+            trajectory.reserveCapacity(steps)
+            for j in 0..<steps {
+                let i = lane + j
+                trajectory.append(TrajectoryPoint(
+                    latitude: w.latitude[i],
+                    longitude: w.longitude[i],
+                    altitude: w.altitude[i],
+                    timeOffset: times[j],
+                    distanceFromCurrent: w.distance[i],
+                    bearing: w.bearing[i]
+                ))
+            }
+            result[flight.id] = trajectory
+        }
+    }
+}
+
+/// Reusable scratch lanes for `predictTrajectories(for:)`
+private final class TrajectoryBatchWorkspace {
+    let px, py, pz, r: UnsafeMutablePointer<Double>
+    let latitude, longitude, altitude: UnsafeMutablePointer<Double>
+    let originLatitude, originLongitude, originAltitude: UnsafeMutablePointer<Double>
+    let originCosLatitude, originSinLatitude: UnsafeMutablePointer<Double>
+    let distance, bearing: UnsafeMutablePointer<Double>
+    let t1, t2, t3, t4, t5, t6: UnsafeMutablePointer<Double>
+    
+    private let buffers: [UnsafeMutablePointer<Double>]
+    
+    init(capacity: Int) {
+        let buffers = (0..<20).map { _ -> UnsafeMutablePointer<Double> in
+            let buffer = UnsafeMutablePointer<Double>.allocate(capacity: capacity)
+            buffer.initialize(repeating: 0, count: capacity)
+            return buffer
+        }
+        px = buffers[0]; py = buffers[1]; pz = buffers[2]; r = buffers[3]
+        latitude = buffers[4]; longitude = buffers[5]; altitude = buffers[6]
+        originLatitude = buffers[7]; originLongitude = buffers[8]; originAltitude = buffers[9]
+        originCosLatitude = buffers[10]; originSinLatitude = buffers[11]
+        distance = buffers[12]; bearing = buffers[13]
+        t1 = buffers[14]; t2 = buffers[15]; t3 = buffers[16]
+        t4 = buffers[17]; t5 = buffers[18]; t6 = buffers[19]
+        self.buffers = buffers
+    }
+    
+    deinit {
+        for buffer in buffers {
+            buffer.deallocate()
+        }
+    }
+}
+
 // MARK: - Data Structures
 
 struct TrajectoryPoint {
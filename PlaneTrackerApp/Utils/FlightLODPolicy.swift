@@ -0,0 +1,53 @@
+import Foundation
+import simd
+
+/// How much scene geometry an aircraft gets
+enum FlightDetailLevel {
+    /// Body, tap target, selection ring, callsign label and heading arrow
+    case full
+    /// A single camera-facing sprite with no text
+    case sprite
+}
+
+/// Chooses a detail level per aircraft from its distance to the camera.
+///
+/// The two thresholds form a hysteresis band: an aircraft only gains full
+/// detail once it is closer than `fullDetailDistance` and only loses it once
+/// it is farther than `spriteDistance`, so one hovering near a single
+/// threshold does not flicker between levels. Distances are in AR units
+/// (1 unit = 1 km). The selected aircraft always keeps full detail.
+struct FlightLODPolicy {
+    var fullDetailDistance: Float = 40
+    var spriteDistance: Float = 50
+    /// Fixed node scale for sprites so far aircraft stay visible at any zoom
+    var spriteScale: Float = 2
+
+    func level(forDistance distance: Float, current: FlightDetailLevel?, isSelected: Bool = false) -> FlightDetailLevel {
+        if isSelected {
+            return .full
+        }
+        switch current {
+        case .full?:
+            return distance > spriteDistance ? .sprite : .full
+        case .sprite?:
+            return distance < fullDetailDistance ? .full : .sprite
+        case nil:
+            // No history: split the band down the middle
+            return distance > (fullDetailDistance + spriteDistance) / 2 ? .sprite : .full
+        }
+    }
+
+    func level(for position: SIMD3<Float>, camera: SIMD3<Float>, current: FlightDetailLevel?, isSelected: Bool = false) -> FlightDetailLevel {
+        return level(forDistance: simd_distance(position, camera), current: current, isSelected: isSelected)
+    }
+
+    /// Node scale for a level at the given pinch zoom
+    func scale(for level: FlightDetailLevel, zoom: Float) -> Float {
+        switch level {
+        case .full:
+            return zoom
+        case .sprite:
+            return spriteScale
+        }
+    }
+}
@@ -0,0 +1,267 @@
+import Foundation
+import CoreLocation
+
+/// Uniform latitude/longitude grid over one flight snapshot.
+///
+/// Built once per refresh; radius, bounding box and view cone queries only
+/// visit the grid cells that can contain a match instead of walking every
+/// flight. Flights without a position are not indexed.
+struct FlightSpatialIndex {
+
+    /// Observer view volume used by `flights(in:)`
+    struct ViewCone {
+        let origin: CLLocationCoordinate2D
+        /// Observer altitude in meters
+        let altitude: Double
+        /// Degrees clockwise from true north
+        let heading: Double
+        /// Degrees above the horizon
+        let pitch: Double
+        let horizontalFieldOfView: Double
+        let verticalFieldOfView: Double
+        let maxDistanceKilometers: Double
+
+        init(origin: CLLocationCoordinate2D,
+             altitude: Double = 0,
+             heading: Double,
+             pitch: Double = 0,
+             horizontalFieldOfView: Double = 60.0,
+             verticalFieldOfView: Double = 180.0,
+             maxDistanceKilometers: Double) {
+            self.origin = origin
+            self.altitude = altitude
+            self.heading = heading
+            self.pitch = pitch
+            self.horizontalFieldOfView = horizontalFieldOfView
+            self.verticalFieldOfView = verticalFieldOfView
+            self.maxDistanceKilometers = maxDistanceKilometers
+        }
+    }
+
+    private struct CellKey: Hashable {
+        let row: Int32
+        let column: Int32
+    }
+
+    private static let earthRadiusKilometers = 6371.0
+    private static let kilometersPerDegree = earthRadiusKilometers * .pi / 180
+
+    let cellSizeDegrees: Double
+
+    private let indexedFlights: [Flight]
+    private let latitudes: [Double]
+    private let longitudes: [Double]
+    private let altitudes: [Double]
+    private let cells: [CellKey: [Int32]]
+    private let rowCount: Int
+    private let columnCount: Int
+
+    init(flights snapshot: [Flight], cellSizeDegrees: Double = 0.25) {
+        let rowCount = Int((180.0 / cellSizeDegrees).rounded(.up))
+        let columnCount = Int((360.0 / cellSizeDegrees).rounded(.up))
+
+        var flights: [Flight] = []
+        var latitudes: [Double] = []
+        var longitudes: [Double] = []
+        var altitudes: [Double] = []
+        flights.reserveCapacity(snapshot.count)
+        latitudes.reserveCapacity(snapshot.count)
+        longitudes.reserveCapacity(snapshot.count)
+        altitudes.reserveCapacity(snapshot.count)
+
+        var cells: [CellKey: [Int32]] = [:]
+
+        for flight in snapshot {
+            guard let lat = flight.latitude, let lon = flight.longitude else { continue }
+
+            let index = Int32(flights.count)
+            flights.append(flight)
+            latitudes.append(lat)
+            longitudes.append(lon)
+            altitudes.append(flight.baroAltitude ?? flight.geoAltitude ?? 0)
+
+            let key = CellKey(row: Int32(FlightSpatialIndex.row(for: lat, cellSize: cellSizeDegrees, rowCount: rowCount)),
+                              column: Int32(FlightSpatialIndex.column(for: lon, cellSize: cellSizeDegrees, columnCount: columnCount)))
+            cells[key, default: []].append(index)
+        }
+
+        self.cellSizeDegrees = cellSizeDegrees
+        self.rowCount = rowCount
+        self.columnCount = columnCount
+        self.indexedFlights = flights
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.altitudes = altitudes
+        self.cells = cells
+    }
+
+    /// Number of indexed (positioned) flights
+    var count: Int {
+        return indexedFlights.count
+    }
+
+    // MARK: - Queries
+
+    /// Flights within `radius` km (great-circle) of `center`, nearest first
+    func flights(withinKilometers radius: Double, of center: CLLocationCoordinate2D) -> [Flight] {
+        return candidates(withinKilometers: radius, of: center)
+            .sorted { $0.distance < $1.distance }
+            .map { indexedFlights[$0.index] }
+    }
+
+    /// Up to `limit` flights closest to `center`, optionally capped at `radius` km
+    func nearest(to center: CLLocationCoordinate2D, limit: Int, withinKilometers radius: Double = 500.0) -> [Flight] {
+        return Array(flights(withinKilometers: radius, of: center).prefix(limit))
+    }
+
+    /// Flights inside a latitude/longitude box. A `westLongitude` east of
+    /// `eastLongitude` is treated as a box crossing the antimeridian.
+    func flights(inLatitudes latitudeRange: ClosedRange<Double>, westLongitude lowerLongitude: Double, eastLongitude upperLongitude: Double) -> [Flight] {
+        let rows = rowRange(latitudeRange)
+        let crossesAntimeridian = lowerLongitude > upperLongitude
+        let columnSpans: [(Double, Double)] = crossesAntimeridian
+            ? [(lowerLongitude, 180.0), (-180.0, upperLongitude)]
+            : [(lowerLongitude, upperLongitude)]
+
+        var result: [Flight] = []
+        for span in columnSpans {
+            let firstColumn = FlightSpatialIndex.column(for: span.0, cellSize: cellSizeDegrees, columnCount: columnCount)
+            let lastColumn = FlightSpatialIndex.column(for: span.1, cellSize: cellSizeDegrees, columnCount: columnCount)
+            guard firstColumn <= lastColumn else { continue }
+
+            for row in rows {
+                for column in firstColumn...lastColumn {
+                    guard let bucket = cells[CellKey(row: Int32(row), column: Int32(column))] else { continue }
+                    for index in bucket {
+                        let i = Int(index)
+                        let lon = longitudes[i]
+                        let inLongitude = crossesAntimeridian
+                            ? (lon >= lowerLongitude || lon <= upperLongitude)
+                            : (lon >= lowerLongitude && lon <= upperLongitude)
+                        if inLongitude && latitudeRange.contains(latitudes[i]) {
+                            result.append(indexedFlights[i])
+                        }
+                    }
+                }
+            }
+        }
+        return result
+    }
+
+    /// Flights visible inside `cone`, nearest first
+    func flights(in cone: ViewCone) -> [Flight] {
+        let halfHorizontal = cone.horizontalFieldOfView / 2
+        let halfVertical = cone.verticalFieldOfView / 2
+
+        return candidates(withinKilometers: cone.maxDistanceKilometers, of: cone.origin)
+            .filter { candidate in
+                let i = candidate.index
+                let bearing = FlightSpatialIndex.bearing(fromLatitude: cone.origin.latitude, longitude: cone.origin.longitude,
+                                                         toLatitude: latitudes[i], longitude: longitudes[i])
+                guard abs(FlightSpatialIndex.angleDifference(bearing, cone.heading)) <= halfHorizontal else {
+                    return false
+                }
+                guard halfVertical < 90 else { return true }
+
+                let elevation = atan2(altitudes[i] - cone.altitude, candidate.distance * 1000) * 180 / .pi
+                return abs(elevation - cone.pitch) <= halfVertical
+            }
+            .sorted { $0.distance < $1.distance }
+            .map { indexedFlights[$0.index] }
+    }
+
+    // MARK: - Cell Walking
+
+    private func candidates(withinKilometers radius: Double, of center: CLLocationCoordinate2D) -> [(index: Int, distance: Double)] {
+        guard radius >= 0, !indexedFlights.isEmpty else { return [] }
+
+        let latitudeSpan = radius / FlightSpatialIndex.kilometersPerDegree
+        let rows = rowRange((center.latitude - latitudeSpan)...(center.latitude + latitudeSpan))
+
+        // Widest longitude span is at the poleward edge of the search band
+        let polewardLatitude = min(abs(center.latitude) + latitudeSpan, 90.0)
+        var columns: [Int] = []
+        if polewardLatitude >= 89.0 {
+            columns = Array(0..<columnCount)
+        } else {
+            let longitudeSpan = latitudeSpan / cos(polewardLatitude * .pi / 180)
+            if longitudeSpan >= 180.0 {
+                columns = Array(0..<columnCount)
+            } else {
+                let first = Int(floor((center.longitude - longitudeSpan + 180.0) / cellSizeDegrees))
+                let last = Int(floor((center.longitude + longitudeSpan + 180.0) / cellSizeDegrees))
+                if last - first + 1 >= columnCount {
+                    columns = Array(0..<columnCount)
+                } else {
+                    columns = (first...last).map { (($0 % columnCount) + columnCount) % columnCount }
+                }
+            }
+        }
+
+        var result: [(index: Int, distance: Double)] = []
+        for row in rows {
+            for column in columns {
+                guard let bucket = cells[CellKey(row: Int32(row), column: Int32(column))] else { continue }
+                for index in bucket {
+                    let i = Int(index)
+                    let distance = FlightSpatialIndex.haversineKilometers(
+                        fromLatitude: center.latitude, longitude: center.longitude,
+                        toLatitude: latitudes[i], longitude: longitudes[i]
+                    )
+                    if distance <= radius {
+                        result.append((index: i, distance: distance))
+                    }
+                }
+            }
+        }
+        return result
+    }
+
+    private func rowRange(_ latitudes: ClosedRange<Double>) -> ClosedRange<Int> {
+        let first = FlightSpatialIndex.row(for: latitudes.lowerBound, cellSize: cellSizeDegrees, rowCount: rowCount)
+        let last = FlightSpatialIndex.row(for: latitudes.upperBound, cellSize: cellSizeDegrees, rowCount: rowCount)
+        return first...last
+    }
+
+    private static func row(for latitude: Double, cellSize: Double, rowCount: Int) -> Int {
+        let row = Int(floor((latitude + 90.0) / cellSize))
+        return min(max(row, 0), rowCount - 1)
+    }
+
+    private static func column(for longitude: Double, cellSize: Double, columnCount: Int) -> Int {
+        let column = Int(floor((longitude + 180.0) / cellSize))
+        return min(max(column, 0), columnCount - 1)
+    }
+
+    // MARK: - Geodesy
+
+    private static func haversineKilometers(fromLatitude lat1: Double, longitude lon1: Double,
+                                            toLatitude lat2: Double, longitude lon2: Double) -> Double {
+        let lat1Rad = lat1 * .pi / 180
+        let lat2Rad = lat2 * .pi / 180
+        let dLat = (lat2 - lat1) * .pi / 180
+        let dLon = (lon2 - lon1) * .pi / 180
+
+        let a = sin(dLat / 2) * sin(dLat / 2) + cos(lat1Rad) * cos(lat2Rad) * sin(dLon / 2) * sin(dLon / 2)
+        return earthRadiusKilometers * 2 * asin(min(1.0, sqrt(a)))
+    }
+
+    private static func bearing(fromLatitude lat1: Double, longitude lon1: Double,
+                                toLatitude lat2: Double, longitude lon2: Double) -> Double {
+        let lat1Rad = lat1 * .pi / 180
+        let lat2Rad = lat2 * .pi / 180
+        let dLon = (lon2 - lon1) * .pi / 180
+
+        let y = sin(dLon) * cos(lat2Rad)
+        let x = cos(lat1Rad) * sin(lat2Rad) - sin(lat1Rad) * cos(lat2Rad) * cos(dLon)
+        return atan2(y, x) * 180 / .pi
+    }
+
+    /// Signed smallest difference between two bearings, in (-180, 180]
+    private static func angleDifference(_ a: Double, _ b: Double) -> Double {
+        var difference = (a - b).truncatingRemainder(dividingBy: 360)
+        if difference > 180 { difference -= 360 }
+        if difference <= -180 { difference += 360 }
+        return difference
+    }
+}
@@ -0,0 +1,128 @@
+import Foundation
+import CoreLocation
+import simd
+
+/// Projects WGS84 latitude / longitude / altitude into a local
+/// East-North-Up frame centred on an observer, and from there into AR space.
+///
+/// The observer's ECEF position and the ECEF-to-ENU rotation are computed
+/// once per location fix. Each point then costs one sine/cosine pair per
+/// angle, a reciprocal square root and a fixed 3x3 multiply-add, which is
+/// exact on the ellipsoid anywhere on the globe, including at the poles and
+/// across the antimeridian. Nothing is allocated per point.
+struct LocalTangentProjector {
+
+    // WGS84 ellipsoid
+    static let semiMajorAxis = 6_378_137.0
+    static let flattening = 1.0 / 298.257_223_563
+    static let eccentricitySquared = flattening * (2.0 - flattening)
+
+    let origin: CLLocationCoordinate2D
+    /// Observer altitude in meters above the ellipsoid
+    let originAltitude: Double
+    /// Real-world meters per AR unit; the scene uses 1 km = 1 AR unit
+    let metersPerUnit: Double
+
+    private let originECEF: SIMD3<Double>
+    /// Rows of the ECEF-to-ENU rotation
+    private let east: SIMD3<Double>
+    private let north: SIMD3<Double>
+    private let up: SIMD3<Double>
+
+    init(origin: CLLocationCoordinate2D, altitude: Double = 0, metersPerUnit: Double = 1000.0) {
+        self.origin = origin
+        self.originAltitude = altitude
+        self.metersPerUnit = metersPerUnit
+
+        let latitude = origin.latitude * .pi / 180
+        let longitude = origin.longitude * .pi / 180
+        let sinLat = sin(latitude), cosLat = cos(latitude)
+        let sinLon = sin(longitude), cosLon = cos(longitude)
+
+        originECEF = LocalTangentProjector.ecef(sinLat: sinLat, cosLat: cosLat, sinLon: sinLon, cosLon: cosLon, altitude: altitude)
+        east = SIMD3(-sinLon, cosLon, 0)
+        north = SIMD3(-sinLat * cosLon, -sinLat * sinLon, cosLat)
+        up = SIMD3(cosLat * cosLon, cosLat * sinLon, sinLat)
+    }
+
+    init(location: CLLocation, metersPerUnit: Double = 1000.0) {
+        self.init(origin: location.coordinate, altitude: location.altitude, metersPerUnit: metersPerUnit)
+    }
+
+    // MARK: - Single Points
+
+    /// Earth-centred, earth-fixed position in meters
+    static func ecef(latitude: Double, longitude: Double, altitude: Double) -> SIMD3<Double> {
+        let phi = latitude * .pi / 180
+        let lambda = longitude * .pi / 180
+        return ecef(sinLat: sin(phi), cosLat: cos(phi), sinLon: sin(lambda), cosLon: cos(lambda), altitude: altitude)
+    }
+
+    @inline(__always)
+    private static func ecef(sinLat: Double, cosLat: Double, sinLon: Double, cosLon: Double, altitude: Double) -> SIMD3<Double> {
+        // Prime vertical radius of curvature
+        let n = semiMajorAxis / (1.0 - eccentricitySquared * sinLat * sinLat).squareRoot()
+        let horizontal = (n + altitude) * cosLat
+        return SIMD3(horizontal * cosLon, horizontal * sinLon, (n * (1.0 - eccentricitySquared) + altitude) * sinLat)
+    }
+
+    /// Meters east, north and up of the observer
+    func enu(latitude: Double, longitude: Double, altitude: Double) -> SIMD3<Double> {
+        let offset = LocalTangentProjector.ecef(latitude: latitude, longitude: longitude, altitude: altitude) - originECEF
+        return SIMD3(simd_dot(east, offset), simd_dot(north, offset), simd_dot(up, offset))
+    }
+
+    /// AR world position: +x east, +y up, -z north, scaled by `metersPerUnit`
+    func arPosition(latitude: Double, longitude: Double, altitude: Double) -> SIMD3<Float> {
+        let local = enu(latitude: latitude, longitude: longitude, altitude: altitude) / metersPerUnit
+        return SIMD3<Float>(Float(local.x), Float(local.z), Float(-local.y))
+    }
+
+    // MARK: - Batches
+
+    /// Project `count` points from parallel columns into `output`, which must
+    /// hold at least as many elements as the shortest input column
+    func project(latitudes: UnsafeBufferPointer<Double>,
+                 longitudes: UnsafeBufferPointer<Double>,
+                 altitudes: UnsafeBufferPointer<Double>,
+                 into output: UnsafeMutableBufferPointer<SIMD3<Float>>) {
+        let count = min(latitudes.count, longitudes.count, altitudes.count)
+        precondition(output.count >= count, "Output buffer too small for projected points")
+
+        let scale = 1.0 / metersPerUnit
+        let eastScaled = east * scale
+        let northScaled = north * scale
+        let upScaled = up * scale
+        let originECEF = self.originECEF
+
+        for i in 0..<count {
+            let phi = latitudes[i] * .pi / 180
+            let lambda = longitudes[i] * .pi / 180
+            let offset = LocalTangentProjector.ecef(
+                sinLat: sin(phi), cosLat: cos(phi),
+                sinLon: sin(lambda), cosLon: cos(lambda),
+                altitude: altitudes[i]
+            ) - originECEF
+            output[i] = SIMD3<Float>(
+                Float(simd_dot(eastScaled, offset)),
+                Float(simd_dot(upScaled, offset)),
+                Float(-simd_dot(northScaled, offset))
+            )
+        }
+    }
+
+    /// Array convenience over `project(latitudes:longitudes:altitudes:into:)`
+    func project(latitudes: [Double], longitudes: [Double], altitudes: [Double]) -> [SIMD3<Float>] {
+        let count = min(latitudes.count, longitudes.count, altitudes.count)
+        return [SIMD3<Float>](unsafeUninitializedCapacity: count) { output, initializedCount in
+            latitudes.withUnsafeBufferPointer { latitudes in
+                longitudes.withUnsafeBufferPointer { longitudes in
+                    altitudes.withUnsafeBufferPointer { altitudes in
+                        project(latitudes: latitudes, longitudes: longitudes, altitudes: altitudes, into: output)
+                    }
+                }
+            }
+            initializedCount = count
+        }
+    }
+}
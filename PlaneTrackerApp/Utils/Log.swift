@@ -0,0 +1,162 @@
+import Foundation
+
+/// Severity of a log message, lowest first
+enum LogLevel: Int, Comparable {
+    case debug
+    case info
+    case warning
+    case error
+
+    static func < (lhs: LogLevel, rhs: LogLevel) -> Bool {
+        return lhs.rawValue < rhs.rawValue
+    }
+}
+
+/// Subsystem a message belongs to. Hot-path categories carry a minimum
+/// interval; messages arriving faster than that are dropped before their
+/// text is ever built, and the next one that gets through reports the count.
+struct LogCategory: Hashable {
+    let name: String
+    let minimumInterval: TimeInterval?
+
+    init(_ name: String, minimumInterval: TimeInterval? = nil) {
+        self.name = name
+        self.minimumInterval = minimumInterval
+    }
+
+    static let general = LogCategory("General")
+    static let network = LogCategory("Network")
+    static let stream = LogCategory("Stream")
+    static let location = LogCategory("Location")
+    /// Every Core Location fix, delivered up to once a second
+    static let locationFixes = LogCategory("LocationFixes", minimumInterval: 1.0)
+    static let scene = LogCategory("Scene")
+    /// Per-flight / per-state-vector messages emitted on every refresh
+    static let flights = LogCategory("Flights", minimumInterval: 1.0)
+    /// Per-point coordinate conversion, the hottest path in the app
+    static let coordinates = LogCategory("Coordinates", minimumInterval: 1.0)
+}
+
+struct LogEntry {
+    let time: Date
+    let level: LogLevel
+    let category: String
+    let message: String
+}
+
+/// Keeps the most recent entries in memory so they can be inspected or
+/// attached to a bug report without relying on the device console
+final class LogMemorySink {
+
+    private let lock = NSLock()
+    private var buffer: RingBuffer<LogEntry>
+
+    init(capacity: Int = 512) {
+        buffer = RingBuffer(capacity: capacity)
+    }
+
+    func append(_ entry: LogEntry) {
+        lock.lock()
+        buffer.append(entry)
+        lock.unlock()
+    }
+
+    /// Oldest first
+    var entries: [LogEntry] {
+        lock.lock()
+        defer { lock.unlock() }
+        return Array(buffer)
+    }
+
+    func removeAll() {
+        lock.lock()
+        buffer.removeAll()
+        lock.unlock()
+    }
+}
+
+/// Leveled logger with per-category rate limiting.
+///
+/// Messages are `@autoclosure`s, so a message below `minimumLevel` or inside
+/// a rate-limited window costs a comparison and never formats its string.
+final class AppLogger {
+
+    var minimumLevel: LogLevel
+    var writesToConsole: Bool
+    let memorySink: LogMemorySink
+
+    private let now: () -> Date
+    private let lock = NSLock()
+    private var lastEmitted: [String: Date] = [:]
+    private var suppressedCounts: [String: Int] = [:]
+
+    init(minimumLevel: LogLevel = .debug,
+         writesToConsole: Bool = true,
+         memorySink: LogMemorySink = LogMemorySink(),
+         now: @escaping () -> Date = Date.init) {
+        self.minimumLevel = minimumLevel
+        self.writesToConsole = writesToConsole
+        self.memorySink = memorySink
+        self.now = now
+    }
+
+    func log(_ level: LogLevel, _ category: LogCategory, _ message: () -> String) {
+        guard level >= minimumLevel else { return }
+
+        let time = now()
+        var suppressed = 0
+        if let interval = category.minimumInterval {
+            lock.lock()
+            if let last = lastEmitted[category.name], time.timeIntervalSince(last) < interval {
+                suppressedCounts[category.name, default: 0] += 1
+                lock.unlock()
+                return
+            }
+            lastEmitted[category.name] = time
+            suppressed = suppressedCounts.removeValue(forKey: category.name) ?? 0
+            lock.unlock()
+        }
+
+        var text = message()
+        if suppressed > 0 {
+            text += " (+\(suppressed) suppressed)"
+        }
+
+        memorySink.append(LogEntry(time: time, level: level, category: category.name, message: text))
+        if writesToConsole {
+            NSLog("%@", text)
+        }
+    }
+}
+
+/// App-wide logging entry points.
+///
+/// `debug` compiles to nothing outside DEBUG builds; release builds also
+/// default to `.info` so anything that slips through is still filtered.
+enum Log {
+
+    #if DEBUG
+    static let shared = AppLogger(minimumLevel: .debug)
+    #else
+    static let shared = AppLogger(minimumLevel: .info)
+    #endif
+
+    @inline(__always)
+    static func debug(_ message: @autoclosure () -> String, category: LogCategory = .general) {
+        #if DEBUG
+        shared.log(.debug, category, message)
+        #endif
+    }
+
+    static func info(_ message: @autoclosure () -> String, category: LogCategory = .general) {
+        shared.log(.info, category, message)
+    }
+
+    static func warning(_ message: @autoclosure () -> String, category: LogCategory = .general) {
+        shared.log(.warning, category, message)
+    }
+
+    static func error(_ message: @autoclosure () -> String, category: LogCategory = .general) {
+        shared.log(.error, category, message)
+    }
+}
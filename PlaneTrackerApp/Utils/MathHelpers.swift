@@ -1,6 +1,7 @@
 import Foundation
 import CoreLocation
 import simd
+import Accelerate
 
 class MathHelpers {
     
@@ -8,24 +9,35 @@ class MathHelpers {
     
     /// Convert geographic coordinates to ARKit world coordinates
     static func geographicToARKit(latitude: Double, longitude: Double, altitude: Double, referenceLocation: CLLocation) -> simd_float3 {
-        // Convert to meters from reference point
-        let location = CLLocation(latitude: latitude, longitude: longitude)
-        let distance = location.distance(from: referenceLocation)
-        let bearing = referenceLocation.bearing(to: location)
+        let projector = LocalTangentProjector(location: referenceLocation, metersPerUnit: 1.0)
+        return geographicToARKit(latitude: latitude, longitude: longitude, altitude: altitude, projector: projector)
+    }
+    
+    /// Same conversion against a projector built once per reference fix
+    static func geographicToARKit(latitude: Double, longitude: Double, altitude: Double, projector: LocalTangentProjector) -> simd_float3 {
+        // Meters east and north of the reference on the WGS84 ellipsoid
+        let local = projector.enu(latitude: latitude, longitude: longitude, altitude: altitude)
         
         // Convert to ARKit coordinates (X = East, Y = Up, Z = North)
-        let x = Float(distance * sin(bearing * .pi / 180))
+        let x = Float(local.x)
         let y = Float(altitude)
-        let z = Float(distance * cos(bearing * .pi / 180))
+        let z = Float(local.y)
         
         return simd_float3(x, y, z)
     }
     
     /// Calculate bearing between two locations
     static func bearing(from: CLLocation, to: CLLocation) -> Double {
-        let lat1 = from.coordinate.latitude * .pi / 180
-        let lat2 = to.coordinate.latitude * .pi / 180
-        let deltaLon = (to.coordinate.longitude - from.coordinate.longitude) * .pi / 180
+        return bearing(fromLatitude: from.coordinate.latitude, longitude: from.coordinate.longitude,
+                       toLatitude: to.coordinate.latitude, longitude: to.coordinate.longitude)
+    }
+    
+    /// Initial great-circle bearing in degrees clockwise from north, in [0, 360)
+    static func bearing(fromLatitude lat1Degrees: Double, longitude lon1Degrees: Double,
+                        toLatitude lat2Degrees: Double, longitude lon2Degrees: Double) -> Double {
+        let lat1 = lat1Degrees * .pi / 180
+        let lat2 = lat2Degrees * .pi / 180
+        let deltaLon = (lon2Degrees - lon1Degrees) * .pi / 180
         
         let y = sin(deltaLon) * cos(lat2)
         let x = cos(lat1) * sin(lat2) - sin(lat1) * cos(lat2) * cos(deltaLon)
@@ -34,6 +46,54 @@ class MathHelpers {
         return (bearing + 360).truncatingRemainder(dividingBy: 360)
     }
     
+    /// Batched `bearing(fromLatitude:longitude:toLatitude:longitude:)` from one
+    /// origin to many points, evaluated with vDSP / vForce
+    static func bearings(from origin: CLLocationCoordinate2D, latitudes: [Double], longitudes: [Double]) -> [Double] {
+        precondition(latitudes.count == longitudes.count, "latitudes and longitudes must pair up")
+        let count = latitudes.count
+        guard count > 0 else { return [] }
+        
+        let n = vDSP_Length(count)
+        var vectorCount = Int32(count)
+        var degreesToRadians = Double.pi / 180
+        var radiansToDegrees = 180 / Double.pi
+        var originLongitudeOffset = -origin.longitude * .pi / 180
+        
+        let lat1 = origin.latitude * .pi / 180
+        var cosLat1 = cos(lat1)
+        var negatedSinLat1 = -sin(lat1)
+        
+        // Target latitudes and longitude deltas in radians
+        var lat2 = [Double](repeating: 0, count: count)
+        var deltaLon = [Double](repeating: 0, count: count)
+        vDSP_vsmulD(latitudes, 1, &degreesToRadians, &lat2, 1, n)
+        vDSP_vsmsaD(longitudes, 1, &degreesToRadians, &originLongitudeOffset, &deltaLon, 1, n)
+        
+        var sinLat2 = [Double](repeating: 0, count: count)
+        var cosLat2 = [Double](repeating: 0, count: count)
+        var sinDeltaLon = [Double](repeating: 0, count: count)
+        var cosDeltaLon = [Double](repeating: 0, count: count)
+        vvsincos(&sinLat2, &cosLat2, lat2, &vectorCount)
+        vvsincos(&sinDeltaLon, &cosDeltaLon, deltaLon, &vectorCount)
+        
+        // y = sin(dLon) cos(lat2); x = cos(lat1) sin(lat2) - sin(lat1) cos(lat2) cos(dLon)
+        var y = [Double](repeating: 0, count: count)
+        var cosLat2CosDeltaLon = [Double](repeating: 0, count: count)
+        var x = [Double](repeating: 0, count: count)
+        vDSP_vmulD(sinDeltaLon, 1, cosLat2, 1, &y, 1, n)
+        vDSP_vmulD(cosLat2, 1, cosDeltaLon, 1, &cosLat2CosDeltaLon, 1, n)
+        vDSP_vsmsmaD(sinLat2, 1, &cosLat1, cosLat2CosDeltaLon, 1, &negatedSinLat1, &x, 1, n)
+        
+        var radians = [Double](repeating: 0, count: count)
+        var bearings = [Double](repeating: 0, count: count)
+        vvatan2(&radians, y, x, &vectorCount)
+        vDSP_vsmulD(radians, 1, &radiansToDegrees, &bearings, 1, n)
+        for index in 0..<count where bearings[index] < 0 {
+            bearings[index] += 360
+        }
+        return bearings
+    }
+    
     // MARK: - Distance Calculations
     
     /// Calculate distance between two 3D points
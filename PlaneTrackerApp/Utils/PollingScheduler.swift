@@ -0,0 +1,243 @@
+import Foundation
+import Combine
+import CoreLocation
+
+/// Time source and timer for `PollingScheduler`, injectable for tests
+struct PollingClock {
+    let now: () -> Date
+    /// Run the action on the main queue after the delay (seconds); cancelling
+    /// the returned token stops it
+    let schedule: (TimeInterval, @escaping () -> Void) -> AnyCancellable
+
+    static let system = PollingClock(now: Date.init, schedule: { delay, action in
+        let work = DispatchWorkItem(block: action)
+        DispatchQueue.main.asyncAfter(deadline: .now() + delay, execute: work)
+        return AnyCancellable { work.cancel() }
+    })
+}
+
+/// Decides when the next flight poll happens.
+///
+/// The interval is chosen so the fastest-moving aircraft within
+/// `motionRange` sweeps at most `maximumAngularStep` across the observer's
+/// view between polls. It is clamped to the minimum and maximum intervals,
+/// and stretched when the API reports few requests left. Failures back off
+/// exponentially with jitter, and a server's Retry-After is a floor on the
+/// next poll. Each poll is anchored to the previous one, so new motion or
+/// rate-limit information reschedules the pending poll without drifting.
+/// Main thread only.
+final class PollingScheduler {
+
+    struct Configuration {
+        /// Never poll faster than this; polls inside the fetch cache's
+        /// freshness window would only be served from the cache, see
+        /// `aligned(with:)`
+        var minimumInterval: TimeInterval = 8
+        /// Interval before any motion information has arrived
+        var defaultInterval: TimeInterval = 10
+        /// Interval when nothing is moving within `motionRange`
+        var maximumInterval: TimeInterval = 30
+        /// Largest angle (degrees) the fastest nearby aircraft may move between polls
+        var maximumAngularStep: Double = 10
+        /// Aircraft farther than this (meters) do not speed polling up
+        var motionRange: CLLocationDistance = 100_000
+        /// At or below this many remaining API requests, polls slow down
+        var lowRemainingRequests = 50
+        var lowRemainingMultiplier: Double = 3
+        /// Cap on the exponential failure backoff
+        var maximumBackoff: TimeInterval = 300
+        /// Backoff is scaled by a random factor within ±jitter
+        var jitter: Double = 0.25
+
+        static let `default` = Configuration()
+
+        /// This configuration with its floor just past the cache's freshness
+        /// window, so every poll at the floor finds the last snapshot stale
+        /// and reaches the network instead of being served from the cache.
+        /// The margin absorbs the gap between a poll firing and its request
+        /// being timestamped, and timer slack.
+        func aligned(with cachePolicy: FlightCachePolicy, margin: TimeInterval = 0.5) -> Configuration {
+            var configuration = self
+            configuration.minimumInterval = max(minimumInterval, cachePolicy.freshness + margin)
+            return configuration
+        }
+    }
+
+    /// What a poll's network request reported
+    enum Outcome: Equatable {
+        case success(remainingRequests: Int?)
+        case failure(retryAfter: TimeInterval?)
+    }
+
+    var configuration: Configuration
+
+    private let clock: PollingClock
+    private let random: () -> Double
+    private let poll: () -> Void
+
+    private(set) var isRunning = false
+    private(set) var lastPollDate: Date?
+    private(set) var nextPollDate: Date?
+    private(set) var consecutiveFailures = 0
+
+    private var retryNotBefore: Date?
+    private var remainingRequests: Int?
+    private var jitterFactor: Double = 1
+    private var motionInterval: TimeInterval?
+    private var pendingPoll: AnyCancellable?
+
+    /// `random` returns values in 0..<1 and drives the backoff jitter
+    init(configuration: Configuration = .default,
+         clock: PollingClock = .system,
+         random: @escaping () -> Double = { Double.random(in: 0..<1) },
+         poll: @escaping () -> Void) {
+        self.configuration = configuration
+        self.clock = clock
+        self.random = random
+        self.poll = poll
+    }
+
+    // MARK: - Running
+
+    /// Poll now, then keep polling until `stop()`
+    func start() {
+        guard !isRunning else { return }
+        isRunning = true
+        Log.info("⏰ PollingScheduler: Started", category: .network)
+        fire()
+    }
+
+    func stop() {
+        guard isRunning else { return }
+        isRunning = false
+        pendingPoll?.cancel()
+        pendingPoll = nil
+        nextPollDate = nil
+        Log.info("⏸️ PollingScheduler: Stopped", category: .network)
+    }
+
+    private func fire() {
+        guard isRunning else { return }
+        lastPollDate = clock.now()
+        poll()
+        reschedule()
+    }
+
+    private func reschedule() {
+        guard isRunning else { return }
+        let now = clock.now()
+        var due = (lastPollDate ?? now).addingTimeInterval(currentInterval)
+        if let notBefore = retryNotBefore, notBefore > due {
+            due = notBefore
+        }
+        nextPollDate = due
+
+        pendingPoll?.cancel()
+        pendingPoll = clock.schedule(max(0, due.timeIntervalSince(now))) { [weak self] in
+            self?.fire()
+        }
+        Log.debug("⏰ PollingScheduler: Next poll in \(String(format: "%.1f", max(0, due.timeIntervalSince(now))))s", category: .network)
+    }
+
+    // MARK: - Inputs
+
+    func record(_ outcome: Outcome) {
+        switch outcome {
+        case .success(let remaining):
+            consecutiveFailures = 0
+            retryNotBefore = nil
+            remainingRequests = remaining
+        case .failure(let retryAfter):
+            consecutiveFailures += 1
+            jitterFactor = 1 + configuration.jitter * (2 * random() - 1)
+            retryNotBefore = retryAfter.map { clock.now().addingTimeInterval($0) }
+            if let retryAfter = retryAfter {
+                Log.warning("⏳ PollingScheduler: Server asked to retry after \(Int(retryAfter))s", category: .network)
+            }
+        }
+        reschedule()
+    }
+
+    /// Fastest angular speed (degrees per second) of any aircraft in range,
+    /// or nil when none is
+    func updateMotion(maximumAngularSpeed: Double?) {
+        if let speed = maximumAngularSpeed, speed > 0 {
+            motionInterval = configuration.maximumAngularStep / speed
+        } else {
+            motionInterval = configuration.maximumInterval
+        }
+        reschedule()
+    }
+
+    /// Delay from the last poll to the next, before any Retry-After floor
+    var currentInterval: TimeInterval {
+        if consecutiveFailures > 0 {
+            let backoff = configuration.defaultInterval * pow(2, Double(consecutiveFailures - 1))
+            return max(configuration.minimumInterval, min(backoff, configuration.maximumBackoff) * jitterFactor)
+        }
+
+        let interval = min(max(motionInterval ?? configuration.defaultInterval, configuration.minimumInterval),
+                           configuration.maximumInterval)
+        if let remaining = remainingRequests, remaining <= configuration.lowRemainingRequests {
+            return interval * configuration.lowRemainingMultiplier
+        }
+        return interval
+    }
+
+    // MARK: - Response Headers
+
+    private static let httpDateFormatter: DateFormatter = {
+        let formatter = DateFormatter()
+        formatter.locale = Locale(identifier: "en_US_POSIX")
+        formatter.timeZone = TimeZone(identifier: "GMT")
+        formatter.dateFormat = "EEE, dd MMM yyyy HH:mm:ss zzz"
+        return formatter
+    }()
+
+    /// Seconds to wait before the next request, from OpenSky's
+    /// `X-Rate-Limit-Retry-After-Seconds` or a standard `Retry-After`
+    /// (delta seconds or HTTP date)
+    static func retryAfter(from response: HTTPURLResponse, now: Date = Date()) -> TimeInterval? {
+        for field in ["X-Rate-Limit-Retry-After-Seconds", "Retry-After"] {
+            guard let value = response.value(forHTTPHeaderField: field)?.trimmingCharacters(in: .whitespaces) else { continue }
+            if let seconds = TimeInterval(value) {
+                return max(0, seconds)
+            }
+            if let date = httpDateFormatter.date(from: value) {
+                return max(0, date.timeIntervalSince(now))
+            }
+        }
+        return nil
+    }
+
+    /// Requests left in the current quota, from `X-Rate-Limit-Remaining`
+    static func remainingRequests(from response: HTTPURLResponse) -> Int? {
+        return response.value(forHTTPHeaderField: "X-Rate-Limit-Remaining")
+            .flatMap { Int($0.trimmingCharacters(in: .whitespaces)) }
+    }
+
+    // MARK: - Motion
+
+    /// Fastest angular speed, in degrees per second, of airborne aircraft
+    /// within `range` of `observer`: ground speed over slant distance, the
+    /// rate at which an aircraft crossing the line of sight sweeps the view.
+    /// Nil when no aircraft in range has a position and speed.
+    static func maximumAngularSpeed(of flights: [Flight], observer: CLLocation, range: CLLocationDistance) -> Double? {
+        var fastest: Double?
+        for flight in flights where !flight.onGround {
+            guard let latitude = flight.latitude,
+                  let longitude = flight.longitude,
+                  let velocity = flight.velocity else { continue }
+
+            let groundDistance = observer.distance(from: CLLocation(latitude: latitude, longitude: longitude))
+            guard groundDistance <= range else { continue }
+
+            let height = (flight.geoAltitude ?? flight.baroAltitude ?? 0) - observer.altitude
+            // Avoid blowing up for an aircraft directly overhead at the observer's altitude
+            let slantDistance = max(100, (groundDistance * groundDistance + height * height).squareRoot())
+            let degreesPerSecond = velocity / slantDistance * 180 / .pi
+            fastest = max(fastest ?? 0, degreesPerSecond)
+        }
+        return fastest
+    }
+}
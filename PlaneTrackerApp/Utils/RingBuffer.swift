@@ -0,0 +1,76 @@
+import Foundation
+
+/// Fixed-capacity FIFO that overwrites its oldest element once full.
+///
+/// Storage is allocated once up front, so appending never shifts elements
+/// the way `Array.removeFirst()` does. Index 0 is the oldest element.
+struct RingBuffer<Element> {
+
+    let capacity: Int
+
+    private var storage: [Element?]
+    private var head = 0
+    private(set) var count = 0
+
+    init(capacity: Int) {
+        precondition(capacity > 0, "RingBuffer capacity must be positive")
+        self.capacity = capacity
+        self.storage = Array(repeating: nil, count: capacity)
+    }
+
+    var isEmpty: Bool {
+        return count == 0
+    }
+
+    var isFull: Bool {
+        return count == capacity
+    }
+
+    var first: Element? {
+        return isEmpty ? nil : self[0]
+    }
+
+    var last: Element? {
+        return isEmpty ? nil : self[count - 1]
+    }
+
+    /// Append `element`, returning the element it evicted when full
+    @discardableResult
+    mutating func append(_ element: Element) -> Element? {
+        let slot = (head + count) % capacity
+        if isFull {
+            let evicted = storage[head]
+            storage[head] = element
+            head = (head + 1) % capacity
+            return evicted
+        }
+        storage[slot] = element
+        count += 1
+        return nil
+    }
+
+    mutating func removeAll() {
+        for index in storage.indices {
+            storage[index] = nil
+        }
+        head = 0
+        count = 0
+    }
+
+    subscript(index: Int) -> Element {
+        precondition(index >= 0 && index < count, "RingBuffer index out of range")
+        return storage[(head + index) % capacity]!
+    }
+}
+
+// MARK: - Collection
+
+extension RingBuffer: RandomAccessCollection {
+    var startIndex: Int {
+        return 0
+    }
+
+    var endIndex: Int {
+        return count
+    }
+}
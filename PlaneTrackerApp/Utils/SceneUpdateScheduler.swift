@@ -0,0 +1,175 @@
+import Foundation
+
+/// One unit of pending scene work for an aircraft
+enum SceneUpdate<Payload> {
+    case update(flightId: String, payload: Payload)
+    case remove(flightId: String)
+
+    var flightId: String {
+        switch self {
+        case .update(let flightId, _), .remove(let flightId):
+            return flightId
+        }
+    }
+}
+
+/// Spreads per-aircraft scene work across frames.
+///
+/// Work is coalesced per flight id (the newest payload wins, a removal
+/// cancels a pending update) and drained in priority order: removals first,
+/// then the selected aircraft, then everything else nearest first. Each drain
+/// stops once `frameBudget` has elapsed on the injected clock, but always
+/// performs at least one item so a backlog cannot starve. Pure and
+/// thread-safe; knows nothing about SceneKit.
+final class SceneUpdateScheduler<Payload> {
+
+    private struct Entry {
+        let update: SceneUpdate<Payload>
+        /// Distance from the viewer in any consistent unit
+        let distance: Float
+    }
+
+    /// Seconds of work allowed per drain
+    var frameBudget: TimeInterval {
+        get { return synchronized { _frameBudget } }
+        set { synchronized { _frameBudget = newValue } }
+    }
+
+    /// Aircraft drained ahead of everything except removals
+    var selectedFlightId: String? {
+        get { return synchronized { _selectedFlightId } }
+        set {
+            synchronized {
+                guard _selectedFlightId != newValue else { return }
+                _selectedFlightId = newValue
+                needsSort = true
+            }
+        }
+    }
+
+    private let now: () -> TimeInterval
+    private let lock = NSLock()
+    private var _frameBudget: TimeInterval
+    private var _selectedFlightId: String?
+    private var pending: [String: Entry] = [:]
+    private var order: [String] = []
+    private var cursor = 0
+    private var needsSort = false
+    private var isDrainScheduled = false
+
+    init(frameBudget: TimeInterval = 0.004,
+         now: @escaping () -> TimeInterval = { ProcessInfo.processInfo.systemUptime }) {
+        self._frameBudget = frameBudget
+        self.now = now
+    }
+
+    var pendingCount: Int {
+        return synchronized { pending.count }
+    }
+
+    // MARK: - Enqueueing
+
+    func enqueueUpdate(flightId: String, payload: Payload, distance: Float) {
+        synchronized {
+            pending[flightId] = Entry(update: .update(flightId: flightId, payload: payload), distance: distance)
+            needsSort = true
+        }
+    }
+
+    func enqueueRemoval(flightId: String) {
+        synchronized {
+            pending[flightId] = Entry(update: .remove(flightId: flightId), distance: 0)
+            needsSort = true
+        }
+    }
+
+    func removeAll() {
+        synchronized {
+            pending.removeAll()
+            order.removeAll()
+            cursor = 0
+            needsSort = false
+        }
+    }
+
+    // MARK: - Draining
+
+    /// Called once per rendered frame. Returns true when there is work and no
+    /// drain is already outstanding, i.e. when the caller should schedule one.
+    func scheduleDrainIfNeeded() -> Bool {
+        return synchronized {
+            guard !pending.isEmpty, !isDrainScheduled else { return false }
+            isDrainScheduled = true
+            return true
+        }
+    }
+
+    /// Perform pending updates in priority order until the frame budget is
+    /// spent. `perform` runs outside the lock, so it may enqueue more work.
+    /// Returns the number of updates performed.
+    @discardableResult
+    func drain(_ perform: (SceneUpdate<Payload>) -> Void) -> Int {
+        let deadline = now() + frameBudget
+        var performed = 0
+
+        while let update = next() {
+            perform(update)
+            performed += 1
+            if now() >= deadline {
+                break
+            }
+        }
+
+        synchronized { isDrainScheduled = false }
+        return performed
+    }
+
+    /// Highest-priority pending update, removed from the queue
+    private func next() -> SceneUpdate<Payload>? {
+        return synchronized {
+            if needsSort {
+                sortPending()
+            }
+            while cursor < order.count {
+                let flightId = order[cursor]
+                cursor += 1
+                if let entry = pending.removeValue(forKey: flightId) {
+                    return entry.update
+                }
+            }
+            return nil
+        }
+    }
+
+    private func sortPending() {
+        let selected = _selectedFlightId
+        order = pending.sorted { lhs, rhs in
+            let leftRank = rank(of: lhs.value, selected: selected)
+            let rightRank = rank(of: rhs.value, selected: selected)
+            if leftRank != rightRank {
+                return leftRank < rightRank
+            }
+            if lhs.value.distance != rhs.value.distance {
+                return lhs.value.distance < rhs.value.distance
+            }
+            return lhs.key < rhs.key
+        }.map { $0.key }
+        cursor = 0
+        needsSort = false
+    }
+
+    private func rank(of entry: Entry, selected: String?) -> Int {
+        switch entry.update {
+        case .remove:
+            return 0
+        case .update(let flightId, _):
+            return flightId == selected ? 1 : 2
+        }
+    }
+
+    private func synchronized<T>(_ body: () -> T) -> T {
+        lock.lock()
+        defer { lock.unlock() }
+        return body()
+    }
+}
@@ -0,0 +1,73 @@
+import Foundation
+import simd
+
+/// Vertex and index buffers for one trajectory polyline
+struct TrajectoryMesh: Equatable {
+    /// Packed xyz positions, 16-byte stride (`SIMD3<Float>` layout)
+    var vertices: [SIMD3<Float>] = []
+    /// Line-list indices: each consecutive pair is one segment
+    var indices: [UInt16] = []
+    
+    var segmentCount: Int {
+        return indices.count / 2
+    }
+    
+    var isEmpty: Bool {
+        return indices.isEmpty
+    }
+    
+    /// Raw vertex bytes for `SCNGeometrySource(data:...)`
+    var vertexData: Data {
+        return vertices.withUnsafeBufferPointer { Data(buffer: $0) }
+    }
+    
+    /// Raw index bytes for `SCNGeometryElement(data:...)`
+    var indexData: Data {
+        return indices.withUnsafeBufferPointer { Data(buffer: $0) }
+    }
+}
+
+/// Turns trajectory points (already in AR world space) into a single
+/// line-list mesh. Pure value code with no SceneKit dependency so it can be
+/// exercised headlessly; `TrajectoryRenderer` wraps the result in geometry.
+struct TrajectoryMeshBuilder {
+    
+    static let vertexStride = MemoryLayout<SIMD3<Float>>.stride
+    static let bytesPerIndex = MemoryLayout<UInt16>.size
+    
+    /// Build a fresh mesh for `points`
+    func makeMesh(points: [SIMD3<Float>]) -> TrajectoryMesh {
+        var mesh = TrajectoryMesh()
+        rebuild(&mesh, points: points)
+        return mesh
+    }
+    
+    /// Refill `mesh` in place, reusing its buffer capacity.
+    ///
+    /// Non-finite points (e.g. from a degenerate projection) are dropped and
+    /// break the line, so no segment ever spans a gap.
+    func rebuild(_ mesh: inout TrajectoryMesh, points: [SIMD3<Float>]) {
+        mesh.vertices.removeAll(keepingCapacity: true)
+        mesh.indices.removeAll(keepingCapacity: true)
+        
+        let usable = min(points.count, Int(UInt16.max))
+        mesh.vertices.reserveCapacity(usable)
+        mesh.indices.reserveCapacity(max(0, usable - 1) * 2)
+        
+        var previousIndex: UInt16?
+        for point in points.prefix(usable) {
+            guard point.x.isFinite, point.y.isFinite, point.z.isFinite else {
+                previousIndex = nil
+                continue
+            }
+            
+            let index = UInt16(mesh.vertices.count)
+            mesh.vertices.append(point)
+            if let previous = previousIndex {
+                mesh.indices.append(previous)
+                mesh.indices.append(index)
+            }
+            previousIndex = index
+        }
+    }
+}
@@ -10,26 +10,86 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
     var sceneView: ARSCNView!
     
     // Services
-    private let flightService = OpenSkyService()
+    let flightRepository: FlightRepository
+    /// Whether this view currently holds one of the repository's polling claims
+    private var isPollingFlights = false
     private let trajectoryPredictor = TrajectoryPredictor()
     private let altitudeFallback = AltitudeFallback()
     private let locationManager = CLLocationManager()
     
     // Location tracking
     private var currentLocation: CLLocation?
+    /// Where the drawn flights were last projected from; moving farther
+    /// than `reprojectionDistance` from it redraws every flight
+    private var projectedLocation: CLLocation?
+    private let reprojectionDistance: CLLocationDistance = 100
+    /// Starts at the Pier 39 fallback. Rebuilt only together with a redraw
+    /// of every flight node and trajectory line, so everything on screen
+    /// always shares one origin
+    private(set) var projector = LocalTangentProjector(
+        origin: CLLocationCoordinate2D(latitude: 37.8087, longitude: -122.4098),
+        altitude: 10.0
+    )
     
     // Flight data and tracking
     private var currentFlights: [Flight] = []
     private var flightTrajectories: [String: [TrajectoryPoint]] = [:]
     private var flightAnchors: [String: ARAnchor] = [:]
+    private var spatialIndex = FlightSpatialIndex(flights: [])
     private var cancellables = Set<AnyCancellable>()
     
     // AR visualization
-    private var trajectoryNodes: [String: SCNNode] = [:]
-    private var flightNodes: [String: SCNNode] = [:]
+    private let trajectoryRenderer = TrajectoryRenderer()
+    private(set) var flightNodes: [String: SCNNode] = [:]
+    /// Reverse of `flightNodes`, so a tapped node resolves without scanning every flight
+    private var flightIdsByNode: [ObjectIdentifier: String] = [:]
+    /// Node work waiting for a frame, drained nearest / selected first
+    private let sceneUpdates = SceneUpdateScheduler<PendingFlightNode>()
+    private let labelCache = FlightLabelCache()
+    private let lodPolicy = FlightLODPolicy()
+    private var detailLevels: [String: FlightDetailLevel] = [:]
+    /// Aircraft restored from disk are drawn faded until fresh data arrives
+    private var showsStaleFlights = false
+    private let staleFlightOpacity: CGFloat = 0.45
+    /// One arrow geometry shared by every flight; nodes only differ in rotation
+    private lazy var directionArrowGeometry: SCNGeometry = {
+        let geometry = SCNBox(width: 0.02, height: 0.001, length: 0.06, chamferRadius: 0.001)
+        geometry.firstMaterial?.diffuse.contents = UIColor.cyan.withAlphaComponent(0.7)
+        geometry.firstMaterial?.lightingModel = .constant
+        return geometry
+    }()
+    /// One sprite material shared by every far aircraft
+    private lazy var spriteMaterial: SCNMaterial = {
+        let size = CGSize(width: 64, height: 64)
+        let image = UIGraphicsImageRenderer(size: size).image { context in
+            let rect = CGRect(origin: .zero, size: size).insetBy(dx: 8, dy: 8)
+            context.cgContext.setFillColor(UIColor.systemRed.cgColor)
+            context.cgContext.fillEllipse(in: rect)
+            context.cgContext.setStrokeColor(UIColor.white.cgColor)
+            context.cgContext.setLineWidth(4)
+            context.cgContext.strokeEllipse(in: rect)
+        }
+        let material = SCNMaterial()
+        material.diffuse.contents = image
+        material.lightingModel = .constant
+        material.isDoubleSided = true
+        return material
+    }()
+    
+    /// Projected when drained, so the node lands where the projector of
+    /// that frame puts it rather than where it stood when queued
+    private struct PendingFlightNode {
+        let flight: Flight
+        let latitude: Double
+        let longitude: Double
+        let altitude: Double
+    }
     
     // Compass overlay
     private var compassView: UIView!
+    private let compassIndicators = CompassIndicatorLayer()
+    /// Nearest aircraft shown as dots on the compass
+    private let maximumCompassIndicators = 300
     private var compassLabels: [UILabel] = []
     private var headingIndicator: UIView!
     
@@ -38,21 +98,33 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
     private var shuffledFlights: [Flight] = []
     private var currentShuffleIndex = 0
     private var popupCompass: UIView?
-    private var selectedFlightId: String? // Track currently selected flight
+    private var selectedFlightId: String? { // Track currently selected flight
+        didSet { sceneUpdates.selectedFlightId = selectedFlightId }
+    }
     
     // Zoom tracking
     private var currentZoom: Float = 1.0
     private var zoomSlider: UISlider?
     
+    init(flightRepository: FlightRepository = .shared) {
+        self.flightRepository = flightRepository
+        super.init(nibName: nil, bundle: nil)
+    }
+    
+    required init?(coder: NSCoder) {
+        self.flightRepository = .shared
+        super.init(coder: coder)
+    }
+    
     override func viewDidLoad() {
         super.viewDidLoad()
-        NSLog("🚀🚀🚀 ARView viewDidLoad called!")
+        Log.info("🚀🚀🚀 ARView viewDidLoad called!", category: .scene)
         
         // Create ARSCNView programmatically
         sceneView = ARSCNView(frame: view.bounds)
         sceneView.autoresizingMask = [.flexibleWidth, .flexibleHeight]
         view.addSubview(sceneView)
-        NSLog("✅ ARSCNView created and added to view")
+        Log.info("✅ ARSCNView created and added to view", category: .scene)
         
         // Set the view's delegate
         sceneView.delegate = self
@@ -65,14 +137,12 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         
         // Set the scene to the view
         sceneView.scene = scene
-        NSLog("✅ Scene created and configured")
+        scene.rootNode.addChildNode(trajectoryRenderer.rootNode)
+        Log.info("✅ Scene created and configured", category: .scene)
         
         // Subscribe to backend service updates
         setupBackendSubscriptions()
         
-        // Start flight data updates
-        startFlightDataUpdates()
-        
         // Setup compass overlay
         setupCompassOverlay()
         
@@ -81,6 +151,9 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         
         // Setup zoom gestures and slider
         setupZoomControls()
+        
+        // Queue whatever the loading screen already fetched for the first frames
+        renderCurrentSnapshot()
     }
     
     private func setupLocationServices() {
@@ -88,17 +161,29 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         locationManager.desiredAccuracy = kCLLocationAccuracyBest
         locationManager.requestWhenInUseAuthorization()
         locationManager.startUpdatingLocation()
-        NSLog("📍 Location services requested")
+        Log.info("📍 Location services requested", category: .location)
     }
     
     func locationManager(_ manager: CLLocationManager, didUpdateLocations locations: [CLLocation]) {
         guard let location = locations.last else { return }
         currentLocation = location
-        NSLog("📍 Got location: lat=\(location.coordinate.latitude), lon=\(location.coordinate.longitude)")
+        flightRepository.updateObserverLocation(location)
+        Log.debug("📍 Got location: lat=\(location.coordinate.latitude), lon=\(location.coordinate.longitude)", category: .locationFixes)
+        
+        // Refreshes only queue flights that changed, so a new origin has to
+        // redraw the rest; GPS jitter is not worth a full redraw
+        if let previous = projectedLocation, previous.distance(from: location) < reprojectionDistance {
+            return
+        }
+        projectedLocation = location
+        projector = LocalTangentProjector(location: location)
+        Log.info("📍 ARView: Observer moved, reprojecting \(currentFlights.count) flights", category: .location)
+        // Drained updates position the node and re-project its trajectory line
+        updateARVisualization()
     }
     
     func locationManager(_ manager: CLLocationManager, didFailWithError error: Error) {
-        NSLog("⚠️ Location error: \(error.localizedDescription)")
+        Log.warning("⚠️ Location error: \(error.localizedDescription)", category: .location)
     }
     
     private func setupZoomControls() {
@@ -134,27 +219,18 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
     }
     
     private func applyZoom() {
-        // Apply zoom to all flight nodes
-        for (_, node) in flightNodes {
-            let baseScale: Float = 1.0
-            
-            // Get distance from camera
-            let cameraPos = getCameraPosition()
-            let nodePos = SIMD3<Float>(node.position.x, node.position.y, node.position.z)
-            let distance = simd_length(nodePos - cameraPos)
-            
-            // Scale based on distance and zoom
-            var scale = baseScale * currentZoom
-            
-            // If flight is too far, maintain minimum size (2x base size)
-            if distance > 50.0 {
-                scale = baseScale * 2.0
-            }
-            
-            node.scale = SCNVector3(scale, scale, scale)
+        // Sprites keep a fixed size, so only full-detail nodes follow the pinch
+        for (flightId, node) in flightNodes {
+            let level = detailLevels[flightId] ?? .full
+            applyScale(lodPolicy.scale(for: level, zoom: currentZoom), to: node)
         }
     }
     
+    private func applyScale(_ scale: Float, to node: SCNNode) {
+        guard node.scale.x != scale || node.scale.y != scale || node.scale.z != scale else { return }
+        node.scale = SCNVector3(scale, scale, scale)
+    }
+    
     private func setupCompassOverlay() {
         // Create compass view
         compassView = UIView(frame: CGRect(x: 0, y: 100, width: 120, height: 120))
@@ -215,8 +291,12 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         
         compassView.addSubview(headingIndicator)
         
+        // Plane indicators, pooled and diffed on every refresh
+        compassIndicators.frame = compassView.bounds
+        compassView.layer.addSublayer(compassIndicators)
+        
         view.addSubview(compassView)
-        NSLog("✅ Compass overlay created")
+        Log.info("✅ Compass overlay created", category: .scene)
         
         // Add shuffle button
         let shuffleButton = UIButton(frame: CGRect(x: view.bounds.width - 160, y: 100, width: 140, height: 44))
@@ -389,21 +469,14 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         
         // Check if we hit a flight node
         for result in hitResults {
-            var node = result.node
+            guard let flightId = getFlightId(for: result.node),
+                  let flight = flightRepository.flightStore[flightId] else { continue }
             
-            // Navigate up to find the parent flight node
-            while node.parent != nil {
-                if let flightId = getFlightId(for: node) {
-                    // Found the flight node - show details
-                    if let flight = currentFlights.first(where: { $0.id == flightId }) {
-                        selectedFlightId = flightId
-                        updateARVisualization() // Update colors
-                        showFlightDetail(for: flight)
-                        return
-                    }
-                }
-                node = node.parent!
-            }
+            // Found the flight node - show details
+            selectedFlightId = flightId
+            updateARVisualization() // Update colors
+            showFlightDetail(for: flight)
+            return
         }
     }
     
@@ -491,25 +564,16 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         }
     }
     
+    /// Walk up from a hit node to the flight node that owns it
     private func getFlightId(for node: SCNNode) -> String? {
-        // Search through flight nodes to find which one contains this node
-        for (flightId, flightNode) in flightNodes {
-            if node === flightNode || isDescendant(of: node, in: flightNode) {
-                return flightId
-            }
-        }
-        return nil
-    }
-    
-    private func isDescendant(of node: SCNNode, in root: SCNNode) -> Bool {
         var currentNode: SCNNode? = node
         while let current = currentNode {
-            if current === root {
-                return true
+            if let flightId = flightIdsByNode[ObjectIdentifier(current)] {
+                return flightId
             }
             currentNode = current.parent
         }
-        return false
+        return nil
     }
     
     private func showFlightDetail(for flight: Flight) {
@@ -728,13 +792,8 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         guard let compass = popupCompass, let userLoc = currentLocation else { return }
         
         // Calculate bearing from user to flight
-        let lat1 = userLoc.coordinate.latitude * .pi / 180
-        let lat2 = flightLat * .pi / 180
-        let dLon = (flightLon - userLoc.coordinate.longitude) * .pi / 180
-        
-        let y = sin(dLon) * cos(lat2)
-        let x = cos(lat1) * sin(lat2) - sin(lat1) * cos(lat2) * cos(dLon)
-        let bearing = atan2(y, x) * 180 / .pi
+        let bearing = MathHelpers.bearing(fromLatitude: userLoc.coordinate.latitude, longitude: userLoc.coordinate.longitude,
+                                          toLatitude: flightLat, longitude: flightLon)
         
         // Get device heading
         guard let frame = sceneView.session.currentFrame else { return }
@@ -785,83 +844,79 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         return true
     }
     
-    private func updateCompass(for flights: [Flight]) {
+    private func updateCompass(for index: FlightSpatialIndex) {
         // Ensure compass view exists
-        guard let compass = compassView else {
-            NSLog("⚠️ Compass view not initialized yet")
+        guard compassView != nil else {
+            Log.warning("⚠️ Compass view not initialized yet", category: .scene)
             return
         }
         
-        // Remove old plane indicators (all subviews except headingIndicator and ringContainer)
-        compass.subviews.forEach { subview in
-            if subview !== headingIndicator && subview.tag != 999 {
-                subview.removeFromSuperview()
-            }
-        }
+        // Use device location if available, otherwise fallback
+        let origin = currentLocation?.coordinate ?? CLLocationCoordinate2D(latitude: 37.8087, longitude: -122.4098)
         
-        // Add plane indicators
-        for flight in flights.prefix(10) { // Show first 10 flights
+        // Plane indicators for the nearest flights
+        let nearestFlights = index.nearest(
+            to: origin,
+            limit: maximumCompassIndicators,
+            withinKilometers: 250.0
+        )
+        var flightIds: [String] = []
+        var latitudes: [Double] = []
+        var longitudes: [Double] = []
+        flightIds.reserveCapacity(nearestFlights.count)
+        latitudes.reserveCapacity(nearestFlights.count)
+        longitudes.reserveCapacity(nearestFlights.count)
+        for flight in nearestFlights {
             guard let lat = flight.latitude, let lon = flight.longitude else { continue }
-            
-            // Use device location if available, otherwise fallback
-            let userLat: Double
-            let userLon: Double
-            
-            if let location = currentLocation {
-                userLat = location.coordinate.latitude
-                userLon = location.coordinate.longitude
-            } else {
-                userLat = 37.8087
-                userLon = -122.4098
-            }
-            
-            // Calculate offset in meters
-            let metersPerDegreeLat = 111000.0
-            let metersPerDegreeLon = 85000.0
-            
-            let northMeters = (lat - userLat) * metersPerDegreeLat
-            let eastMeters = (lon - userLon) * metersPerDegreeLon
-            
-            // Calculate bearing (relative to north)
-            let bearing = atan2(eastMeters, northMeters) * 180 / .pi
-            
-            // Create plane indicator
-            let indicator = UIView(frame: CGRect(x: 0, y: 0, width: 6, height: 6))
-            indicator.backgroundColor = .systemRed
-            indicator.layer.cornerRadius = 3
-            indicator.tag = 1000 // Tag for plane indicators
-            
-            let angle = CGFloat(bearing) * .pi / 180
-            let radius: CGFloat = 38
-            indicator.center = CGPoint(
-                x: 60 + radius * sin(angle),
-                y: 60 - radius * cos(angle)
-            )
-            
-            compass.addSubview(indicator)
+            flightIds.append(flight.id)
+            latitudes.append(lat)
+            longitudes.append(lon)
         }
+        
+        let bearings = MathHelpers.bearings(from: origin, latitudes: latitudes, longitudes: longitudes)
+        compassIndicators.update(bearings: Dictionary(zip(flightIds, bearings), uniquingKeysWith: { first, _ in first }))
     }
     
     private func setupBackendSubscriptions() {
-        NSLog("🔔 Setting up flight service subscriptions...")
-        // Subscribe to flight updates
-        flightService.$flights
-            .sink { [weak self] flights in
-                NSLog("🛫 ARView: Received %d flights from backend", flights.count)
-                for flight in flights.prefix(3) {
-                    NSLog("  ✈️ %@: lat=%.4f, lon=%.4f, alt=%.0f", 
-                          flight.callsign, flight.latitude ?? 0, flight.longitude ?? 0, flight.baroAltitude ?? 0)
+        Log.info("🔔 Setting up flight service subscriptions...", category: .scene)
+        // Subscribe to per-refresh flight changes
+        flightRepository.flightChanges
+            .sink { [weak self] changes in
+                Log.info("🛫 ARView: Received +\(changes.added.count) ~\(changes.updated.count) -\(changes.removed.count) flights from backend",
+                         category: .scene)
+                self?.handleFlightChanges(changes)
+            }
+            .store(in: &cancellables)
+        
+        flightRepository.isStalePublisher
+            .sink { [weak self] isStale in
+                guard let self = self else { return }
+                self.showsStaleFlights = isStale
+                let opacity: CGFloat = isStale ? self.staleFlightOpacity : 1.0
+                for node in self.flightNodes.values {
+                    node.opacity = opacity
                 }
-                self?.currentFlights = flights
-                
-                // Temporarily disable trajectories - causing too many issues
-                // self?.updateFlightTrajectories()
-                self?.updateARVisualization()
-                self?.updateCompass(for: flights)
             }
             .store(in: &cancellables)
     }
     
+    private func handleFlightChanges(_ changes: FlightChangeset) {
+        currentFlights = flightRepository.flights
+        spatialIndex = FlightSpatialIndex(flights: currentFlights)
+        
+        updateFlightTrajectories(for: changes)
+        applyFlightChanges(changes)
+        updateCompass(for: spatialIndex)
+    }
+    
+    /// Render the repository's existing snapshot without waiting for the next poll
+    private func renderCurrentSnapshot() {
+        let snapshot = flightRepository.currentSnapshotChanges()
+        guard !snapshot.isEmpty else { return }
+        Log.info("🛫 ARView: Starting from \(snapshot.added.count) already-fetched flights", category: .scene)
+        handleFlightChanges(snapshot)
+    }
+    
     override func viewWillAppear(_ animated: Bool) {
         super.viewWillAppear(animated)
         
@@ -870,6 +925,9 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         
         // Run the view's session
         sceneView.session.run(configuration)
+        
+        // Poll for flights only while the AR view is on screen
+        setFlightPolling(true)
     }
     
     override func viewWillDisappear(_ animated: Bool) {
@@ -877,6 +935,20 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         
         // Pause the view's session
         sceneView.session.pause()
+        
+        setFlightPolling(false)
+    }
+    
+    /// Hold or release this view's polling claim on the repository; balanced,
+    /// so disappearing during a session interruption does not release twice
+    private func setFlightPolling(_ active: Bool) {
+        guard active != isPollingFlights else { return }
+        isPollingFlights = active
+        if active {
+            flightRepository.startPolling()
+        } else {
+            flightRepository.stopPolling()
+        }
     }
     
     // MARK: - ARSCNViewDelegate
@@ -887,93 +959,113 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
     
     func sessionWasInterrupted(_ session: ARSession) {
         // Inform the user that the session has been interrupted, for example, by presenting an overlay
+        // Nothing is drawn while interrupted (e.g. backgrounded), so stop polling
+        setFlightPolling(false)
     }
     
     func sessionInterruptionEnded(_ session: ARSession) {
         // Reset tracking and/or remove existing anchors if consistent tracking is required
-    }
-    
-    // MARK: - Flight Data Management
-    
-    private func startFlightDataUpdates() {
-        NSLog("🚀🚀🚀 ARView: Starting flight data updates...")
-        NSLog("📡 Using OpenSky Service with MOCK data")
-        
-        // Fetch initial flight data
-        NSLog("🌐 Calling fetchFlights() for the first time...")
-        flightService.fetchFlights()
-        
-        // Start periodic flight data updates (service handles caching)
-        Timer.scheduledTimer(withTimeInterval: 5.0, repeats: true) { [weak self] _ in
-            NSLog("⏰ ARView: Timer fired - fetching flights...")
-            self?.flightService.fetchFlights()
+        if viewIfLoaded?.window != nil {
+            setFlightPolling(true)
         }
-        NSLog("✅ Timer scheduled successfully")
     }
     
-    private func updateFlightTrajectories() {
-        // Update trajectories for all flights using backend data
-        for flight in currentFlights {
-            updateFlightTrajectory(flight)
+    /// Runs on SceneKit's render thread once per frame. Node and view state
+    /// belong to the main thread, so this only schedules a budgeted drain there.
+    func renderer(_ renderer: SCNSceneRenderer, updateAtTime time: TimeInterval) {
+        guard sceneUpdates.scheduleDrainIfNeeded() else { return }
+        DispatchQueue.main.async { [weak self] in
+            self?.drainSceneUpdates()
         }
     }
     
-    private func updateFlightTrajectory(_ flight: Flight) {
-        // Predict trajectory for the flight
-        let trajectory = trajectoryPredictor.predictTrajectory(for: flight)
-        flightTrajectories[flight.id] = trajectory
-        
-        // Filter trajectory for AR view
-        let cameraPosition = getCameraPosition()
-        let cameraOrientation = getCameraOrientation()
-        
-        let visibleTrajectory = trajectoryPredictor.calculateTrajectoryForAR(
-            flight: flight,
-            cameraPosition: cameraPosition,
-            cameraOrientation: cameraOrientation
-        )
+    // MARK: - Flight Data Management
+    
+    /// Re-predict only flights that were added or moved, in one batched pass
+    private func updateFlightTrajectories(for changes: FlightChangeset) {
+        for flightId in changes.removed {
+            flightTrajectories.removeValue(forKey: flightId)
+        }
         
-        // Update trajectory visualization
-        updateTrajectoryVisualization(for: flight.id, trajectory: visibleTrajectory)
+        let predicted = trajectoryPredictor.predictTrajectories(for: changes.upserted)
+        flightTrajectories.merge(predicted) { _, new in new }
     }
     
     // MARK: - AR Visualization
     
     private func updateARVisualization() {
-        print("🎨 ARView: Updating AR visualization for \(currentFlights.count) flights")
-        // Update flight positions and trajectories in AR space
-        for flight in currentFlights {
-            updateFlightPosition(flight)
-            updateTrajectoryVisualization(for: flight.id, trajectory: flightTrajectories[flight.id] ?? [])
+        Log.debug("🎨 ARView: Updating AR visualization for \(currentFlights.count) flights", category: .scene)
+        // Queue flight positions and trajectories for the next frames
+        enqueueFlightNodes(for: currentFlights)
+    }
+    
+    /// Queue only the nodes of flights that were added, moved or dropped
+    private func applyFlightChanges(_ changes: FlightChangeset) {
+        for flightId in changes.removed {
+            sceneUpdates.enqueueRemoval(flightId: flightId)
         }
-        print("📍 ARView: Total flight nodes in scene: \(flightNodes.count)")
+        enqueueFlightNodes(for: changes.upserted)
     }
     
-    private func updateFlightPosition(_ flight: Flight) {
-        guard let lat = flight.latitude,
-              let lon = flight.longitude else { 
-            print("⚠️ Flight \(flight.callsign) missing coordinates")
-            return 
+    /// Distances are cheap and computed now so the queue can order by them;
+    /// the final position, node and text work waits for `drainSceneUpdates`
+    private func enqueueFlightNodes(for flights: [Flight]) {
+        let altitudes = altitudeFallback.estimateAltitudes(for: flights)
+        for flight in flights {
+            guard let lat = flight.latitude,
+                  let lon = flight.longitude else {
+                Log.debug("⚠️ Flight \(flight.callsign) missing coordinates", category: .flights)
+                continue
+            }
+            
+            let altitude = altitudes[flight.id] ?? altitudeFallback.estimateAltitude(for: flight)
+            let worldPosition = convertToARWorldCoordinates(latitude: lat, longitude: lon, altitude: altitude)
+            Log.debug("📍 Flight \(flight.callsign): lat=\(lat), lon=\(lon), alt=\(altitude) → AR pos=(\(worldPosition.x), \(worldPosition.y), \(worldPosition.z))", category: .coordinates)
+            
+            sceneUpdates.enqueueUpdate(
+                flightId: flight.id,
+                payload: PendingFlightNode(flight: flight, latitude: lat, longitude: lon, altitude: altitude),
+                distance: simd_length(worldPosition)
+            )
         }
-        
-        // Get predicted altitude
-        let altitude = altitudeFallback.estimateAltitude(for: flight, with: currentFlights)
-        
-        // Convert to AR world coordinates
-        let worldPosition = convertToARWorldCoordinates(
-            latitude: lat,
-            longitude: lon,
-            altitude: altitude
-        )
-        
-        print("📍 Flight \(flight.callsign): lat=\(lat), lon=\(lon), alt=\(altitude) → AR pos=(\(worldPosition.x), \(worldPosition.y), \(worldPosition.z))")
-        
+    }
+    
+    /// Apply queued node work until this frame's budget is spent
+    func drainSceneUpdates() {
+        let cameraPosition = getCameraPosition()
+        let performed = sceneUpdates.drain { update in
+            switch update {
+            case .remove(let flightId):
+                removeFlightNodes(for: flightId)
+            case .update(let flightId, let pending):
+                let worldPosition = convertToARWorldCoordinates(latitude: pending.latitude, longitude: pending.longitude,
+                                                                altitude: pending.altitude)
+                updateFlightNode(pending.flight, position: worldPosition, cameraPosition: cameraPosition)
+                updateTrajectoryVisualization(for: flightId, trajectory: flightTrajectories[flightId] ?? [])
+            }
+        }
+        Log.debug("📍 ARView: Applied \(performed) node updates, \(sceneUpdates.pendingCount) pending, \(flightNodes.count) in scene", category: .scene)
+    }
+    
+    private func updateFlightNode(_ flight: Flight, position worldPosition: SIMD3<Float>, cameraPosition: SIMD3<Float>) {
         // Create or update flight node
         let flightNode = getOrCreateFlightNode(for: flight.id)
         flightNode.position = SCNVector3(worldPosition.x, worldPosition.y, worldPosition.z)
+        flightNode.opacity = showsStaleFlights ? staleFlightOpacity : 1.0
+        
+        let level = lodPolicy.level(
+            for: worldPosition,
+            camera: cameraPosition,
+            current: detailLevels[flight.id],
+            isSelected: flight.id == selectedFlightId
+        )
+        detailLevels[flight.id] = level
+        applyScale(lodPolicy.scale(for: level, zoom: currentZoom), to: flightNode)
+        
+        guard let detailNode = applyDetailLevel(level, to: flightNode) else { return }
         
         // Update target ring color based on selection
-        if let ringNode = flightNode.childNode(withName: "targetRing", recursively: false) {
+        if let ringNode = detailNode.childNode(withName: "targetRing", recursively: false) {
             if flight.id == selectedFlightId {
                 // Selected flight - glowing cyan ring
                 ringNode.geometry?.firstMaterial?.diffuse.contents = UIColor.cyan.withAlphaComponent(0.5)
@@ -986,31 +1078,10 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         }
         
         // Add flight information
-        addFlightInfoToNode(flightNode, flight: flight)
+        addFlightInfoToNode(detailNode, flight: flight)
     }
     
     private func updateTrajectoryVisualization(for flightId: String, trajectory: [TrajectoryPoint]) {
-        // Remove existing trajectory
-        if let existingNode = trajectoryNodes[flightId] {
-            existingNode.removeFromParentNode()
-        }
-        
-        guard !trajectory.isEmpty else { return }
-        
-        // Create trajectory line
-        let trajectoryNode = createTrajectoryNode(trajectory: trajectory)
-        trajectoryNodes[flightId] = trajectoryNode
-        
-        // Add to scene
-        sceneView.scene.rootNode.addChildNode(trajectoryNode)
-    }
-    
-    private func createTrajectoryNode(trajectory: [TrajectoryPoint]) -> SCNNode {
-        let node = SCNNode()
-        
-        guard trajectory.count >= 2 else { return node }
-        
-        // Create curved path from trajectory points
         let points = trajectory.map { point in
             convertToARWorldCoordinates(
                 latitude: point.latitude,
@@ -1019,121 +1090,19 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
             )
         }
         
-        // Create smooth curve using linear interpolation
-        for i in 0..<points.count - 1 {
-            let p1 = points[i]
-            let p2 = points[i + 1]
-            
-            // Create smooth curve between p1 and p2
-            let segments = 20 // Number of segments for smooth curve
-            for j in 0..<segments {
-                let t = Float(j) / Float(segments)
-                
-                // Linear interpolation
-                let point = p1 + (p2 - p1) * t
-                
-                let nextT = Float(j + 1) / Float(segments)
-                let nextPoint = p1 + (p2 - p1) * nextT
-                
-                let lineNode = createLineNode(from: point, to: nextPoint)
-                node.addChildNode(lineNode)
-            }
-        }
-        
-        return node
-    }
-    
-    private func createLineNode(from: SIMD3<Float>, to: SIMD3<Float>) -> SCNNode {
-        let lineNode = SCNNode()
-        
-        // Calculate distance and direction
-        let distance = length(to - from)
-        
-        // Create cylinder geometry for trajectory line
-        let cylinder = SCNCylinder(radius: 0.01, height: CGFloat(distance))
-        cylinder.firstMaterial?.diffuse.contents = UIColor.cyan.withAlphaComponent(0.8)
-        cylinder.firstMaterial?.lightingModel = .constant
-        
-        let geometryNode = SCNNode(geometry: cylinder)
-        
-        // Position at midpoint
-        let midPoint = (from + to) / 2
-        geometryNode.position = SCNVector3(midPoint.x, midPoint.y, midPoint.z)
-        
-        // Calculate direction vector
-        let direction = to - from
-        
-        // Cylinder default is along Y axis, we need to rotate it to align with our direction
-        // Calculate rotation axis (cross product of Y axis with our direction)
-        let yAxis = SIMD3<Float>(0, 1, 0)
-        let normalizedDirection = normalize(direction)
-        let rotationAxis = cross(yAxis, normalizedDirection)
-        
-        // Calculate rotation angle
-        let angle = acos(dot(yAxis, normalizedDirection))
-        
-        // Apply rotation
-        if length(rotationAxis) > 0.001 { // Avoid division by zero
-            geometryNode.rotation = SCNVector4(
-                rotationAxis.x,
-                rotationAxis.y,
-                rotationAxis.z,
-                angle
-            )
-        }
-        
-        lineNode.addChildNode(geometryNode)
-        return lineNode
+        // Renderer skips flights whose line is unchanged
+        trajectoryRenderer.update(flightId: flightId, points: points)
     }
     
     // MARK: - Coordinate Conversion
     
+    /// Independent of the AR session: the world origin is where the session
+    /// started, which is the observer the projector is centred on, so
+    /// flights queued before the first `ARFrame` still land in place
     private func convertToARWorldCoordinates(latitude: Double, longitude: Double, altitude: Double) -> SIMD3<Float> {
-        // Verify AR session is running
-        guard sceneView.session.currentFrame != nil else {
-            return SIMD3<Float>(0, 0, 0)
-        }
-        
-        // Use device's actual location if available, otherwise fallback to Pier 39
-        let userLat: Double
-        let userLon: Double
-        let userAlt: Double
-        
-        if let location = currentLocation {
-            userLat = location.coordinate.latitude
-            userLon = location.coordinate.longitude
-            userAlt = location.altitude
-            NSLog("📍 Using device location: lat=\(userLat), lon=\(userLon)")
-        } else {
-            // Fallback to Pier 39
-            userLat = 37.8087
-            userLon = -122.4098
-            userAlt = 10.0
-            NSLog("📍 Using fallback location (Pier 39)")
-        }
-        
-        // Calculate offset from user position in meters
-        let latDiff = latitude - userLat
-        let lonDiff = longitude - userLon
-        let altDiff = altitude - userAlt
-        
-        // Convert degrees to meters (rough approximation)
-        // At SF latitude: 1° lat ≈ 111km, 1° lon ≈ 85km
-        let metersPerDegreeLat = 111000.0
-        let metersPerDegreeLon = 85000.0
-        
-        let northMeters = latDiff * metersPerDegreeLat
-        let eastMeters = lonDiff * metersPerDegreeLon
-        
-        // Convert to AR coordinates (scale down for AR visualization)
-        // Use 1:1000 scale so 1km = 1 meter in AR
-        let x = Float(eastMeters / 1000.0)     // East/West
-        let y = Float(altDiff / 1000.0)        // Altitude (meters to AR units, 1:1000 scale)
-        let z = Float(-northMeters / 1000.0)   // North/South (negative Z is forward)
-        
-        NSLog("🔄 Coord conversion: latDiff=\(latDiff)° -> northMeters=\(northMeters)m -> z=\(z)")
-        
-        return SIMD3<Float>(x, y, z)
+        // East-north-up offset from the device (or the Pier 39 fallback) on the
+        // WGS84 ellipsoid, at 1:1000 scale so 1km = 1 meter in AR
+        return projector.arPosition(latitude: latitude, longitude: longitude, altitude: altitude)
     }
     
     // MARK: - Camera Information
@@ -1151,19 +1120,6 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         )
     }
     
-    private func getCameraOrientation() -> SIMD3<Float> {
-        guard let frame = sceneView.session.currentFrame else {
-            return SIMD3<Float>(0, 0, -1)
-        }
-        
-        let transform = frame.camera.transform
-        return SIMD3<Float>(
-            transform.columns.2.x,
-            transform.columns.2.y,
-            transform.columns.2.z
-        )
-    }
-    
     // MARK: - Node Management
     
     private func getOrCreateFlightNode(for flightId: String) -> SCNNode {
@@ -1172,15 +1128,70 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
         }
         
         // Create new flight node
-        let flightNode = createFlightNode()
+        let flightNode = SCNNode()
         flightNodes[flightId] = flightNode
+        flightIdsByNode[ObjectIdentifier(flightNode)] = flightId
         sceneView.scene.rootNode.addChildNode(flightNode)
         
         return flightNode
     }
     
-    private func createFlightNode() -> SCNNode {
+    private func removeFlightNodes(for flightId: String) {
+        if let flightNode = flightNodes.removeValue(forKey: flightId) {
+            flightIdsByNode.removeValue(forKey: ObjectIdentifier(flightNode))
+            flightNode.removeFromParentNode()
+        }
+        detailLevels.removeValue(forKey: flightId)
+        trajectoryRenderer.remove(flightId: flightId)
+        flightTrajectories.removeValue(forKey: flightId)
+    }
+    
+    /// Show the children for `level`, building them the first time they are
+    /// needed. Returns the full-detail container, or nil for a sprite.
+    @discardableResult
+    private func applyDetailLevel(_ level: FlightDetailLevel, to flightNode: SCNNode) -> SCNNode? {
+        let detailNode = flightNode.childNode(withName: "fullDetail", recursively: false)
+        let spriteNode = flightNode.childNode(withName: "sprite", recursively: false)
+        
+        switch level {
+        case .full:
+            spriteNode?.isHidden = true
+            if let detailNode = detailNode {
+                detailNode.isHidden = false
+                return detailNode
+            }
+            let newDetailNode = createFullDetailNode()
+            flightNode.addChildNode(newDetailNode)
+            return newDetailNode
+        case .sprite:
+            detailNode?.isHidden = true
+            if let spriteNode = spriteNode {
+                spriteNode.isHidden = false
+            } else {
+                flightNode.addChildNode(createSpriteNode())
+            }
+            return nil
+        }
+    }
+    
+    private func createSpriteNode() -> SCNNode {
+        // Doubles as the tap target while the aircraft is far away
+        let spriteGeometry = SCNPlane(width: 0.3, height: 0.3)
+        spriteGeometry.materials = [spriteMaterial]
+        
+        let node = SCNNode(geometry: spriteGeometry)
+        node.name = "sprite"
+        
+        let billboardConstraint = SCNBillboardConstraint()
+        billboardConstraint.freeAxes = [.X, .Y, .Z]
+        node.constraints = [billboardConstraint]
+        
+        return node
+    }
+    
+    private func createFullDetailNode() -> SCNNode {
         let node = SCNNode()
+        node.name = "fullDetail"
         
         // Create aircraft geometry - red plane silhouette
         let aircraftGeometry = SCNBox(width: 0.08, height: 0.03, length: 0.15, chamferRadius: 0.01)
@@ -1219,54 +1230,50 @@ class ARView: UIViewController, ARSCNViewDelegate, CLLocationManagerDelegate, UI
     }
     
     private func addFlightInfoToNode(_ node: SCNNode, flight: Flight) {
-        // Remove old text if exists
-        node.childNodes.filter { $0.geometry is SCNText }.forEach { $0.removeFromParentNode() }
-        
         // ONLY show flight code (callsign) - white, billboard style, always facing camera
         let callsignText = flight.callsign.trimmingCharacters(in: .whitespaces)
+        let textGeometry = labelCache.geometry(for: callsignText)
         
-        let textGeometry = SCNText(string: callsignText, extrusionDepth: 0.01)
-        textGeometry.font = UIFont.boldSystemFont(ofSize: 12)
-        textGeometry.flatness = 0.1
-        textGeometry.firstMaterial?.diffuse.contents = UIColor.white
-        textGeometry.firstMaterial?.emission.contents = UIColor.white
-        textGeometry.firstMaterial?.lightingModel = .constant
-        
-        // Center the text horizontally
-        let (min, max) = textGeometry.boundingBox
-        let dx = (max.x - min.x) / 2
-        let dy = (max.y - min.y) / 2
-        textGeometry.containerFrame = CGRect(x: CGFloat(-dx), y: CGFloat(-dy), width: CGFloat(max.x - min.x), height: CGFloat(max.y - min.y))
-        
-        let textNode = SCNNode(geometry: textGeometry)
-        textNode.name = "flightInfo"
-        textNode.position = SCNVector3(0, -0.15, 0)  // Below the aircraft
-        textNode.scale = SCNVector3(0.006, 0.006, 0.006)
-        
-        // Add billboard constraint - completely free rotation to always face camera
-        let billboardConstraint = SCNBillboardConstraint()
-        billboardConstraint.freeAxes = [.X, .Y, .Z] // Free on all axes for true billboard
-        textNode.constraints = [billboardConstraint]
-        
-        node.addChildNode(textNode)
+        if let textNode = node.childNode(withName: "flightInfo", recursively: false) {
+            // Same callsign hands back the same geometry - nothing to re-tessellate
+            if textNode.geometry !== textGeometry {
+                textNode.geometry = textGeometry
+            }
+        } else {
+            let textNode = SCNNode(geometry: textGeometry)
+            textNode.name = "flightInfo"
+            textNode.position = SCNVector3(0, -0.15, 0)  // Below the aircraft
+            textNode.scale = SCNVector3(0.006, 0.006, 0.006)
+            
+            // Add billboard constraint - completely free rotation to always face camera
+            let billboardConstraint = SCNBillboardConstraint()
+            billboardConstraint.freeAxes = [.X, .Y, .Z] // Free on all axes for true billboard
+            textNode.constraints = [billboardConstraint]
+            
+            node.addChildNode(textNode)
+        }
         
         // Add direction arrow if heading available
         if let heading = flight.trueTrack {
-            addDirectionArrow(to: node, heading: heading)
+            updateDirectionArrow(on: node, heading: heading)
+        } else {
+            node.childNode(withName: "directionArrow", recursively: false)?.removeFromParentNode()
         }
     }
     
-    private func addDirectionArrow(to node: SCNNode, heading: Double) {
-        // Create a small arrow showing flight direction
-        let arrowGeometry = SCNBox(width: 0.02, height: 0.001, length: 0.06, chamferRadius: 0.001)
-        arrowGeometry.firstMaterial?.diffuse.contents = UIColor.cyan.withAlphaComponent(0.7)
-        arrowGeometry.firstMaterial?.lightingModel = .constant
-        
-        let arrowNode = SCNNode(geometry: arrowGeometry)
-        arrowNode.position = SCNVector3(0, 0.12, 0) // Below the plane
-        
+    private func updateDirectionArrow(on node: SCNNode, heading: Double) {
         // Rotate arrow to match heading (heading is in degrees, 0 = north)
         let headingRadians = Float(heading) * .pi / 180.0
+        
+        if let arrowNode = node.childNode(withName: "directionArrow", recursively: false) {
+            arrowNode.rotation = SCNVector4(0, 1, 0, headingRadians)
+            return
+        }
+        
+        // Create a small arrow showing flight direction
+        let arrowNode = SCNNode(geometry: directionArrowGeometry)
+        arrowNode.name = "directionArrow"
+        arrowNode.position = SCNVector3(0, 0.12, 0) // Below the plane
         arrowNode.rotation = SCNVector4(0, 1, 0, headingRadians)
         
         node.addChildNode(arrowNode)
@@ -0,0 +1,120 @@
+import UIKit
+
+/// Aircraft dots around the compass, one pooled `CAShapeLayer` per icao24.
+///
+/// `update(bearings:)` diffs against what is already on screen: aircraft
+/// that appeared take a layer from the pool and are placed without
+/// animation, aircraft that left are hidden and returned to the pool, and
+/// only aircraft whose bearing moved by at least `minimumBearingChange`
+/// are animated to their new position. Nothing is allocated once the pool
+/// has grown to the largest set shown so far.
+class CompassIndicatorLayer: CALayer {
+
+    /// Distance of the dots from the compass center, in points
+    var ringRadius: CGFloat = 38
+    var dotDiameter: CGFloat = 6
+    var dotColor: UIColor = .systemRed
+    /// Bearing changes smaller than this (degrees) leave the dot where it is
+    var minimumBearingChange: Double = 0.5
+    var animationDuration: TimeInterval = 0.3
+
+    private var indicators: [String: CAShapeLayer] = [:]
+    private var displayedBearings: [String: Double] = [:]
+    private var reusableIndicators: [CAShapeLayer] = []
+
+    /// Layers allocated so far, shown or pooled
+    private(set) var allocatedIndicatorCount = 0
+
+    /// Aircraft currently shown
+    var indicatorCount: Int {
+        return indicators.count
+    }
+
+    func bearing(for flightId: String) -> Double? {
+        return displayedBearings[flightId]
+    }
+
+    // MARK: - Updates
+
+    /// Show exactly the aircraft in `bearings` (icao24 → degrees from north)
+    @discardableResult
+    func update(bearings: [String: Double]) -> (added: Int, moved: Int, removed: Int) {
+        var added = 0
+        var moved = 0
+        var removed = 0
+
+        CATransaction.begin()
+        CATransaction.setDisableActions(true)
+
+        for (flightId, indicator) in indicators where bearings[flightId] == nil {
+            indicator.isHidden = true
+            reusableIndicators.append(indicator)
+            indicators.removeValue(forKey: flightId)
+            displayedBearings.removeValue(forKey: flightId)
+            removed += 1
+        }
+
+        var movedIndicators: [(layer: CAShapeLayer, bearing: Double)] = []
+        for (flightId, bearing) in bearings {
+            if let indicator = indicators[flightId], let previous = displayedBearings[flightId] {
+                guard CompassIndicatorLayer.angularDistance(previous, bearing) >= minimumBearingChange else { continue }
+                displayedBearings[flightId] = bearing
+                movedIndicators.append((layer: indicator, bearing: bearing))
+                moved += 1
+            } else {
+                let indicator = dequeueIndicator()
+                indicator.position = position(forBearing: bearing)
+                indicator.isHidden = false
+                indicators[flightId] = indicator
+                displayedBearings[flightId] = bearing
+                added += 1
+            }
+        }
+
+        CATransaction.commit()
+
+        if !movedIndicators.isEmpty {
+            CATransaction.begin()
+            CATransaction.setAnimationDuration(animationDuration)
+            for moved in movedIndicators {
+                moved.layer.position = position(forBearing: moved.bearing)
+            }
+            CATransaction.commit()
+        }
+
+        return (added: added, moved: moved, removed: removed)
+    }
+
+    func removeAllIndicators() {
+        update(bearings: [:])
+    }
+
+    // MARK: - Layout
+
+    /// Point on the ring for a bearing, clockwise from the top
+    func position(forBearing bearing: Double) -> CGPoint {
+        let angle = CGFloat(bearing) * .pi / 180
+        return CGPoint(
+            x: bounds.midX + ringRadius * sin(angle),
+            y: bounds.midY - ringRadius * cos(angle)
+        )
+    }
+
+    private func dequeueIndicator() -> CAShapeLayer {
+        if let indicator = reusableIndicators.popLast() {
+            return indicator
+        }
+
+        let indicator = CAShapeLayer()
+        indicator.bounds = CGRect(x: 0, y: 0, width: dotDiameter, height: dotDiameter)
+        indicator.path = UIBezierPath(ovalIn: indicator.bounds).cgPath
+        indicator.fillColor = dotColor.cgColor
+        addSublayer(indicator)
+        allocatedIndicatorCount += 1
+        return indicator
+    }
+
+    private static func angularDistance(_ a: Double, _ b: Double) -> Double {
+        return abs(remainder(a - b, 360))
+    }
+}
@@ -0,0 +1,97 @@
+import SceneKit
+import UIKit
+
+/// Appearance of a flight label; part of the cache key
+struct FlightLabelStyle: Hashable {
+    var fontSize: CGFloat
+    var isBold: Bool
+    var color: UIColor
+    var extrusionDepth: CGFloat
+    var flatness: CGFloat
+
+    static let callsign = FlightLabelStyle(fontSize: 12, isBold: true, color: .white, extrusionDepth: 0.01, flatness: 0.1)
+}
+
+/// Shares tessellated `SCNText` geometry between refreshes.
+///
+/// Tessellating text is one of the most expensive things SceneKit does, and
+/// callsigns rarely change. Geometry is keyed by text and style, so a flight
+/// that keeps its callsign gets the identical instance back and its node can
+/// skip the geometry swap entirely. Least recently used entries are dropped
+/// once `capacity` is reached.
+class FlightLabelCache {
+
+    private struct Key: Hashable {
+        let text: String
+        let style: FlightLabelStyle
+    }
+
+    private struct Entry {
+        let geometry: SCNText
+        var lastUsed: Int
+    }
+
+    let capacity: Int
+
+    /// Number of geometries tessellated so far, for tests and diagnostics
+    private(set) var buildCount = 0
+
+    private var entries: [Key: Entry] = [:]
+    private var clock = 0
+
+    init(capacity: Int = 512) {
+        self.capacity = max(1, capacity)
+    }
+
+    var count: Int {
+        return entries.count
+    }
+
+    /// Centered text geometry for `text`, built only on a cache miss
+    func geometry(for text: String, style: FlightLabelStyle = .callsign) -> SCNText {
+        clock += 1
+        let key = Key(text: text, style: style)
+
+        if let index = entries.index(forKey: key) {
+            entries.values[index].lastUsed = clock
+            return entries.values[index].geometry
+        }
+
+        if entries.count >= capacity {
+            evictLeastRecentlyUsed()
+        }
+
+        let geometry = makeGeometry(text: text, style: style)
+        entries[key] = Entry(geometry: geometry, lastUsed: clock)
+        buildCount += 1
+        return geometry
+    }
+
+    func removeAll() {
+        entries.removeAll()
+    }
+
+    // MARK: - Geometry
+
+    private func evictLeastRecentlyUsed() {
+        guard let oldest = entries.min(by: { $0.value.lastUsed < $1.value.lastUsed }) else { return }
+        entries.removeValue(forKey: oldest.key)
+    }
+
+    private func makeGeometry(text: String, style: FlightLabelStyle) -> SCNText {
+        let textGeometry = SCNText(string: text, extrusionDepth: style.extrusionDepth)
+        textGeometry.font = style.isBold ? UIFont.boldSystemFont(ofSize: style.fontSize) : UIFont.systemFont(ofSize: style.fontSize)
+        textGeometry.flatness = style.flatness
+        textGeometry.firstMaterial?.diffuse.contents = style.color
+        textGeometry.firstMaterial?.emission.contents = style.color
+        textGeometry.firstMaterial?.lightingModel = .constant
+
+        // Center the text horizontally
+        let (min, max) = textGeometry.boundingBox
+        let dx = (max.x - min.x) / 2
+        let dy = (max.y - min.y) / 2
+        textGeometry.containerFrame = CGRect(x: CGFloat(-dx), y: CGFloat(-dy), width: CGFloat(max.x - min.x), height: CGFloat(max.y - min.y))
+
+        return textGeometry
+    }
+}
@@ -3,7 +3,7 @@ import Combine
 
 class LoadingViewController: UIViewController {
     
-    private let flightService = OpenSkyService()
+    let flightRepository: FlightRepository
     private var cancellables = Set<AnyCancellable>()
     
     private let statusLabel: UILabel = {
@@ -38,6 +38,16 @@ class LoadingViewController: UIViewController {
     private var transitionTimer: Timer?
     private var timeoutTimer: Timer?
     
+    init(flightRepository: FlightRepository = .shared) {
+        self.flightRepository = flightRepository
+        super.init(nibName: nil, bundle: nil)
+    }
+    
+    required init?(coder: NSCoder) {
+        self.flightRepository = .shared
+        super.init(coder: coder)
+    }
+    
     override func viewDidLoad() {
         super.viewDidLoad()
         
@@ -49,13 +59,14 @@ class LoadingViewController: UIViewController {
         // Subscribe to backend updates
         setupBackendSubscriptions()
         
-        // Fetch initial data
-        NSLog("🔵 LoadingViewController: Fetching initial flight data...")
-        flightService.fetchFlights()
+        // Show last launch's aircraft straight away, then fetch fresh data
+        Log.info("🔵 LoadingViewController: Restoring cached snapshot and fetching initial flight data...")
+        flightRepository.restoreCachedSnapshot()
+        flightRepository.refresh()
         
         // Set timeout to transition anyway after 10 seconds
         timeoutTimer = Timer.scheduledTimer(withTimeInterval: 10.0, repeats: false) { [weak self] _ in
-            NSLog("⏰ LoadingViewController: Timeout reached - transitioning to AR anyway")
+            Log.info("⏰ LoadingViewController: Timeout reached - transitioning to AR anyway")
             self?.transitionToARView()
         }
     }
@@ -103,21 +114,21 @@ class LoadingViewController: UIViewController {
     
     private func setupBackendSubscriptions() {
         // Subscribe to flight updates
-        flightService.$flights
+        flightRepository.flightsPublisher
             .sink { [weak self] flights in
                 guard let self = self else { return }
                 
                 if flights.isEmpty {
-                    NSLog("📭 LoadingViewController: Received empty flights array")
+                    Log.info("📭 LoadingViewController: Received empty flights array")
                     return
                 }
                 
-                NSLog("✅ LoadingViewController: Received \(flights.count) flights!")
+                Log.info("✅ LoadingViewController: Received \(flights.count) flights!")
                 self.hasReceivedData = true
                 
                 DispatchQueue.main.async {
                     self.statusLabel.text = "Found \(flights.count) flights"
-                    self.detailLabel.text = "in SF Bay Area"
+                    self.detailLabel.text = self.flightRepository.isStale ? "in SF Bay Area (updating...)" : "in SF Bay Area"
                     
                     // Schedule transition to AR view after 3 seconds
                     self.scheduleTransitionToAR()
@@ -126,11 +137,11 @@ class LoadingViewController: UIViewController {
             .store(in: &cancellables)
         
         // Subscribe to error messages
-        flightService.$errorMessage
+        flightRepository.errorMessagePublisher
             .sink { [weak self] errorMessage in
                 guard let self = self, let error = errorMessage else { return }
                 
-                NSLog("❌ LoadingViewController: Error - \(error)")
+                Log.error("❌ LoadingViewController: Error - \(error)")
                 
                 DispatchQueue.main.async {
                     self.statusLabel.text = "Connection Error"
@@ -140,7 +151,7 @@ class LoadingViewController: UIViewController {
             .store(in: &cancellables)
         
         // Subscribe to loading state
-        flightService.$isLoading
+        flightRepository.isLoadingPublisher
             .sink { [weak self] isLoading in
                 guard let self = self else { return }
                 
@@ -163,7 +174,7 @@ class LoadingViewController: UIViewController {
             self?.transitionToARView()
         }
         
-        NSLog("⏰ LoadingViewController: Scheduled transition to AR view in 3 seconds")
+        Log.info("⏰ LoadingViewController: Scheduled transition to AR view in 3 seconds")
     }
     
     private func transitionToARView() {
@@ -171,17 +182,22 @@ class LoadingViewController: UIViewController {
         transitionTimer?.invalidate()
         timeoutTimer?.invalidate()
         
-        NSLog("🚀 LoadingViewController: Transitioning to AR view...")
+        Log.info("🚀 LoadingViewController: Transitioning to AR view...")
         
-        let arView = ARView()
+        let arView = makeARView()
         arView.modalPresentationStyle = .fullScreen
         arView.modalTransitionStyle = .crossDissolve
         
         present(arView, animated: true) {
-            NSLog("✅ LoadingViewController: AR view presented")
+            Log.info("✅ LoadingViewController: AR view presented")
         }
     }
     
+    /// Same repository, so the AR scene starts from the snapshot found here
+    func makeARView() -> ARView {
+        return ARView(flightRepository: flightRepository)
+    }
+    
     deinit {
         transitionTimer?.invalidate()
         timeoutTimer?.invalidate()
@@ -0,0 +1,108 @@
+import SceneKit
+import UIKit
+import simd
+
+/// Draws every flight's predicted trajectory as one line geometry per flight.
+///
+/// Replaces the old approach of one `SCNCylinder` node per interpolated
+/// segment (~600 nodes per flight). Each flight keeps a single node whose
+/// geometry is swapped only when its points actually change; all flights
+/// share one material.
+class TrajectoryRenderer {
+    
+    /// Parent of all trajectory nodes; add once to the scene
+    let rootNode = SCNNode()
+    
+    private let meshBuilder = TrajectoryMeshBuilder()
+    private let material: SCNMaterial
+    private var nodes: [String: SCNNode] = [:]
+    private(set) var meshes: [String: TrajectoryMesh] = [:]
+    private var renderedPoints: [String: [SIMD3<Float>]] = [:]
+    
+    init(color: UIColor = UIColor.cyan.withAlphaComponent(0.8)) {
+        material = SCNMaterial()
+        material.diffuse.contents = color
+        material.lightingModel = .constant
+        material.isDoubleSided = true
+        rootNode.name = "trajectories"
+    }
+    
+    /// Number of flights with a trajectory node
+    var count: Int {
+        return nodes.count
+    }
+    
+    // MARK: - Updates
+    
+    /// Show `points` for `flightId`; no-op when they match what is on screen
+    func update(flightId: String, points: [SIMD3<Float>]) {
+        guard points.count >= 2 else {
+            remove(flightId: flightId)
+            return
+        }
+        if renderedPoints[flightId] == points {
+            return
+        }
+        
+        // Rebuild inside the dictionary: copying the mesh out and back would
+        // leave a second reference to its arrays and force a reallocation
+        meshBuilder.rebuild(&meshes[flightId, default: TrajectoryMesh()], points: points)
+        guard let mesh = meshes[flightId], !mesh.isEmpty else {
+            remove(flightId: flightId)
+            return
+        }
+        
+        let node = nodes[flightId] ?? makeNode(for: flightId)
+        node.geometry = makeGeometry(from: mesh)
+        
+        renderedPoints[flightId] = points
+    }
+    
+    func remove(flightId: String) {
+        nodes.removeValue(forKey: flightId)?.removeFromParentNode()
+        meshes.removeValue(forKey: flightId)
+        renderedPoints.removeValue(forKey: flightId)
+    }
+    
+    func removeAll() {
+        for node in nodes.values {
+            node.removeFromParentNode()
+        }
+        nodes.removeAll()
+        meshes.removeAll()
+        renderedPoints.removeAll()
+    }
+    
+    // MARK: - Geometry
+    
+    private func makeNode(for flightId: String) -> SCNNode {
+        let node = SCNNode()
+        node.name = "trajectory_\(flightId)"
+        nodes[flightId] = node
+        rootNode.addChildNode(node)
+        return node
+    }
+    
+    private func makeGeometry(from mesh: TrajectoryMesh) -> SCNGeometry {
+        let source = SCNGeometrySource(
+            data: mesh.vertexData,
+            semantic: .vertex,
+            vectorCount: mesh.vertices.count,
+            usesFloatComponents: true,
+            componentsPerVector: 3,
+            bytesPerComponent: MemoryLayout<Float>.size,
+            dataOffset: 0,
+            dataStride: TrajectoryMeshBuilder.vertexStride
+        )
+        let element = SCNGeometryElement(
+            data: mesh.indexData,
+            primitiveType: .line,
+            primitiveCount: mesh.segmentCount,
+            bytesPerIndex: TrajectoryMeshBuilder.bytesPerIndex
+        )
+        
+        let geometry = SCNGeometry(sources: [source], elements: [element])
+        geometry.materials = [material]
+        return geometry
+    }
+}
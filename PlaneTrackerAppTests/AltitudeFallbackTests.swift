@@ -417,4 +417,74 @@ class AltitudeFallbackTests: XCTestCase {
             XCTAssertGreaterThanOrEqual(altitude, 0)
         }
     }
-}
\ No newline at end of file
+    
+    // MARK: - Batch Estimation Tests
+    
+    /// Mixed refresh touching every step of the cascade; `poll` advances time
+    private func makeRefresh(count: Int, poll: Int) -> [Flight] {
+        let timePosition = 1760024985 + poll * 10
+        return (0..<count).map { index in
+            let kind = (index + poll * 3) % 8
+            return Flight(
+                id: String(format: "%06x", index),
+                callsign: "TEST\(index)",
+                originCountry: "United States",
+                timePosition: kind == 7 ? nil : timePosition,
+                lastContact: timePosition,
+                longitude: -122.0 + Double(index % 100) * 0.01 + Double(poll) * 0.001,
+                latitude: 37.0 + Double(index / 100) * 0.01 + Double(poll * poll) * 0.0001,
+                baroAltitude: kind == 1 || kind == 7 ? 1000 + Double(index % 9000) : (kind == 2 ? 90000 : nil),
+                onGround: kind == 3,
+                velocity: kind == 5 || kind == 6 ? Double(index % 500) : nil,
+                trueTrack: nil,
+                verticalRate: kind == 4 || kind == 1 ? Double(index % 21) - 10 : nil,
+                sensors: nil,
+                geoAltitude: kind == 2 || kind == 6 ? 800 + Double(index % 7000) : nil,
+                squawk: nil,
+                spi: false,
+                positionSource: 0,
+                predictedAltitude: kind == 0 ? 2000 + Double(index % 5000) : nil,
+                altitudeConfidence: nil,
+                hasPredictedAltitude: kind == 0,
+                predictedTrajectory: nil
+            )
+        }
+    }
+    
+    func testBatchEstimationMatchesScalarPath() {
+        var currentTime: TimeInterval = 1760024985
+        let scalar = AltitudeFallback(now: { Date(timeIntervalSince1970: currentTime) })
+        let batch = AltitudeFallback(now: { Date(timeIntervalSince1970: currentTime) })
+        
+        var seenSources = Set<AltitudeSource>()
+        for poll in 0..<6 {
+            currentTime = 1760024985 + Double(poll * 10)
+            let flights = makeRefresh(count: 400, poll: poll)
+            
+            let expected = flights.map { scalar.estimateAltitudeWithSource(for: $0) }
+            let estimates = batch.estimateAltitudes(AltitudeColumns(flights: flights))
+            
+            XCTAssertEqual(estimates.altitudes, expected.map { $0.altitude }, "poll \(poll)")
+            XCTAssertEqual(estimates.sources, expected.map { $0.source }, "poll \(poll)")
+            seenSources.formUnion(estimates.sources)
+        }
+        
+        XCTAssertTrue(seenSources.isSuperset(of: [
+            .backendPrediction, .barometric, .geometric, .ground,
+            .kalmanPrediction, .verticalRateIntegration, .velocity
+        ]))
+    }
+    
+    func testBatchAltitudeEstimationThroughput() {
+        let refreshes = (0..<5).map { makeRefresh(count: 10_000, poll: $0) }
+        let columns = refreshes.map { AltitudeColumns(flights: $0) }
+        
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let fallback = AltitudeFallback(now: { Date(timeIntervalSince1970: 1760024985 + 60) })
+            for refresh in columns {
+                let estimates = fallback.estimateAltitudes(refresh)
+                XCTAssertEqual(estimates.altitudes.count, 10_000)
+            }
+        }
+    }
+}
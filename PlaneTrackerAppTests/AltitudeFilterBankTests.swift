@@ -0,0 +1,151 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class AltitudeFilterBankTests: XCTestCase {
+    var currentTime: TimeInterval = 1760024985
+    var altitudeFallback: AltitudeFallback!
+
+    override func setUp() {
+        super.setUp()
+        currentTime = 1760024985
+        altitudeFallback = AltitudeFallback(now: { [unowned self] in Date(timeIntervalSince1970: self.currentTime) })
+    }
+
+    override func tearDown() {
+        altitudeFallback = nil
+        super.tearDown()
+    }
+
+    private func makeFlight(id: String, baroAltitude: Double?, verticalRate: Double?, timePosition: Int) -> Flight {
+        return Flight(
+            id: id,
+            callsign: "TEST\(id)",
+            originCountry: "United States",
+            timePosition: timePosition,
+            lastContact: timePosition,
+            longitude: -122.2438,
+            latitude: 37.5637,
+            baroAltitude: baroAltitude,
+            onGround: false,
+            velocity: 220.0,
+            trueTrack: 297.82,
+            verticalRate: verticalRate,
+            sensors: nil,
+            geoAltitude: nil,
+            squawk: nil,
+            spi: false,
+            positionSource: 0
+        )
+    }
+
+    // MARK: - Filter Tests
+
+    func testTracksAreIndependentPerAircraft() {
+        let start = Int(currentTime)
+        _ = altitudeFallback.estimateAltitudes(for: [
+            makeFlight(id: "low", baroAltitude: 1000, verticalRate: 0, timePosition: start),
+            makeFlight(id: "high", baroAltitude: 11000, verticalRate: 0, timePosition: start)
+        ])
+
+        // Both lose their altitude; each must coast on its own state
+        currentTime += 10
+        let altitudes = altitudeFallback.estimateAltitudes(for: [
+            makeFlight(id: "low", baroAltitude: nil, verticalRate: 0, timePosition: start + 10),
+            makeFlight(id: "high", baroAltitude: nil, verticalRate: 0, timePosition: start + 10)
+        ])
+
+        XCTAssertEqual(altitudes["low"] ?? 0, 1000, accuracy: 1)
+        XCTAssertEqual(altitudes["high"] ?? 0, 11000, accuracy: 1)
+        XCTAssertEqual(altitudeFallback.filterBank.count, 2)
+    }
+
+    func testPredictionFollowsFusedClimbRate() {
+        let bank = AltitudeFilterBank()
+        for second in 0...30 {
+            bank.update(flightId: "a0f355", with: AltitudeMeasurement(
+                time: currentTime + Double(second),
+                altitude: 3000 + 10 * Double(second),
+                verticalRate: 10
+            ))
+        }
+
+        let track = bank.track(for: "a0f355")!
+        XCTAssertEqual(track.altitude, 3300, accuracy: 5)
+        XCTAssertEqual(track.verticalRate, 10, accuracy: 0.5)
+        XCTAssertEqual(track.measurements.count, bank.historyCapacity)
+        XCTAssertEqual(track.measurements.last?.altitude, 3300)
+
+        let predicted = bank.predictedAltitude(for: "a0f355", at: currentTime + 40)!
+        XCTAssertEqual(predicted.altitude, 3400, accuracy: 10)
+        // Uncertainty grows while coasting
+        XCTAssertGreaterThan(predicted.variance, track.altitudeVariance)
+    }
+
+    func testRepeatedReportIsNotFusedTwice() {
+        let bank = AltitudeFilterBank()
+        let measurement = AltitudeMeasurement(time: currentTime, altitude: 5000, verticalRate: nil)
+        bank.update(flightId: "a0f355", with: AltitudeMeasurement(time: currentTime - 5, altitude: 5000, verticalRate: nil))
+        bank.update(flightId: "a0f355", with: measurement)
+        let variance = bank.track(for: "a0f355")!.altitudeVariance
+
+        bank.update(flightId: "a0f355", with: measurement)
+
+        XCTAssertEqual(bank.track(for: "a0f355")!.altitudeVariance, variance)
+        XCTAssertEqual(bank.track(for: "a0f355")!.measurements.count, 2)
+    }
+
+    func testIdleTracksAreEvicted() {
+        let start = Int(currentTime)
+        _ = altitudeFallback.estimateAltitudes(for: [
+            makeFlight(id: "gone", baroAltitude: 9000, verticalRate: 0, timePosition: start),
+            makeFlight(id: "stays", baroAltitude: 9000, verticalRate: 0, timePosition: start)
+        ])
+
+        currentTime += altitudeFallback.filterBank.idleTimeout + 1
+        _ = altitudeFallback.estimateAltitudes(for: [
+            makeFlight(id: "stays", baroAltitude: 9100, verticalRate: 0, timePosition: Int(currentTime))
+        ])
+
+        XCTAssertNil(altitudeFallback.filterBank.track(for: "gone"))
+        XCTAssertNotNil(altitudeFallback.filterBank.track(for: "stays"))
+        XCTAssertGreaterThan(altitudeFallback.getConfidenceScore(for: "stays"), 0.5)
+        XCTAssertEqual(altitudeFallback.getConfidenceScore(for: "gone"), 0)
+    }
+
+    func testRingBufferOverwritesOldest() {
+        var buffer = RingBuffer<Int>(capacity: 3)
+        for value in 1...5 {
+            buffer.append(value)
+        }
+
+        XCTAssertEqual(Array(buffer), [3, 4, 5])
+        XCTAssertEqual(buffer.append(6), 3)
+        XCTAssertEqual(buffer.first, 4)
+        XCTAssertEqual(buffer.last, 6)
+    }
+
+    // MARK: - Performance Tests
+
+    func testFilterBankPerformanceWith5kTracks() {
+        let start = Int(currentTime)
+        let flightsPerPoll = (0..<20).map { poll in
+            (0..<5_000).map { index in
+                makeFlight(
+                    id: String(format: "%06x", index),
+                    baroAltitude: Double(1000 + index % 11_000) + Double(poll) * 5,
+                    verticalRate: 1.0,
+                    timePosition: start + poll * 5
+                )
+            }
+        }
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let fallback = AltitudeFallback(now: { Date(timeIntervalSince1970: TimeInterval(start)) })
+            for flights in flightsPerPoll {
+                let altitudes = fallback.estimateAltitudes(for: flights)
+                XCTAssertEqual(altitudes.count, 5_000)
+            }
+            XCTAssertEqual(fallback.filterBank.count, 5_000)
+        }
+    }
+}
@@ -0,0 +1,253 @@
+import XCTest
+import Combine
+@testable import PlaneTrackerApp
+
+class BackendSessionTests: XCTestCase {
+    var server: StubHTTPServer!
+    var session: BackendSession!
+
+    override func setUpWithError() throws {
+        try super.setUpWithError()
+        server = try StubHTTPServer { _ in
+            StubHTTPServer.Response.json(["success": true], headers: ["ETag": "\"v1\""])
+        }
+        try server.start()
+        session = BackendSession()
+    }
+
+    override func tearDown() {
+        server.stop()
+        server = nil
+        session = nil
+        super.tearDown()
+    }
+
+    private func url(_ path: String) -> URL {
+        return URL(string: server.baseURL + path)!
+    }
+
+    private func get(_ path: String, endpoint: BackendEndpoint = .flights,
+                     accept: String = "application/json") -> Result<BackendSessionResponse, Error> {
+        let done = expectation(description: "GET \(path)")
+        var received: Result<BackendSessionResponse, Error>!
+        session.get(url(path), endpoint: endpoint, accept: accept) { result in
+            received = result
+            done.fulfill()
+        }
+        wait(for: [done], timeout: 5)
+        return received
+    }
+
+    // MARK: - Conditional Requests
+
+    func testReplaysETagAndReturnsCachedBodyOnNotModified() throws {
+        server.setHandler { request in
+            if request.header("If-None-Match") == "\"v1\"" {
+                return StubHTTPServer.Response(status: 304, headers: ["ETag": "\"v1\""])
+            }
+            return StubHTTPServer.Response.json(["success": true], headers: ["ETag": "\"v1\""])
+        }
+
+        let first = try get("/api/flights").get()
+        let second = try get("/api/flights").get()
+
+        XCTAssertFalse(first.isNotModified)
+        XCTAssertTrue(second.isNotModified)
+        XCTAssertEqual(second.data, first.data)
+        XCTAssertNil(server.requests[0].header("If-None-Match"))
+        XCTAssertEqual(server.requests[1].header("If-None-Match"), "\"v1\"")
+    }
+
+    func testNotModifiedKeepsTheCachedContentType() throws {
+        server.setHandler { request in
+            if request.header("If-None-Match") == "\"v1\"" {
+                return StubHTTPServer.Response(status: 304, headers: ["ETag": "\"v1\""])
+            }
+            return StubHTTPServer.Response(status: 200, headers: ["ETag": "\"v1\"", "Content-Type": CompactFlightsCodec.contentType],
+                                           body: Data([0x50, 0x54, 0x46, 0x31]))
+        }
+
+        _ = try get("/api/flights", accept: CompactFlightsCodec.contentType).get()
+        let second = try get("/api/flights", accept: CompactFlightsCodec.contentType).get()
+
+        XCTAssertTrue(second.isNotModified)
+        XCTAssertEqual(second.header("Content-Type"), CompactFlightsCodec.contentType)
+    }
+
+    func testValidatorsAreKeptPerAcceptedFormat() throws {
+        server.setHandler { request in
+            let etag = request.header("Accept") == "application/json" ? "\"json\"" : "\"compact\""
+            return StubHTTPServer.Response.json(["success": true], headers: ["ETag": etag])
+        }
+
+        _ = try get("/api/flights").get()
+        _ = try get("/api/flights", accept: CompactFlightsCodec.contentType).get()
+        _ = try get("/api/flights").get()
+
+        XCTAssertNil(server.requests[1].header("If-None-Match"))
+        XCTAssertEqual(server.requests[2].header("If-None-Match"), "\"json\"")
+    }
+
+    func testNegotiatesCompression() throws {
+        _ = try get("/api/flights").get()
+
+        let acceptEncoding = server.requests.first?.header("Accept-Encoding") ?? ""
+        XCTAssertTrue(acceptEncoding.contains("gzip"))
+        XCTAssertTrue(acceptEncoding.contains("deflate"))
+    }
+
+    func testServerErrorFails() {
+        server.setHandler { _ in StubHTTPServer.Response(status: 500) }
+
+        XCTAssertThrowsError(try get("/api/flights").get())
+    }
+
+    // MARK: - Connection Reuse and Coalescing
+
+    func testReusesConnectionAcrossRequests() throws {
+        for _ in 0..<3 {
+            _ = try get("/api/flights").get()
+        }
+
+        XCTAssertEqual(server.requests.count, 3)
+        XCTAssertEqual(server.connectionCount, 1)
+    }
+
+    func testCoalescesConcurrentIdenticalRequests() {
+        server.setHandler { _ in
+            var response = StubHTTPServer.Response.json(["success": true])
+            response.delay = 0.3
+            return response
+        }
+
+        let callers = 5
+        let done = expectation(description: "all callers answered")
+        done.expectedFulfillmentCount = callers
+        var bodies: [Data] = []
+        let lock = NSLock()
+
+        for _ in 0..<callers {
+            session.get(url("/api/flights"), endpoint: .flights) { result in
+                lock.lock()
+                bodies.append((try? result.get().data) ?? Data())
+                lock.unlock()
+                done.fulfill()
+            }
+        }
+        wait(for: [done], timeout: 5)
+
+        XCTAssertEqual(server.requests.count, 1)
+        XCTAssertEqual(Set(bodies).count, 1)
+        XCTAssertEqual(session.metrics(for: .flights).coalescedCount, callers - 1)
+    }
+
+    // MARK: - Metrics
+
+    func testRecordsPerEndpointMetrics() throws {
+        _ = try get("/api/flights/abc/trajectory", endpoint: .trajectory).get()
+        _ = try get("/api/flights/abc/trajectory", endpoint: .trajectory).get()
+
+        let recorded = NSPredicate { _, _ in self.session.metrics(for: .trajectory).requestCount == 2 }
+        wait(for: [XCTNSPredicateExpectation(predicate: recorded, object: nil)], timeout: 5)
+
+        let metrics = session.metrics(for: .trajectory)
+        XCTAssertGreaterThan(metrics.bytesReceived, 0)
+        XCTAssertGreaterThan(metrics.bytesSent, 0)
+        XCTAssertGreaterThan(metrics.averageLatency, 0)
+        XCTAssertEqual(session.metrics(for: .flights).requestCount, 0)
+    }
+
+    // MARK: - BackendService Integration
+
+    func testBackendServiceFetchesThroughSession() {
+        server.setHandler { _ in
+            StubHTTPServer.Response.json([
+                "success": true,
+                "count": 1,
+                "timestamp": "2025-10-09T12:00:00Z",
+                "flights": [[
+                    "icao24": "a0f355", "callsign": "SKW5596", "originCountry": "United States",
+                    "timePosition": 1760024985, "lastContact": 1760024985,
+                    "longitude": -122.2438, "latitude": 37.5637, "baroAltitude": 586.74,
+                    "onGround": false, "velocity": 94.81, "trueTrack": 297.82, "verticalRate": -4.88,
+                    "geoAltitude": 563.88, "spi": false, "positionSource": 0
+                ]]
+            ], headers: ["ETag": "\"snapshot-1\""])
+        }
+        let service = BackendService(baseURL: server.baseURL, session: session)
+
+        let received = expectation(description: "flights published")
+        let cancellable = service.flightChanges.sink { changes in
+            XCTAssertEqual(changes.added.map { $0.id }, ["a0f355"])
+            received.fulfill()
+        }
+        service.fetchFlights()
+        wait(for: [received], timeout: 5)
+        cancellable.cancel()
+
+        XCTAssertEqual(service.flights.count, 1)
+    }
+
+    // MARK: - Bulk Trajectories
+
+    func testBulkTrajectoriesChunkAndFillCache() throws {
+        server.setHandler { request in
+            guard request.method == "POST", request.path == "/api/flights/trajectories",
+                  let payload = try? JSONSerialization.jsonObject(with: request.body) as? [String: Any],
+                  let ids = payload["flight_ids"] as? [String] else {
+                return StubHTTPServer.Response(status: 400)
+            }
+            var trajectories: [String: Any] = [:]
+            // The backend omits flights it cannot predict
+            for id in ids where id != "unknown" {
+                trajectories[id] = [[
+                    "latitude": 37.5637, "longitude": -122.2438, "altitude": 586.74,
+                    "time_offset": 0.0, "distance_from_current": 0.0, "bearing": 0.0
+                ]]
+            }
+            return StubHTTPServer.Response.json([
+                "success": true,
+                "prediction_time": payload["prediction_time"] ?? 0,
+                "timestamp": "2025-10-09T12:00:00Z",
+                "trajectories": trajectories
+            ])
+        }
+        let service = BackendService(baseURL: server.baseURL, session: session)
+        let ids = (0..<600).map { String(format: "t%05x", $0) }
+
+        let done = expectation(description: "bulk fetch")
+        var fetched: [String: [TrajectoryPoint]] = [:]
+        Task {
+            fetched = (try? await service.fetchTrajectories(flightIds: ids + ids.prefix(10) + ["unknown"], predictionTime: 30)) ?? [:]
+            done.fulfill()
+        }
+        wait(for: [done], timeout: 10)
+
+        XCTAssertEqual(fetched.count, 600)
+        XCTAssertNil(fetched["unknown"])
+        XCTAssertEqual(server.requests.count, 3) // 601 unique ids / 250 per request
+        XCTAssertEqual(service.cachedTrajectory(for: "t00000")?.first?.altitude, 586.74)
+
+        // Chunks go out in parallel, so compare them in any order
+        let bodies = try server.requests.map { try JSONSerialization.jsonObject(with: $0.body) as? [String: Any] }
+        XCTAssertEqual(bodies.compactMap { ($0?["flight_ids"] as? [String])?.count }.sorted(), [101, 250, 250])
+        XCTAssertTrue(bodies.allSatisfy { $0?["prediction_time"] as? Double == 30 })
+    }
+
+    func testTrajectoryCacheExpiresAndIsBounded() {
+        let service = BackendService(baseURL: server.baseURL, session: session)
+        service.maximumCachedTrajectories = 2
+        let start = Date(timeIntervalSince1970: 1760024985)
+        let point = TrajectoryPoint(latitude: 37.5637, longitude: -122.2438, altitude: 586.74,
+                                    timeOffset: 0, distanceFromCurrent: 0, bearing: 0)
+
+        service.storeTrajectories(["a": [point]], at: start)
+        service.storeTrajectories(["b": [point]], at: start.addingTimeInterval(1))
+        service.storeTrajectories(["c": [point]], at: start.addingTimeInterval(2))
+
+        XCTAssertEqual(service.cachedTrajectoryCount, 2)
+        XCTAssertNil(service.cachedTrajectory(for: "a", now: start.addingTimeInterval(2)))
+        XCTAssertNotNil(service.cachedTrajectory(for: "c", now: start.addingTimeInterval(2)))
+        XCTAssertNil(service.cachedTrajectory(for: "c", now: start.addingTimeInterval(2 + service.trajectoryLifetime)))
+    }
+}
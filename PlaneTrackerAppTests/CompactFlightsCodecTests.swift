@@ -0,0 +1,208 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class CompactFlightsCodecTests: XCTestCase {
+    var codec: CompactFlightsCodec!
+
+    override func setUp() {
+        super.setUp()
+        codec = CompactFlightsCodec()
+    }
+
+    override func tearDown() {
+        codec = nil
+        super.tearDown()
+    }
+
+    // MARK: - Fixtures
+
+    /// Backend-style flight dictionaries; every third one carries a 31-point trajectory
+    static func makeBackendFlights(count: Int) -> [[String: Any]] {
+        return (0..<count).map { i in
+            var flight: [String: Any] = [
+                "icao24": String(format: "c%05x", i),
+                "callsign": String(format: "UAL%04d", i % 10000),
+                "originCountry": i % 4 == 0 ? "Canada" : "United States",
+                "timePosition": 1760024980 + i % 5,
+                "lastContact": 1760024985,
+                "longitude": -125.00041 + Double(i % 991) * 0.0211,
+                "latitude": 30.00037 + Double(i % 997) * 0.0137,
+                "baroAltitude": 1000.3 + Double(i % 40) * 250.17,
+                "onGround": false,
+                "velocity": 90.5 + Double(i % 180),
+                "trueTrack": Double(i % 360) + 0.25,
+                "verticalRate": Double(i % 21) - 10.5,
+                "geoAltitude": 1020.7 + Double(i % 40) * 250.13,
+                "spi": false,
+                "positionSource": 0,
+                "predictedAltitude": 1010.1 + Double(i % 40) * 250.11,
+                "altitudeConfidence": 0.85,
+                "hasPredictedAltitude": true
+            ]
+            if i % 7 == 0 {
+                flight["squawk"] = "\(1200 + i % 6000)"
+                flight["sensors"] = [i % 100, 42]
+            }
+            if i % 3 == 0 {
+                flight["predictedTrajectory"] = (0...30).map { step -> [String: Any] in
+                    let t = Double(step) * 2.0
+                    return [
+                        "latitude": 30.00037 + t * 0.0011,
+                        "longitude": -125.00041 + t * 0.0013,
+                        "altitude": 1000.3 + t * 3.5,
+                        "time_offset": t,
+                        "distance_from_current": t * 190.5,
+                        "bearing": 45.25
+                    ]
+                }
+            }
+            return flight
+        }
+    }
+
+    static func makeJSONPayload(count: Int) -> Data {
+        let response: [String: Any] = [
+            "success": true,
+            "count": count,
+            "timestamp": "2025-10-09T12:00:00Z",
+            "flights": makeBackendFlights(count: count)
+        ]
+        return try! JSONSerialization.data(withJSONObject: response)
+    }
+
+    private func decodeJSON(_ data: Data) throws -> [Flight] {
+        return try JSONDecoder().decode(BackendFlightsResponse.self, from: data).flights.map { Flight(from: $0) }
+    }
+
+    private func assertEqualFlights(_ lhs: [Flight], _ rhs: [Flight], file: StaticString = #file, line: UInt = #line) {
+        XCTAssertEqual(lhs.count, rhs.count, file: file, line: line)
+        for (a, b) in zip(lhs, rhs) {
+            XCTAssertTrue(a.hasSameState(as: b), "\(a.id) differs", file: file, line: line)
+            XCTAssertEqual(a.originCountry, b.originCountry, file: file, line: line)
+            XCTAssertEqual(a.sensors, b.sensors, file: file, line: line)
+            XCTAssertEqual(a.spi, b.spi, file: file, line: line)
+            XCTAssertEqual(a.positionSource, b.positionSource, file: file, line: line)
+            XCTAssertEqual(a.altitudeConfidence, b.altitudeConfidence, file: file, line: line)
+            XCTAssertEqual(a.hasPredictedAltitude, b.hasPredictedAltitude, file: file, line: line)
+            XCTAssertEqual(a.predictedTrajectory, b.predictedTrajectory, file: file, line: line)
+        }
+    }
+
+    // MARK: - Round Trip Tests
+
+    func testRoundTripMatchesJSONDecoding() throws {
+        let flights = try decodeJSON(CompactFlightsCodecTests.makeJSONPayload(count: 300))
+
+        let payload = try codec.decode(codec.encode(flights, timestamp: "2025-10-09T12:00:00Z"))
+
+        XCTAssertEqual(payload.timestamp, "2025-10-09T12:00:00Z")
+        assertEqualFlights(payload.flights, flights)
+        XCTAssertEqual(payload.flights[0].predictedTrajectory?.count, 31)
+    }
+
+    func testRoundTripPreservesNils() throws {
+        let flight = Flight(
+            id: "a0f355",
+            callsign: "",
+            originCountry: "United States",
+            timePosition: nil,
+            lastContact: 1760024985,
+            longitude: nil,
+            latitude: nil,
+            baroAltitude: nil,
+            onGround: true,
+            velocity: nil,
+            trueTrack: nil,
+            verticalRate: nil,
+            sensors: nil,
+            geoAltitude: nil,
+            squawk: nil,
+            spi: true,
+            positionSource: 2
+        )
+
+        let decoded = try codec.decode(codec.encode([flight], timestamp: "")).flights
+
+        assertEqualFlights(decoded, [flight])
+        XCTAssertNil(decoded[0].predictedTrajectory)
+        XCTAssertNil(decoded[0].timePosition)
+        XCTAssertTrue(decoded[0].onGround)
+    }
+
+    func testRejectsTruncatedAndForeignPayloads() {
+        let encoded = codec.encode(Array(repeating: makeSampleFlight(), count: 4), timestamp: "t")
+
+        XCTAssertThrowsError(try codec.decode(encoded.prefix(encoded.count - 3)))
+        XCTAssertThrowsError(try codec.decode(CompactFlightsCodecTests.makeJSONPayload(count: 1)))
+    }
+
+    func testLongStringsAreCutOnCharacterBoundaries() throws {
+        let prefix = String(repeating: "a", count: Int(UInt16.max) - 1)
+        // "é" is two bytes and would straddle the 65535-byte limit
+        let encoded = codec.encode([makeSampleFlight()], timestamp: prefix + "é" + "b")
+
+        XCTAssertEqual(try codec.decode(encoded).timestamp, prefix)
+    }
+
+    private func makeSampleFlight() -> Flight {
+        return Flight(id: "a0f355", callsign: "SKW5596", originCountry: "United States",
+                      timePosition: 1760024985, lastContact: 1760024985, longitude: -122.2438, latitude: 37.5637,
+                      baroAltitude: 586.74, onGround: false, velocity: 94.81, trueTrack: 297.82, verticalRate: -4.88,
+                      sensors: nil, geoAltitude: 563.88, squawk: "4521", spi: false, positionSource: 0)
+    }
+
+    // MARK: - Negotiation
+
+    func testBackendServiceNegotiatesCompactFormat() throws {
+        let flights = try decodeJSON(CompactFlightsCodecTests.makeJSONPayload(count: 25))
+        let body = codec.encode(flights, timestamp: "2025-10-09T12:00:00Z")
+        let server = try StubHTTPServer { request in
+            guard request.header("Accept")?.contains(CompactFlightsCodec.contentType) == true else {
+                return StubHTTPServer.Response(status: 406)
+            }
+            return StubHTTPServer.Response(status: 200, headers: ["Content-Type": CompactFlightsCodec.contentType], body: body)
+        }
+        try server.start()
+        defer { server.stop() }
+
+        let service = BackendService(baseURL: server.baseURL)
+        let received = expectation(description: "flights published")
+        let cancellable = service.flightChanges.sink { _ in received.fulfill() }
+        service.fetchFlights()
+        wait(for: [received], timeout: 5)
+        cancellable.cancel()
+
+        XCTAssertEqual(service.flights.count, 25)
+    }
+
+    // MARK: - Size and Performance
+
+    func testCompactPayloadIsSmallerThanJSON() throws {
+        let json = CompactFlightsCodecTests.makeJSONPayload(count: 5000)
+        let compact = codec.encode(try decodeJSON(json), timestamp: "2025-10-09T12:00:00Z")
+
+        XCTAssertLessThan(compact.count, json.count / 2)
+
+        let sizes = XCTAttachment(string: "JSON \(json.count) bytes, compact \(compact.count) bytes")
+        sizes.name = "Flights payload for 5000 aircraft"
+        add(sizes)
+    }
+
+    func testCompactDecodePerformance5k() throws {
+        let compact = codec.encode(try decodeJSON(CompactFlightsCodecTests.makeJSONPayload(count: 5000)), timestamp: "t")
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let payload = try? codec.decode(compact)
+            XCTAssertEqual(payload?.flights.count, 5000)
+        }
+    }
+
+    func testJSONDecodePerformance5k() {
+        let json = CompactFlightsCodecTests.makeJSONPayload(count: 5000)
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let flights = try? decodeJSON(json)
+            XCTAssertEqual(flights?.count, 5000)
+        }
+    }
+}
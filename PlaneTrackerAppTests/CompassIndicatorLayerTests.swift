@@ -0,0 +1,71 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class CompassIndicatorLayerTests: XCTestCase {
+
+    private func makeLayer() -> CompassIndicatorLayer {
+        let layer = CompassIndicatorLayer()
+        layer.frame = CGRect(x: 0, y: 0, width: 120, height: 120)
+        layer.minimumBearingChange = 0.5
+        return layer
+    }
+
+    func testDiffAddsMovesAndRemovesByIcao24() {
+        let layer = makeLayer()
+        XCTAssertTrue(layer.update(bearings: ["a1": 0, "b2": 90, "c3": 180]) == (added: 3, moved: 0, removed: 0))
+
+        let changes = layer.update(bearings: ["a1": 0.2, "b2": 95, "d4": 270])
+
+        XCTAssertTrue(changes == (added: 1, moved: 1, removed: 1))
+        XCTAssertEqual(layer.indicatorCount, 3)
+        XCTAssertEqual(layer.bearing(for: "a1"), 0) // below the change threshold
+        XCTAssertEqual(layer.bearing(for: "b2"), 95)
+        XCTAssertNil(layer.bearing(for: "c3"))
+    }
+
+    func testAngularChangeWrapsAroundNorth() {
+        let layer = makeLayer()
+        layer.update(bearings: ["a1": 359.9])
+
+        XCTAssertTrue(layer.update(bearings: ["a1": 0.1]) == (added: 0, moved: 0, removed: 0))
+    }
+
+    func testLayersAreReusedAcrossRefreshes() {
+        let layer = makeLayer()
+        let first = Dictionary(uniqueKeysWithValues: (0..<300).map { ("A\($0)", Double($0)) })
+        let second = Dictionary(uniqueKeysWithValues: (0..<300).map { ("B\($0)", Double($0)) })
+
+        layer.update(bearings: first)
+        layer.update(bearings: second)
+        layer.update(bearings: first)
+
+        XCTAssertEqual(layer.allocatedIndicatorCount, 300)
+        XCTAssertEqual(layer.indicatorCount, 300)
+        XCTAssertEqual(layer.sublayers?.count, 300)
+    }
+
+    func testIndicatorSitsOnRingAtBearing() {
+        let layer = makeLayer()
+        layer.ringRadius = 38
+
+        let east = layer.position(forBearing: 90)
+
+        XCTAssertEqual(east.x, 98, accuracy: 1e-9)
+        XCTAssertEqual(east.y, 60, accuracy: 1e-9)
+    }
+
+    // MARK: - Performance Tests
+
+    func testRefreshWithHundredsOfAircraft() {
+        let layer = makeLayer()
+        let refreshes = (0..<10).map { step in
+            Dictionary(uniqueKeysWithValues: (0..<500).map { ("F\($0 + step * 25)", Double(($0 * 7 + step) % 360)) })
+        }
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            for bearings in refreshes {
+                layer.update(bearings: bearings)
+            }
+        }
+    }
+}
@@ -115,6 +115,24 @@ class CoordinatesTests: XCTestCase {
         XCTAssertEqual(bearing, 270, accuracy: 1.0)
     }
     
+    func testBatchedBearingsMatchScalarBearing() {
+        let origin = CLLocationCoordinate2D(latitude: 37.8087, longitude: -122.4098)
+        let latitudes = (0..<257).map { 36.0 + Double($0 % 37) * 0.1 }
+        let longitudes = (0..<257).map { -124.0 + Double($0 % 41) * 0.1 }
+        
+        let bearings = MathHelpers.bearings(from: origin, latitudes: latitudes, longitudes: longitudes)
+        
+        XCTAssertEqual(bearings.count, latitudes.count)
+        for index in bearings.indices {
+            let expected = MathHelpers.bearing(fromLatitude: origin.latitude, longitude: origin.longitude,
+                                               toLatitude: latitudes[index], longitude: longitudes[index])
+            XCTAssertEqual(bearings[index], expected, accuracy: 1e-9)
+            XCTAssertGreaterThanOrEqual(bearings[index], 0)
+            XCTAssertLessThan(bearings[index], 360)
+        }
+        XCTAssertEqual(MathHelpers.bearings(from: origin, latitudes: [], longitudes: []), [])
+    }
+    
     // MARK: - ARKit Utilities Tests
     
     func testARFieldOfView() {
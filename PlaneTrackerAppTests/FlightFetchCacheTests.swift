@@ -0,0 +1,125 @@
+import XCTest
+import Combine
+@testable import PlaneTrackerApp
+
+class FlightFetchCacheTests: XCTestCase {
+    let start = Date(timeIntervalSince1970: 1760024985)
+
+    private func makeFlight(_ id: String) -> Flight {
+        return Flight(id: id, callsign: "TEST\(id)", originCountry: "United States",
+                      timePosition: 1760024985, lastContact: 1760024985, longitude: -122.2438, latitude: 37.5637,
+                      baroAltitude: 586.74, onGround: false, velocity: 94.81, trueTrack: 297.82, verticalRate: -4.88,
+                      sensors: nil, geoAltitude: 563.88, squawk: nil, spi: false, positionSource: 0)
+    }
+
+    // MARK: - Freshness Windows
+
+    func testLookupFollowsFreshnessAndStalenessWindows() {
+        let cache = FlightFetchCache(policy: FlightCachePolicy(freshness: 8, maximumStaleness: 60))
+        XCTAssertEqual(cache.lookup(at: start), .miss)
+        XCTAssertNil(cache.age(at: start))
+
+        cache.store([makeFlight("a")], at: start)
+
+        XCTAssertEqual(cache.lookup(at: start.addingTimeInterval(7.5)), .fresh)
+        XCTAssertEqual(cache.lookup(at: start.addingTimeInterval(8)), .stale)
+        XCTAssertEqual(cache.lookup(at: start.addingTimeInterval(59)), .stale)
+        XCTAssertEqual(cache.lookup(at: start.addingTimeInterval(60)), .miss)
+        XCTAssertEqual(cache.age(at: start.addingTimeInterval(12)), 12)
+    }
+
+    func testEmptySnapshotIsAMiss() {
+        let cache = FlightFetchCache()
+        cache.store([], at: start)
+
+        XCTAssertEqual(cache.lookup(at: start), .miss)
+        XCTAssertNil(cache.age(at: start))
+    }
+
+    func testRevalidationRestartsTheClock() {
+        let cache = FlightFetchCache(policy: FlightCachePolicy(freshness: 8, maximumStaleness: 60))
+        cache.revalidate(at: start)
+        XCTAssertNil(cache.storedAt)
+
+        cache.store([makeFlight("a")], at: start)
+        cache.revalidate(at: start.addingTimeInterval(30))
+
+        XCTAssertEqual(cache.lookup(at: start.addingTimeInterval(35)), .fresh)
+        XCTAssertEqual(cache.flights.map { $0.id }, ["a"])
+    }
+
+    func testOnlyOneRefreshAtATime() {
+        let cache = FlightFetchCache()
+
+        XCTAssertTrue(cache.beginRefresh())
+        XCTAssertFalse(cache.beginRefresh())
+        cache.endRefresh()
+        XCTAssertTrue(cache.beginRefresh())
+    }
+
+    // MARK: - Stale-While-Revalidate
+
+    func testStaleSnapshotIsServedWhileOneRefreshRuns() throws {
+        var flightIds = ["a0f355"]
+        let lock = NSLock()
+        let server = try StubHTTPServer { _ in
+            lock.lock()
+            let ids = flightIds
+            lock.unlock()
+            var response = StubHTTPServer.Response.json([
+                "success": true,
+                "count": ids.count,
+                "timestamp": "2025-10-09T12:00:00Z",
+                "flights": ids.map { id in [
+                    "icao24": id, "callsign": "SKW5596", "originCountry": "United States",
+                    "timePosition": 1760024985, "lastContact": 1760024985,
+                    "longitude": -122.2438, "latitude": 37.5637, "baroAltitude": 586.74,
+                    "onGround": false, "velocity": 94.81, "trueTrack": 297.82, "verticalRate": -4.88,
+                    "geoAltitude": 563.88, "spi": false, "positionSource": 0
+                ] }
+            ])
+            response.delay = ids.count > 1 ? 0.3 : 0
+            return response
+        }
+        try server.start()
+        defer { server.stop() }
+
+        // Every snapshot is stale as soon as it lands
+        let service = BackendService(baseURL: server.baseURL,
+                                     cachePolicy: FlightCachePolicy(freshness: 0, maximumStaleness: 60))
+
+        let first = expectation(description: "first fetch")
+        var cancellable = service.flightChanges.sink { _ in first.fulfill() }
+        service.fetchFlights()
+        XCTAssertTrue(service.isLoading)
+        wait(for: [first], timeout: 5)
+        cancellable.cancel()
+
+        lock.lock()
+        flightIds.append("a0f356")
+        lock.unlock()
+
+        let revalidated = expectation(description: "background refresh published")
+        cancellable = service.flightChanges.sink { changes in
+            if changes.added.map({ $0.id }) == ["a0f356"] {
+                revalidated.fulfill()
+            }
+        }
+        service.fetchFlights()
+        XCTAssertFalse(service.isLoading)
+        XCTAssertTrue(service.isRefreshing)
+        XCTAssertEqual(service.flights.count, 1)
+
+        // Polls while the refresh is outstanding do not start another
+        service.fetchFlights()
+        service.fetchFlights()
+
+        wait(for: [revalidated], timeout: 5)
+        cancellable.cancel()
+
+        XCTAssertEqual(server.requests.count, 2)
+        XCTAssertEqual(service.flights.count, 2)
+        XCTAssertFalse(service.isRefreshing)
+        XCTAssertLessThan(service.cacheAge ?? .infinity, 5)
+    }
+}
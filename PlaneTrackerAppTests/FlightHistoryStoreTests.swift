@@ -0,0 +1,104 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class FlightHistoryStoreTests: XCTestCase {
+    let start = 1760024985
+
+    private func makeFlight(id: String = "a0f355",
+                            at timePosition: Int,
+                            latitude: Double = 37.5637,
+                            longitude: Double = -122.2438,
+                            baroAltitude: Double? = nil,
+                            velocity: Double? = nil,
+                            verticalRate: Double? = nil) -> Flight {
+        return Flight(
+            id: id,
+            callsign: "SKW5596",
+            originCountry: "United States",
+            timePosition: timePosition,
+            lastContact: timePosition,
+            longitude: longitude,
+            latitude: latitude,
+            baroAltitude: baroAltitude,
+            onGround: false,
+            velocity: velocity,
+            trueTrack: nil,
+            verticalRate: verticalRate,
+            sensors: nil,
+            geoAltitude: nil,
+            squawk: nil,
+            spi: false,
+            positionSource: 0
+        )
+    }
+
+    // MARK: - Store Tests
+
+    func testLastKnownAltitudeOutlivesRingCapacity() {
+        let store = FlightHistoryStore(capacity: 4)
+        store.record(makeFlight(at: start, baroAltitude: 3000))
+        for second in 1...10 {
+            store.record(makeFlight(at: start + second))
+        }
+
+        XCTAssertEqual(store.samples(for: "a0f355")?.count, 4)
+        XCTAssertEqual(store.lastKnownAltitude(for: "a0f355")?.altitude, 3000)
+        XCTAssertEqual(store.lastKnownAltitude(for: "a0f355")?.time, TimeInterval(start))
+        XCTAssertNil(store.lastKnownAltitude(for: "unknown"))
+    }
+
+    func testStaleAndRepeatedReportsAreIgnored() {
+        let store = FlightHistoryStore()
+        store.record(makeFlight(at: start + 10, latitude: 37.6))
+        store.record(makeFlight(at: start + 10, latitude: 37.7))
+        store.record(makeFlight(at: start, latitude: 37.8))
+
+        XCTAssertEqual(store.recentPositions(for: "a0f355", limit: 5).map { $0.latitude }, [37.6])
+    }
+
+    func testRecentPositionsAreOldestFirstAndLimited() {
+        let store = FlightHistoryStore()
+        store.record((0..<8).map { makeFlight(at: start + $0, latitude: 37.0 + Double($0)) })
+
+        XCTAssertEqual(store.recentPositions(for: "a0f355", limit: 3).map { $0.latitude }, [42.0, 43.0, 44.0])
+    }
+
+    // MARK: - Fallback Integration Tests
+
+    func testVerticalRateIntegratesFromLastKnownAltitude() {
+        var currentTime = TimeInterval(start)
+        let fallback = AltitudeFallback(now: { Date(timeIntervalSince1970: currentTime) })
+        _ = fallback.estimateAltitude(for: makeFlight(at: start, baroAltitude: 3000, verticalRate: 5))
+
+        // Past the Kalman extrapolation window, so rate integration answers
+        currentTime += 200
+        let altitude = fallback.estimateAltitude(for: makeFlight(at: start + 200, verticalRate: 5))
+
+        XCTAssertEqual(altitude, 4000, accuracy: 0.001)
+    }
+
+    func testFlightPhaseAnalysisWithSeveralPositions() {
+        let fallback = AltitudeFallback(now: { Date(timeIntervalSince1970: TimeInterval(self.start)) })
+        var altitude = -1.0
+
+        // Used to index past the end of the position list once three or more reports existed
+        for step in 0..<6 {
+            altitude = fallback.estimateAltitude(for: makeFlight(
+                at: start + step * 5,
+                latitude: 37.5 + 0.01 * Double(step),
+                longitude: -122.2 + 0.001 * Double(step * step)
+            ))
+        }
+
+        XCTAssertTrue([20000.0, 30000.0, 35000.0].contains(altitude))
+    }
+
+    func testLegacyHistoryArgumentIsRecorded() {
+        let fallback = AltitudeFallback(now: { Date(timeIntervalSince1970: TimeInterval(self.start + 300)) })
+        let history = [makeFlight(at: start, baroAltitude: 2000)]
+
+        let altitude = fallback.estimateAltitude(for: makeFlight(at: start + 100, verticalRate: -10), with: history)
+
+        XCTAssertEqual(altitude, 1000, accuracy: 0.001)
+    }
+}
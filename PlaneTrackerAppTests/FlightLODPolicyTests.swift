@@ -0,0 +1,53 @@
+import XCTest
+import simd
+@testable import PlaneTrackerApp
+
+class FlightLODPolicyTests: XCTestCase {
+    let policy = FlightLODPolicy(fullDetailDistance: 40, spriteDistance: 50, spriteScale: 2)
+
+    func testNearAircraftGetFullDetailAndFarOnesASprite() {
+        XCTAssertEqual(policy.level(forDistance: 2, current: nil), .full)
+        XCTAssertEqual(policy.level(forDistance: 150, current: nil), .sprite)
+    }
+
+    func testHysteresisBandKeepsCurrentLevel() {
+        for distance: Float in [41, 45, 49] {
+            XCTAssertEqual(policy.level(forDistance: distance, current: .full), .full)
+            XCTAssertEqual(policy.level(forDistance: distance, current: .sprite), .sprite)
+        }
+        XCTAssertEqual(policy.level(forDistance: 51, current: .full), .sprite)
+        XCTAssertEqual(policy.level(forDistance: 39, current: .sprite), .full)
+    }
+
+    func testAircraftOscillatingAcrossOneThresholdDoesNotFlicker() {
+        var level: FlightDetailLevel? = .full
+        var changes = 0
+        for step in 0..<100 {
+            let distance: Float = step % 2 == 0 ? 48 : 52
+            let next = policy.level(forDistance: distance, current: level)
+            if next != level {
+                changes += 1
+            }
+            level = next
+        }
+        XCTAssertEqual(changes, 1)
+    }
+
+    func testSelectedAircraftKeepsFullDetail() {
+        XCTAssertEqual(policy.level(forDistance: 150, current: .sprite, isSelected: true), .full)
+    }
+
+    func testLevelUsesDistanceFromCamera() {
+        let camera = SIMD3<Float>(0, 0, 100)
+
+        XCTAssertEqual(policy.level(for: SIMD3<Float>(0, 10, 95), camera: camera, current: .sprite), .full)
+        XCTAssertEqual(policy.level(for: SIMD3<Float>(0, 10, -20), camera: camera, current: .full), .sprite)
+        XCTAssertEqual(policy.level(for: SIMD3<Float>(30, 0, 100), camera: camera, current: .full), .full)
+        XCTAssertEqual(policy.level(for: SIMD3<Float>(0, 0, -200), camera: camera, current: .sprite, isSelected: true), .full)
+    }
+
+    func testSpritesIgnoreZoom() {
+        XCTAssertEqual(policy.scale(for: .full, zoom: 3), 3)
+        XCTAssertEqual(policy.scale(for: .sprite, zoom: 3), 2)
+    }
+}
@@ -0,0 +1,74 @@
+import XCTest
+import SceneKit
+@testable import PlaneTrackerApp
+
+class FlightLabelCacheTests: XCTestCase {
+
+    func testUnchangedCallsignReusesGeometry() {
+        let cache = FlightLabelCache()
+
+        let first = cache.geometry(for: "UAL123")
+        let second = cache.geometry(for: "UAL123")
+
+        XCTAssertTrue(first === second)
+        XCTAssertEqual(cache.buildCount, 1)
+        XCTAssertEqual(first.string as? String, "UAL123")
+    }
+
+    func testStyleIsPartOfTheKey() {
+        let cache = FlightLabelCache()
+        var large = FlightLabelStyle.callsign
+        large.fontSize = 24
+
+        let regular = cache.geometry(for: "UAL123")
+        let enlarged = cache.geometry(for: "UAL123", style: large)
+
+        XCTAssertFalse(regular === enlarged)
+        XCTAssertEqual(cache.buildCount, 2)
+    }
+
+    func testEvictsLeastRecentlyUsedAtCapacity() {
+        let cache = FlightLabelCache(capacity: 2)
+
+        let first = cache.geometry(for: "A")
+        _ = cache.geometry(for: "B")
+        _ = cache.geometry(for: "A")
+        _ = cache.geometry(for: "C")
+
+        XCTAssertEqual(cache.count, 2)
+        XCTAssertTrue(cache.geometry(for: "A") === first)
+        XCTAssertEqual(cache.buildCount, 3)
+        _ = cache.geometry(for: "B")
+        XCTAssertEqual(cache.buildCount, 4)
+    }
+
+    // MARK: - Performance Tests
+
+    private let callsigns = (0..<300).map { "TEST\($0)" }
+
+    /// Previous behaviour: tessellate every label on every refresh
+    func testRebuildingLabelsPerRefresh() {
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            for callsign in self.callsigns {
+                let text = SCNText(string: callsign, extrusionDepth: 0.01)
+                text.font = UIFont.boldSystemFont(ofSize: 12)
+                text.flatness = 0.1
+                _ = text.boundingBox
+            }
+        }
+    }
+
+    func testCachedLabelsPerRefresh() {
+        let cache = FlightLabelCache()
+        for callsign in callsigns {
+            _ = cache.geometry(for: callsign)
+        }
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            for callsign in self.callsigns {
+                _ = cache.geometry(for: callsign)
+            }
+        }
+        XCTAssertEqual(cache.buildCount, callsigns.count)
+    }
+}
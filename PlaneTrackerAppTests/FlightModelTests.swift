@@ -110,6 +110,59 @@ class FlightModelTests: XCTestCase {
         }
     }
     
+    func testBackendTrajectoryDecodesIntoTypedBuffer() throws {
+        let jsonData = """
+        {
+            "icao24": "a0f355", "callsign": "SKW5596", "originCountry": "United States",
+            "timePosition": 1760024985, "lastContact": 1760024985,
+            "longitude": -122.2438, "latitude": 37.5637, "baroAltitude": 586.74,
+            "onGround": false, "velocity": 94.81, "trueTrack": 297.82, "verticalRate": -4.88,
+            "geoAltitude": 563.88, "spi": false, "positionSource": 0,
+            "predictedTrajectory": [
+                {"latitude": 37.5637, "longitude": -122.2438, "altitude": 586.74,
+                 "time_offset": 0, "distance_from_current": 0, "bearing": 0},
+                {"latitude": 37.5631, "longitude": -122.2419, "altitude": 655.80,
+                 "time_offset": 2.0, "distance_from_current": 189.85, "bearing": 111.71}
+            ]
+        }
+        """.data(using: .utf8)!
+        
+        let flight = Flight(from: try JSONDecoder().decode(BackendFlight.self, from: jsonData))
+        
+        // Integral values such as "time_offset": 0 must not drop the point
+        let trajectory = try XCTUnwrap(flight.predictedTrajectory)
+        XCTAssertEqual(trajectory.count, 2)
+        XCTAssertEqual(trajectory.timeOffsets, [0.0, 2.0])
+        XCTAssertEqual(trajectory.altitudes, [586.74, 655.80])
+        XCTAssertEqual(trajectory[1].bearing, 111.71)
+        XCTAssertEqual(TrajectoryPredictor().predictTrajectory(for: flight).map { $0.distanceFromCurrent }, [0.0, 189.85])
+    }
+    
+    func testMalformedTrajectoryPointIsSkipped() throws {
+        let jsonData = """
+        {
+            "icao24": "a0f355", "callsign": "SKW5596", "originCountry": "United States",
+            "timePosition": 1760024985, "lastContact": 1760024985,
+            "longitude": -122.2438, "latitude": 37.5637, "baroAltitude": 586.74,
+            "onGround": false, "velocity": 94.81, "trueTrack": 297.82, "verticalRate": -4.88,
+            "geoAltitude": 563.88, "spi": false, "positionSource": 0,
+            "predictedTrajectory": [
+                {"latitude": 37.5637, "longitude": -122.2438, "altitude": 586.74,
+                 "time_offset": 0, "distance_from_current": 0, "bearing": 0},
+                {"latitude": null, "longitude": -122.2429, "altitude": 620.00,
+                 "time_offset": 1.0, "distance_from_current": 95.00, "bearing": 111.71},
+                {"latitude": 37.5631, "longitude": -122.2419, "altitude": 655.80,
+                 "time_offset": 2.0, "distance_from_current": 189.85, "bearing": 111.71}
+            ]
+        }
+        """.data(using: .utf8)!
+        
+        let flight = Flight(from: try JSONDecoder().decode(BackendFlight.self, from: jsonData))
+        
+        let trajectory = try XCTUnwrap(flight.predictedTrajectory)
+        XCTAssertEqual(trajectory.timeOffsets, [0.0, 2.0])
+    }
+    
     // MARK: - Coordinate Extraction Tests
     
     func testCoordinateExtraction() {
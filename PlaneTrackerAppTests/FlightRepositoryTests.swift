@@ -0,0 +1,107 @@
+import XCTest
+import Combine
+import simd
+@testable import PlaneTrackerApp
+
+class FlightRepositoryTests: XCTestCase {
+    var server: StubHTTPServer!
+    var manualClock: ManualPollingClock!
+
+    override func setUpWithError() throws {
+        try super.setUpWithError()
+        // Three airborne aircraft; the fixture's first state is filtered out
+        server = try StubHTTPServer { _ in
+            StubHTTPServer.Response(status: 200, headers: ["Content-Type": "application/json"],
+                                    body: OpenSkyStateDecoderTests.makeStatesFixture(stateCount: 4))
+        }
+        try server.start()
+        manualClock = ManualPollingClock()
+    }
+
+    override func tearDown() {
+        server.stop()
+        server = nil
+        manualClock = nil
+        super.tearDown()
+    }
+
+    private func makeRepository() -> FlightRepository {
+        return FlightRepository(service: OpenSkyService(baseURL: server.baseURL),
+                                clock: manualClock.clock, snapshotCache: nil)
+    }
+
+    private func fetchSnapshot(into repository: FlightRepository) {
+        let received = expectation(description: "snapshot fetched")
+        let cancellable = repository.flightChanges.sink { _ in received.fulfill() }
+        repository.refresh()
+        wait(for: [received], timeout: 5)
+        cancellable.cancel()
+    }
+
+    // MARK: - Polling
+
+    func testPollingRunsWhileAnyClientHoldsIt() {
+        let repository = makeRepository()
+        XCTAssertFalse(repository.isPolling)
+
+        repository.startPolling()
+        repository.startPolling()
+        repository.stopPolling()
+        XCTAssertTrue(repository.isPolling)
+        XCTAssertEqual(repository.nextPollDate, manualClock.now.addingTimeInterval(PollingScheduler.Configuration.default.defaultInterval))
+
+        repository.stopPolling()
+        XCTAssertFalse(repository.isPolling)
+        XCTAssertNil(repository.nextPollDate)
+        XCTAssertEqual(manualClock.scheduledCount, 0)
+
+        // Unbalanced stops are ignored
+        repository.stopPolling()
+        repository.startPolling()
+        XCTAssertTrue(repository.isPolling)
+        repository.stopPolling()
+
+        XCTAssertTrue(server.requests.allSatisfy { $0.path.hasPrefix("/api/states/all") })
+    }
+
+    // MARK: - Sharing Between Screens
+
+    func testEmptyRepositoryHasNothingToReplay() {
+        XCTAssertTrue(makeRepository().currentSnapshotChanges().isEmpty)
+    }
+
+    func testLoadingScreenHandsItsRepositoryToTheARScreen() {
+        let repository = makeRepository()
+        let loading = LoadingViewController(flightRepository: repository)
+
+        XCTAssertTrue(loading.makeARView().flightRepository === repository)
+    }
+
+    func testARScreenDrawsTheExistingSnapshotOnItsFirstFrames() throws {
+        let repository = makeRepository()
+        fetchSnapshot(into: repository)
+        XCTAssertEqual(repository.currentSnapshotChanges().added.count, 3)
+        let requestsBeforeARView = server.requests.count
+
+        let arView = ARView(flightRepository: repository)
+        arView.loadViewIfNeeded()
+        // Frames drain queued node work within a budget; a handful is plenty for three aircraft
+        for _ in 0..<10 where arView.flightNodes.count < 3 {
+            arView.drainSceneUpdates()
+        }
+
+        XCTAssertEqual(Set(arView.flightNodes.keys), Set(repository.flights.map { $0.id }))
+        XCTAssertEqual(server.requests.count, requestsBeforeARView)
+
+        // No AR frame has arrived yet; nodes must still land where the projector puts them
+        for flight in repository.flights {
+            let node = try XCTUnwrap(arView.flightNodes[flight.id])
+            let expected = arView.projector.arPosition(latitude: flight.latitude!, longitude: flight.longitude!,
+                                                        altitude: flight.geoAltitude ?? 0)
+            XCTAssertGreaterThan(simd_length(SIMD3<Float>(node.position.x, node.position.y, node.position.z)), 100)
+            // Altitude estimation may differ slightly from the reported value; ground position may not
+            XCTAssertEqual(node.position.x, expected.x, accuracy: 0.5)
+            XCTAssertEqual(node.position.z, expected.z, accuracy: 0.5)
+        }
+    }
+}
@@ -0,0 +1,187 @@
+import XCTest
+import Combine
+@testable import PlaneTrackerApp
+
+class FlightSnapshotCacheTests: XCTestCase {
+    var fileURL: URL!
+    let now = Date(timeIntervalSince1970: 1760024985)
+
+    override func setUp() {
+        super.setUp()
+        fileURL = FileManager.default.temporaryDirectory
+            .appendingPathComponent("FlightSnapshotCacheTests-\(UUID().uuidString).ptf")
+    }
+
+    override func tearDown() {
+        try? FileManager.default.removeItem(at: fileURL)
+        fileURL = nil
+        super.tearDown()
+    }
+
+    private func makeFlight(_ id: String, latitude: Double = 0, longitude: Double = 0, onGround: Bool = false) -> Flight {
+        return Flight(id: id, callsign: "TEST\(id)", originCountry: "United States",
+                      timePosition: 1760024925, lastContact: 1760024925, longitude: longitude, latitude: latitude,
+                      baroAltitude: 3000, onGround: onGround, velocity: 250, trueTrack: 90, verticalRate: 5,
+                      sensors: nil, geoAltitude: 3050, squawk: nil, spi: false, positionSource: 0)
+    }
+
+    private func makeCache(with flights: [Flight], savedAt: Date) -> FlightSnapshotCache {
+        let cache = FlightSnapshotCache(fileURL: fileURL)
+        cache.save(flights, at: savedAt)
+        cache.waitUntilIdle()
+        return cache
+    }
+
+    // MARK: - Persistence
+
+    func testRoundTripsThroughDisk() {
+        let flights = [makeFlight("a"), makeFlight("b", latitude: 37.6, longitude: -122.4)]
+        let cache = makeCache(with: flights, savedAt: now.addingTimeInterval(-60))
+
+        let loaded = FlightSnapshotCache(fileURL: fileURL).load(now: now)
+
+        XCTAssertEqual(loaded?.flights.map { $0.id }, ["a", "b"])
+        XCTAssertEqual(loaded?.flights[1].latitude, 37.6)
+        XCTAssertEqual(loaded?.savedAt, now.addingTimeInterval(-60))
+        XCTAssertEqual(cache.fileURL, fileURL)
+    }
+
+    func testMissingOldOrCorruptSnapshotsAreIgnored() throws {
+        let cache = FlightSnapshotCache(fileURL: fileURL)
+        XCTAssertNil(cache.load(now: now))
+
+        cache.save([makeFlight("a")], at: now.addingTimeInterval(-cache.maximumAge - 1))
+        cache.waitUntilIdle()
+        XCTAssertNil(cache.load(now: now))
+
+        try Data("not a snapshot".utf8).write(to: fileURL)
+        XCTAssertNil(cache.load(now: now))
+    }
+
+    // MARK: - Dead Reckoning
+
+    func testDeadReckonsAlongTrack() {
+        let flights = [makeFlight("air"), makeFlight("ground", onGround: true)]
+
+        let moved = FlightSnapshotCache.deadReckon(flights, from: now.addingTimeInterval(-60), to: now)
+
+        // 250 m/s due east for 60 s along the equator is 15 km, ~0.1349°
+        XCTAssertEqual(moved[0].longitude!, 0.134898, accuracy: 1e-5)
+        XCTAssertEqual(moved[0].latitude!, 0, accuracy: 1e-9)
+        XCTAssertEqual(moved[0].baroAltitude!, 3300, accuracy: 1e-9)
+        XCTAssertEqual(moved[0].geoAltitude!, 3350, accuracy: 1e-9)
+        XCTAssertTrue(moved[1].hasSameState(as: flights[1]))
+    }
+
+    func testDeadReckoningIsCapped() {
+        let flights = [makeFlight("air")]
+
+        let capped = FlightSnapshotCache.deadReckon(flights, from: now.addingTimeInterval(-3600), to: now, maximumInterval: 60)
+
+        XCTAssertEqual(capped[0].longitude!, 0.134898, accuracy: 1e-5)
+    }
+
+    // MARK: - Warm Start
+
+    func testRepositoryRestoresStaleSnapshotOnLaunch() {
+        let flights = (0..<20).map { makeFlight("f\($0)", latitude: 37.6, longitude: -122.4) }
+        let cache = makeCache(with: flights, savedAt: now.addingTimeInterval(-30))
+        let repository = FlightRepository(service: OpenSkyService(), snapshotCache: cache)
+
+        let received = expectation(description: "restored flights published")
+        let cancellable = repository.flightChanges.sink { changes in
+            XCTAssertEqual(changes.added.count, 20)
+            received.fulfill()
+        }
+        repository.restoreCachedSnapshot(now: now)
+        wait(for: [received], timeout: 5)
+        cancellable.cancel()
+
+        XCTAssertTrue(repository.isStale)
+        XCTAssertEqual(repository.flights.count, 20)
+        XCTAssertNotEqual(repository.flights[0].longitude, -122.4)
+    }
+
+    func testNothingToRestoreIsNotStale() {
+        let repository = FlightRepository(service: OpenSkyService(), snapshotCache: FlightSnapshotCache(fileURL: fileURL))
+        let done = expectation(description: "restore finished")
+
+        repository.restoreCachedSnapshot(now: now) { restored in
+            XCTAssertEqual(restored, 0)
+            done.fulfill()
+        }
+        wait(for: [done], timeout: 5)
+
+        XCTAssertFalse(repository.isStale)
+    }
+
+    func testRestoreAfterAFetchLandedDoesNotMarkStale() throws {
+        let server = try StubHTTPServer { _ in
+            StubHTTPServer.Response(status: 200, headers: ["Content-Type": "application/json"],
+                                    body: OpenSkyStateDecoderTests.makeStatesFixture(stateCount: 4))
+        }
+        try server.start()
+        defer { server.stop() }
+
+        let cache = makeCache(with: [makeFlight("cached")], savedAt: now.addingTimeInterval(-30))
+        // No fetch cache, so the second refresh below reaches the server
+        let service = OpenSkyService(cachePolicy: FlightCachePolicy(freshness: 0, maximumStaleness: 0), baseURL: server.baseURL)
+        let repository = FlightRepository(service: service, snapshotCache: cache)
+
+        let fetched = expectation(description: "network snapshot published")
+        let cancellable = repository.flightChanges.sink { _ in fetched.fulfill() }
+        repository.refresh()
+        wait(for: [fetched], timeout: 5)
+        cancellable.cancel()
+
+        let done = expectation(description: "restore finished")
+        repository.restoreCachedSnapshot(now: now) { restored in
+            XCTAssertEqual(restored, 0)
+            done.fulfill()
+        }
+        wait(for: [done], timeout: 5)
+
+        XCTAssertFalse(repository.isStale)
+        XCTAssertEqual(repository.flights.count, 3)
+
+        // The next fetch must still be diffed against the first one, not the discarded restore
+        server.setHandler { _ in
+            StubHTTPServer.Response(status: 200, headers: ["Content-Type": "application/json"],
+                                    body: OpenSkyStateDecoderTests.makeStatesFixture(stateCount: 3))
+        }
+        var changes: FlightChangeset?
+        let refetched = expectation(description: "second snapshot published")
+        let refetchCancellable = repository.flightChanges.sink { published in
+            changes = published
+            refetched.fulfill()
+        }
+        repository.refresh()
+        wait(for: [refetched], timeout: 5)
+        refetchCancellable.cancel()
+
+        XCTAssertEqual(changes?.added.count, 0)
+        XCTAssertEqual(changes?.updated.count, 0)
+        XCTAssertEqual(changes?.removed, ["a00003"])
+    }
+
+    // MARK: - Performance Tests
+
+    /// Launch to first aircraft published, from a fresh repository and a 500-aircraft snapshot on disk
+    func testTimeToFirstAircraftFromCachedSnapshot() {
+        let flights = (0..<500).map { makeFlight(String(format: "c%05x", $0), latitude: 37.0 + Double($0) * 0.002, longitude: -122.4) }
+        _ = makeCache(with: flights, savedAt: now.addingTimeInterval(-45))
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let repository = FlightRepository(service: OpenSkyService(), snapshotCache: FlightSnapshotCache(fileURL: self.fileURL))
+            let firstAircraft = expectation(description: "first aircraft")
+            let cancellable = repository.flightChanges.sink { changes in
+                if !changes.added.isEmpty {
+                    firstAircraft.fulfill()
+                }
+            }
+            repository.restoreCachedSnapshot(now: self.now)
+            wait(for: [firstAircraft], timeout: 5)
+            cancellable.cancel()
+        }
+    }
+}
@@ -0,0 +1,185 @@
+import XCTest
+import Combine
+@testable import PlaneTrackerApp
+
+/// Records which thread flight decoding ran on
+private final class ThreadRecordingBackendService: BackendService {
+    private let lock = NSLock()
+    private var _decodedOnMain: [Bool] = []
+
+    var decodedOnMain: [Bool] {
+        lock.lock()
+        defer { lock.unlock() }
+        return _decodedOnMain
+    }
+
+    override func decodeFlights(_ response: BackendSessionResponse) throws -> [Flight]? {
+        lock.lock()
+        _decodedOnMain.append(Thread.isMainThread)
+        lock.unlock()
+        return try super.decodeFlights(response)
+    }
+}
+
+class FlightSnapshotProcessorTests: XCTestCase {
+
+    private func makeFlight(_ id: String, latitude: Double? = 37.6, longitude: Double? = -122.4, altitude: Double = 1000) -> Flight {
+        return Flight(id: id, callsign: "TEST", originCountry: "United States",
+                      timePosition: 1760024985, lastContact: 1760024985, longitude: longitude, latitude: latitude,
+                      baroAltitude: altitude, onGround: false, velocity: 200, trueTrack: 90, verticalRate: 0,
+                      sensors: nil, geoAltitude: altitude, squawk: nil, spi: false, positionSource: 0)
+    }
+
+    private func process(_ processor: FlightSnapshotProcessor, _ flights: [Flight]) -> FlightSnapshot {
+        let done = expectation(description: "snapshot delivered")
+        var delivered: FlightSnapshot!
+        processor.process(flights: flights) { snapshot in
+            delivered = snapshot
+            done.fulfill()
+        }
+        wait(for: [done], timeout: 5)
+        return delivered
+    }
+
+    // MARK: - Threading
+
+    func testDecodesOffMainAndDeliversOnMain() {
+        let processor = FlightSnapshotProcessor()
+        let done = expectation(description: "snapshot delivered")
+        var decodedOnMain: Bool?
+
+        processor.process({
+            decodedOnMain = Thread.isMainThread
+            return [self.makeFlight("a")]
+        }, completion: { result in
+            XCTAssertTrue(Thread.isMainThread)
+            XCTAssertEqual(try? result.get()?.flightIds, ["a"])
+            done.fulfill()
+        })
+        wait(for: [done], timeout: 5)
+
+        XCTAssertEqual(decodedOnMain, false)
+    }
+
+    func testBackendServiceNeverDecodesOnMain() throws {
+        let server = try StubHTTPServer { _ in
+            StubHTTPServer.Response.json([
+                "success": true,
+                "count": 50,
+                "timestamp": "2025-10-09T12:00:00Z",
+                "flights": CompactFlightsCodecTests.makeBackendFlights(count: 50)
+            ])
+        }
+        try server.start()
+        defer { server.stop() }
+
+        let service = ThreadRecordingBackendService(baseURL: server.baseURL)
+        service.prefersCompactFormat = false
+        let received = expectation(description: "flights published")
+        let cancellable = service.flightChanges.sink { changes in
+            XCTAssertTrue(Thread.isMainThread)
+            XCTAssertEqual(changes.added.count, 50)
+            received.fulfill()
+        }
+        service.fetchFlights()
+        wait(for: [received], timeout: 5)
+        cancellable.cancel()
+
+        XCTAssertEqual(service.decodedOnMain, [false])
+        XCTAssertEqual(service.flightStore.count, 50)
+    }
+
+    // MARK: - Snapshots
+
+    func testSnapshotsAreDiffedAgainstThePreviousOne() {
+        let processor = FlightSnapshotProcessor()
+        _ = process(processor, [makeFlight("a"), makeFlight("b")])
+
+        let snapshot = process(processor, [makeFlight("b", altitude: 2000), makeFlight("c"), makeFlight("b")])
+
+        XCTAssertEqual(snapshot.flightIds, ["b", "c"])
+        XCTAssertEqual(snapshot.changes.added.map { $0.id }, ["c"])
+        XCTAssertEqual(snapshot.changes.updated.map { $0.id }, ["b"])
+        XCTAssertEqual(snapshot.changes.removed, ["a"])
+    }
+
+    func testInvalidFlightsAreRejected() {
+        let processor = FlightSnapshotProcessor()
+
+        let snapshot = process(processor, [
+            makeFlight("ok"),
+            makeFlight(""),
+            makeFlight("nan", latitude: .nan),
+            makeFlight("range", longitude: 540),
+            makeFlight("unplaced", latitude: nil, longitude: nil)
+        ])
+
+        XCTAssertEqual(snapshot.flightIds, ["ok", "unplaced"])
+        XCTAssertEqual(snapshot.rejectedCount, 3)
+    }
+
+    func testDeltasMergeIntoCurrentSnapshot() {
+        let processor = FlightSnapshotProcessor()
+        _ = process(processor, [makeFlight("a"), makeFlight("b")])
+
+        let done = expectation(description: "delta delivered")
+        processor.process(upserts: [makeFlight("c")], removals: ["a"]) { snapshot in
+            XCTAssertEqual(snapshot.flightIds, ["b", "c"])
+            XCTAssertEqual(snapshot.changes.added.map { $0.id }, ["c"])
+            XCTAssertEqual(snapshot.changes.removed, ["a"])
+            done.fulfill()
+        }
+        wait(for: [done], timeout: 5)
+    }
+
+    func testStoreAdoptsSnapshotWithoutRediffing() {
+        let processor = FlightSnapshotProcessor()
+        let snapshot = process(processor, [makeFlight("a"), makeFlight("b")])
+        let store = FlightStore()
+
+        let changes = store.adopt(snapshot)
+
+        XCTAssertEqual(changes.added.map { $0.id }, ["a", "b"])
+        XCTAssertEqual(store.flightIds, ["a", "b"])
+        XCTAssertNotNil(store["b"])
+    }
+
+    // MARK: - Performance Tests
+
+    /// Previous behaviour: decode and diff a 5000-aircraft refresh on the main thread
+    func testMainThreadTimePerRefreshDecodingOnMain() {
+        let json = CompactFlightsCodecTests.makeJSONPayload(count: 5000)
+        let store = FlightStore()
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let decoded = try? JSONDecoder().decode(BackendFlightsResponse.self, from: json)
+            let flights = decoded?.flights.map { Flight(from: $0) } ?? []
+            store.apply(flights)
+            XCTAssertEqual(store.count, 5000)
+        }
+    }
+
+    /// Main-thread share of the same refresh once the processor has built the snapshot
+    func testMainThreadTimePerRefreshAdoptingSnapshot() {
+        let json = CompactFlightsCodecTests.makeJSONPayload(count: 5000)
+        let processor = FlightSnapshotProcessor()
+        let done = expectation(description: "snapshot delivered")
+        var snapshot: FlightSnapshot?
+        processor.process({
+            try JSONDecoder().decode(BackendFlightsResponse.self, from: json).flights.map { Flight(from: $0) }
+        }, completion: { result in
+            snapshot = try? result.get()
+            done.fulfill()
+        })
+        wait(for: [done], timeout: 30)
+        guard let built = snapshot else {
+            return XCTFail("No snapshot built")
+        }
+        let store = FlightStore()
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            store.adopt(built)
+            XCTAssertEqual(store.count, 5000)
+        }
+    }
+}
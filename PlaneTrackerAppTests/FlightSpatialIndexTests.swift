@@ -0,0 +1,173 @@
+import XCTest
+import CoreLocation
+@testable import PlaneTrackerApp
+
+class FlightSpatialIndexTests: XCTestCase {
+    
+    // Reference point: Pier 39, San Francisco
+    private let pier39 = CLLocationCoordinate2D(latitude: 37.8087, longitude: -122.4098)
+    
+    private func makeFlight(id: String, latitude: Double?, longitude: Double?, altitude: Double = 3000.0) -> Flight {
+        return Flight(
+            id: id,
+            callsign: id.uppercased(),
+            originCountry: "United States",
+            timePosition: 1760024985,
+            lastContact: 1760024985,
+            longitude: longitude,
+            latitude: latitude,
+            baroAltitude: altitude,
+            onGround: false,
+            velocity: 200.0,
+            trueTrack: 90.0,
+            verticalRate: 0.0,
+            sensors: nil,
+            geoAltitude: nil,
+            squawk: nil,
+            spi: false,
+            positionSource: 0
+        )
+    }
+    
+    /// Deterministic pseudo-random aircraft spread over the contiguous US
+    private func makeSyntheticFlights(count: Int) -> [Flight] {
+        var seed: UInt64 = 0x9E3779B97F4A7C15
+        func next() -> Double {
+            seed = seed &* 6364136223846793005 &+ 1442695040888963407
+            return Double(seed >> 11) / Double(1 << 53)
+        }
+        return (0..<count).map { i in
+            makeFlight(id: String(format: "s%05x", i),
+                       latitude: 25.0 + next() * 24.0,
+                       longitude: -125.0 + next() * 58.0,
+                       altitude: 500.0 + next() * 12000.0)
+        }
+    }
+    
+    // MARK: - Query Tests
+    
+    func testRadiusQueryReturnsNearestFirst() {
+        let index = FlightSpatialIndex(flights: [
+            makeFlight(id: "far", latitude: 38.5, longitude: -122.4098),   // ~77 km north
+            makeFlight(id: "near", latitude: 37.82, longitude: -122.4098), // ~1 km north
+            makeFlight(id: "mid", latitude: 37.9, longitude: -122.4098),   // ~10 km north
+            makeFlight(id: "nopos", latitude: nil, longitude: nil)
+        ])
+        
+        XCTAssertEqual(index.count, 3)
+        XCTAssertEqual(index.flights(withinKilometers: 20, of: pier39).map { $0.id }, ["near", "mid"])
+        XCTAssertEqual(index.nearest(to: pier39, limit: 1).map { $0.id }, ["near"])
+    }
+    
+    func testBoundingBoxQuery() {
+        let index = FlightSpatialIndex(flights: [
+            makeFlight(id: "inside", latitude: 37.5, longitude: -122.0),
+            makeFlight(id: "outside", latitude: 39.5, longitude: -122.0),
+            makeFlight(id: "edge", latitude: 38.8, longitude: -121.0)
+        ])
+        
+        let result = index.flights(inLatitudes: 36.8...38.8, westLongitude: -123.8, eastLongitude: -121.0)
+        
+        XCTAssertEqual(Set(result.map { $0.id }), ["inside", "edge"])
+    }
+    
+    func testBoundingBoxAcrossAntimeridian() {
+        let index = FlightSpatialIndex(flights: [
+            makeFlight(id: "east", latitude: 10.0, longitude: 179.5),
+            makeFlight(id: "west", latitude: 10.0, longitude: -179.5),
+            makeFlight(id: "greenwich", latitude: 10.0, longitude: 0.0)
+        ])
+        
+        let result = index.flights(inLatitudes: 5.0...15.0, westLongitude: 179.0, eastLongitude: -179.0)
+        
+        XCTAssertEqual(Set(result.map { $0.id }), ["east", "west"])
+    }
+    
+    func testRadiusQueryAcrossAntimeridian() {
+        let index = FlightSpatialIndex(flights: [
+            makeFlight(id: "west", latitude: 0.0, longitude: -179.9)
+        ])
+        
+        let result = index.flights(withinKilometers: 50, of: CLLocationCoordinate2D(latitude: 0.0, longitude: 179.9))
+        
+        XCTAssertEqual(result.map { $0.id }, ["west"])
+    }
+    
+    func testViewConeQuery() {
+        let index = FlightSpatialIndex(flights: [
+            makeFlight(id: "north", latitude: 37.9, longitude: -122.4098),
+            makeFlight(id: "south", latitude: 37.7, longitude: -122.4098),
+            makeFlight(id: "east", latitude: 37.8087, longitude: -122.3)
+        ])
+        
+        let lookingNorth = FlightSpatialIndex.ViewCone(origin: pier39, heading: 0, horizontalFieldOfView: 60, maxDistanceKilometers: 50)
+        let lookingEast = FlightSpatialIndex.ViewCone(origin: pier39, heading: 90, horizontalFieldOfView: 60, maxDistanceKilometers: 50)
+        let lookingNorthAtHorizon = FlightSpatialIndex.ViewCone(origin: pier39, heading: 0, pitch: 0,
+                                                                verticalFieldOfView: 2, maxDistanceKilometers: 50)
+        
+        XCTAssertEqual(index.flights(in: lookingNorth).map { $0.id }, ["north"])
+        XCTAssertEqual(index.flights(in: lookingEast).map { $0.id }, ["east"])
+        // 3 km up at 10 km range is ~17° above the horizon
+        XCTAssertTrue(index.flights(in: lookingNorthAtHorizon).isEmpty)
+    }
+    
+    func testMatchesLinearScan() {
+        let flights = makeSyntheticFlights(count: 5000)
+        let index = FlightSpatialIndex(flights: flights)
+        let center = CLLocationCoordinate2D(latitude: 37.0, longitude: -100.0)
+        let centerLocation = CLLocation(latitude: center.latitude, longitude: center.longitude)
+        
+        let indexed = Set(index.flights(withinKilometers: 400, of: center).map { $0.id })
+        let scanned = Set(flights.filter { flight in
+            let location = CLLocation(latitude: flight.latitude!, longitude: flight.longitude!)
+            return location.distance(from: centerLocation) <= 400_000
+        }.map { $0.id })
+        
+        // CLLocation uses an ellipsoid; allow a handful of boundary disagreements
+        XCTAssertLessThanOrEqual(indexed.symmetricDifference(scanned).count, 5)
+        XCTAssertGreaterThan(indexed.count, 0)
+    }
+    
+    // MARK: - Performance Tests
+    
+    private func measureBuildAndQuery(count: Int) {
+        let flights = makeSyntheticFlights(count: count)
+        let cone = FlightSpatialIndex.ViewCone(origin: pier39, heading: 45, maxDistanceKilometers: 150)
+        
+        measure {
+            let index = FlightSpatialIndex(flights: flights)
+            _ = index.flights(withinKilometers: 150, of: pier39)
+            _ = index.flights(inLatitudes: 36.8...38.8, westLongitude: -123.8, eastLongitude: -121.0)
+            _ = index.flights(in: cone)
+        }
+    }
+    
+    func testBuildAndQueryPerformance100() {
+        measureBuildAndQuery(count: 100)
+    }
+    
+    func testBuildAndQueryPerformance1k() {
+        measureBuildAndQuery(count: 1_000)
+    }
+    
+    func testBuildAndQueryPerformance10k() {
+        measureBuildAndQuery(count: 10_000)
+    }
+    
+    func testBuildAndQueryPerformance50k() {
+        measureBuildAndQuery(count: 50_000)
+    }
+    
+    func testLinearScanBaselinePerformance50k() {
+        let flights = makeSyntheticFlights(count: 50_000)
+        let center = CLLocation(latitude: pier39.latitude, longitude: pier39.longitude)
+        
+        measure {
+            let nearby = flights.filter { flight in
+                let location = CLLocation(latitude: flight.latitude!, longitude: flight.longitude!)
+                return location.distance(from: center) <= 150_000
+            }
+            XCTAssertGreaterThanOrEqual(nearby.count, 0)
+        }
+    }
+}
@@ -0,0 +1,124 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class FlightStoreTests: XCTestCase {
+    var store: FlightStore!
+    
+    override func setUp() {
+        super.setUp()
+        store = FlightStore()
+    }
+    
+    override func tearDown() {
+        store = nil
+        super.tearDown()
+    }
+    
+    private func makeFlight(id: String, latitude: Double = 37.5637, lastContact: Int = 1760024985) -> Flight {
+        return Flight(
+            id: id,
+            callsign: "SKW5596",
+            originCountry: "United States",
+            timePosition: lastContact,
+            lastContact: lastContact,
+            longitude: -122.2438,
+            latitude: latitude,
+            baroAltitude: 586.74,
+            onGround: false,
+            velocity: 94.81,
+            trueTrack: 297.82,
+            verticalRate: -4.88,
+            sensors: nil,
+            geoAltitude: 563.88,
+            squawk: nil,
+            spi: false,
+            positionSource: 0
+        )
+    }
+    
+    // MARK: - Changeset Tests
+    
+    func testFirstSnapshotIsAllAdded() {
+        let changes = store.apply([makeFlight(id: "a"), makeFlight(id: "b")])
+        
+        XCTAssertEqual(changes.added.map { $0.id }, ["a", "b"])
+        XCTAssertTrue(changes.updated.isEmpty)
+        XCTAssertTrue(changes.removed.isEmpty)
+        XCTAssertEqual(store.count, 2)
+    }
+    
+    func testAddedUpdatedRemoved() {
+        store.apply([makeFlight(id: "a"), makeFlight(id: "b"), makeFlight(id: "c")])
+        
+        let changes = store.apply([
+            makeFlight(id: "a"),                                          // unchanged
+            makeFlight(id: "b", latitude: 37.6, lastContact: 1760024990), // moved
+            makeFlight(id: "d")                                           // new
+        ])
+        
+        XCTAssertEqual(changes.added.map { $0.id }, ["d"])
+        XCTAssertEqual(changes.updated.map { $0.id }, ["b"])
+        XCTAssertEqual(changes.removed, ["c"])
+        XCTAssertEqual(store.flights.map { $0.id }, ["a", "b", "d"])
+        XCTAssertEqual(store["b"]?.latitude, 37.6)
+        XCTAssertNil(store["c"])
+    }
+    
+    func testIdenticalSnapshotIsEmptyChangeset() {
+        let snapshot = [makeFlight(id: "a"), makeFlight(id: "b")]
+        store.apply(snapshot)
+        
+        XCTAssertTrue(store.apply(snapshot).isEmpty)
+    }
+    
+    func testDuplicateIdsKeepFirstOccurrence() {
+        let changes = store.apply([makeFlight(id: "a", latitude: 1.0), makeFlight(id: "a", latitude: 2.0)])
+        
+        XCTAssertEqual(changes.added.count, 1)
+        XCTAssertEqual(store["a"]?.latitude, 1.0)
+    }
+    
+    func testRemoveAll() {
+        store.apply([makeFlight(id: "a"), makeFlight(id: "b")])
+        
+        let changes = store.removeAll()
+        
+        XCTAssertEqual(Set(changes.removed), ["a", "b"])
+        XCTAssertEqual(store.count, 0)
+    }
+    
+    // MARK: - Performance Tests
+    
+    func testMostlyUnchangedRefreshPerformance() {
+        let snapshot = (0..<1000).map { makeFlight(id: String(format: "a%05x", $0)) }
+        store.apply(snapshot)
+        
+        var next = snapshot
+        for i in stride(from: 0, to: next.count, by: 20) {
+            next[i] = makeFlight(id: next[i].id, latitude: 37.7, lastContact: 1760024990)
+        }
+        
+        measure {
+            store.apply(snapshot)
+            let changes = store.apply(next)
+            XCTAssertEqual(changes.updated.count, 50)
+        }
+    }
+    
+    // MARK: - Delta Tests
+    
+    func testDeltaTouchesOnlyListedFlights() {
+        store.apply([makeFlight(id: "a"), makeFlight(id: "b"), makeFlight(id: "c")])
+        
+        let changes = store.applyDelta(
+            upserts: [makeFlight(id: "b", latitude: 37.6, lastContact: 1760024990), makeFlight(id: "d")],
+            removals: ["a", "unknown"]
+        )
+        
+        XCTAssertEqual(changes.added.map { $0.id }, ["d"])
+        XCTAssertEqual(changes.updated.map { $0.id }, ["b"])
+        XCTAssertEqual(changes.removed, ["a"])
+        XCTAssertEqual(store.flights.map { $0.id }, ["b", "c", "d"])
+        XCTAssertEqual(store["b"]?.latitude, 37.6)
+    }
+}
@@ -0,0 +1,229 @@
+import XCTest
+import Combine
+@testable import PlaneTrackerApp
+
+class FlightUpdateStreamTests: XCTestCase {
+    var server: StubHTTPServer!
+    var cancellables = Set<AnyCancellable>()
+
+    override func setUpWithError() throws {
+        try super.setUpWithError()
+        server = try StubHTTPServer { _ in
+            StubHTTPServer.Response.eventStream(FlightUpdateStreamTests.snapshotEvent(id: 1, flightIds: ["a", "b"]))
+        }
+        try server.start()
+    }
+
+    override func tearDown() {
+        cancellables.removeAll()
+        server.stop()
+        server = nil
+        super.tearDown()
+    }
+
+    // MARK: - Fixtures
+
+    private static func flightJSON(_ id: String, latitude: Double = 37.5637) -> [String: Any] {
+        return [
+            "icao24": id, "callsign": "SKW5596", "originCountry": "United States",
+            "timePosition": 1760024985, "lastContact": 1760024985,
+            "longitude": -122.2438, "latitude": latitude, "baroAltitude": 586.74,
+            "onGround": false, "velocity": 94.81, "trueTrack": 297.82, "verticalRate": -4.88,
+            "geoAltitude": 563.88, "spi": false, "positionSource": 0
+        ]
+    }
+
+    private static func event(_ name: String, id: Int, payload: [String: Any]) -> String {
+        let json = String(data: try! JSONSerialization.data(withJSONObject: payload), encoding: .utf8)!
+        return "id: \(id)\nevent: \(name)\ndata: \(json)\n\n"
+    }
+
+    static func snapshotEvent(id: Int, flightIds: [String]) -> String {
+        return event("snapshot", id: id, payload: [
+            "success": true, "count": flightIds.count, "timestamp": "2025-10-09T12:00:00Z",
+            "flights": flightIds.map { flightJSON($0) }
+        ])
+    }
+
+    static func deltaEvent(id: Int, upserts: [[String: Any]], removed: [String]) -> String {
+        return event("delta", id: id, payload: ["sequence": id, "upserts": upserts, "removed": removed])
+    }
+
+    // MARK: - Parser Tests
+
+    func testParserHandlesFieldsCommentsAndMultilineData() {
+        var parser = ServerSentEventParser()
+
+        let events = parser.feed(Data(": heartbeat\nid: 7\nevent: delta\ndata: line1\ndata:line2\nretry: 2500\n\ndata: plain\n\n".utf8))
+
+        XCTAssertEqual(events, [
+            ServerSentEvent(id: "7", event: "delta", data: "line1\nline2"),
+            ServerSentEvent(id: "7", event: "message", data: "plain")
+        ])
+        XCTAssertEqual(parser.retryInterval, 2.5)
+    }
+
+    func testParserHandlesChunksSplitMidLineAndCRLF() {
+        var parser = ServerSentEventParser()
+        let stream = "id: 1\r\nevent: snapshot\r\ndata: {\"a\":1}\r\n\r\n"
+
+        var events: [ServerSentEvent] = []
+        for byte in stream.utf8 {
+            events += parser.feed(Data([byte]))
+        }
+
+        XCTAssertEqual(events, [ServerSentEvent(id: "1", event: "snapshot", data: "{\"a\":1}")])
+    }
+
+    func testParserIgnoresEventsWithoutData() {
+        var parser = ServerSentEventParser()
+
+        XCTAssertTrue(parser.feed(Data("event: delta\nid: 3\n\n".utf8)).isEmpty)
+        XCTAssertEqual(parser.lastEventId, "3")
+    }
+
+    func testParserCommitsIdOnlyWhenTheEventIsComplete() {
+        var parser = ServerSentEventParser(lastEventId: "3")
+
+        XCTAssertTrue(parser.feed(Data("id: 4\nevent: delta\ndata: {}\n".utf8)).isEmpty)
+        XCTAssertEqual(parser.lastEventId, "3")
+
+        XCTAssertEqual(parser.feed(Data("\n".utf8)), [ServerSentEvent(id: "4", event: "delta", data: "{}")])
+        XCTAssertEqual(parser.lastEventId, "4")
+    }
+
+    // MARK: - Stream Tests
+
+    func testBackendServiceAppliesPushedDeltas() {
+        let service = BackendService(baseURL: server.baseURL)
+        var changesets: [FlightChangeset] = []
+        let snapshot = expectation(description: "snapshot applied")
+        let delta = expectation(description: "delta applied")
+
+        service.flightChanges
+            .sink { changes in
+                changesets.append(changes)
+                if changesets.count == 1 { snapshot.fulfill() }
+                if changesets.count == 2 { delta.fulfill() }
+            }
+            .store(in: &cancellables)
+
+        service.startStreaming()
+        wait(for: [snapshot], timeout: 5)
+
+        server.pushEvent(FlightUpdateStreamTests.deltaEvent(
+            id: 2,
+            upserts: [FlightUpdateStreamTests.flightJSON("b", latitude: 37.7), FlightUpdateStreamTests.flightJSON("c")],
+            removed: ["a"]
+        ))
+        wait(for: [delta], timeout: 5)
+        service.stopStreaming()
+
+        XCTAssertEqual(changesets[0].added.map { $0.id }, ["a", "b"])
+        XCTAssertEqual(changesets[1].added.map { $0.id }, ["c"])
+        XCTAssertEqual(changesets[1].updated.map { $0.id }, ["b"])
+        XCTAssertEqual(changesets[1].removed, ["a"])
+        XCTAssertEqual(service.flights.map { $0.id }, ["b", "c"])
+    }
+
+    func testStreamCutMidEventResumesFromTheLastCompleteEvent() {
+        let stream = FlightUpdateStream(url: URL(string: server.baseURL + "/api/flights/stream")!)
+        stream.minimumReconnectDelay = 0.05
+
+        let snapshot = expectation(description: "initial snapshot")
+        stream.messages
+            .sink { _ in snapshot.fulfill() }
+            .store(in: &cancellables)
+
+        stream.start()
+        wait(for: [snapshot], timeout: 5)
+
+        // Delta 2 is cut off before the blank line that would dispatch it
+        server.setHandler { _ in StubHTTPServer.Response.eventStream() }
+        server.pushEvent("id: 2\nevent: delta\ndata: {\"sequence\": 2, \"upserts\": [], \"removed\": [\"a\"]}\n")
+        server.closeEventStreams()
+        wait(for: [XCTNSPredicateExpectation(predicate: NSPredicate { _, _ in self.server.requests.count == 2 }, object: nil)],
+             timeout: 5)
+        stream.stop()
+
+        XCTAssertEqual(server.requests[1].header("Last-Event-ID"), "1")
+    }
+
+    func testDuplicateDeltasAreDroppedAndGapsResynchronize() {
+        let stream = FlightUpdateStream(url: URL(string: server.baseURL + "/api/flights/stream")!)
+        stream.minimumReconnectDelay = 0.05
+
+        var messages: [FlightStreamMessage] = []
+        let resynchronized = expectation(description: "fresh snapshot after a gap")
+        stream.messages
+            .sink { message in
+                messages.append(message)
+                if messages.count == 3 { resynchronized.fulfill() }
+            }
+            .store(in: &cancellables)
+
+        stream.start()
+        wait(for: [XCTNSPredicateExpectation(predicate: NSPredicate { _, _ in self.server.openEventStreamCount == 1 }, object: nil)],
+             timeout: 5)
+        server.setHandler { _ in
+            StubHTTPServer.Response.eventStream(FlightUpdateStreamTests.snapshotEvent(id: 9, flightIds: ["c"]))
+        }
+        server.pushEvent(FlightUpdateStreamTests.deltaEvent(id: 2, upserts: [], removed: ["a"])
+                         + FlightUpdateStreamTests.deltaEvent(id: 2, upserts: [], removed: ["a"])
+                         + FlightUpdateStreamTests.deltaEvent(id: 5, upserts: [FlightUpdateStreamTests.flightJSON("x")], removed: []))
+        wait(for: [resynchronized], timeout: 5)
+        stream.stop()
+
+        XCTAssertEqual(server.requests.count, 2)
+        XCTAssertNil(server.requests[1].header("Last-Event-ID"))
+        guard case .delta = messages[1], case .snapshot(let flights) = messages[2] else {
+            return XCTFail("Expected snapshot, one delta, then a fresh snapshot")
+        }
+        XCTAssertEqual(flights.map { $0.id }, ["c"])
+        XCTAssertEqual(stream.lastEventId, "9")
+    }
+
+    func testReconnectsAndResumesFromLastEventId() {
+        let stream = FlightUpdateStream(url: URL(string: server.baseURL + "/api/flights/stream")!)
+        stream.minimumReconnectDelay = 0.05
+
+        var messages: [FlightStreamMessage] = []
+        let firstSnapshot = expectation(description: "initial snapshot")
+        let resumedDelta = expectation(description: "delta after reconnect")
+        stream.messages
+            .sink { message in
+                messages.append(message)
+                if messages.count == 2 { firstSnapshot.fulfill() }
+                if messages.count == 3 { resumedDelta.fulfill() }
+            }
+            .store(in: &cancellables)
+
+        stream.start()
+        wait(for: [XCTNSPredicateExpectation(predicate: NSPredicate { _, _ in self.server.openEventStreamCount == 1 }, object: nil)],
+             timeout: 5)
+        server.pushEvent(FlightUpdateStreamTests.deltaEvent(id: 2, upserts: [], removed: ["a"]))
+        wait(for: [firstSnapshot], timeout: 5)
+
+        // On resume the server replays only what came after the client's last id
+        server.setHandler { request in
+            let lastId = Int(request.header("Last-Event-ID") ?? "") ?? 0
+            return StubHTTPServer.Response.eventStream(
+                FlightUpdateStreamTests.deltaEvent(id: lastId + 1, upserts: [FlightUpdateStreamTests.flightJSON("z")], removed: [])
+            )
+        }
+        server.closeEventStreams()
+        wait(for: [resumedDelta], timeout: 5)
+        stream.stop()
+
+        XCTAssertEqual(server.requests.count, 2)
+        XCTAssertNil(server.requests[0].header("Last-Event-ID"))
+        XCTAssertEqual(server.requests[1].header("Last-Event-ID"), "2")
+        XCTAssertEqual(server.requests[1].header("Accept"), "text/event-stream")
+        XCTAssertEqual(stream.lastEventId, "3")
+        if case .delta(let upserts, _) = messages[2] {
+            XCTAssertEqual(upserts.map { $0.id }, ["z"])
+        } else {
+            XCTFail("Expected a delta after reconnecting")
+        }
+    }
+}
@@ -0,0 +1,155 @@
+import XCTest
+import CoreLocation
+import simd
+@testable import PlaneTrackerApp
+
+class LocalTangentProjectorTests: XCTestCase {
+
+    // MARK: - Reference Geodesic
+
+    /// Vincenty's inverse solution on the WGS84 ellipsoid: surface distance in
+    /// meters and initial azimuth in degrees clockwise from north
+    private func vincentyInverse(from: CLLocationCoordinate2D, to: CLLocationCoordinate2D) -> (distance: Double, azimuth: Double) {
+        let a = LocalTangentProjector.semiMajorAxis
+        let f = LocalTangentProjector.flattening
+        let b = a * (1 - f)
+
+        let u1 = atan((1 - f) * tan(from.latitude * .pi / 180))
+        let u2 = atan((1 - f) * tan(to.latitude * .pi / 180))
+        var deltaLongitude = (to.longitude - from.longitude) * .pi / 180
+        deltaLongitude = atan2(sin(deltaLongitude), cos(deltaLongitude))
+        let sinU1 = sin(u1), cosU1 = cos(u1), sinU2 = sin(u2), cosU2 = cos(u2)
+
+        var lambda = deltaLongitude
+        var sinSigma = 0.0, cosSigma = 0.0, sigma = 0.0, cosSqAlpha = 0.0, cos2SigmaM = 0.0
+        for _ in 0..<200 {
+            let sinLambda = sin(lambda), cosLambda = cos(lambda)
+            sinSigma = ((cosU2 * sinLambda) * (cosU2 * sinLambda) +
+                        (cosU1 * sinU2 - sinU1 * cosU2 * cosLambda) * (cosU1 * sinU2 - sinU1 * cosU2 * cosLambda)).squareRoot()
+            cosSigma = sinU1 * sinU2 + cosU1 * cosU2 * cosLambda
+            sigma = atan2(sinSigma, cosSigma)
+            let sinAlpha = cosU1 * cosU2 * sinLambda / sinSigma
+            cosSqAlpha = 1 - sinAlpha * sinAlpha
+            cos2SigmaM = cosSqAlpha == 0 ? 0 : cosSigma - 2 * sinU1 * sinU2 / cosSqAlpha
+            let c = f / 16 * cosSqAlpha * (4 + f * (4 - 3 * cosSqAlpha))
+            let previous = lambda
+            lambda = deltaLongitude + (1 - c) * f * sinAlpha *
+                (sigma + c * sinSigma * (cos2SigmaM + c * cosSigma * (-1 + 2 * cos2SigmaM * cos2SigmaM)))
+            if abs(lambda - previous) < 1e-12 { break }
+        }
+
+        let uSq = cosSqAlpha * (a * a - b * b) / (b * b)
+        let bigA = 1 + uSq / 16384 * (4096 + uSq * (-768 + uSq * (320 - 175 * uSq)))
+        let bigB = uSq / 1024 * (256 + uSq * (-128 + uSq * (74 - 47 * uSq)))
+        let deltaSigma = bigB * sinSigma * (cos2SigmaM + bigB / 4 * (cosSigma * (-1 + 2 * cos2SigmaM * cos2SigmaM) -
+            bigB / 6 * cos2SigmaM * (-3 + 4 * sinSigma * sinSigma) * (-3 + 4 * cos2SigmaM * cos2SigmaM)))
+        let distance = b * bigA * (sigma - deltaSigma)
+
+        let azimuth = atan2(cosU2 * sin(lambda), cosU1 * sinU2 - sinU1 * cosU2 * cos(lambda)) * 180 / .pi
+        return (distance, (azimuth + 360).truncatingRemainder(dividingBy: 360))
+    }
+
+    // MARK: - Accuracy Tests
+
+    func testMatchesGeodesicAnywhereOnTheGlobe() {
+        let observers = [
+            CLLocationCoordinate2D(latitude: 37.8087, longitude: -122.4098),   // San Francisco
+            CLLocationCoordinate2D(latitude: 64.1466, longitude: -21.9426),    // Reykjavik
+            CLLocationCoordinate2D(latitude: -33.8688, longitude: 151.2093),   // Sydney
+            CLLocationCoordinate2D(latitude: 0.5, longitude: 179.95),          // Equator at the antimeridian
+            CLLocationCoordinate2D(latitude: 78.2232, longitude: 15.6267)      // Svalbard
+        ]
+
+        for observer in observers {
+            let projector = LocalTangentProjector(origin: observer, metersPerUnit: 1.0)
+            for bearing in stride(from: 0.0, to: 360.0, by: 30.0) {
+                for distance in [1_000.0, 20_000.0, 50_000.0] {
+                    let target = destination(from: observer, bearing: bearing, meters: distance)
+                    let reference = vincentyInverse(from: observer, to: target)
+                    let local = projector.enu(latitude: target.latitude, longitude: target.longitude, altitude: 0)
+
+                    // Horizontal projection vs arc length differs by ~d³/6R² (< 1 m at 50 km)
+                    let horizontal = (local.x * local.x + local.y * local.y).squareRoot()
+                    XCTAssertEqual(horizontal, reference.distance, accuracy: 1.0, "\(observer) \(bearing)° \(distance)m")
+
+                    let azimuth = (atan2(local.x, local.y) * 180 / .pi + 360).truncatingRemainder(dividingBy: 360)
+                    let azimuthError = abs((azimuth - reference.azimuth + 540).truncatingRemainder(dividingBy: 360) - 180)
+                    XCTAssertLessThan(azimuthError, 0.01, "\(observer) \(bearing)° \(distance)m")
+
+                    // Surface points drop below the tangent plane by ~d²/2R
+                    let drop = distance * distance / (2 * 6_371_000.0)
+                    XCTAssertEqual(local.z, -drop, accuracy: max(1.0, drop * 0.01))
+                }
+            }
+        }
+    }
+
+    func testARPositionAxesAndScale() {
+        let observer = CLLocationCoordinate2D(latitude: 60.0, longitude: 10.0)
+        let projector = LocalTangentProjector(origin: observer, altitude: 100)
+
+        let north = projector.arPosition(latitude: 60.01, longitude: 10.0, altitude: 100)
+        let east = projector.arPosition(latitude: 60.0, longitude: 10.02, altitude: 100)
+        let above = projector.arPosition(latitude: 60.0, longitude: 10.0, altitude: 10_100)
+
+        // 0.01° of latitude and 0.02° of longitude at 60°N are both ~1.11 km; the old
+        // fixed 85 km per degree of longitude would have put east at 1.7 km
+        XCTAssertEqual(north.z, -1.1141, accuracy: 0.001)
+        XCTAssertEqual(north.x, 0, accuracy: 0.001)
+        XCTAssertEqual(east.x, 1.1160, accuracy: 0.001)
+        XCTAssertEqual(above.y, 10.0, accuracy: 0.0001)
+        XCTAssertEqual(projector.arPosition(latitude: 60.0, longitude: 10.0, altitude: 100), SIMD3<Float>(0, 0, 0))
+    }
+
+    func testBatchMatchesSinglePoints() {
+        let projector = LocalTangentProjector(origin: CLLocationCoordinate2D(latitude: 37.8087, longitude: -122.4098), altitude: 10)
+        let latitudes = (0..<100).map { 37.0 + Double($0) * 0.02 }
+        let longitudes = (0..<100).map { -123.0 + Double($0) * 0.015 }
+        let altitudes = (0..<100).map { Double($0) * 120 }
+
+        let batch = projector.project(latitudes: latitudes, longitudes: longitudes, altitudes: altitudes)
+
+        XCTAssertEqual(batch.count, 100)
+        for i in 0..<100 {
+            let single = projector.arPosition(latitude: latitudes[i], longitude: longitudes[i], altitude: altitudes[i])
+            XCTAssertLessThan(simd_distance(batch[i], single), 1e-4)
+        }
+    }
+
+    // MARK: - Performance Tests
+
+    func testProjectionPerformancePerMillionPoints() {
+        let count = 1_000_000
+        let projector = LocalTangentProjector(origin: CLLocationCoordinate2D(latitude: 37.8087, longitude: -122.4098), altitude: 10)
+        let latitudes = (0..<count).map { 36.0 + Double($0 % 4000) * 0.001 }
+        let longitudes = (0..<count).map { -124.0 + Double($0 / 4000) * 0.016 }
+        let altitudes = (0..<count).map { Double($0 % 12_000) }
+        let output = UnsafeMutableBufferPointer<SIMD3<Float>>.allocate(capacity: count)
+        defer { output.deallocate() }
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            latitudes.withUnsafeBufferPointer { latitudes in
+                longitudes.withUnsafeBufferPointer { longitudes in
+                    altitudes.withUnsafeBufferPointer { altitudes in
+                        projector.project(latitudes: latitudes, longitudes: longitudes, altitudes: altitudes, into: output)
+                    }
+                }
+            }
+        }
+        XCTAssertFalse(output[count - 1].x.isNaN)
+    }
+
+    // MARK: - Helpers
+
+    /// Spherical forward solution; only used to scatter test targets around the observer
+    private func destination(from origin: CLLocationCoordinate2D, bearing: Double, meters: Double) -> CLLocationCoordinate2D {
+        let angular = meters / 6_371_000.0
+        let theta = bearing * .pi / 180
+        let phi1 = origin.latitude * .pi / 180
+        let lambda1 = origin.longitude * .pi / 180
+        let phi2 = asin(sin(phi1) * cos(angular) + cos(phi1) * sin(angular) * cos(theta))
+        let lambda2 = lambda1 + atan2(sin(theta) * sin(angular) * cos(phi1), cos(angular) - sin(phi1) * sin(phi2))
+        let longitude = (lambda2 * 180 / .pi + 540).truncatingRemainder(dividingBy: 360) - 180
+        return CLLocationCoordinate2D(latitude: phi2 * 180 / .pi, longitude: longitude)
+    }
+}
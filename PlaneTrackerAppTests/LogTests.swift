@@ -0,0 +1,109 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class LogTests: XCTestCase {
+    var currentTime = Date(timeIntervalSince1970: 1760024985)
+
+    private func makeLogger(minimumLevel: LogLevel = .debug, capacity: Int = 512) -> AppLogger {
+        return AppLogger(
+            minimumLevel: minimumLevel,
+            writesToConsole: false,
+            memorySink: LogMemorySink(capacity: capacity),
+            now: { [unowned self] in self.currentTime }
+        )
+    }
+
+    // MARK: - Filtering Tests
+
+    func testMessagesBelowMinimumLevelAreNeverFormatted() {
+        let logger = makeLogger(minimumLevel: .info)
+        var evaluations = 0
+        let message: () -> String = {
+            evaluations += 1
+            return "formatted"
+        }
+
+        logger.log(.debug, .general, message)
+        logger.log(.warning, .general, message)
+
+        XCTAssertEqual(evaluations, 1)
+        XCTAssertEqual(logger.memorySink.entries.map { $0.level }, [.warning])
+    }
+
+    func testRateLimitedCategoryReportsSuppressedCount() {
+        let logger = makeLogger()
+        var evaluations = 0
+
+        for index in 0..<100 {
+            logger.log(.debug, .coordinates) {
+                evaluations += 1
+                return "point \(index)"
+            }
+        }
+        currentTime += LogCategory.coordinates.minimumInterval!
+        logger.log(.debug, .coordinates) { "point 100" }
+        logger.log(.debug, .general) { "unlimited" }
+
+        XCTAssertEqual(evaluations, 1)
+        XCTAssertEqual(logger.memorySink.entries.map { $0.message }, [
+            "point 0",
+            "point 100 (+99 suppressed)",
+            "unlimited"
+        ])
+    }
+
+    func testLocationFixesAreRateLimitedWithoutHidingLocationErrors() {
+        let logger = makeLogger()
+
+        for index in 0..<10 {
+            logger.log(.debug, .locationFixes) { "fix \(index)" }
+        }
+        logger.log(.warning, .location) { "location error" }
+
+        XCTAssertEqual(logger.memorySink.entries.map { $0.message }, ["fix 0", "location error"])
+    }
+
+    func testMemorySinkKeepsMostRecentEntries() {
+        let logger = makeLogger(capacity: 3)
+
+        for index in 0..<5 {
+            logger.log(.info, .general) { "entry \(index)" }
+        }
+
+        XCTAssertEqual(logger.memorySink.entries.map { $0.message }, ["entry 2", "entry 3", "entry 4"])
+        XCTAssertEqual(logger.memorySink.entries.map { $0.category }, ["General", "General", "General"])
+    }
+
+    // MARK: - Performance Tests
+
+    private let refresh: [(callsign: String, latitude: Double, longitude: Double, altitude: Double)] = (0..<500).map {
+        ("TEST\($0)", 37.0 + Double($0) * 0.001, -122.0 - Double($0) * 0.001, Double($0) * 20)
+    }
+
+    /// Previous behaviour: every flight and every converted point formatted a line
+    func testEagerPerFlightFormattingPerRefresh() {
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            var lines: [String] = []
+            for flight in self.refresh {
+                lines.append("✅ Parsed flight: \(flight.callsign) at (\(flight.latitude), \(flight.longitude)) alt=\(flight.altitude)")
+                lines.append("📍 Using device location: lat=37.8087, lon=-122.4098")
+                lines.append("🔄 Coord conversion: latDiff=\(flight.latitude - 37.8087)° -> z=\(flight.altitude / 1000)")
+                lines.append("📍 Flight \(flight.callsign): lat=\(flight.latitude), lon=\(flight.longitude), alt=\(flight.altitude)")
+            }
+            XCTAssertEqual(lines.count, self.refresh.count * 4)
+        }
+    }
+
+    /// Same messages through the rate-limited hot-path categories (debug build, worst case)
+    func testRateLimitedLoggingPerRefresh() {
+        let logger = makeLogger()
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            for flight in self.refresh {
+                logger.log(.debug, .flights) { "✅ Parsed flight: \(flight.callsign) at (\(flight.latitude), \(flight.longitude)) alt=\(flight.altitude)" }
+                logger.log(.debug, .coordinates) { "📍 Flight \(flight.callsign): lat=\(flight.latitude), lon=\(flight.longitude), alt=\(flight.altitude)" }
+            }
+        }
+        XCTAssertLessThanOrEqual(logger.memorySink.entries.count, 2)
+    }
+}
@@ -0,0 +1,35 @@
+import Foundation
+import Combine
+@testable import PlaneTrackerApp
+
+/// `PollingClock` that only moves when told to, firing due actions in order
+final class ManualPollingClock {
+
+    private(set) var now = Date(timeIntervalSince1970: 1760024985)
+    private var pending: [(id: Int, fireAt: Date, action: () -> Void)] = []
+    private var nextId = 0
+
+    var clock: PollingClock {
+        return PollingClock(now: { self.now }, schedule: { delay, action in
+            let id = self.nextId
+            self.nextId += 1
+            self.pending.append((id: id, fireAt: self.now.addingTimeInterval(delay), action: action))
+            return AnyCancellable { self.pending.removeAll { $0.id == id } }
+        })
+    }
+
+    var scheduledCount: Int {
+        return pending.count
+    }
+
+    /// Move time forward, running every action that falls due on the way
+    func advance(by interval: TimeInterval) {
+        let end = now.addingTimeInterval(interval)
+        while let next = pending.filter({ $0.fireAt <= end }).min(by: { ($0.fireAt, $0.id) < ($1.fireAt, $1.id) }) {
+            pending.removeAll { $0.id == next.id }
+            now = max(now, next.fireAt)
+            next.action()
+        }
+        now = end
+    }
+}
@@ -0,0 +1,176 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class OpenSkyStateDecoderTests: XCTestCase {
+    var decoder: OpenSkyStateDecoder!
+
+    override func setUp() {
+        super.setUp()
+        decoder = OpenSkyStateDecoder()
+    }
+
+    override func tearDown() {
+        decoder = nil
+        super.tearDown()
+    }
+
+    // MARK: - Fixtures
+
+    /// Builds a `states/all` payload with `stateCount` airborne state vectors
+    /// spread over a wide bounding box. Every 50th aircraft is on the ground
+    /// and every 75th has no position, so both filters are exercised.
+    static func makeStatesFixture(stateCount: Int) -> Data {
+        var json = "{\"time\":1760024985,\"states\":["
+        json.reserveCapacity(stateCount * 180)
+
+        for i in 0..<stateCount {
+            if i > 0 { json += "," }
+            let icao24 = String(format: "a%05x", i)
+            let callsign = String(format: "SKW%04d  ", i % 10000)
+            let lat = 30.00037 + Double(i % 997) * 0.0137
+            let lon = -125.00041 + Double(i % 991) * 0.0211
+            let onGround = i % 50 == 0
+            let position = i % 75 == 0 ? "null,null" : "\(lon),\(lat)"
+            json += "[\"\(icao24)\",\"\(callsign)\",\"United States\",1760024980,1760024985,"
+            json += "\(position),\(1000.3 + Double(i % 40) * 250.17),\(onGround),"
+            json += "\(90.5 + Double(i % 180)),\(Double(i % 360) + 0.25),\(Double(i % 21) - 10.5),"
+            json += "null,\(1020.7 + Double(i % 40) * 250.13),\"\(1200 + i % 6000)\",false,0]"
+        }
+
+        json += "]}"
+        return json.data(using: .utf8)!
+    }
+
+    private func legacyParse(_ data: Data) throws -> [Flight] {
+        let response = try JSONDecoder().decode(OpenSkyResponse.self, from: data)
+        return OpenSkyService().parseFlights(from: response)
+    }
+
+    // MARK: - Decoding Tests
+
+    func testDecodesStateVectorIntoFlight() throws {
+        let json = """
+        {"time": 1760024985, "states": [
+            ["a0f355", "SKW5596 ", "United States", 1760024985, 1760024985, -122.2438, 37.5637,
+             586.74, false, 94.81, 297.82, -4.88, null, 563.88, "4521", false, 0]
+        ]}
+        """.data(using: .utf8)!
+
+        let snapshot = try decoder.decode(json)
+
+        XCTAssertEqual(snapshot.time, 1760024985)
+        XCTAssertEqual(snapshot.stateCount, 1)
+        XCTAssertEqual(snapshot.flights.count, 1)
+
+        let flight = snapshot.flights[0]
+        XCTAssertEqual(flight.id, "a0f355")
+        XCTAssertEqual(flight.callsign, "SKW5596")
+        XCTAssertEqual(flight.originCountry, "United States")
+        XCTAssertEqual(flight.timePosition, 1760024985)
+        XCTAssertEqual(flight.lastContact, 1760024985)
+        XCTAssertEqual(flight.longitude, -122.2438)
+        XCTAssertEqual(flight.latitude, 37.5637)
+        XCTAssertEqual(flight.baroAltitude, 586.74)
+        XCTAssertEqual(flight.velocity, 94.81)
+        XCTAssertEqual(flight.trueTrack, 297.82)
+        XCTAssertEqual(flight.verticalRate, -4.88)
+        XCTAssertEqual(flight.geoAltitude, 563.88)
+        XCTAssertEqual(flight.squawk, "4521")
+        XCTAssertFalse(flight.onGround)
+        XCTAssertFalse(flight.spi)
+        XCTAssertEqual(flight.positionSource, 0)
+    }
+
+    func testSkipsGroundAndPositionlessStates() throws {
+        let json = """
+        {"time": 1, "states": [
+            ["aaaaaa", "GND1", "United States", 1, 1, -122.1, 37.1, 0.0, true, 0.0, 0.0, 0.0, null, 0.0, null, false, 0],
+            ["bbbbbb", "NOPOS", "United States", null, 1, null, null, 1000.0, false, 200.0, 90.0, 0.0, null, 1000.0, null, false, 0],
+            ["cccccc", "SHORT", "United States", 1, 1, -122.1, 37.1],
+            ["dddddd", "OK1", "United States", 1, 1, -122.1, 37.1, 1000.0, false, 200.0, 90.0, 0.0, [1, 2], 1000.0, null, false, 0, 3]
+        ]}
+        """.data(using: .utf8)!
+
+        let snapshot = try decoder.decode(json)
+
+        XCTAssertEqual(snapshot.stateCount, 4)
+        XCTAssertEqual(snapshot.flights.map { $0.id }, ["dddddd"])
+        XCTAssertNil(snapshot.flights[0].sensors)
+    }
+
+    func testNullStatesAndUnknownKeys() throws {
+        let json = "{\"extra\": {\"nested\": [1, \"]\", {}]}, \"time\": 5, \"states\": null}".data(using: .utf8)!
+
+        let snapshot = try decoder.decode(json)
+
+        XCTAssertEqual(snapshot.time, 5)
+        XCTAssertTrue(snapshot.flights.isEmpty)
+    }
+
+    func testEscapedStrings() throws {
+        let json = """
+        {"time": 1, "states": [
+            ["a0f355", "\\u0041BC\\"1 ", "C\\u00f4te d'Ivoire", 1, 1, -122.1, 37.1, 1000.0, false, 200.0, 90.0, 0.0, null, 1000.0, null, false, 0]
+        ]}
+        """.data(using: .utf8)!
+
+        let snapshot = try decoder.decode(json)
+
+        XCTAssertEqual(snapshot.flights.first?.callsign, "ABC\"1")
+        XCTAssertEqual(snapshot.flights.first?.originCountry, "Côte d'Ivoire")
+    }
+
+    func testRejectsTruncatedPayload() {
+        let fixture = OpenSkyStateDecoderTests.makeStatesFixture(stateCount: 10)
+        let truncated = fixture.prefix(fixture.count - 20)
+
+        XCTAssertThrowsError(try decoder.decode(Data(truncated)))
+    }
+
+    func testMatchesLegacyParsingPath() throws {
+        let fixture = OpenSkyStateDecoderTests.makeStatesFixture(stateCount: 2000)
+
+        let decoded = try decoder.decode(fixture).flights
+        let legacy = try legacyParse(fixture)
+
+        XCTAssertEqual(decoded.count, legacy.count)
+        for (new, old) in zip(decoded, legacy) {
+            XCTAssertEqual(new.id, old.id)
+            XCTAssertEqual(new.callsign, old.callsign)
+            XCTAssertEqual(new.originCountry, old.originCountry)
+            XCTAssertEqual(new.timePosition, old.timePosition)
+            XCTAssertEqual(new.lastContact, old.lastContact)
+            XCTAssertEqual(new.longitude, old.longitude)
+            XCTAssertEqual(new.latitude, old.latitude)
+            XCTAssertEqual(new.baroAltitude, old.baroAltitude)
+            XCTAssertEqual(new.velocity, old.velocity)
+            XCTAssertEqual(new.trueTrack, old.trueTrack)
+            XCTAssertEqual(new.verticalRate, old.verticalRate)
+            XCTAssertEqual(new.geoAltitude, old.geoAltitude)
+            XCTAssertEqual(new.squawk, old.squawk)
+            XCTAssertEqual(new.onGround, old.onGround)
+            XCTAssertEqual(new.spi, old.spi)
+            XCTAssertEqual(new.positionSource, old.positionSource)
+        }
+    }
+
+    // MARK: - Performance Tests
+
+    func testStreamingDecodePerformance10k() {
+        let fixture = OpenSkyStateDecoderTests.makeStatesFixture(stateCount: 10_000)
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let snapshot = try? decoder.decode(fixture)
+            XCTAssertEqual(snapshot?.stateCount, 10_000)
+        }
+    }
+
+    func testLegacyDecodePerformance10k() {
+        let fixture = OpenSkyStateDecoderTests.makeStatesFixture(stateCount: 10_000)
+
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let flights = try? legacyParse(fixture)
+            XCTAssertNotNil(flights)
+        }
+    }
+}
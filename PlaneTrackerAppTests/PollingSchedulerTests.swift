@@ -0,0 +1,214 @@
+import XCTest
+import CoreLocation
+@testable import PlaneTrackerApp
+
+class PollingSchedulerTests: XCTestCase {
+    var manualClock: ManualPollingClock!
+    var pollCount = 0
+    var randomValue = 0.5
+
+    override func setUp() {
+        super.setUp()
+        manualClock = ManualPollingClock()
+        pollCount = 0
+        randomValue = 0.5
+    }
+
+    override func tearDown() {
+        manualClock = nil
+        super.tearDown()
+    }
+
+    private func makeScheduler(_ configuration: PollingScheduler.Configuration = .default) -> PollingScheduler {
+        return PollingScheduler(configuration: configuration, clock: manualClock.clock, random: { self.randomValue }) {
+            self.pollCount += 1
+        }
+    }
+
+    private func secondsUntilNextPoll(_ scheduler: PollingScheduler) -> TimeInterval? {
+        return scheduler.nextPollDate?.timeIntervalSince(manualClock.now)
+    }
+
+    // MARK: - Running
+
+    func testPollsImmediatelyThenAtTheDefaultInterval() {
+        let scheduler = makeScheduler()
+
+        scheduler.start()
+        XCTAssertEqual(pollCount, 1)
+
+        manualClock.advance(by: 9.5)
+        XCTAssertEqual(pollCount, 1)
+        manualClock.advance(by: 0.5)
+        XCTAssertEqual(pollCount, 2)
+        manualClock.advance(by: 30)
+        XCTAssertEqual(pollCount, 5)
+    }
+
+    func testStopCancelsThePendingPoll() {
+        let scheduler = makeScheduler()
+        scheduler.start()
+        scheduler.stop()
+
+        manualClock.advance(by: 600)
+
+        XCTAssertEqual(pollCount, 1)
+        XCTAssertNil(scheduler.nextPollDate)
+        XCTAssertEqual(manualClock.scheduledCount, 0)
+
+        scheduler.start()
+        XCTAssertEqual(pollCount, 2)
+    }
+
+    // MARK: - Motion
+
+    func testIntervalFollowsAngularSpeedWithinBounds() {
+        let scheduler = makeScheduler()
+        scheduler.start()
+
+        // 10° per poll at 0.5°/s
+        scheduler.updateMotion(maximumAngularSpeed: 0.5)
+        XCTAssertEqual(scheduler.currentInterval, 20)
+        XCTAssertEqual(secondsUntilNextPoll(scheduler), 20)
+
+        // Fast aircraft are capped at the minimum interval
+        scheduler.updateMotion(maximumAngularSpeed: 5)
+        XCTAssertEqual(scheduler.currentInterval, 8)
+
+        // Nothing nearby: slowest pace
+        scheduler.updateMotion(maximumAngularSpeed: nil)
+        XCTAssertEqual(scheduler.currentInterval, 30)
+
+        // Rescheduling does not poll by itself
+        XCTAssertEqual(pollCount, 1)
+        XCTAssertEqual(manualClock.scheduledCount, 1)
+    }
+
+    func testMotionUpdateIsAnchoredToTheLastPoll() {
+        let scheduler = makeScheduler()
+        scheduler.start()
+        manualClock.advance(by: 6)
+
+        scheduler.updateMotion(maximumAngularSpeed: 2)
+
+        XCTAssertEqual(secondsUntilNextPoll(scheduler), 2)
+        manualClock.advance(by: 2)
+        XCTAssertEqual(pollCount, 2)
+    }
+
+    func testPollsAtTheFloorAlwaysReachTheNetwork() {
+        let cache = FlightFetchCache(policy: .default)
+        let flight = Flight(id: "a0f355", callsign: "SKW5596", originCountry: "United States",
+                            timePosition: nil, lastContact: 0, longitude: -122.4, latitude: 37.6,
+                            baroAltitude: 3000, onGround: false, velocity: 250, trueTrack: 90, verticalRate: 0,
+                            sensors: nil, geoAltitude: 3000, squawk: nil, spi: false, positionSource: 0)
+        var networkRequests = 0
+        let configuration = PollingScheduler.Configuration.default.aligned(with: cache.policy)
+        let scheduler = PollingScheduler(configuration: configuration, clock: manualClock.clock) {
+            self.pollCount += 1
+            // The service stamps the request a moment after the poll fires
+            let requestedAt = self.manualClock.now.addingTimeInterval(0.05)
+            guard cache.lookup(at: requestedAt) != .fresh else { return }
+            networkRequests += 1
+            cache.store([flight], at: requestedAt)
+        }
+
+        scheduler.start()
+        // Aircraft fast enough to pin polling to the floor
+        scheduler.updateMotion(maximumAngularSpeed: 10)
+        manualClock.advance(by: 120)
+        scheduler.stop()
+
+        XCTAssertEqual(scheduler.configuration.minimumInterval, 8.5)
+        XCTAssertGreaterThan(pollCount, 10)
+        XCTAssertEqual(networkRequests, pollCount)
+    }
+
+    func testAngularSpeedOfNearbyAircraft() {
+        let observer = CLLocation(coordinate: CLLocationCoordinate2D(latitude: 37.6, longitude: -122.4),
+                                  altitude: 0, horizontalAccuracy: 5, verticalAccuracy: 5, timestamp: Date())
+        func flight(_ id: String, latitudeOffset: Double, onGround: Bool = false) -> Flight {
+            return Flight(id: id, callsign: id, originCountry: "United States",
+                          timePosition: nil, lastContact: 0, longitude: -122.4, latitude: 37.6 + latitudeOffset,
+                          baroAltitude: 0, onGround: onGround, velocity: 250, trueTrack: 90, verticalRate: 0,
+                          sensors: nil, geoAltitude: 0, squawk: nil, spi: false, positionSource: 0)
+        }
+
+        // ~10 km north: 250 m/s over 10 km ≈ 1.43°/s
+        let speed = PollingScheduler.maximumAngularSpeed(
+            of: [flight("near", latitudeOffset: 0.09), flight("far", latitudeOffset: 0.5), flight("taxi", latitudeOffset: 0.01, onGround: true)],
+            observer: observer, range: 20_000)
+        XCTAssertEqual(speed ?? 0, 1.43, accuracy: 0.03)
+
+        XCTAssertNil(PollingScheduler.maximumAngularSpeed(of: [flight("far", latitudeOffset: 0.5)], observer: observer, range: 20_000))
+    }
+
+    // MARK: - Failures and Rate Limits
+
+    func testFailuresBackOffExponentiallyWithJitter() {
+        let scheduler = makeScheduler()
+        scheduler.start()
+
+        scheduler.record(.failure(retryAfter: nil))
+        XCTAssertEqual(scheduler.currentInterval, 10)
+        scheduler.record(.failure(retryAfter: nil))
+        XCTAssertEqual(scheduler.currentInterval, 20)
+        scheduler.record(.failure(retryAfter: nil))
+        XCTAssertEqual(scheduler.currentInterval, 40)
+
+        // Lowest jitter draw is 25% earlier
+        randomValue = 0
+        scheduler.record(.failure(retryAfter: nil))
+        XCTAssertEqual(scheduler.currentInterval, 60)
+
+        for _ in 0..<10 {
+            scheduler.record(.failure(retryAfter: nil))
+        }
+        XCTAssertEqual(scheduler.currentInterval, 225)
+
+        scheduler.record(.success(remainingRequests: nil))
+        XCTAssertEqual(scheduler.consecutiveFailures, 0)
+        XCTAssertEqual(scheduler.currentInterval, 10)
+    }
+
+    func testRetryAfterDelaysTheNextPoll() {
+        let scheduler = makeScheduler()
+        scheduler.start()
+        manualClock.advance(by: 1)
+
+        scheduler.record(.failure(retryAfter: 120))
+
+        XCTAssertEqual(secondsUntilNextPoll(scheduler), 120)
+        manualClock.advance(by: 119)
+        XCTAssertEqual(pollCount, 1)
+        manualClock.advance(by: 1)
+        XCTAssertEqual(pollCount, 2)
+    }
+
+    func testFewRemainingRequestsSlowPollingDown() {
+        let scheduler = makeScheduler()
+        scheduler.start()
+
+        scheduler.record(.success(remainingRequests: 400))
+        XCTAssertEqual(scheduler.currentInterval, 10)
+
+        scheduler.record(.success(remainingRequests: 20))
+        XCTAssertEqual(scheduler.currentInterval, 30)
+    }
+
+    func testReadsRateLimitHeaders() {
+        let url = URL(string: "https://opensky-network.org/api/states/all")!
+        func response(_ headers: [String: String]) -> HTTPURLResponse {
+            return HTTPURLResponse(url: url, statusCode: 429, httpVersion: "HTTP/1.1", headerFields: headers)!
+        }
+        let now = Date(timeIntervalSince1970: 1760024985)
+
+        XCTAssertEqual(PollingScheduler.retryAfter(from: response(["X-Rate-Limit-Retry-After-Seconds": "42"])), 42)
+        XCTAssertEqual(PollingScheduler.retryAfter(from: response(["Retry-After": "120"])), 120)
+        XCTAssertEqual(PollingScheduler.retryAfter(from: response(["Retry-After": "Thu, 09 Oct 2025 16:09:45 GMT"]), now: now), 1200)
+        XCTAssertNil(PollingScheduler.retryAfter(from: response([:])))
+
+        XCTAssertEqual(PollingScheduler.remainingRequests(from: response(["X-Rate-Limit-Remaining": "17"])), 17)
+        XCTAssertNil(PollingScheduler.remainingRequests(from: response([:])))
+    }
+}
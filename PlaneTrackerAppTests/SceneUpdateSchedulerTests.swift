@@ -0,0 +1,119 @@
+import XCTest
+@testable import PlaneTrackerApp
+
+class SceneUpdateSchedulerTests: XCTestCase {
+    var currentTime: TimeInterval = 0
+
+    private func makeScheduler(frameBudget: TimeInterval = 0.004) -> SceneUpdateScheduler<Int> {
+        return SceneUpdateScheduler(frameBudget: frameBudget, now: { [unowned self] in self.currentTime })
+    }
+
+    /// Drain, advancing the fake clock by `cost` per performed update
+    private func drainIds(_ scheduler: SceneUpdateScheduler<Int>, cost: TimeInterval = 0) -> [String] {
+        var ids: [String] = []
+        scheduler.drain { update in
+            ids.append(update.flightId)
+            self.currentTime += cost
+        }
+        return ids
+    }
+
+    // MARK: - Priority Tests
+
+    func testRemovalsThenSelectedThenNearestFirst() {
+        let scheduler = makeScheduler()
+        scheduler.enqueueUpdate(flightId: "far", payload: 0, distance: 50)
+        scheduler.enqueueUpdate(flightId: "near", payload: 0, distance: 2)
+        scheduler.enqueueUpdate(flightId: "selected", payload: 0, distance: 80)
+        scheduler.enqueueRemoval(flightId: "gone")
+        scheduler.selectedFlightId = "selected"
+
+        XCTAssertEqual(drainIds(scheduler), ["gone", "selected", "near", "far"])
+        XCTAssertEqual(scheduler.pendingCount, 0)
+    }
+
+    func testSelectionChangeReordersPendingWork() {
+        let scheduler = makeScheduler(frameBudget: 0.25)
+        for index in 0..<4 {
+            scheduler.enqueueUpdate(flightId: "F\(index)", payload: index, distance: Float(index))
+        }
+
+        XCTAssertEqual(drainIds(scheduler, cost: 0.25), ["F0"])
+        scheduler.selectedFlightId = "F3"
+        XCTAssertEqual(drainIds(scheduler, cost: 0.25), ["F3"])
+        XCTAssertEqual(drainIds(scheduler), ["F1", "F2"])
+    }
+
+    // MARK: - Budget Tests
+
+    func testDrainStopsWhenBudgetIsSpent() {
+        let scheduler = makeScheduler(frameBudget: 0.5)
+        for index in 0..<10 {
+            scheduler.enqueueUpdate(flightId: "F\(index)", payload: index, distance: Float(index))
+        }
+
+        XCTAssertEqual(drainIds(scheduler, cost: 0.125), ["F0", "F1", "F2", "F3"])
+        XCTAssertEqual(scheduler.pendingCount, 6)
+        XCTAssertEqual(drainIds(scheduler, cost: 0.125), ["F4", "F5", "F6", "F7"])
+        XCTAssertEqual(drainIds(scheduler, cost: 0.125), ["F8", "F9"])
+    }
+
+    func testAlwaysPerformsAtLeastOneUpdate() {
+        let scheduler = makeScheduler(frameBudget: 0.001)
+        scheduler.enqueueUpdate(flightId: "A", payload: 0, distance: 1)
+        scheduler.enqueueUpdate(flightId: "B", payload: 0, distance: 2)
+
+        XCTAssertEqual(drainIds(scheduler, cost: 0.050), ["A"])
+        XCTAssertEqual(drainIds(scheduler, cost: 0.050), ["B"])
+    }
+
+    // MARK: - Coalescing Tests
+
+    func testLatestPayloadWins() {
+        let scheduler = makeScheduler()
+        scheduler.enqueueUpdate(flightId: "A", payload: 1, distance: 10)
+        scheduler.enqueueUpdate(flightId: "A", payload: 2, distance: 5)
+
+        var payloads: [Int] = []
+        scheduler.drain { update in
+            if case .update(_, let payload) = update {
+                payloads.append(payload)
+            }
+        }
+        XCTAssertEqual(payloads, [2])
+    }
+
+    func testRemovalCancelsPendingUpdate() {
+        let scheduler = makeScheduler()
+        scheduler.enqueueUpdate(flightId: "A", payload: 1, distance: 10)
+        scheduler.enqueueRemoval(flightId: "A")
+
+        var removed: [String] = []
+        scheduler.drain { update in
+            if case .remove(let flightId) = update {
+                removed.append(flightId)
+            } else {
+                XCTFail("Update should have been replaced by the removal")
+            }
+        }
+        XCTAssertEqual(removed, ["A"])
+    }
+
+    // MARK: - Frame Tick Tests
+
+    func testSchedulesOneDrainAtATime() {
+        let scheduler = makeScheduler()
+        XCTAssertFalse(scheduler.scheduleDrainIfNeeded())
+
+        scheduler.enqueueUpdate(flightId: "A", payload: 0, distance: 1)
+        XCTAssertTrue(scheduler.scheduleDrainIfNeeded())
+        XCTAssertFalse(scheduler.scheduleDrainIfNeeded())
+
+        scheduler.enqueueUpdate(flightId: "B", payload: 0, distance: 2)
+        scheduler.drain { _ in }
+        XCTAssertFalse(scheduler.scheduleDrainIfNeeded())
+
+        scheduler.enqueueUpdate(flightId: "C", payload: 0, distance: 3)
+        XCTAssertTrue(scheduler.scheduleDrainIfNeeded())
+    }
+}
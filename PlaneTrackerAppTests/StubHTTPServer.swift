@@ -0,0 +1,240 @@
+import Foundation
+import Network
+
+/// Minimal HTTP/1.1 server on 127.0.0.1 for exercising the backend client.
+///
+/// Understands GET/POST with `Content-Length` bodies and keeps connections
+/// alive, so tests can assert on connection reuse as well as on headers.
+final class StubHTTPServer {
+
+    struct Request {
+        let method: String
+        let path: String
+        let headers: [String: String]
+        let body: Data
+        /// Sequential id of the TCP connection the request arrived on
+        let connectionId: Int
+
+        func header(_ name: String) -> String? {
+            return headers[name.lowercased()]
+        }
+    }
+
+    struct Response {
+        var status: Int = 200
+        var headers: [String: String] = [:]
+        var body = Data()
+        /// Delay before responding, for coalescing tests
+        var delay: TimeInterval = 0
+        /// Keep the connection open as a `text/event-stream`; `body` is sent
+        /// first and later events go out through `pushEvent(_:)`
+        var isEventStream = false
+
+        static func eventStream(_ initialEvents: String = "") -> Response {
+            return Response(status: 200, headers: ["Content-Type": "text/event-stream"],
+                            body: Data(initialEvents.utf8), isEventStream: true)
+        }
+
+        static func json(_ object: Any, headers: [String: String] = [:]) -> Response {
+            let body = (try? JSONSerialization.data(withJSONObject: object)) ?? Data()
+            var allHeaders = headers
+            allHeaders["Content-Type"] = "application/json"
+            return Response(status: 200, headers: allHeaders, body: body)
+        }
+    }
+
+    typealias Handler = (Request) -> Response
+
+    private let listener: NWListener
+    private let queue = DispatchQueue(label: "StubHTTPServer")
+    private let lock = NSLock()
+    private var handler: Handler
+    private var receivedRequests: [Request] = []
+    private var connections: [NWConnection] = []
+    private var eventStreams: [NWConnection] = []
+
+    init(handler: @escaping Handler) throws {
+        self.handler = handler
+        let parameters = NWParameters.tcp
+        parameters.requiredLocalEndpoint = NWEndpoint.hostPort(host: "127.0.0.1", port: .any)
+        listener = try NWListener(using: parameters)
+    }
+
+    /// Base URL of the running server, e.g. `http://127.0.0.1:54321`
+    private(set) var baseURL = ""
+
+    var requests: [Request] {
+        lock.lock()
+        defer { lock.unlock() }
+        return receivedRequests
+    }
+
+    var connectionCount: Int {
+        lock.lock()
+        defer { lock.unlock() }
+        return connections.count
+    }
+
+    func setHandler(_ handler: @escaping Handler) {
+        lock.lock()
+        self.handler = handler
+        lock.unlock()
+    }
+
+    func start(timeout: TimeInterval = 5) throws {
+        let ready = DispatchSemaphore(value: 0)
+        var failure: Error?
+
+        listener.stateUpdateHandler = { state in
+            switch state {
+            case .ready:
+                ready.signal()
+            case .failed(let error):
+                failure = error
+                ready.signal()
+            default:
+                break
+            }
+        }
+        listener.newConnectionHandler = { [weak self] connection in
+            self?.accept(connection)
+        }
+        listener.start(queue: queue)
+
+        guard ready.wait(timeout: .now() + timeout) == .success else {
+            throw URLError(.timedOut)
+        }
+        if let failure = failure {
+            throw failure
+        }
+        baseURL = "http://127.0.0.1:\(listener.port?.rawValue ?? 0)"
+    }
+
+    /// Send raw event-stream text to every open event stream
+    func pushEvent(_ text: String) {
+        lock.lock()
+        let streams = eventStreams
+        lock.unlock()
+        for connection in streams {
+            connection.send(content: Data(text.utf8), completion: .contentProcessed { _ in })
+        }
+    }
+
+    /// Drop every open event stream, as a flaky network would
+    func closeEventStreams() {
+        lock.lock()
+        let streams = eventStreams
+        eventStreams.removeAll()
+        lock.unlock()
+        streams.forEach { $0.cancel() }
+    }
+
+    var openEventStreamCount: Int {
+        lock.lock()
+        defer { lock.unlock() }
+        return eventStreams.count
+    }
+
+    func stop() {
+        listener.cancel()
+        lock.lock()
+        let open = connections
+        lock.unlock()
+        open.forEach { $0.cancel() }
+    }
+
+    // MARK: - Connection Handling
+
+    private func accept(_ connection: NWConnection) {
+        lock.lock()
+        connections.append(connection)
+        let connectionId = connections.count
+        lock.unlock()
+
+        connection.start(queue: queue)
+        receive(on: connection, connectionId: connectionId, buffer: Data())
+    }
+
+    private func receive(on connection: NWConnection, connectionId: Int, buffer: Data) {
+        connection.receive(minimumIncompleteLength: 1, maximumLength: 65536) { [weak self] content, _, isComplete, error in
+            guard let self = self else { return }
+            var pending = buffer
+            if let content = content {
+                pending.append(content)
+            }
+
+            while let (request, consumed) = StubHTTPServer.parseRequest(pending, connectionId: connectionId) {
+                pending = pending.subdata(in: (pending.startIndex + consumed)..<pending.endIndex)
+                self.respond(to: request, on: connection)
+            }
+
+            if isComplete || error != nil {
+                connection.cancel()
+            } else {
+                self.receive(on: connection, connectionId: connectionId, buffer: pending)
+            }
+        }
+    }
+
+    private func respond(to request: Request, on connection: NWConnection) {
+        lock.lock()
+        receivedRequests.append(request)
+        let handler = self.handler
+        lock.unlock()
+
+        let response = handler(request)
+        var head = "HTTP/1.1 \(response.status) \(HTTPURLResponse.localizedString(forStatusCode: response.status))\r\n"
+        var headers = response.headers
+        if response.isEventStream {
+            // No length: the body runs until the connection closes
+            headers["Cache-Control"] = "no-cache"
+            lock.lock()
+            eventStreams.append(connection)
+            lock.unlock()
+        } else {
+            headers["Content-Length"] = "\(response.status == 304 ? 0 : response.body.count)"
+        }
+        headers["Connection"] = "keep-alive"
+        for (name, value) in headers {
+            head += "\(name): \(value)\r\n"
+        }
+        head += "\r\n"
+
+        var payload = Data(head.utf8)
+        if response.status != 304 {
+            payload.append(response.body)
+        }
+
+        queue.asyncAfter(deadline: .now() + response.delay) {
+            connection.send(content: payload, completion: .contentProcessed { _ in })
+        }
+    }
+
+    private static func parseRequest(_ data: Data, connectionId: Int) -> (Request, Int)? {
+        guard let headerEnd = data.range(of: Data("\r\n\r\n".utf8)),
+              let head = String(data: data[data.startIndex..<headerEnd.lowerBound], encoding: .utf8) else {
+            return nil
+        }
+
+        var lines = head.components(separatedBy: "\r\n")
+        let requestLine = lines.removeFirst().split(separator: " ")
+        guard requestLine.count >= 2 else { return nil }
+
+        var headers: [String: String] = [:]
+        for line in lines {
+            guard let colon = line.firstIndex(of: ":") else { continue }
+            let name = line[..<colon].trimmingCharacters(in: .whitespaces).lowercased()
+            let value = line[line.index(after: colon)...].trimmingCharacters(in: .whitespaces)
+            headers[name] = value
+        }
+
+        let bodyLength = Int(headers["content-length"] ?? "0") ?? 0
+        let bodyStart = headerEnd.upperBound - data.startIndex
+        guard data.count >= bodyStart + bodyLength else { return nil }
+
+        let body = data.subdata(in: (data.startIndex + bodyStart)..<(data.startIndex + bodyStart + bodyLength))
+        let request = Request(method: String(requestLine[0]), path: String(requestLine[1]),
+                              headers: headers, body: body, connectionId: connectionId)
+        return (request, bodyStart + bodyLength)
+    }
+}
@@ -0,0 +1,94 @@
+import XCTest
+import simd
+@testable import PlaneTrackerApp
+
+class TrajectoryMeshBuilderTests: XCTestCase {
+    var meshBuilder: TrajectoryMeshBuilder!
+    
+    override func setUp() {
+        super.setUp()
+        meshBuilder = TrajectoryMeshBuilder()
+    }
+    
+    override func tearDown() {
+        meshBuilder = nil
+        super.tearDown()
+    }
+    
+    private func makePoints(count: Int) -> [SIMD3<Float>] {
+        return (0..<count).map { i in
+            SIMD3<Float>(Float(i) * 0.5, 1.0 + Float(i) * 0.01, -Float(i))
+        }
+    }
+    
+    // MARK: - Mesh Tests
+    
+    func testBuildsLineListForPolyline() {
+        let points = makePoints(count: 31)
+        
+        let mesh = meshBuilder.makeMesh(points: points)
+        
+        XCTAssertEqual(mesh.vertices, points)
+        XCTAssertEqual(mesh.segmentCount, 30)
+        XCTAssertEqual(Array(mesh.indices.prefix(6)), [0, 1, 1, 2, 2, 3])
+        XCTAssertEqual(mesh.indices.last, 30)
+    }
+    
+    func testBufferSizesMatchGeometryLayout() {
+        let mesh = meshBuilder.makeMesh(points: makePoints(count: 31))
+        
+        XCTAssertEqual(mesh.vertexData.count, 31 * TrajectoryMeshBuilder.vertexStride)
+        XCTAssertEqual(mesh.indexData.count, 60 * TrajectoryMeshBuilder.bytesPerIndex)
+    }
+    
+    func testSinglePointProducesNoSegments() {
+        let mesh = meshBuilder.makeMesh(points: makePoints(count: 1))
+        
+        XCTAssertTrue(mesh.isEmpty)
+    }
+    
+    func testNonFinitePointsBreakTheLine() {
+        var points = makePoints(count: 5)
+        points[2] = SIMD3<Float>(.nan, 0, 0)
+        
+        let mesh = meshBuilder.makeMesh(points: points)
+        
+        XCTAssertEqual(mesh.vertices.count, 4)
+        XCTAssertEqual(mesh.indices, [0, 1, 2, 3])
+    }
+    
+    func testRebuildReusesMesh() {
+        var mesh = meshBuilder.makeMesh(points: makePoints(count: 31))
+        
+        meshBuilder.rebuild(&mesh, points: makePoints(count: 3))
+        
+        XCTAssertEqual(mesh, meshBuilder.makeMesh(points: makePoints(count: 3)))
+    }
+    
+    func testRendererRebuildsMeshesInPlace() {
+        let renderer = TrajectoryRenderer()
+        renderer.update(flightId: "a", points: makePoints(count: 31))
+        let vertexBuffer = renderer.meshes["a"]?.vertices.withUnsafeBufferPointer { $0.baseAddress }
+        let indexBuffer = renderer.meshes["a"]?.indices.withUnsafeBufferPointer { $0.baseAddress }
+        
+        renderer.update(flightId: "a", points: makePoints(count: 31).map { $0 + SIMD3<Float>(1, 0, 0) })
+        
+        XCTAssertEqual(renderer.meshes["a"]?.vertices.first, SIMD3<Float>(1, 1, 0))
+        XCTAssertEqual(renderer.meshes["a"]?.vertices.withUnsafeBufferPointer { $0.baseAddress }, vertexBuffer)
+        XCTAssertEqual(renderer.meshes["a"]?.indices.withUnsafeBufferPointer { $0.baseAddress }, indexBuffer)
+    }
+    
+    // MARK: - Performance Tests
+    
+    func testRebuildPerformanceFullSky() {
+        // 2,000 flights with the default 31-point trajectory
+        let trajectories = (0..<2000).map { _ in makePoints(count: 31) }
+        var meshes = trajectories.map { meshBuilder.makeMesh(points: $0) }
+        
+        measure {
+            for i in meshes.indices {
+                meshBuilder.rebuild(&meshes[i], points: trajectories[i])
+            }
+        }
+    }
+}
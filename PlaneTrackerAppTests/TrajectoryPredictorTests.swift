@@ -366,4 +366,106 @@ class TrajectoryPredictorTests: XCTestCase {
             XCTAssertFalse(trajectory.isEmpty)
         }
     }
-}
\ No newline at end of file
+    
+    // MARK: - Batch Prediction Tests
+    
+    private func makeFleet(count: Int) -> [Flight] {
+        return (0..<count).map { i in
+            Flight(
+                id: String(format: "b%05x", i),
+                callsign: "TST\(i)",
+                originCountry: "United States",
+                timePosition: 1760024985,
+                lastContact: 1760024985,
+                longitude: -125.0 + Double(i % 997) * 0.0583,
+                latitude: 25.0 + Double(i % 991) * 0.0241,
+                // Cycle through every altitude correction band, plus the 35000 default
+                baroAltitude: i % 13 == 0 ? nil : Double(i % 40) * 1100.0 + 150.0,
+                onGround: false,
+                velocity: i % 17 == 0 ? nil : 60.0 + Double(i % 200),
+                trueTrack: Double(i % 360) + 0.5,
+                verticalRate: Double(i % 21) - 10.0,
+                sensors: nil,
+                geoAltitude: nil,
+                squawk: nil,
+                spi: false,
+                positionSource: 0
+            )
+        }
+    }
+    
+    func testBatchPredictionMatchesPerFlightPath() {
+        let fleet = makeFleet(count: 1500)
+        
+        let batch = trajectoryPredictor.predictTrajectories(for: fleet, predictionTime: 60.0, timeStep: 2.0)
+        
+        XCTAssertEqual(batch.count, fleet.count)
+        for flight in fleet {
+            let expected = trajectoryPredictor.predictTrajectory(for: flight, predictionTime: 60.0, timeStep: 2.0)
+            guard let actual = batch[flight.id] else {
+                XCTFail("Missing batch trajectory for \(flight.id)")
+                continue
+            }
+            XCTAssertEqual(actual.count, expected.count)
+            for (a, e) in zip(actual, expected) {
+                XCTAssertEqual(a.latitude, e.latitude, accuracy: 1e-9)
+                XCTAssertEqual(a.longitude, e.longitude, accuracy: 1e-9)
+                XCTAssertEqual(a.altitude, e.altitude, accuracy: 1e-6)
+                XCTAssertEqual(a.timeOffset, e.timeOffset)
+                XCTAssertEqual(a.distanceFromCurrent, e.distanceFromCurrent, accuracy: 1e-3)
+                // Bearing is ill-conditioned at zero displacement; compare elsewhere
+                if e.distanceFromCurrent > 1.0 {
+                    XCTAssertEqual(a.bearing, e.bearing, accuracy: 1e-6)
+                }
+            }
+        }
+    }
+    
+    func testBatchPredictionHandlesMissingPosition() {
+        let missing = Flight(
+            id: "nopos",
+            callsign: "NOPOS",
+            originCountry: "United States",
+            timePosition: nil,
+            lastContact: 1760024985,
+            longitude: nil,
+            latitude: nil,
+            baroAltitude: nil,
+            onGround: false,
+            velocity: nil,
+            trueTrack: nil,
+            verticalRate: nil,
+            sensors: nil,
+            geoAltitude: nil,
+            squawk: nil,
+            spi: false,
+            positionSource: 0
+        )
+        
+        let batch = trajectoryPredictor.predictTrajectories(for: [missing] + makeFleet(count: 3))
+        
+        XCTAssertEqual(batch["nopos"]?.isEmpty, true)
+        XCTAssertEqual(batch.count, 4)
+    }
+    
+    func testBatchPredictionPerformance() {
+        let fleet = makeFleet(count: 10_000)
+        
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            let trajectories = trajectoryPredictor.predictTrajectories(for: fleet)
+            XCTAssertEqual(trajectories.count, fleet.count)
+        }
+    }
+    
+    func testPerFlightPredictionPerformanceBaseline() {
+        let fleet = makeFleet(count: 10_000)
+        
+        measure(metrics: [XCTClockMetric(), XCTMemoryMetric()]) {
+            var trajectories: [String: [TrajectoryPoint]] = [:]
+            for flight in fleet {
+                trajectories[flight.id] = trajectoryPredictor.predictTrajectory(for: flight)
+            }
+            XCTAssertEqual(trajectories.count, fleet.count)
+        }
+    }
+}